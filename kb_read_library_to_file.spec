@@ -21,6 +21,7 @@ Operational notes:
 - If a file downloaded from Shock has a .gz suffix, it is assumed to be
   gzipped.
 - Files are assumed to be in correct fastq format.
+- Output files are in fastq format unless fasta format is requested.
 
 */
 
@@ -52,11 +53,38 @@ module kb_read_library_to_file {
         tern interleaved - if true, provide the files in interleaved format if
             they are not already. If false, provide forward and reverse reads
             files. If null or missing, leave files as is.
+        int chunks - if provided, split each reads file into this many files
+            of approximately equal size, e.g. for sharding the reads across
+            processes. Read pairs are never split, and the nth forward file
+            contains the mates of the reads in the nth reverse file. Must be
+            at least 1 and at most a maximum set by the service, 100 by
+            default. If null or missing, each reads file is provided as a
+            single file.
+        string output_format - the format of the output files, either
+            'fastq' or 'fasta'. FASTA output omits the quality scores. If null
+            or missing, the files are provided in FASTQ format.
+        bool stats - if true, include statistics about the time spent and
+            bytes processed by each stage of the conversion in the output.
+            Defaults to false.
+        bool continue_on_failure - if true, a read library that fails to
+            convert does not fail the call. Instead, the error is reported in
+            the errors field of the output and the other read libraries are
+            converted as usual. Defaults to false.
+        string priority - the priority of the conversion, either
+            'interactive' or 'batch'. Batch conversions use the capacity
+            interactive conversions leave, and the service may limit how
+            many run at once. If null or missing, conversions that download
+            more than a size set by the service are batch conversions.
     */
     typedef structure {
         list<read_lib> read_libraries;
         tern gzip;
         tern interleaved;
+        int chunks;
+        string output_format;
+        bool stats;
+        bool continue_on_failure;
+        string priority;
     } ConvertReadLibraryParams;
     
     /* Reads file locations and gzip status.
@@ -69,12 +97,27 @@ module kb_read_library_to_file {
         bool rev_gz - whether the reverse / right reads are gzipped.
         bool inter_gz - whether the interleaved reads are gzipped.
         bool sing_gz - whether the single reads are gzipped.
+        list<string> fwd_chunks - the paths to the forward / left reads
+            chunks.
+        list<string> rev_chunks - the paths to the reverse / right reads
+            chunks.
+        list<string> inter_chunks - the paths to the interleaved reads chunks.
+        list<string> sing_chunks - the paths to the single end reads chunks.
+        The *_chunks fields are provided instead of the fwd, rev, inter, and
+        sing fields when the chunks parameter is set.
+        The files may be hard links to files shared with other conversions
+        and the service's caches, so they must not be modified in place. To
+        change a file, write a new file and replace the old one with it.
      */
     typedef structure {
         string fwd;
         string rev;
         string inter;
         string sing;
+        list<string> fwd_chunks;
+        list<string> rev_chunks;
+        list<string> inter_chunks;
+        list<string> sing_chunks;
         bool fwd_gz;
         bool rev_gz;
         bool inter_gz;
@@ -121,16 +164,167 @@ module kb_read_library_to_file {
         float gc_content;
     } ConvertedReadLibrary;
 
+    /* Statistics for a stage of a conversion.
+        float seconds - the wall clock time spent in the stage.
+        int bytes_read - the number of bytes read by the stage.
+        int bytes_written - the number of bytes written by the stage.
+        float bytes_per_sec - the number of bytes read per second. null if
+            the stage took no measurable time.
+     */
+    typedef structure {
+        float seconds;
+        int bytes_read;
+        int bytes_written;
+        float bytes_per_sec;
+    } StageStats;
+
+    /* Statistics for a conversion.
+        float seconds - the wall clock time of the conversion.
+        mapping<string, StageStats> stages - the statistics for each stage
+            of the conversion, summed over all the read libraries. The
+            stages are ws_fetch, batch_queue, shock_metadata, shock_download,
+            peer_download, gunzip, gzip, mv, split, interleave, and
+            deinterleave. ws_fetch is the workspace calls that fetch the read
+            library objects and resolve the references to them. batch_queue
+            is the time a batch priority conversion waited to start.
+            shock_metadata is the Shock calls for the reads file metadata.
+            Only the stages that ran are included.
+        mapping<string, mapping<string, StageStats>> libraries - the
+            statistics for each stage for each read library, keyed by the
+            absolute reference of the library. The ws_fetch and batch_queue
+            stages run for several libraries at once and are not included.
+     */
+    typedef structure {
+        float seconds;
+        mapping<string, StageStats> stages;
+        mapping<string, mapping<string, StageStats>> libraries;
+    } ConversionStats;
+
+    /* An error that occurred when converting a read library.
+        string error - the error message.
+        string type - the type of the error, e.g. ShockError or
+            ValueError.
+        bool transient - whether the error may not recur if the read library
+            is converted again, e.g. a timeout or an unavailable service.
+     */
+    typedef structure {
+        string error;
+        string type;
+        bool transient;
+    } ConversionError;
+
     /* The output of the convert method.
         mapping<read_lib, ConvertedReadLibrary> files - a mapping
             of the read library workspace references to information
-            about the converted data for each library.
+            about the converted data for each library. References that
+            point to the same object, e.g. MyWorkspace/MyReads and 256/3/6,
+            share the same converted data.
+        mapping<read_lib, ConversionError> errors - a mapping of the read
+            library workspace references that failed to convert to the
+            error for each library. Failed libraries are not present in the
+            files mapping. Only present if continue_on_failure is true.
+        ConversionStats stats - statistics about the conversion. Only
+            present if requested.
+        string call_id - the ID the service generated for the conversion,
+            which identifies it in the service's logs and progress records.
+            For asynchronous jobs, this is the job ID.
      */
     typedef structure {
         mapping<read_lib, ConvertedReadLibrary> files;
+        mapping<read_lib, ConversionError> errors;
+        ConversionStats stats;
+        string call_id;
     } ConvertReadLibraryOutput;
    
     /* Convert read libraries to files */
     funcdef convert_read_library_to_file(ConvertReadLibraryParams params)
         returns(ConvertReadLibraryOutput output) authentication required;
+
+    /* The ID of an asynchronous conversion job. */
+    typedef string job_id;
+
+    /* Submit a conversion job that runs in the background on the service.
+        The job status and results are available from get_job_status and
+        get_job_result.
+     */
+    funcdef submit_convert_read_library_to_file(
+        ConvertReadLibraryParams params) returns(job_id job_id)
+        authentication required;
+
+    /* The progress of a conversion.
+        int libraries_total - the number of read libraries to convert.
+        int libraries_done - the number of read libraries converted so far.
+        string stage - the stage that is running, or null.
+        int stage_bytes_done - the number of bytes the stage has processed.
+        int stage_bytes_total - the number of bytes the stage will process.
+     */
+    typedef structure {
+        int libraries_total;
+        int libraries_done;
+        string stage;
+        int stage_bytes_done;
+        int stage_bytes_total;
+    } ConversionProgress;
+
+    /* The status of an asynchronous conversion job.
+        job_id job_id - the ID of the job.
+        string status - the status of the job, one of 'queued', 'running',
+            'complete', or 'error'.
+        string error - the error message if the job failed. null otherwise.
+        int submitted - the time the job was submitted in milliseconds since
+            the epoch.
+        int started - the time the job started in milliseconds since the
+            epoch. null if the job has not started.
+        int finished - the time the job finished in milliseconds since the
+            epoch. null if the job has not finished.
+        ConversionProgress progress - the most recently recorded progress of
+            the job. null if the job has not started.
+     */
+    typedef structure {
+        job_id job_id;
+        string status;
+        string error;
+        int submitted;
+        int started;
+        int finished;
+        ConversionProgress progress;
+    } JobStatus;
+
+    /* Get the status of a conversion job. */
+    funcdef get_job_status(job_id job_id) returns(JobStatus status)
+        authentication required;
+
+    /* Get the results of a completed conversion job. Throws an error if the
+        job failed or has not yet completed.
+     */
+    funcdef get_job_result(job_id job_id)
+        returns(ConvertReadLibraryOutput output) authentication required;
+
+    /* Input parameters for prefetching read libraries.
+        list<read_lib> read_libraries - the names of the workspace read
+            library objects to prefetch.
+     */
+    typedef structure {
+        list<read_lib> read_libraries;
+    } PrefetchReadLibrariesParams;
+
+    /* The output of the prefetch method.
+        mapping<read_lib, read_lib> refs - a mapping of the read library
+            workspace references to the absolute references of the objects
+            that will be prefetched.
+     */
+    typedef structure {
+        mapping<read_lib, read_lib> refs;
+    } PrefetchReadLibrariesOutput;
+
+    /* Download the reads files for read libraries to the service's staging
+        area in the background, so that later conversions of the libraries
+        read the files from local disk. Returns once the references have
+        been resolved. Staged files expire if they are not used for a while
+        and may be evicted if the staging area is full, in which case
+        conversions download the files as usual. Throws an error if the
+        service has no staging area.
+     */
+    funcdef prefetch_read_libraries(PrefetchReadLibrariesParams params)
+        returns(PrefetchReadLibrariesOutput output) authentication required;
 };
\ No newline at end of file
@@ -67,6 +67,150 @@ function kb_read_library_to_file(url, auth, auth_cb, timeout, async_job_check_ti
         return json_call_ajax("kb_read_library_to_file._convert_read_library_to_file_submit", 
             [params], 1, _callback, _errorCallback, json_rpc_context);
     };
+
+    this.submit_convert_read_library_to_file = function (params, _callback, _errorCallback, json_rpc_context) {
+        if (self.async_version) {
+            if (!json_rpc_context)
+                json_rpc_context = {};
+            json_rpc_context['service_ver'] = self.async_version;
+        }
+        self._submit_convert_read_library_to_file_submit(params, function(job_id) {
+            var _checkCallback = null;
+            _checkCallback = function(job_state) {
+                if (job_state.finished != 0) {
+                    if (!job_state.hasOwnProperty('result'))
+                        job_state.result = null;
+                    _callback(job_state.result[0]);
+                } else {
+                    setTimeout(function () {
+                        self._check_job(job_id, _checkCallback, _errorCallback);
+                    }, self.async_job_check_time_ms);
+                }
+            };       
+            _checkCallback({finished: 0});
+        }, _errorCallback, json_rpc_context);
+    };
+
+    this._submit_convert_read_library_to_file_submit = function (params, _callback, _errorCallback, json_rpc_context) {
+        if (typeof params === 'function')
+            throw 'Argument params can not be a function';
+        if (_callback && typeof _callback !== 'function')
+            throw 'Argument _callback must be a function if defined';
+        if (_errorCallback && typeof _errorCallback !== 'function')
+            throw 'Argument _errorCallback must be a function if defined';
+        if (typeof arguments === 'function' && arguments.length > 1+2)
+            throw 'Too many arguments ('+arguments.length+' instead of '+(1+2)+')';
+        return json_call_ajax("kb_read_library_to_file._submit_convert_read_library_to_file_submit", 
+            [params], 1, _callback, _errorCallback, json_rpc_context);
+    };
+
+    this.get_job_status = function (job_id, _callback, _errorCallback, json_rpc_context) {
+        if (self.async_version) {
+            if (!json_rpc_context)
+                json_rpc_context = {};
+            json_rpc_context['service_ver'] = self.async_version;
+        }
+        self._get_job_status_submit(job_id, function(job_id) {
+            var _checkCallback = null;
+            _checkCallback = function(job_state) {
+                if (job_state.finished != 0) {
+                    if (!job_state.hasOwnProperty('result'))
+                        job_state.result = null;
+                    _callback(job_state.result[0]);
+                } else {
+                    setTimeout(function () {
+                        self._check_job(job_id, _checkCallback, _errorCallback);
+                    }, self.async_job_check_time_ms);
+                }
+            };       
+            _checkCallback({finished: 0});
+        }, _errorCallback, json_rpc_context);
+    };
+
+    this._get_job_status_submit = function (job_id, _callback, _errorCallback, json_rpc_context) {
+        if (typeof job_id === 'function')
+            throw 'Argument job_id can not be a function';
+        if (_callback && typeof _callback !== 'function')
+            throw 'Argument _callback must be a function if defined';
+        if (_errorCallback && typeof _errorCallback !== 'function')
+            throw 'Argument _errorCallback must be a function if defined';
+        if (typeof arguments === 'function' && arguments.length > 1+2)
+            throw 'Too many arguments ('+arguments.length+' instead of '+(1+2)+')';
+        return json_call_ajax("kb_read_library_to_file._get_job_status_submit", 
+            [job_id], 1, _callback, _errorCallback, json_rpc_context);
+    };
+
+    this.get_job_result = function (job_id, _callback, _errorCallback, json_rpc_context) {
+        if (self.async_version) {
+            if (!json_rpc_context)
+                json_rpc_context = {};
+            json_rpc_context['service_ver'] = self.async_version;
+        }
+        self._get_job_result_submit(job_id, function(job_id) {
+            var _checkCallback = null;
+            _checkCallback = function(job_state) {
+                if (job_state.finished != 0) {
+                    if (!job_state.hasOwnProperty('result'))
+                        job_state.result = null;
+                    _callback(job_state.result[0]);
+                } else {
+                    setTimeout(function () {
+                        self._check_job(job_id, _checkCallback, _errorCallback);
+                    }, self.async_job_check_time_ms);
+                }
+            };       
+            _checkCallback({finished: 0});
+        }, _errorCallback, json_rpc_context);
+    };
+
+    this._get_job_result_submit = function (job_id, _callback, _errorCallback, json_rpc_context) {
+        if (typeof job_id === 'function')
+            throw 'Argument job_id can not be a function';
+        if (_callback && typeof _callback !== 'function')
+            throw 'Argument _callback must be a function if defined';
+        if (_errorCallback && typeof _errorCallback !== 'function')
+            throw 'Argument _errorCallback must be a function if defined';
+        if (typeof arguments === 'function' && arguments.length > 1+2)
+            throw 'Too many arguments ('+arguments.length+' instead of '+(1+2)+')';
+        return json_call_ajax("kb_read_library_to_file._get_job_result_submit", 
+            [job_id], 1, _callback, _errorCallback, json_rpc_context);
+    };
+
+    this.prefetch_read_libraries = function (params, _callback, _errorCallback, json_rpc_context) {
+        if (self.async_version) {
+            if (!json_rpc_context)
+                json_rpc_context = {};
+            json_rpc_context['service_ver'] = self.async_version;
+        }
+        self._prefetch_read_libraries_submit(params, function(job_id) {
+            var _checkCallback = null;
+            _checkCallback = function(job_state) {
+                if (job_state.finished != 0) {
+                    if (!job_state.hasOwnProperty('result'))
+                        job_state.result = null;
+                    _callback(job_state.result[0]);
+                } else {
+                    setTimeout(function () {
+                        self._check_job(job_id, _checkCallback, _errorCallback);
+                    }, self.async_job_check_time_ms);
+                }
+            };       
+            _checkCallback({finished: 0});
+        }, _errorCallback, json_rpc_context);
+    };
+
+    this._prefetch_read_libraries_submit = function (params, _callback, _errorCallback, json_rpc_context) {
+        if (typeof params === 'function')
+            throw 'Argument params can not be a function';
+        if (_callback && typeof _callback !== 'function')
+            throw 'Argument _callback must be a function if defined';
+        if (_errorCallback && typeof _errorCallback !== 'function')
+            throw 'Argument _errorCallback must be a function if defined';
+        if (typeof arguments === 'function' && arguments.length > 1+2)
+            throw 'Too many arguments ('+arguments.length+' instead of '+(1+2)+')';
+        return json_call_ajax("kb_read_library_to_file._prefetch_read_libraries_submit", 
+            [params], 1, _callback, _errorCallback, json_rpc_context);
+    };
     
   
 
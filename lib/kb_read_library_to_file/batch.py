@@ -0,0 +1,62 @@
+'''
+Concurrent handling of the requests in JSON-RPC batch calls.
+'''
+
+import copy
+import sys
+import threading
+
+
+class BatchRunner(object):
+    '''
+    Runs the requests from JSON-RPC batch calls with up to concurrency
+    requests running at once, shared across all batch calls. If concurrency
+    is 1, batch requests are run one at a time.
+    '''
+
+    def __init__(self, concurrency=1):
+        if concurrency < 1:
+            raise ValueError('concurrency must be at least 1')
+        self.concurrency = concurrency
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def _get_pool(self):
+        # created lazily so that uwsgi workers forked after the application
+        # is loaded get their own threads
+        with self._pool_lock:
+            if self._pool is None:
+                from multiprocessing.pool import ThreadPool
+                self._pool = ThreadPool(self.concurrency)
+            return self._pool
+
+    def run(self, ctx, requests, handle):
+        '''
+        Handles the requests in a batch with handle(ctx, request), returning
+        the responses in request order. Raises the error from the first
+        failed request, if any, and runs no further requests once a request
+        fails. When requests run concurrently, requests that are already
+        running when another request fails still finish, and a later request
+        may fail first.
+        '''
+        if self.concurrency == 1 or len(requests) == 1:
+            return [handle(ctx, r) for r in requests]
+
+        failed = threading.Event()
+
+        def run_one(request):
+            if failed.is_set():
+                return None
+            try:
+                # requests may modify the context
+                return True, handle(copy.copy(ctx), request)
+            except Exception:
+                failed.set()
+                return False, sys.exc_info()
+
+        results = self._get_pool().map(run_one, requests, chunksize=1)
+        for result in results:
+            if result and not result[0]:
+                # keep the traceback of the failed request
+                raise result[1][0], result[1][1], result[1][2]
+        return [respond for _, respond in results]
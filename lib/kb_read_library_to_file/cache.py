@@ -0,0 +1,128 @@
+'''
+In memory caches shared between requests.
+'''
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache(object):
+    '''
+    A thread safe, size bounded cache that evicts the least recently used
+    entry when full. A maximum size of 0 disables the cache.
+    '''
+
+    def __init__(self, maxsize):
+        if maxsize < 0:
+            raise ValueError('maxsize must be >= 0')
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        '''
+        Returns the value for the key, or None if the key is not in the cache.
+        '''
+        with self._lock:
+            if key not in self._cache:
+                self.misses += 1
+                return None
+            self.hits += 1
+            value = self._cache.pop(key)
+            self._cache[key] = value
+            return value
+
+    def put(self, key, value):
+        if not self.maxsize:
+            return
+        with self._lock:
+            self._cache.pop(key, None)
+            self._cache[key] = value
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+
+    def __len__(self):
+        return len(self._cache)
+
+
+class TokenCache(object):
+    '''
+    A thread safe cache of validated tokens and their user names. Tokens are
+    stored as hashes rather than in the clear. Entries expire ttl seconds
+    after they are added, and the oldest entries are evicted when the cache
+    holds more than maxsize entries.
+    '''
+
+    def __init__(self, maxsize, ttl):
+        if maxsize < 0:
+            raise ValueError('maxsize must be >= 0')
+        if ttl < 0:
+            raise ValueError('ttl must be >= 0')
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # since all entries have the same ttl, insertion order is also
+        # expiration order
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _hash(self, token):
+        return hashlib.sha256(token).hexdigest()
+
+    def get_user(self, token):
+        '''
+        Returns the user name for the token, or None if the token is not in
+        the cache or has expired.
+        '''
+        th = self._hash(token)
+        with self._lock:
+            if th not in self._cache:
+                return None
+            user, expires = self._cache[th]
+            if expires <= time.time():
+                del self._cache[th]
+                return None
+            return user
+
+    def add_valid_token(self, token, user):
+        if not self.maxsize or not self.ttl:
+            return
+        th = self._hash(token)
+        with self._lock:
+            self._cache.pop(th, None)
+            self._cache[th] = (user, time.time() + self.ttl)
+            now = time.time()
+            while self._cache:
+                oldest = next(iter(self._cache))
+                if (len(self._cache) <= self.maxsize and
+                        self._cache[oldest][1] > now):
+                    break
+                del self._cache[oldest]
+
+    def __len__(self):
+        return len(self._cache)
+
+
+class CachingAuthClient(object):
+    '''
+    Wraps an auth client so that tokens in cache, a TokenCache, aren't
+    validated again with the auth service.
+    '''
+
+    def __init__(self, client, cache):
+        self.client = client
+        self.cache = cache
+
+    def validate_token(self, token):
+        '''
+        Returns a tuple like the wrapped client's, but with only the user name
+        set, as that's all the cache holds.
+        '''
+        user = self.cache.get_user(token)
+        if user is None:
+            user = self.client.validate_token(token)[0]
+            self.cache.add_valid_token(token, user)
+        return user, None, None
@@ -0,0 +1,173 @@
+'''
+Coalescing of identical work that runs at the same time.
+'''
+
+import errno
+import fcntl
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+class _Flight(object):
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+
+
+class Coalescer(object):
+    '''
+    Runs work identified by a key so that callers that ask for the same work
+    while it is running wait for the result of the running work rather than
+    repeating it. Work is coalesced within this process, and across processes
+    that share directory via lock and result files in the directory.
+
+    The first caller, the leader, calls func() and returns the result. The
+    other callers, the followers, wait for the leader and return
+    share(result), which must return a result of their own, such as a copy of
+    the leader's files. Results are serialized to JSON to pass them to other
+    processes. If the leader fails or share() fails, the follower does the
+    work itself.
+    '''
+
+    def __init__(self, directory, log=None):
+        self.directory = directory
+        self.log = log
+        self._lock = threading.Lock()
+        self._flights = {}
+
+    def _log(self, message):
+        if self.log:
+            self.log(message)
+
+    def run(self, key, func, share):
+        '''
+        Returns a tuple of the result for key and whether it was shared from
+        another caller's work.
+        '''
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        if not leader:
+            flight.done.wait()
+            if flight.result is None:  # the leader failed
+                return self.run(key, func, share)
+            result = self._share(share, flight.result)
+            return (func(), False) if result is None else (result, True)
+        try:
+            flight.result, shared = self._run_locked(key, func, share)
+            return flight.result, shared
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def _share(self, share, result):
+        try:
+            return share(result)
+        except Exception as e:
+            self._log('Could not share the result of coalesced work: ' +
+                      str(e))
+            return None
+
+    def _paths(self, key):
+        name = os.path.join(self.directory, hashlib.sha256(key).hexdigest())
+        return name + '.lock', name + '.json'
+
+    def _lock_file(self, path):
+        while True:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            # the lock file may have been deleted, e.g. by the scratch
+            # sweeper, while waiting, in which case the lock excludes nobody
+            try:
+                if os.stat(path).st_ino == os.fstat(fd).st_ino:
+                    return fd
+            except OSError as e:
+                if e.errno != errno.ENOENT:
+                    os.close(fd)
+                    raise
+            os.close(fd)
+
+    def _read_result(self, path, since):
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (IOError, ValueError):
+            return None
+        # results from before the wait started are not from coalesced work
+        return data['result'] if data['finished'] >= since else None
+
+    def _write_result(self, path, result):
+        tmp = path + '.' + str(os.getpid()) + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump({'finished': time.time(), 'result': result}, f)
+        os.rename(tmp, path)
+
+    def prune(self, max_age):
+        '''
+        Deletes the lock and result files that haven't been modified for
+        max_age seconds. Lock files are only deleted if no process holds
+        them. Returns the number of files deleted.
+        '''
+        cutoff = time.time() - max_age
+        deleted = 0
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if os.path.getmtime(path) >= cutoff:
+                    continue
+                if name.endswith('.lock'):
+                    if not self._remove_unlocked(path):
+                        continue
+                else:
+                    os.remove(path)
+                deleted += 1
+            except OSError as e:
+                if e.errno != errno.ENOENT:
+                    raise
+        return deleted
+
+    # Processes waiting for the lock file when it's deleted find it has been
+    # deleted when they get the lock, and lock a new file.
+    def _remove_unlocked(self, path):
+        fd = os.open(path, os.O_RDWR)
+        try:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except IOError as e:
+                if e.errno not in (errno.EAGAIN, errno.EACCES):
+                    raise
+                return False
+            os.remove(path)
+            return True
+        finally:
+            os.close(fd)
+
+    # Another process's leader holds the lock file while it works, and
+    # releases it, even if it dies, when it's done.
+    def _run_locked(self, key, func, share):
+        lock, result_path = self._paths(key)
+        since = time.time()
+        fd = self._lock_file(lock)
+        try:
+            result = self._read_result(result_path, since)
+            if result is not None:
+                result = self._share(share, result)
+                if result is not None:
+                    return result, True
+            result = func()
+            try:
+                self._write_result(result_path, result)
+            except (IOError, OSError) as e:
+                self._log('Could not write the result of coalesced work: ' +
+                          str(e))
+            return result, False
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
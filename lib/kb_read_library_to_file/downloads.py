@@ -0,0 +1,220 @@
+'''
+Scheduling for downloads from Shock.
+'''
+
+import threading
+import time
+from collections import OrderedDict
+
+from kb_read_library_to_file.metrics import RateMeter
+from kb_read_library_to_file.priority import (
+    INTERACTIVE, BACKGROUND, PRIORITIES)
+
+
+class TokenBucket(object):
+    '''
+    Limits the rate of a flow of bytes to rate bytes per second, allowing
+    bursts of up to capacity bytes, which defaults to one second's worth.
+    '''
+
+    def __init__(self, rate, capacity=None):
+        if rate <= 0:
+            raise ValueError('rate must be greater than 0')
+        self.rate = float(rate)
+        self.capacity = float(capacity or rate)
+        self._tokens = self.capacity
+        self._time = time.time()
+        self._lock = threading.Lock()
+
+    def consume(self, amount):
+        '''
+        Takes amount tokens from the bucket, sleeping until the bucket has
+        refilled if it goes into debt. Returns the number of seconds slept.
+        '''
+        with self._lock:
+            now = time.time()
+            self._tokens = min(self.capacity, self._tokens +
+                               (now - self._time) * self.rate)
+            self._time = now
+            self._tokens -= amount
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+class _Ticket(object):
+
+    def __init__(self, user, priority):
+        self.user = user
+        self.priority = priority
+
+
+class _ScheduledStream(object):
+    '''
+    Wraps a stream so that reads are throttled and the download slot is
+    released when the stream is closed.
+    '''
+
+    def __init__(self, stream, scheduler, user, request, priority):
+        self._stream = stream
+        self._scheduler = scheduler
+        self._user = user
+        self._request = request
+        self._priority = priority
+        self._closed = False
+
+    def read(self, size=-1):
+        data = self._stream.read(size)
+        self._scheduler.throttle(len(data), self._priority)
+        return data
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._stream.close()
+        finally:
+            self._scheduler.release(self._user, self._request)
+
+
+class DownloadScheduler(object):
+    '''
+    Limits the downloads running in this process to connections downloads
+    in total and per_user downloads for any one user, and optionally limits
+    their total bandwidth to bandwidth bytes per second. A limit of 0
+    disables that limit.
+
+    Waiting downloads are started in order of the priority of their
+    requests, and within a priority in turn by request, so a request with
+    many libraries to download can't hold up the requests that arrive after
+    it. reserved connections are kept for interactive downloads, and batch
+    and background downloads may additionally be limited to batch_bandwidth
+    bytes per second, so they use the capacity interactive downloads leave.
+    No more than background background downloads run at once.
+
+    The limits aren't shared with other processes, so when the server runs
+    several worker processes, each process has its own limits.
+
+    throughput measures the rate of the downloads in bytes per second.
+    '''
+
+    def __init__(self, connections, per_user=0, bandwidth=0, background=1,
+                 reserved=0, batch_bandwidth=0):
+        if connections < 1:
+            raise ValueError('connections must be at least 1')
+        if background < 1:
+            raise ValueError('background must be at least 1')
+        if not 0 <= reserved < connections:
+            raise ValueError('reserved must be at least 0 and less than ' +
+                             'connections')
+        self.connections = connections
+        self.per_user = per_user
+        self.background = background
+        self.reserved = reserved
+        self.bucket = TokenBucket(bandwidth) if bandwidth else None
+        self.batch_bucket = TokenBucket(batch_bandwidth) \
+            if batch_bandwidth else None
+        self.throughput = RateMeter()
+        self._cond = threading.Condition()
+        self._active = 0
+        self._users = {}
+        self._requests = {}
+        # request -> priority, for requests with running downloads
+        self._priorities = {}
+        # priority -> running downloads
+        self._running = {p: 0 for p in PRIORITIES}
+        # request -> waiting tickets. Requests are moved to the end when one
+        # of their downloads starts.
+        self._waiting = OrderedDict()
+
+    def _can_start(self, ticket):
+        if self._active >= self.connections or (
+                self.per_user and
+                self._users.get(ticket.user, 0) >= self.per_user):
+            return False
+        if ticket.priority == INTERACTIVE:
+            return True
+        if self._active >= self.connections - self.reserved:
+            return False
+        return ticket.priority != BACKGROUND or \
+            self._running[BACKGROUND] < self.background
+
+    def _next(self):
+        for priority in PRIORITIES:
+            for tickets in self._waiting.values():
+                if tickets[0].priority == priority and \
+                        self._can_start(tickets[0]):
+                    return tickets[0]
+        return None
+
+    def acquire(self, user, request, nested=False, priority=INTERACTIVE):
+        '''
+        Waits for a download slot. request is any hashable value that
+        identifies the request the download is for. If nested is True and
+        the request already holds a slot, the slot is granted immediately,
+        which allows a request to read two files at once without
+        deadlocking. priority is the priority of the request, which must be
+        the same for all its downloads. Returns the number of seconds
+        waited.
+        '''
+        if priority not in PRIORITIES:
+            raise ValueError('Invalid priority: ' + str(priority))
+        start = time.time()
+        ticket = _Ticket(user, priority)
+        with self._cond:
+            if not nested or request not in self._requests:
+                self._waiting.setdefault(request, []).append(ticket)
+                while self._next() is not ticket:
+                    self._cond.wait()
+                tickets = self._waiting.pop(request)
+                tickets.pop(0)
+                if tickets:
+                    self._waiting[request] = tickets
+            self._active += 1
+            self._users[user] = self._users.get(user, 0) + 1
+            self._requests[request] = self._requests.get(request, 0) + 1
+            self._priorities[request] = priority
+            self._running[priority] += 1
+            # there may be room for the next download too
+            self._cond.notify_all()
+        return time.time() - start
+
+    def release(self, user, request):
+        with self._cond:
+            self._active -= 1
+            self._running[self._priorities[request]] -= 1
+            for counts, key in [(self._users, user),
+                                (self._requests, request)]:
+                counts[key] -= 1
+                if not counts[key]:
+                    del counts[key]
+            if request not in self._requests:
+                del self._priorities[request]
+            self._cond.notify_all()
+
+    def throttle(self, size, priority=INTERACTIVE):
+        '''
+        Accounts for size bytes downloaded at priority, sleeping if a
+        bandwidth limit has been exceeded.
+        '''
+        self.throughput.add(size)
+        if self.bucket:
+            self.bucket.consume(size)
+        if self.batch_bucket and priority != INTERACTIVE:
+            self.batch_bucket.consume(size)
+
+    def wrap(self, stream, user, request, priority=INTERACTIVE):
+        '''
+        Wraps a stream opened after acquire() so that reads are throttled and
+        the slot is released when the stream is closed.
+        '''
+        return _ScheduledStream(stream, self, user, request, priority)
+
+    def counts(self):
+        '''
+        Returns a tuple of the number of running and waiting downloads.
+        '''
+        with self._cond:
+            return self._active, sum(len(t) for t in self._waiting.values())
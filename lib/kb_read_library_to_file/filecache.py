@@ -0,0 +1,220 @@
+'''
+A cache of files on disk shared between requests and processes.
+'''
+
+import errno
+import fcntl
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+
+class FileCache(object):
+    '''
+    A size bounded cache of sets of files, stored in directory and shared by
+    the processes that use the directory. Files are added to and returned
+    from the cache as hard links, so they must be on the same file system as
+    the directory and must not be modified in place. When the cached files
+    take up more than max_bytes, the least recently used entries are evicted.
+    A max_bytes of 0 disables the cache. If max_age is provided, entries that
+    haven't been used for max_age seconds expire. Expired entries are never
+    returned, and are deleted when entries are added or evict() is called.
+
+    Entries are written to a temporary directory and renamed into place, so
+    an entry is either complete or absent, even if a process dies while
+    adding it.
+    '''
+
+    MANIFEST = 'manifest.json'
+    TMP_PREFIX = '.tmp-'
+    LOCK = '.lock'
+    # temporary directories older than this were left by dead processes
+    TMP_MAX_AGE = 3600
+
+    def __init__(self, directory, max_bytes, log=None, max_age=None):
+        if max_bytes < 0:
+            raise ValueError('max_bytes must be >= 0')
+        if max_age is not None and max_age <= 0:
+            raise ValueError('max_age must be > 0')
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.log = log
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _log(self, message):
+        if self.log:
+            self.log(message)
+
+    @staticmethod
+    def digest(key):
+        '''
+        Returns the digest of a key, which identifies its entry in any cache.
+        '''
+        return hashlib.sha256(key).hexdigest()
+
+    def _entry(self, key):
+        return os.path.join(self.directory, self.digest(key))
+
+    def _expired(self, last_use):
+        return self.max_age is not None and \
+            time.time() - last_use > self.max_age
+
+    @contextmanager
+    def _locked(self):
+        with self._lock:
+            fd = os.open(os.path.join(self.directory, self.LOCK),
+                         os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                yield
+            finally:
+                os.close(fd)
+
+    def get(self, key):
+        '''
+        Returns a tuple of the metadata stored with the files for the key and
+        a mapping of the names of the files to their paths in the cache, or
+        None if the key is not in the cache. The files may be evicted at any
+        time, so they should be linked or opened promptly.
+        '''
+        return self.get_digest(self.digest(key))
+
+    def contains(self, key):
+        '''
+        Returns whether the key is in the cache, without counting a hit or a
+        miss or recording a use of the entry.
+        '''
+        manifest = os.path.join(self._entry(key), self.MANIFEST)
+        try:
+            return not self._expired(os.stat(manifest).st_mtime)
+        except OSError:
+            return False
+
+    def get_digest(self, digest):
+        '''
+        Like get(), but takes the digest of the key.
+        '''
+        if not re.match('^[0-9a-f]{64}$', digest):
+            raise ValueError('Invalid digest: ' + digest)
+        manifest = os.path.join(self.directory, digest, self.MANIFEST)
+        try:
+            # the manifest's modification time records the last use
+            if self._expired(os.stat(manifest).st_mtime):
+                self.misses += 1
+                return None
+            with open(manifest) as f:
+                data = json.load(f)
+            os.utime(manifest, None)
+        except (IOError, OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        entry = os.path.dirname(manifest)
+        return data['meta'], {n: os.path.join(entry, n)
+                              for n in data['names']}
+
+    def put(self, key, paths, meta=None):
+        '''
+        Adds hard links to the files at paths, which must have distinct
+        names, to the cache along with metadata that can be serialized to
+        JSON. Returns False if the files are too large to cache.
+        '''
+        if not self.max_bytes:
+            return False
+        size = sum(os.path.getsize(p) for p in paths)
+        if size > self.max_bytes:
+            return False
+        entry = self._entry(key)
+        if os.path.exists(entry):
+            return True
+        tmp = os.path.join(self.directory,
+                           self.TMP_PREFIX + str(uuid.uuid4()))
+        os.mkdir(tmp)
+        try:
+            for p in paths:
+                os.link(p, os.path.join(tmp, os.path.basename(p)))
+            with open(os.path.join(tmp, self.MANIFEST), 'w') as f:
+                json.dump({'names': [os.path.basename(p) for p in paths],
+                           'meta': meta,
+                           'size': size}, f)
+                f.flush()
+                os.fsync(f.fileno())
+            with self._locked():
+                try:
+                    os.rename(tmp, entry)
+                except OSError as e:
+                    # another process added the entry first
+                    if e.errno not in (errno.EEXIST, errno.ENOTEMPTY):
+                        raise
+                self._evict()
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        return True
+
+    def _remove(self, entry):
+        # move the entry out of the way first so it disappears at once
+        tmp = os.path.join(self.directory,
+                           self.TMP_PREFIX + str(uuid.uuid4()))
+        os.rename(entry, tmp)
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    def _entries(self):
+        '''
+        Returns a list of tuples of the last use time, size, and path of the
+        entries in the cache, removing temporary directories left behind by
+        dead processes.
+        '''
+        entries = []
+        now = time.time()
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if name.startswith(self.TMP_PREFIX):
+                    if now - os.stat(path).st_mtime > self.TMP_MAX_AGE:
+                        shutil.rmtree(path, ignore_errors=True)
+                    continue
+                if not os.path.isdir(path):
+                    continue
+                manifest = os.path.join(path, self.MANIFEST)
+                with open(manifest) as f:
+                    size = json.load(f)['size']
+                entries.append((os.stat(manifest).st_mtime, size, path))
+            except (IOError, OSError, ValueError) as e:
+                self._log('Could not read cache entry {}: {}'.format(path, e))
+        return entries
+
+    def evict(self):
+        '''
+        Deletes expired entries and, if the cache is over its size limit,
+        the least recently used entries.
+        '''
+        with self._locked():
+            self._evict()
+
+    # must be called with the lock held
+    def _evict(self):
+        entries = sorted(self._entries())
+        total = sum(e[1] for e in entries)
+        for last_use, size, path in entries:
+            if total <= self.max_bytes and not self._expired(last_use):
+                break
+            self._log('Evicting cache entry ' + path)
+            self._remove(path)
+            total -= size
+
+    def size(self):
+        '''
+        Returns a tuple of the number of entries in the cache and their total
+        size in bytes.
+        '''
+        entries = self._entries()
+        return len(entries), sum(e[1] for e in entries)
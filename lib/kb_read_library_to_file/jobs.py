@@ -0,0 +1,219 @@
+'''
+A persistent store for asynchronous jobs and a local worker pool to run them.
+'''
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+import Queue
+from contextlib import closing
+
+
+def now_ms():
+    return int(round(time.time() * 1000))
+
+
+class JobStore(object):
+    '''
+    Stores job state in a SQLite database so that job status and results are
+    available from any server process and survive a server restart.
+    '''
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    COMPLETE = 'complete'
+    ERROR = 'error'
+
+    _FIELDS = ['job_id', 'user', 'owner', 'status', 'result', 'error',
+               'submitted', 'started', 'finished']
+
+    def __init__(self, path, create=True):
+        '''
+        path - the path of the database.
+        create - whether to create the database and its tables if they don't
+            exist. If False, the database must already exist.
+        '''
+        self.path = path
+        if not create:
+            return
+        with closing(self._connect()) as conn, conn:
+            conn.execute('''CREATE TABLE IF NOT EXISTS jobs (
+                                job_id TEXT PRIMARY KEY,
+                                user TEXT,
+                                owner TEXT NOT NULL,
+                                status TEXT NOT NULL,
+                                params TEXT NOT NULL,
+                                result TEXT,
+                                error TEXT,
+                                submitted INTEGER NOT NULL,
+                                started INTEGER,
+                                finished INTEGER)''')
+            conn.execute(
+                'CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status)')
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=60)
+
+    def _update(self, job_id, **fields):
+        cols = sorted(fields)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                'UPDATE jobs SET {} WHERE job_id = ?'.format(
+                    ', '.join(c + ' = ?' for c in cols)),
+                [fields[c] for c in cols] + [job_id])
+
+    def create(self, user, owner, params):
+        job_id = str(uuid.uuid4())
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                '''INSERT INTO jobs (job_id, user, owner, status, params,
+                                     submitted)
+                   VALUES (?, ?, ?, ?, ?, ?)''',
+                (job_id, user, owner, self.QUEUED, json.dumps(params),
+                 now_ms()))
+        return job_id
+
+    def set_running(self, job_id):
+        self._update(job_id, status=self.RUNNING, started=now_ms())
+
+    def set_complete(self, job_id, result):
+        self._update(job_id, status=self.COMPLETE, result=json.dumps(result),
+                     finished=now_ms())
+
+    def set_error(self, job_id, error):
+        self._update(job_id, status=self.ERROR, error=error,
+                     finished=now_ms())
+
+    def get(self, job_id):
+        '''
+        Returns the job as a dict, or None if there is no such job.
+        '''
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                'SELECT {} FROM jobs WHERE job_id = ?'.format(
+                    ', '.join(self._FIELDS)), (job_id,)).fetchone()
+        if not row:
+            return None
+        job = dict(zip(self._FIELDS, row))
+        if job['result'] is not None:
+            job['result'] = json.loads(job['result'])
+        return job
+
+    def count(self, status):
+        with closing(self._connect()) as conn:
+            return conn.execute('SELECT COUNT(*) FROM jobs WHERE status = ?',
+                                (status,)).fetchone()[0]
+
+    def delete_finished(self, before):
+        '''
+        Deletes the jobs that finished before the time before, in
+        milliseconds since the epoch. Returns the number of jobs deleted.
+        '''
+        with closing(self._connect()) as conn, conn:
+            return conn.execute(
+                'DELETE FROM jobs WHERE status IN (?, ?) AND finished < ?',
+                (self.COMPLETE, self.ERROR, before)).rowcount
+
+    def fail_orphans(self, host, is_alive, message):
+        '''
+        Fails any unfinished jobs owned by processes on this host that are no
+        longer running. Tokens are never persisted, so such jobs can't be
+        restarted.
+        host - the host name of this host.
+        is_alive - a function that takes a process ID and returns whether the
+            process is still running.
+        message - the error message for the failed jobs.
+        '''
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                'SELECT job_id, owner FROM jobs WHERE status IN (?, ?)',
+                (self.QUEUED, self.RUNNING)).fetchall()
+        for job_id, owner in rows:
+            ohost, pid = owner.rsplit(':', 1)
+            if ohost == host and not is_alive(int(pid)):
+                self.set_error(job_id, message)
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except OSError:
+        return False
+    return True
+
+
+class JobRunner(object):
+    '''
+    Runs jobs on a pool of local worker threads, recording their state in a
+    JobStore. The threads are started on the first submission, so that
+    servers that fork worker processes after loading the application don't
+    lose them.
+    '''
+
+    RESTART_ERROR = 'The server restarted before the job completed'
+
+    def __init__(self, store, workers, run):
+        '''
+        store - the JobStore.
+        workers - the number of worker threads.
+        run - the function that runs a job. It takes the job context, with
+            the job ID added under the job_id key, and the job parameters, and
+            returns the job result.
+        '''
+        if workers < 1:
+            raise ValueError('workers must be at least 1')
+        self.store = store
+        self.workers = workers
+        self._run = run
+        self._queue = Queue.Queue()
+        self._threads = []
+        self._lock = threading.Lock()
+        self.store.fail_orphans(socket.gethostname(), _pid_alive,
+                                self.RESTART_ERROR)
+
+    def _owner(self):
+        return socket.gethostname() + ':' + str(os.getpid())
+
+    def _start(self):
+        with self._lock:
+            if self._threads:
+                return
+            for i in xrange(self.workers):
+                t = threading.Thread(target=self._work,
+                                     name='job_worker_' + str(i))
+                t.daemon = True
+                t.start()
+                self._threads.append(t)
+
+    def _work(self):
+        while True:
+            job_id, ctx, params = self._queue.get()
+            try:
+                self.store.set_running(job_id)
+                result = self._run(dict(ctx, job_id=job_id), params)
+            except Exception as e:
+                traceback.print_exc()
+                self.store.set_error(job_id, str(e))
+            else:
+                self.store.set_complete(job_id, result)
+            finally:
+                self._queue.task_done()
+
+    def submit(self, ctx, params):
+        '''
+        Queues a job and returns its ID.
+        ctx - the job context. The context is held in memory only.
+        params - the job parameters.
+        '''
+        job_id = self.store.create(ctx.get('user_id'), self._owner(), params)
+        self._start()
+        self._queue.put((job_id, ctx, params))
+        return job_id
+
+    def queued(self):
+        return self._queue.qsize()
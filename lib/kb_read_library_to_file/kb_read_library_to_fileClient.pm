@@ -48,6 +48,7 @@ Operational notes:
 - If a file downloaded from Shock has a .gz suffix, it is assumed to be
   gzipped.
 - Files are assumed to be in correct fastq format.
+- Output files are in fastq format unless fasta format is requested.
 
 
 =cut
@@ -195,10 +196,19 @@ ConvertReadLibraryParams is a reference to a hash where the following keys are d
 	read_libraries has a value which is a reference to a list where each element is a kb_read_library_to_file.read_lib
 	gzip has a value which is a kb_read_library_to_file.tern
 	interleaved has a value which is a kb_read_library_to_file.tern
+	chunks has a value which is an int
+	output_format has a value which is a string
+	stats has a value which is a kb_read_library_to_file.bool
+	continue_on_failure has a value which is a kb_read_library_to_file.bool
+	priority has a value which is a string
 read_lib is a string
 tern is a string
+bool is a string
 ConvertReadLibraryOutput is a reference to a hash where the following keys are defined:
 	files has a value which is a reference to a hash where the key is a kb_read_library_to_file.read_lib and the value is a kb_read_library_to_file.ConvertedReadLibrary
+	errors has a value which is a reference to a hash where the key is a kb_read_library_to_file.read_lib and the value is a kb_read_library_to_file.ConversionError
+	stats has a value which is a kb_read_library_to_file.ConversionStats
+	call_id has a value which is a string
 ConvertedReadLibrary is a reference to a hash where the following keys are defined:
 	files has a value which is a kb_read_library_to_file.ReadsFiles
 	ref has a value which is a string
@@ -217,11 +227,14 @@ ReadsFiles is a reference to a hash where the following keys are defined:
 	rev has a value which is a string
 	inter has a value which is a string
 	sing has a value which is a string
+	fwd_chunks has a value which is a reference to a list where each element is a string
+	rev_chunks has a value which is a reference to a list where each element is a string
+	inter_chunks has a value which is a reference to a list where each element is a string
+	sing_chunks has a value which is a reference to a list where each element is a string
 	fwd_gz has a value which is a kb_read_library_to_file.bool
 	rev_gz has a value which is a kb_read_library_to_file.bool
 	inter_gz has a value which is a kb_read_library_to_file.bool
 	sing_gz has a value which is a kb_read_library_to_file.bool
-bool is a string
 StrainInfo is a reference to a hash where the following keys are defined:
 	genetic_code has a value which is an int
 	genus has a value which is a string
@@ -243,6 +256,19 @@ Location is a reference to a hash where the following keys are defined:
 	elevation has a value which is a float
 	date has a value which is a string
 	description has a value which is a string
+ConversionError is a reference to a hash where the following keys are defined:
+	error has a value which is a string
+	type has a value which is a string
+	transient has a value which is a kb_read_library_to_file.bool
+ConversionStats is a reference to a hash where the following keys are defined:
+	seconds has a value which is a float
+	stages has a value which is a reference to a hash where the key is a string and the value is a kb_read_library_to_file.StageStats
+	libraries has a value which is a reference to a hash where the key is a string and the value is a reference to a hash where the key is a string and the value is a kb_read_library_to_file.StageStats
+StageStats is a reference to a hash where the following keys are defined:
+	seconds has a value which is a float
+	bytes_read has a value which is an int
+	bytes_written has a value which is an int
+	bytes_per_sec has a value which is a float
 
 </pre>
 
@@ -256,10 +282,19 @@ ConvertReadLibraryParams is a reference to a hash where the following keys are d
 	read_libraries has a value which is a reference to a list where each element is a kb_read_library_to_file.read_lib
 	gzip has a value which is a kb_read_library_to_file.tern
 	interleaved has a value which is a kb_read_library_to_file.tern
+	chunks has a value which is an int
+	output_format has a value which is a string
+	stats has a value which is a kb_read_library_to_file.bool
+	continue_on_failure has a value which is a kb_read_library_to_file.bool
+	priority has a value which is a string
 read_lib is a string
 tern is a string
+bool is a string
 ConvertReadLibraryOutput is a reference to a hash where the following keys are defined:
 	files has a value which is a reference to a hash where the key is a kb_read_library_to_file.read_lib and the value is a kb_read_library_to_file.ConvertedReadLibrary
+	errors has a value which is a reference to a hash where the key is a kb_read_library_to_file.read_lib and the value is a kb_read_library_to_file.ConversionError
+	stats has a value which is a kb_read_library_to_file.ConversionStats
+	call_id has a value which is a string
 ConvertedReadLibrary is a reference to a hash where the following keys are defined:
 	files has a value which is a kb_read_library_to_file.ReadsFiles
 	ref has a value which is a string
@@ -278,11 +313,14 @@ ReadsFiles is a reference to a hash where the following keys are defined:
 	rev has a value which is a string
 	inter has a value which is a string
 	sing has a value which is a string
+	fwd_chunks has a value which is a reference to a list where each element is a string
+	rev_chunks has a value which is a reference to a list where each element is a string
+	inter_chunks has a value which is a reference to a list where each element is a string
+	sing_chunks has a value which is a reference to a list where each element is a string
 	fwd_gz has a value which is a kb_read_library_to_file.bool
 	rev_gz has a value which is a kb_read_library_to_file.bool
 	inter_gz has a value which is a kb_read_library_to_file.bool
 	sing_gz has a value which is a kb_read_library_to_file.bool
-bool is a string
 StrainInfo is a reference to a hash where the following keys are defined:
 	genetic_code has a value which is an int
 	genus has a value which is a string
@@ -304,6 +342,19 @@ Location is a reference to a hash where the following keys are defined:
 	elevation has a value which is a float
 	date has a value which is a string
 	description has a value which is a string
+ConversionError is a reference to a hash where the following keys are defined:
+	error has a value which is a string
+	type has a value which is a string
+	transient has a value which is a kb_read_library_to_file.bool
+ConversionStats is a reference to a hash where the following keys are defined:
+	seconds has a value which is a float
+	stages has a value which is a reference to a hash where the key is a string and the value is a kb_read_library_to_file.StageStats
+	libraries has a value which is a reference to a hash where the key is a string and the value is a reference to a hash where the key is a string and the value is a kb_read_library_to_file.StageStats
+StageStats is a reference to a hash where the following keys are defined:
+	seconds has a value which is a float
+	bytes_read has a value which is an int
+	bytes_written has a value which is an int
+	bytes_per_sec has a value which is a float
 
 
 =end text
@@ -332,21 +383,598 @@ sub convert_read_library_to_file
     }
 }
 
-sub _convert_read_library_to_file_submit {
+sub _convert_read_library_to_file_submit {
+    my($self, @args) = @_;
+# Authentication: required
+    if ((my $n = @args) != 1) {
+        Bio::KBase::Exceptions::ArgumentValidationError->throw(error =>
+                                   "Invalid argument count for function convert_read_library_to_file_async (received $n, expecting 1)");
+    }
+    {
+        my($params) = @args;
+        my @_bad_arguments;
+        (ref($params) eq 'HASH') or push(@_bad_arguments, "Invalid type for argument 1 \"params\" (value was \"$params\")");
+        if (@_bad_arguments) {
+            my $msg = "Invalid arguments passed to _convert_read_library_to_file_submit:\n" . join("", map { "\t$_\n" } @_bad_arguments);
+            Bio::KBase::Exceptions::ArgumentValidationError->throw(error => $msg,
+                                   method_name => '_convert_read_library_to_file_submit');
+        }
+    }
+    my $context = undef;
+    if ($self->{async_version}) {
+        $context = {'service_ver' => $self->{async_version}};
+    }
+    my $result = $self->{client}->call($self->{url}, $self->{headers}, {
+        method => "kb_read_library_to_file._convert_read_library_to_file_submit",
+        params => \@args}, context => $context);
+    if ($result) {
+        if ($result->is_error) {
+            Bio::KBase::Exceptions::JSONRPC->throw(error => $result->error_message,
+                           code => $result->content->{error}->{code},
+                           method_name => '_convert_read_library_to_file_submit',
+                           data => $result->content->{error}->{error} # JSON::RPC::ReturnObject only supports JSONRPC 1.1 or 1.O
+            );
+        } else {
+            return $result->result->[0];  # job_id
+        }
+    } else {
+        Bio::KBase::Exceptions::HTTP->throw(error => "Error invoking method convert_read_library_to_file_async",
+                        status_line => $self->{client}->status_line,
+                        method_name => '_convert_read_library_to_file_submit');
+    }
+}
+
+=head2 submit_convert_read_library_to_file
+
+  $job_id = $obj->submit_convert_read_library_to_file($params)
+
+=over 4
+
+=item Parameter and return types
+
+=begin html
+
+<pre>
+$params is a kb_read_library_to_file.ConvertReadLibraryParams
+$job_id is a kb_read_library_to_file.job_id
+ConvertReadLibraryParams is a reference to a hash where the following keys are defined:
+	read_libraries has a value which is a reference to a list where each element is a kb_read_library_to_file.read_lib
+	gzip has a value which is a kb_read_library_to_file.tern
+	interleaved has a value which is a kb_read_library_to_file.tern
+	chunks has a value which is an int
+	output_format has a value which is a string
+	stats has a value which is a kb_read_library_to_file.bool
+	continue_on_failure has a value which is a kb_read_library_to_file.bool
+	priority has a value which is a string
+read_lib is a string
+tern is a string
+bool is a string
+job_id is a string
+
+</pre>
+
+=end html
+
+=begin text
+
+$params is a kb_read_library_to_file.ConvertReadLibraryParams
+$job_id is a kb_read_library_to_file.job_id
+ConvertReadLibraryParams is a reference to a hash where the following keys are defined:
+	read_libraries has a value which is a reference to a list where each element is a kb_read_library_to_file.read_lib
+	gzip has a value which is a kb_read_library_to_file.tern
+	interleaved has a value which is a kb_read_library_to_file.tern
+	chunks has a value which is an int
+	output_format has a value which is a string
+	stats has a value which is a kb_read_library_to_file.bool
+	continue_on_failure has a value which is a kb_read_library_to_file.bool
+	priority has a value which is a string
+read_lib is a string
+tern is a string
+bool is a string
+job_id is a string
+
+
+=end text
+
+=item Description
+
+Submit a conversion job that runs in the background on the service.
+The job status and results are available from get_job_status and
+get_job_result.
+
+=back
+
+=cut
+
+sub submit_convert_read_library_to_file
+{
+    my($self, @args) = @_;
+    my $job_id = $self->_submit_convert_read_library_to_file_submit(@args);
+    while (1) {
+        Time::HiRes::sleep($self->{async_job_check_time});
+        my $job_state_ref = $self->_check_job($job_id);
+        if ($job_state_ref->{"finished"} != 0) {
+            if (!exists $job_state_ref->{"result"}) {
+                $job_state_ref->{"result"} = [];
+            }
+            return wantarray ? @{$job_state_ref->{"result"}} : $job_state_ref->{"result"}->[0];
+        }
+    }
+}
+
+sub _submit_convert_read_library_to_file_submit {
+    my($self, @args) = @_;
+# Authentication: required
+    if ((my $n = @args) != 1) {
+        Bio::KBase::Exceptions::ArgumentValidationError->throw(error =>
+                                   "Invalid argument count for function submit_convert_read_library_to_file_async (received $n, expecting 1)");
+    }
+    {
+        my($params) = @args;
+        my @_bad_arguments;
+        (ref($params) eq 'HASH') or push(@_bad_arguments, "Invalid type for argument 1 \"params\" (value was \"$params\")");
+        if (@_bad_arguments) {
+            my $msg = "Invalid arguments passed to _submit_convert_read_library_to_file_submit:\n" . join("", map { "\t$_\n" } @_bad_arguments);
+            Bio::KBase::Exceptions::ArgumentValidationError->throw(error => $msg,
+                                   method_name => '_submit_convert_read_library_to_file_submit');
+        }
+    }
+    my $context = undef;
+    if ($self->{async_version}) {
+        $context = {'service_ver' => $self->{async_version}};
+    }
+    my $result = $self->{client}->call($self->{url}, $self->{headers}, {
+        method => "kb_read_library_to_file._submit_convert_read_library_to_file_submit",
+        params => \@args}, context => $context);
+    if ($result) {
+        if ($result->is_error) {
+            Bio::KBase::Exceptions::JSONRPC->throw(error => $result->error_message,
+                           code => $result->content->{error}->{code},
+                           method_name => '_submit_convert_read_library_to_file_submit',
+                           data => $result->content->{error}->{error} # JSON::RPC::ReturnObject only supports JSONRPC 1.1 or 1.O
+            );
+        } else {
+            return $result->result->[0];  # job_id
+        }
+    } else {
+        Bio::KBase::Exceptions::HTTP->throw(error => "Error invoking method submit_convert_read_library_to_file_async",
+                        status_line => $self->{client}->status_line,
+                        method_name => '_submit_convert_read_library_to_file_submit');
+    }
+}
+
+=head2 get_job_status
+
+  $status = $obj->get_job_status($job_id)
+
+=over 4
+
+=item Parameter and return types
+
+=begin html
+
+<pre>
+$job_id is a kb_read_library_to_file.job_id
+$status is a kb_read_library_to_file.JobStatus
+job_id is a string
+JobStatus is a reference to a hash where the following keys are defined:
+	job_id has a value which is a kb_read_library_to_file.job_id
+	status has a value which is a string
+	error has a value which is a string
+	submitted has a value which is an int
+	started has a value which is an int
+	finished has a value which is an int
+	progress has a value which is a kb_read_library_to_file.ConversionProgress
+ConversionProgress is a reference to a hash where the following keys are defined:
+	libraries_total has a value which is an int
+	libraries_done has a value which is an int
+	stage has a value which is a string
+	stage_bytes_done has a value which is an int
+	stage_bytes_total has a value which is an int
+
+</pre>
+
+=end html
+
+=begin text
+
+$job_id is a kb_read_library_to_file.job_id
+$status is a kb_read_library_to_file.JobStatus
+job_id is a string
+JobStatus is a reference to a hash where the following keys are defined:
+	job_id has a value which is a kb_read_library_to_file.job_id
+	status has a value which is a string
+	error has a value which is a string
+	submitted has a value which is an int
+	started has a value which is an int
+	finished has a value which is an int
+	progress has a value which is a kb_read_library_to_file.ConversionProgress
+ConversionProgress is a reference to a hash where the following keys are defined:
+	libraries_total has a value which is an int
+	libraries_done has a value which is an int
+	stage has a value which is a string
+	stage_bytes_done has a value which is an int
+	stage_bytes_total has a value which is an int
+
+
+=end text
+
+=item Description
+
+Get the status of a conversion job.
+
+=back
+
+=cut
+
+sub get_job_status
+{
+    my($self, @args) = @_;
+    my $job_id = $self->_get_job_status_submit(@args);
+    while (1) {
+        Time::HiRes::sleep($self->{async_job_check_time});
+        my $job_state_ref = $self->_check_job($job_id);
+        if ($job_state_ref->{"finished"} != 0) {
+            if (!exists $job_state_ref->{"result"}) {
+                $job_state_ref->{"result"} = [];
+            }
+            return wantarray ? @{$job_state_ref->{"result"}} : $job_state_ref->{"result"}->[0];
+        }
+    }
+}
+
+sub _get_job_status_submit {
+    my($self, @args) = @_;
+# Authentication: required
+    if ((my $n = @args) != 1) {
+        Bio::KBase::Exceptions::ArgumentValidationError->throw(error =>
+                                   "Invalid argument count for function get_job_status_async (received $n, expecting 1)");
+    }
+    {
+        my($job_id) = @args;
+        my @_bad_arguments;
+        (!ref($job_id)) or push(@_bad_arguments, "Invalid type for argument 1 \"job_id\" (value was \"$job_id\")");
+        if (@_bad_arguments) {
+            my $msg = "Invalid arguments passed to _get_job_status_submit:\n" . join("", map { "\t$_\n" } @_bad_arguments);
+            Bio::KBase::Exceptions::ArgumentValidationError->throw(error => $msg,
+                                   method_name => '_get_job_status_submit');
+        }
+    }
+    my $context = undef;
+    if ($self->{async_version}) {
+        $context = {'service_ver' => $self->{async_version}};
+    }
+    my $result = $self->{client}->call($self->{url}, $self->{headers}, {
+        method => "kb_read_library_to_file._get_job_status_submit",
+        params => \@args}, context => $context);
+    if ($result) {
+        if ($result->is_error) {
+            Bio::KBase::Exceptions::JSONRPC->throw(error => $result->error_message,
+                           code => $result->content->{error}->{code},
+                           method_name => '_get_job_status_submit',
+                           data => $result->content->{error}->{error} # JSON::RPC::ReturnObject only supports JSONRPC 1.1 or 1.O
+            );
+        } else {
+            return $result->result->[0];  # job_id
+        }
+    } else {
+        Bio::KBase::Exceptions::HTTP->throw(error => "Error invoking method get_job_status_async",
+                        status_line => $self->{client}->status_line,
+                        method_name => '_get_job_status_submit');
+    }
+}
+
+=head2 get_job_result
+
+  $output = $obj->get_job_result($job_id)
+
+=over 4
+
+=item Parameter and return types
+
+=begin html
+
+<pre>
+$job_id is a kb_read_library_to_file.job_id
+$output is a kb_read_library_to_file.ConvertReadLibraryOutput
+job_id is a string
+ConvertReadLibraryOutput is a reference to a hash where the following keys are defined:
+	files has a value which is a reference to a hash where the key is a kb_read_library_to_file.read_lib and the value is a kb_read_library_to_file.ConvertedReadLibrary
+	errors has a value which is a reference to a hash where the key is a kb_read_library_to_file.read_lib and the value is a kb_read_library_to_file.ConversionError
+	stats has a value which is a kb_read_library_to_file.ConversionStats
+	call_id has a value which is a string
+read_lib is a string
+ConvertedReadLibrary is a reference to a hash where the following keys are defined:
+	files has a value which is a kb_read_library_to_file.ReadsFiles
+	ref has a value which is a string
+	single_genome has a value which is a kb_read_library_to_file.tern
+	read_orientation_outward has a value which is a kb_read_library_to_file.tern
+	sequencing_tech has a value which is a string
+	strain has a value which is a KBaseCommon.StrainInfo
+	source has a value which is a KBaseCommon.SourceInfo
+	insert_size_mean has a value which is a float
+	insert_size_std_dev has a value which is a float
+	read_count has a value which is an int
+	read_size has a value which is an int
+	gc_content has a value which is a float
+ReadsFiles is a reference to a hash where the following keys are defined:
+	fwd has a value which is a string
+	rev has a value which is a string
+	inter has a value which is a string
+	sing has a value which is a string
+	fwd_chunks has a value which is a reference to a list where each element is a string
+	rev_chunks has a value which is a reference to a list where each element is a string
+	inter_chunks has a value which is a reference to a list where each element is a string
+	sing_chunks has a value which is a reference to a list where each element is a string
+	fwd_gz has a value which is a kb_read_library_to_file.bool
+	rev_gz has a value which is a kb_read_library_to_file.bool
+	inter_gz has a value which is a kb_read_library_to_file.bool
+	sing_gz has a value which is a kb_read_library_to_file.bool
+bool is a string
+tern is a string
+StrainInfo is a reference to a hash where the following keys are defined:
+	genetic_code has a value which is an int
+	genus has a value which is a string
+	species has a value which is a string
+	strain has a value which is a string
+	organelle has a value which is a string
+	source has a value which is a KBaseCommon.SourceInfo
+	ncbi_taxid has a value which is an int
+	location has a value which is a KBaseCommon.Location
+SourceInfo is a reference to a hash where the following keys are defined:
+	source has a value which is a string
+	source_id has a value which is a KBaseCommon.source_id
+	project_id has a value which is a KBaseCommon.project_id
+source_id is a string
+project_id is a string
+Location is a reference to a hash where the following keys are defined:
+	lat has a value which is a float
+	lon has a value which is a float
+	elevation has a value which is a float
+	date has a value which is a string
+	description has a value which is a string
+ConversionError is a reference to a hash where the following keys are defined:
+	error has a value which is a string
+	type has a value which is a string
+	transient has a value which is a kb_read_library_to_file.bool
+ConversionStats is a reference to a hash where the following keys are defined:
+	seconds has a value which is a float
+	stages has a value which is a reference to a hash where the key is a string and the value is a kb_read_library_to_file.StageStats
+	libraries has a value which is a reference to a hash where the key is a string and the value is a reference to a hash where the key is a string and the value is a kb_read_library_to_file.StageStats
+StageStats is a reference to a hash where the following keys are defined:
+	seconds has a value which is a float
+	bytes_read has a value which is an int
+	bytes_written has a value which is an int
+	bytes_per_sec has a value which is a float
+
+</pre>
+
+=end html
+
+=begin text
+
+$job_id is a kb_read_library_to_file.job_id
+$output is a kb_read_library_to_file.ConvertReadLibraryOutput
+job_id is a string
+ConvertReadLibraryOutput is a reference to a hash where the following keys are defined:
+	files has a value which is a reference to a hash where the key is a kb_read_library_to_file.read_lib and the value is a kb_read_library_to_file.ConvertedReadLibrary
+	errors has a value which is a reference to a hash where the key is a kb_read_library_to_file.read_lib and the value is a kb_read_library_to_file.ConversionError
+	stats has a value which is a kb_read_library_to_file.ConversionStats
+	call_id has a value which is a string
+read_lib is a string
+ConvertedReadLibrary is a reference to a hash where the following keys are defined:
+	files has a value which is a kb_read_library_to_file.ReadsFiles
+	ref has a value which is a string
+	single_genome has a value which is a kb_read_library_to_file.tern
+	read_orientation_outward has a value which is a kb_read_library_to_file.tern
+	sequencing_tech has a value which is a string
+	strain has a value which is a KBaseCommon.StrainInfo
+	source has a value which is a KBaseCommon.SourceInfo
+	insert_size_mean has a value which is a float
+	insert_size_std_dev has a value which is a float
+	read_count has a value which is an int
+	read_size has a value which is an int
+	gc_content has a value which is a float
+ReadsFiles is a reference to a hash where the following keys are defined:
+	fwd has a value which is a string
+	rev has a value which is a string
+	inter has a value which is a string
+	sing has a value which is a string
+	fwd_chunks has a value which is a reference to a list where each element is a string
+	rev_chunks has a value which is a reference to a list where each element is a string
+	inter_chunks has a value which is a reference to a list where each element is a string
+	sing_chunks has a value which is a reference to a list where each element is a string
+	fwd_gz has a value which is a kb_read_library_to_file.bool
+	rev_gz has a value which is a kb_read_library_to_file.bool
+	inter_gz has a value which is a kb_read_library_to_file.bool
+	sing_gz has a value which is a kb_read_library_to_file.bool
+bool is a string
+tern is a string
+StrainInfo is a reference to a hash where the following keys are defined:
+	genetic_code has a value which is an int
+	genus has a value which is a string
+	species has a value which is a string
+	strain has a value which is a string
+	organelle has a value which is a string
+	source has a value which is a KBaseCommon.SourceInfo
+	ncbi_taxid has a value which is an int
+	location has a value which is a KBaseCommon.Location
+SourceInfo is a reference to a hash where the following keys are defined:
+	source has a value which is a string
+	source_id has a value which is a KBaseCommon.source_id
+	project_id has a value which is a KBaseCommon.project_id
+source_id is a string
+project_id is a string
+Location is a reference to a hash where the following keys are defined:
+	lat has a value which is a float
+	lon has a value which is a float
+	elevation has a value which is a float
+	date has a value which is a string
+	description has a value which is a string
+ConversionError is a reference to a hash where the following keys are defined:
+	error has a value which is a string
+	type has a value which is a string
+	transient has a value which is a kb_read_library_to_file.bool
+ConversionStats is a reference to a hash where the following keys are defined:
+	seconds has a value which is a float
+	stages has a value which is a reference to a hash where the key is a string and the value is a kb_read_library_to_file.StageStats
+	libraries has a value which is a reference to a hash where the key is a string and the value is a reference to a hash where the key is a string and the value is a kb_read_library_to_file.StageStats
+StageStats is a reference to a hash where the following keys are defined:
+	seconds has a value which is a float
+	bytes_read has a value which is an int
+	bytes_written has a value which is an int
+	bytes_per_sec has a value which is a float
+
+
+=end text
+
+=item Description
+
+Get the results of a completed conversion job. Throws an error if the
+job failed or has not yet completed.
+
+=back
+
+=cut
+
+sub get_job_result
+{
+    my($self, @args) = @_;
+    my $job_id = $self->_get_job_result_submit(@args);
+    while (1) {
+        Time::HiRes::sleep($self->{async_job_check_time});
+        my $job_state_ref = $self->_check_job($job_id);
+        if ($job_state_ref->{"finished"} != 0) {
+            if (!exists $job_state_ref->{"result"}) {
+                $job_state_ref->{"result"} = [];
+            }
+            return wantarray ? @{$job_state_ref->{"result"}} : $job_state_ref->{"result"}->[0];
+        }
+    }
+}
+
+sub _get_job_result_submit {
+    my($self, @args) = @_;
+# Authentication: required
+    if ((my $n = @args) != 1) {
+        Bio::KBase::Exceptions::ArgumentValidationError->throw(error =>
+                                   "Invalid argument count for function get_job_result_async (received $n, expecting 1)");
+    }
+    {
+        my($job_id) = @args;
+        my @_bad_arguments;
+        (!ref($job_id)) or push(@_bad_arguments, "Invalid type for argument 1 \"job_id\" (value was \"$job_id\")");
+        if (@_bad_arguments) {
+            my $msg = "Invalid arguments passed to _get_job_result_submit:\n" . join("", map { "\t$_\n" } @_bad_arguments);
+            Bio::KBase::Exceptions::ArgumentValidationError->throw(error => $msg,
+                                   method_name => '_get_job_result_submit');
+        }
+    }
+    my $context = undef;
+    if ($self->{async_version}) {
+        $context = {'service_ver' => $self->{async_version}};
+    }
+    my $result = $self->{client}->call($self->{url}, $self->{headers}, {
+        method => "kb_read_library_to_file._get_job_result_submit",
+        params => \@args}, context => $context);
+    if ($result) {
+        if ($result->is_error) {
+            Bio::KBase::Exceptions::JSONRPC->throw(error => $result->error_message,
+                           code => $result->content->{error}->{code},
+                           method_name => '_get_job_result_submit',
+                           data => $result->content->{error}->{error} # JSON::RPC::ReturnObject only supports JSONRPC 1.1 or 1.O
+            );
+        } else {
+            return $result->result->[0];  # job_id
+        }
+    } else {
+        Bio::KBase::Exceptions::HTTP->throw(error => "Error invoking method get_job_result_async",
+                        status_line => $self->{client}->status_line,
+                        method_name => '_get_job_result_submit');
+    }
+}
+
+=head2 prefetch_read_libraries
+
+  $output = $obj->prefetch_read_libraries($params)
+
+=over 4
+
+=item Parameter and return types
+
+=begin html
+
+<pre>
+$params is a kb_read_library_to_file.PrefetchReadLibrariesParams
+$output is a kb_read_library_to_file.PrefetchReadLibrariesOutput
+PrefetchReadLibrariesParams is a reference to a hash where the following keys are defined:
+	read_libraries has a value which is a reference to a list where each element is a kb_read_library_to_file.read_lib
+read_lib is a string
+PrefetchReadLibrariesOutput is a reference to a hash where the following keys are defined:
+	refs has a value which is a reference to a hash where the key is a kb_read_library_to_file.read_lib and the value is a kb_read_library_to_file.read_lib
+
+</pre>
+
+=end html
+
+=begin text
+
+$params is a kb_read_library_to_file.PrefetchReadLibrariesParams
+$output is a kb_read_library_to_file.PrefetchReadLibrariesOutput
+PrefetchReadLibrariesParams is a reference to a hash where the following keys are defined:
+	read_libraries has a value which is a reference to a list where each element is a kb_read_library_to_file.read_lib
+read_lib is a string
+PrefetchReadLibrariesOutput is a reference to a hash where the following keys are defined:
+	refs has a value which is a reference to a hash where the key is a kb_read_library_to_file.read_lib and the value is a kb_read_library_to_file.read_lib
+
+
+=end text
+
+=item Description
+
+Download the reads files for read libraries to the service's staging
+area in the background, so that later conversions of the libraries
+read the files from local disk. Returns once the references have
+been resolved. Staged files expire if they are not used for a while
+and may be evicted if the staging area is full, in which case
+conversions download the files as usual. Throws an error if the
+service has no staging area.
+
+=back
+
+=cut
+
+sub prefetch_read_libraries
+{
+    my($self, @args) = @_;
+    my $job_id = $self->_prefetch_read_libraries_submit(@args);
+    while (1) {
+        Time::HiRes::sleep($self->{async_job_check_time});
+        my $job_state_ref = $self->_check_job($job_id);
+        if ($job_state_ref->{"finished"} != 0) {
+            if (!exists $job_state_ref->{"result"}) {
+                $job_state_ref->{"result"} = [];
+            }
+            return wantarray ? @{$job_state_ref->{"result"}} : $job_state_ref->{"result"}->[0];
+        }
+    }
+}
+
+sub _prefetch_read_libraries_submit {
     my($self, @args) = @_;
 # Authentication: required
     if ((my $n = @args) != 1) {
         Bio::KBase::Exceptions::ArgumentValidationError->throw(error =>
-                                   "Invalid argument count for function convert_read_library_to_file_async (received $n, expecting 1)");
+                                   "Invalid argument count for function prefetch_read_libraries_async (received $n, expecting 1)");
     }
     {
         my($params) = @args;
         my @_bad_arguments;
         (ref($params) eq 'HASH') or push(@_bad_arguments, "Invalid type for argument 1 \"params\" (value was \"$params\")");
         if (@_bad_arguments) {
-            my $msg = "Invalid arguments passed to _convert_read_library_to_file_submit:\n" . join("", map { "\t$_\n" } @_bad_arguments);
+            my $msg = "Invalid arguments passed to _prefetch_read_libraries_submit:\n" . join("", map { "\t$_\n" } @_bad_arguments);
             Bio::KBase::Exceptions::ArgumentValidationError->throw(error => $msg,
-                                   method_name => '_convert_read_library_to_file_submit');
+                                   method_name => '_prefetch_read_libraries_submit');
         }
     }
     my $context = undef;
@@ -354,22 +982,22 @@ sub _convert_read_library_to_file_submit {
         $context = {'service_ver' => $self->{async_version}};
     }
     my $result = $self->{client}->call($self->{url}, $self->{headers}, {
-        method => "kb_read_library_to_file._convert_read_library_to_file_submit",
+        method => "kb_read_library_to_file._prefetch_read_libraries_submit",
         params => \@args}, context => $context);
     if ($result) {
         if ($result->is_error) {
             Bio::KBase::Exceptions::JSONRPC->throw(error => $result->error_message,
                            code => $result->content->{error}->{code},
-                           method_name => '_convert_read_library_to_file_submit',
+                           method_name => '_prefetch_read_libraries_submit',
                            data => $result->content->{error}->{error} # JSON::RPC::ReturnObject only supports JSONRPC 1.1 or 1.O
             );
         } else {
             return $result->result->[0];  # job_id
         }
     } else {
-        Bio::KBase::Exceptions::HTTP->throw(error => "Error invoking method convert_read_library_to_file_async",
+        Bio::KBase::Exceptions::HTTP->throw(error => "Error invoking method prefetch_read_libraries_async",
                         status_line => $self->{client}->status_line,
-                        method_name => '_convert_read_library_to_file_submit');
+                        method_name => '_prefetch_read_libraries_submit');
     }
 }
 
@@ -549,6 +1177,28 @@ tern gzip - if true, gzip any unzipped files. If false, gunzip any
 tern interleaved - if true, provide the files in interleaved format if
     they are not already. If false, provide forward and reverse reads
     files. If null or missing, leave files as is.
+int chunks - if provided, split each reads file into this many files
+    of approximately equal size, e.g. for sharding the reads across
+    processes. Read pairs are never split, and the nth forward file
+    contains the mates of the reads in the nth reverse file. Must be
+    at least 1 and at most a maximum set by the service, 100 by
+    default. If null or missing, each reads file is provided as a
+    single file.
+string output_format - the format of the output files, either
+    'fastq' or 'fasta'. FASTA output omits the quality scores. If null
+    or missing, the files are provided in FASTQ format.
+bool stats - if true, include statistics about the time spent and
+    bytes processed by each stage of the conversion in the output.
+    Defaults to false.
+bool continue_on_failure - if true, a read library that fails to
+    convert does not fail the call. Instead, the error is reported in
+    the errors field of the output and the other read libraries are
+    converted as usual. Defaults to false.
+string priority - the priority of the conversion, either
+    'interactive' or 'batch'. Batch conversions use the capacity
+    interactive conversions leave, and the service may limit how
+    many run at once. If null or missing, conversions that download
+    more than a size set by the service are batch conversions.
 
 
 =item Definition
@@ -560,6 +1210,11 @@ a reference to a hash where the following keys are defined:
 read_libraries has a value which is a reference to a list where each element is a kb_read_library_to_file.read_lib
 gzip has a value which is a kb_read_library_to_file.tern
 interleaved has a value which is a kb_read_library_to_file.tern
+chunks has a value which is an int
+output_format has a value which is a string
+stats has a value which is a kb_read_library_to_file.bool
+continue_on_failure has a value which is a kb_read_library_to_file.bool
+priority has a value which is a string
 
 </pre>
 
@@ -571,6 +1226,11 @@ a reference to a hash where the following keys are defined:
 read_libraries has a value which is a reference to a list where each element is a kb_read_library_to_file.read_lib
 gzip has a value which is a kb_read_library_to_file.tern
 interleaved has a value which is a kb_read_library_to_file.tern
+chunks has a value which is an int
+output_format has a value which is a string
+stats has a value which is a kb_read_library_to_file.bool
+continue_on_failure has a value which is a kb_read_library_to_file.bool
+priority has a value which is a string
 
 
 =end text
@@ -597,6 +1257,17 @@ bool fwd_gz - whether the forward / left reads are gzipped.
 bool rev_gz - whether the reverse / right reads are gzipped.
 bool inter_gz - whether the interleaved reads are gzipped.
 bool sing_gz - whether the single reads are gzipped.
+list<string> fwd_chunks - the paths to the forward / left reads
+    chunks.
+list<string> rev_chunks - the paths to the reverse / right reads
+    chunks.
+list<string> inter_chunks - the paths to the interleaved reads chunks.
+list<string> sing_chunks - the paths to the single end reads chunks.
+The *_chunks fields are provided instead of the fwd, rev, inter, and
+sing fields when the chunks parameter is set.
+The files may be hard links to files shared with other conversions
+and the service's caches, so they must not be modified in place. To
+change a file, write a new file and replace the old one with it.
 
 
 =item Definition
@@ -609,6 +1280,10 @@ fwd has a value which is a string
 rev has a value which is a string
 inter has a value which is a string
 sing has a value which is a string
+fwd_chunks has a value which is a reference to a list where each element is a string
+rev_chunks has a value which is a reference to a list where each element is a string
+inter_chunks has a value which is a reference to a list where each element is a string
+sing_chunks has a value which is a reference to a list where each element is a string
 fwd_gz has a value which is a kb_read_library_to_file.bool
 rev_gz has a value which is a kb_read_library_to_file.bool
 inter_gz has a value which is a kb_read_library_to_file.bool
@@ -625,6 +1300,10 @@ fwd has a value which is a string
 rev has a value which is a string
 inter has a value which is a string
 sing has a value which is a string
+fwd_chunks has a value which is a reference to a list where each element is a string
+rev_chunks has a value which is a reference to a list where each element is a string
+inter_chunks has a value which is a reference to a list where each element is a string
+sing_chunks has a value which is a reference to a list where each element is a string
 fwd_gz has a value which is a kb_read_library_to_file.bool
 rev_gz has a value which is a kb_read_library_to_file.bool
 inter_gz has a value which is a kb_read_library_to_file.bool
@@ -717,6 +1396,149 @@ gc_content has a value which is a float
 
 
 
+=head2 StageStats
+
+=over 4
+
+
+
+=item Description
+
+Statistics for a stage of a conversion.
+float seconds - the wall clock time spent in the stage.
+int bytes_read - the number of bytes read by the stage.
+int bytes_written - the number of bytes written by the stage.
+float bytes_per_sec - the number of bytes read per second. null if
+    the stage took no measurable time.
+
+
+=item Definition
+
+=begin html
+
+<pre>
+a reference to a hash where the following keys are defined:
+seconds has a value which is a float
+bytes_read has a value which is an int
+bytes_written has a value which is an int
+bytes_per_sec has a value which is a float
+
+</pre>
+
+=end html
+
+=begin text
+
+a reference to a hash where the following keys are defined:
+seconds has a value which is a float
+bytes_read has a value which is an int
+bytes_written has a value which is an int
+bytes_per_sec has a value which is a float
+
+
+=end text
+
+=back
+
+
+
+=head2 ConversionStats
+
+=over 4
+
+
+
+=item Description
+
+Statistics for a conversion.
+float seconds - the wall clock time of the conversion.
+mapping<string, StageStats> stages - the statistics for each stage
+    of the conversion, summed over all the read libraries. The
+    stages are ws_fetch, batch_queue, shock_metadata, shock_download,
+    peer_download, gunzip, gzip, mv, split, interleave, and
+    deinterleave. ws_fetch is the workspace calls that fetch the read
+    library objects and resolve the references to them. batch_queue
+    is the time a batch priority conversion waited to start.
+    shock_metadata is the Shock calls for the reads file metadata.
+    Only the stages that ran are included.
+mapping<string, mapping<string, StageStats>> libraries - the
+    statistics for each stage for each read library, keyed by the
+    absolute reference of the library. The ws_fetch and batch_queue
+    stages run for several libraries at once and are not included.
+
+
+=item Definition
+
+=begin html
+
+<pre>
+a reference to a hash where the following keys are defined:
+seconds has a value which is a float
+stages has a value which is a reference to a hash where the key is a string and the value is a kb_read_library_to_file.StageStats
+libraries has a value which is a reference to a hash where the key is a string and the value is a reference to a hash where the key is a string and the value is a kb_read_library_to_file.StageStats
+
+</pre>
+
+=end html
+
+=begin text
+
+a reference to a hash where the following keys are defined:
+seconds has a value which is a float
+stages has a value which is a reference to a hash where the key is a string and the value is a kb_read_library_to_file.StageStats
+libraries has a value which is a reference to a hash where the key is a string and the value is a reference to a hash where the key is a string and the value is a kb_read_library_to_file.StageStats
+
+
+=end text
+
+=back
+
+
+
+=head2 ConversionError
+
+=over 4
+
+
+
+=item Description
+
+An error that occurred when converting a read library.
+string error - the error message.
+string type - the type of the error, e.g. ShockError or
+    ValueError.
+bool transient - whether the error may not recur if the read library
+    is converted again, e.g. a timeout or an unavailable service.
+
+
+=item Definition
+
+=begin html
+
+<pre>
+a reference to a hash where the following keys are defined:
+error has a value which is a string
+type has a value which is a string
+transient has a value which is a kb_read_library_to_file.bool
+
+</pre>
+
+=end html
+
+=begin text
+
+a reference to a hash where the following keys are defined:
+error has a value which is a string
+type has a value which is a string
+transient has a value which is a kb_read_library_to_file.bool
+
+
+=end text
+
+=back
+
+
+
 =head2 ConvertReadLibraryOutput
 
 =over 4
@@ -728,7 +1550,18 @@ gc_content has a value which is a float
 The output of the convert method.
 mapping<read_lib, ConvertedReadLibrary> files - a mapping
     of the read library workspace references to information
-    about the converted data for each library.
+    about the converted data for each library. References that
+    point to the same object, e.g. MyWorkspace/MyReads and 256/3/6,
+    share the same converted data.
+mapping<read_lib, ConversionError> errors - a mapping of the read
+    library workspace references that failed to convert to the
+    error for each library. Failed libraries are not present in the
+    files mapping. Only present if continue_on_failure is true.
+ConversionStats stats - statistics about the conversion. Only
+    present if requested.
+string call_id - the ID the service generated for the conversion,
+    which identifies it in the service's logs and progress records.
+    For asynchronous jobs, this is the job ID.
 
 
 =item Definition
@@ -738,6 +1571,9 @@ mapping<read_lib, ConvertedReadLibrary> files - a mapping
 <pre>
 a reference to a hash where the following keys are defined:
 files has a value which is a reference to a hash where the key is a kb_read_library_to_file.read_lib and the value is a kb_read_library_to_file.ConvertedReadLibrary
+errors has a value which is a reference to a hash where the key is a kb_read_library_to_file.read_lib and the value is a kb_read_library_to_file.ConversionError
+stats has a value which is a kb_read_library_to_file.ConversionStats
+call_id has a value which is a string
 
 </pre>
 
@@ -747,6 +1583,222 @@ files has a value which is a reference to a hash where the key is a kb_read_libr
 
 a reference to a hash where the following keys are defined:
 files has a value which is a reference to a hash where the key is a kb_read_library_to_file.read_lib and the value is a kb_read_library_to_file.ConvertedReadLibrary
+errors has a value which is a reference to a hash where the key is a kb_read_library_to_file.read_lib and the value is a kb_read_library_to_file.ConversionError
+stats has a value which is a kb_read_library_to_file.ConversionStats
+call_id has a value which is a string
+
+
+=end text
+
+=back
+
+
+
+=head2 job_id
+
+=over 4
+
+
+
+=item Description
+
+The ID of an asynchronous conversion job.
+
+
+=item Definition
+
+=begin html
+
+<pre>
+a string
+</pre>
+
+=end html
+
+=begin text
+
+a string
+
+=end text
+
+=back
+
+
+
+=head2 ConversionProgress
+
+=over 4
+
+
+
+=item Description
+
+The progress of a conversion.
+int libraries_total - the number of read libraries to convert.
+int libraries_done - the number of read libraries converted so far.
+string stage - the stage that is running, or null.
+int stage_bytes_done - the number of bytes the stage has processed.
+int stage_bytes_total - the number of bytes the stage will process.
+
+
+=item Definition
+
+=begin html
+
+<pre>
+a reference to a hash where the following keys are defined:
+libraries_total has a value which is an int
+libraries_done has a value which is an int
+stage has a value which is a string
+stage_bytes_done has a value which is an int
+stage_bytes_total has a value which is an int
+
+</pre>
+
+=end html
+
+=begin text
+
+a reference to a hash where the following keys are defined:
+libraries_total has a value which is an int
+libraries_done has a value which is an int
+stage has a value which is a string
+stage_bytes_done has a value which is an int
+stage_bytes_total has a value which is an int
+
+
+=end text
+
+=back
+
+
+
+=head2 JobStatus
+
+=over 4
+
+
+
+=item Description
+
+The status of an asynchronous conversion job.
+job_id job_id - the ID of the job.
+string status - the status of the job, one of 'queued', 'running',
+    'complete', or 'error'.
+string error - the error message if the job failed. null otherwise.
+int submitted - the time the job was submitted in milliseconds since
+    the epoch.
+int started - the time the job started in milliseconds since the
+    epoch. null if the job has not started.
+int finished - the time the job finished in milliseconds since the
+    epoch. null if the job has not finished.
+ConversionProgress progress - the most recently recorded progress of
+    the job. null if the job has not started.
+
+
+=item Definition
+
+=begin html
+
+<pre>
+a reference to a hash where the following keys are defined:
+job_id has a value which is a kb_read_library_to_file.job_id
+status has a value which is a string
+error has a value which is a string
+submitted has a value which is an int
+started has a value which is an int
+finished has a value which is an int
+progress has a value which is a kb_read_library_to_file.ConversionProgress
+
+</pre>
+
+=end html
+
+=begin text
+
+a reference to a hash where the following keys are defined:
+job_id has a value which is a kb_read_library_to_file.job_id
+status has a value which is a string
+error has a value which is a string
+submitted has a value which is an int
+started has a value which is an int
+finished has a value which is an int
+progress has a value which is a kb_read_library_to_file.ConversionProgress
+
+
+=end text
+
+=back
+
+
+
+=head2 PrefetchReadLibrariesParams
+
+=over 4
+
+
+
+=item Description
+
+Input parameters for prefetching read libraries.
+list<read_lib> read_libraries - the names of the workspace read
+    library objects to prefetch.
+
+
+=item Definition
+
+=begin html
+
+<pre>
+a reference to a hash where the following keys are defined:
+read_libraries has a value which is a reference to a list where each element is a kb_read_library_to_file.read_lib
+
+</pre>
+
+=end html
+
+=begin text
+
+a reference to a hash where the following keys are defined:
+read_libraries has a value which is a reference to a list where each element is a kb_read_library_to_file.read_lib
+
+
+=end text
+
+=back
+
+
+
+=head2 PrefetchReadLibrariesOutput
+
+=over 4
+
+
+
+=item Description
+
+The output of the prefetch method.
+mapping<read_lib, read_lib> refs - a mapping of the read library
+    workspace references to the absolute references of the objects
+    that will be prefetched.
+
+
+=item Definition
+
+=begin html
+
+<pre>
+a reference to a hash where the following keys are defined:
+refs has a value which is a reference to a hash where the key is a kb_read_library_to_file.read_lib and the value is a kb_read_library_to_file.read_lib
+
+</pre>
+
+=end html
+
+=begin text
+
+a reference to a hash where the following keys are defined:
+refs has a value which is a reference to a hash where the key is a kb_read_library_to_file.read_lib and the value is a kb_read_library_to_file.read_lib
 
 
 =end text
@@ -49,122 +49,205 @@ class kb_read_library_to_file(object):
         Convert read libraries to files
         :param params: instance of type "ConvertReadLibraryParams" (Input
            parameters for converting libraries to files. list<read_lib>
-           read_libraries - the names of the workspace read library objects
-           to convert. tern gzip - if true, gzip any unzipped files. If
-           false, gunzip any zipped files. If null or missing, leave files as
-           is unless unzipping is required for interleaving or
-           deinterleaving, in which case the files will be left unzipped.
-           tern interleaved - if true, provide the files in interleaved
-           format if they are not already. If false, provide forward and
-           reverse reads files. If null or missing, leave files as is.) ->
-           structure: parameter "read_libraries" of list of type "read_lib"
-           (A reference to a read library stored in the workspace service,
-           whether of the KBaseAssembly or KBaseFile type. Usage of absolute
-           references (e.g. 256/3/6) is strongly encouraged to avoid race
-           conditions, although any valid reference is allowed.), parameter
-           "gzip" of type "tern" (A ternary. Allowed values are 'false',
-           'true', or null. Any other value is invalid.), parameter
-           "interleaved" of type "tern" (A ternary. Allowed values are
-           'false', 'true', or null. Any other value is invalid.)
-        :returns: instance of type "ConvertReadLibraryOutput" (The output of
-           the convert method. mapping<read_lib, ConvertedReadLibrary> files
-           - a mapping of the read library workspace references to
-           information about the converted data for each library.) ->
-           structure: parameter "files" of mapping from type "read_lib" (A
-           reference to a read library stored in the workspace service,
-           whether of the KBaseAssembly or KBaseFile type. Usage of absolute
-           references (e.g. 256/3/6) is strongly encouraged to avoid race
-           conditions, although any valid reference is allowed.) to type
-           "ConvertedReadLibrary" (Information about each set of reads.
-           ReadsFiles files - the reads files. string ref - the absolute
-           workspace reference of the reads file, e.g
-           workspace_id/object_id/version. tern single_genome - whether the
-           reads are from a single genome or a metagenome. null if unknown.
-           tern read_orientation_outward - whether the read orientation is
-           outward from the set of primers. null if unknown or single ended
+           read_libraries - the names of the workspace read library objects to
+           convert. tern gzip - if true, gzip any unzipped files. If false,
+           gunzip any zipped files. If null or missing, leave files as is unless
+           unzipping is required for interleaving or deinterleaving, in which
+           case the files will be left unzipped. tern interleaved - if true,
+           provide the files in interleaved format if they are not already. If
+           false, provide forward and reverse reads files. If null or missing,
+           leave files as is. int chunks - if provided, split each reads file
+           into this many files of approximately equal size, e.g. for sharding
+           the reads across processes. Read pairs are never split, and the nth
+           forward file contains the mates of the reads in the nth reverse file.
+           Must be at least 1 and at most a maximum set by the service, 100 by
+           default. If null or missing, each reads file is provided as a single
+           file. string output_format - the format of the output files, either
+           'fastq' or 'fasta'. FASTA output omits the quality scores. If null or
+           missing, the files are provided in FASTQ format. bool stats - if
+           true, include statistics about the time spent and bytes processed by
+           each stage of the conversion in the output. Defaults to false. bool
+           continue_on_failure - if true, a read library that fails to convert
+           does not fail the call. Instead, the error is reported in the errors
+           field of the output and the other read libraries are converted as
+           usual. Defaults to false. string priority - the priority of the
+           conversion, either 'interactive' or 'batch'. Batch conversions use
+           the capacity interactive conversions leave, and the service may limit
+           how many run at once. If null or missing, conversions that download
+           more than a size set by the service are batch conversions.) ->
+           structure: parameter "read_libraries" of list of type "read_lib" (A
+           reference to a read library stored in the workspace service, whether
+           of the KBaseAssembly or KBaseFile type. Usage of absolute references
+           (e.g. 256/3/6) is strongly encouraged to avoid race conditions,
+           although any valid reference is allowed.), parameter "gzip" of type
+           "tern" (A ternary. Allowed values are 'false', 'true', or null. Any
+           other value is invalid.), parameter "interleaved" of type "tern" (A
+           ternary. Allowed values are 'false', 'true', or null. Any other value
+           is invalid.), parameter "chunks" of Long, parameter "output_format"
+           of String, parameter "stats" of type "bool" (A boolean. Allowed
+           values are 'false' or 'true'. Any other value is invalid.), parameter
+           "continue_on_failure" of type "bool" (A boolean. Allowed values are
+           'false' or 'true'. Any other value is invalid.), parameter "priority"
+           of String
+        :returns: instance of type "ConvertReadLibraryOutput" (The output of the
+           convert method. mapping<read_lib, ConvertedReadLibrary> files - a
+           mapping of the read library workspace references to information about
+           the converted data for each library. References that point to the
+           same object, e.g. MyWorkspace/MyReads and 256/3/6, share the same
+           converted data. mapping<read_lib, ConversionError> errors - a mapping
+           of the read library workspace references that failed to convert to
+           the error for each library. Failed libraries are not present in the
+           files mapping. Only present if continue_on_failure is true.
+           ConversionStats stats - statistics about the conversion. Only present
+           if requested. string call_id - the ID the service generated for the
+           conversion, which identifies it in the service's logs and progress
+           records. For asynchronous jobs, this is the job ID.) -> structure:
+           parameter "files" of mapping from type "read_lib" (A reference to a
+           read library stored in the workspace service, whether of the
+           KBaseAssembly or KBaseFile type. Usage of absolute references (e.g.
+           256/3/6) is strongly encouraged to avoid race conditions, although
+           any valid reference is allowed.) to type "ConvertedReadLibrary"
+           (Information about each set of reads. ReadsFiles files - the reads
+           files. string ref - the absolute workspace reference of the reads
+           file, e.g workspace_id/object_id/version. tern single_genome -
+           whether the reads are from a single genome or a metagenome. null if
+           unknown. tern read_orientation_outward - whether the read orientation
+           is outward from the set of primers. null if unknown or single ended
            reads. string sequencing_tech - the sequencing technology used to
-           produce the reads. null if unknown. KBaseCommon.StrainInfo strain
-           - information about the organism strain that was sequenced. null
-           if unavailable. KBaseCommon.SourceInfo source - information about
-           the organism source. null if unavailable. float insert_size_mean -
-           the mean size of the genetic fragments. null if unavailable or
-           single end reads. float insert_size_std_dev - the standard
-           deviation of the size of the genetic fragments. null if
-           unavailable or single end reads. int read_count - the number of
-           reads in the this dataset. null if unavailable. int read_size -
-           the total size of the reads, in bases. null if unavailable. float
-           gc_content - the GC content of the reads. null if unavailable.) ->
-           structure: parameter "files" of type "ReadsFiles" (Reads file
-           locations and gzip status. Only the relevant fields will be
-           present in the structure. string fwd - the path to the forward /
-           left reads. string rev - the path to the reverse / right reads.
-           string inter - the path to the interleaved reads. string sing -
-           the path to the single end reads. bool fwd_gz - whether the
-           forward / left reads are gzipped. bool rev_gz - whether the
-           reverse / right reads are gzipped. bool inter_gz - whether the
-           interleaved reads are gzipped. bool sing_gz - whether the single
-           reads are gzipped.) -> structure: parameter "fwd" of String,
-           parameter "rev" of String, parameter "inter" of String, parameter
-           "sing" of String, parameter "fwd_gz" of type "bool" (A boolean.
-           Allowed values are 'false' or 'true'. Any other value is
+           produce the reads. null if unknown. KBaseCommon.StrainInfo strain -
+           information about the organism strain that was sequenced. null if
+           unavailable. KBaseCommon.SourceInfo source - information about the
+           organism source. null if unavailable. float insert_size_mean - the
+           mean size of the genetic fragments. null if unavailable or single end
+           reads. float insert_size_std_dev - the standard deviation of the size
+           of the genetic fragments. null if unavailable or single end reads.
+           int read_count - the number of reads in the this dataset. null if
+           unavailable. int read_size - the total size of the reads, in bases.
+           null if unavailable. float gc_content - the GC content of the reads.
+           null if unavailable.) -> structure: parameter "files" of type
+           "ReadsFiles" (Reads file locations and gzip status. Only the relevant
+           fields will be present in the structure. string fwd - the path to the
+           forward / left reads. string rev - the path to the reverse / right
+           reads. string inter - the path to the interleaved reads. string sing
+           - the path to the single end reads. bool fwd_gz - whether the forward
+           / left reads are gzipped. bool rev_gz - whether the reverse / right
+           reads are gzipped. bool inter_gz - whether the interleaved reads are
+           gzipped. bool sing_gz - whether the single reads are gzipped.
+           list<string> fwd_chunks - the paths to the forward / left reads
+           chunks. list<string> rev_chunks - the paths to the reverse / right
+           reads chunks. list<string> inter_chunks - the paths to the
+           interleaved reads chunks. list<string> sing_chunks - the paths to the
+           single end reads chunks. The *_chunks fields are provided instead of
+           the fwd, rev, inter, and sing fields when the chunks parameter is
+           set. The files may be hard links to files shared with other
+           conversions and the service's caches, so they must not be modified in
+           place. To change a file, write a new file and replace the old one
+           with it.) -> structure: parameter "fwd" of String, parameter "rev" of
+           String, parameter "inter" of String, parameter "sing" of String,
+           parameter "fwd_chunks" of list of String, parameter "rev_chunks" of
+           list of String, parameter "inter_chunks" of list of String, parameter
+           "sing_chunks" of list of String, parameter "fwd_gz" of type "bool" (A
+           boolean. Allowed values are 'false' or 'true'. Any other value is
            invalid.), parameter "rev_gz" of type "bool" (A boolean. Allowed
-           values are 'false' or 'true'. Any other value is invalid.),
-           parameter "inter_gz" of type "bool" (A boolean. Allowed values are
-           'false' or 'true'. Any other value is invalid.), parameter
-           "sing_gz" of type "bool" (A boolean. Allowed values are 'false' or
-           'true'. Any other value is invalid.), parameter "ref" of String,
-           parameter "single_genome" of type "tern" (A ternary. Allowed
-           values are 'false', 'true', or null. Any other value is invalid.),
-           parameter "read_orientation_outward" of type "tern" (A ternary.
-           Allowed values are 'false', 'true', or null. Any other value is
-           invalid.), parameter "sequencing_tech" of String, parameter
-           "strain" of type "StrainInfo" (Information about a strain.
-           genetic_code - the genetic code of the strain. See
-           http://www.ncbi.nlm.nih.gov/Taxonomy/Utils/wprintgc.cgi?mode=c
-           genus - the genus of the strain species - the species of the
-           strain strain - the identifier for the strain source - information
-           about the source of the strain organelle - the organelle of
-           interest for the related data (e.g. mitochondria) ncbi_taxid - the
-           NCBI taxonomy ID of the strain location - the location from which
-           the strain was collected @optional genetic_code source ncbi_taxid
-           organelle location) -> structure: parameter "genetic_code" of
-           Long, parameter "genus" of String, parameter "species" of String,
-           parameter "strain" of String, parameter "organelle" of String,
-           parameter "source" of type "SourceInfo" (Information about the
-           source of a piece of data. source - the name of the source (e.g.
-           NCBI, JGI, Swiss-Prot) source_id - the ID of the data at the
-           source project_id - the ID of a project encompassing the data at
-           the source @optional source source_id project_id) -> structure:
-           parameter "source" of String, parameter "source_id" of type
-           "source_id" (An ID used for a piece of data at its source. @id
-           external), parameter "project_id" of type "project_id" (An ID used
-           for a project encompassing a piece of data at its source. @id
-           external), parameter "ncbi_taxid" of Long, parameter "location" of
-           type "Location" (Information about a location. lat - latitude of
-           the site, recorded as a decimal number. North latitudes are
-           positive values and south latitudes are negative numbers. lon -
-           longitude of the site, recorded as a decimal number. West
-           longitudes are positive values and east longitudes are negative
-           numbers. elevation - elevation of the site, expressed in meters
-           above sea level. Negative values are allowed. date - date of an
-           event at this location (for example, sample collection), expressed
-           in the format YYYY-MM-DDThh:mm:ss.SSSZ description - a free text
-           description of the location and, if applicable, the associated
-           event. @optional date description) -> structure: parameter "lat"
-           of Double, parameter "lon" of Double, parameter "elevation" of
-           Double, parameter "date" of String, parameter "description" of
-           String, parameter "source" of type "SourceInfo" (Information about
-           the source of a piece of data. source - the name of the source
-           (e.g. NCBI, JGI, Swiss-Prot) source_id - the ID of the data at the
-           source project_id - the ID of a project encompassing the data at
-           the source @optional source source_id project_id) -> structure:
-           parameter "source" of String, parameter "source_id" of type
-           "source_id" (An ID used for a piece of data at its source. @id
-           external), parameter "project_id" of type "project_id" (An ID used
-           for a project encompassing a piece of data at its source. @id
-           external), parameter "insert_size_mean" of Double, parameter
-           "insert_size_std_dev" of Double, parameter "read_count" of Long,
-           parameter "read_size" of Long, parameter "gc_content" of Double
+           values are 'false' or 'true'. Any other value is invalid.), parameter
+           "inter_gz" of type "bool" (A boolean. Allowed values are 'false' or
+           'true'. Any other value is invalid.), parameter "sing_gz" of type
+           "bool" (A boolean. Allowed values are 'false' or 'true'. Any other
+           value is invalid.), parameter "ref" of String, parameter
+           "single_genome" of type "tern" (A ternary. Allowed values are
+           'false', 'true', or null. Any other value is invalid.), parameter
+           "read_orientation_outward" of type "tern" (A ternary. Allowed values
+           are 'false', 'true', or null. Any other value is invalid.), parameter
+           "sequencing_tech" of String, parameter "strain" of type "StrainInfo"
+           (Information about a strain. genetic_code - the genetic code of the
+           strain. See
+           http://www.ncbi.nlm.nih.gov/Taxonomy/Utils/wprintgc.cgi?mode=c genus
+           - the genus of the strain species - the species of the strain strain
+           - the identifier for the strain source - information about the source
+           of the strain organelle - the organelle of interest for the related
+           data (e.g. mitochondria) ncbi_taxid - the NCBI taxonomy ID of the
+           strain location - the location from which the strain was collected
+           @optional genetic_code source ncbi_taxid organelle location) ->
+           structure: parameter "genetic_code" of Long, parameter "genus" of
+           String, parameter "species" of String, parameter "strain" of String,
+           parameter "organelle" of String, parameter "source" of type
+           "SourceInfo" (Information about the source of a piece of data. source
+           - the name of the source (e.g. NCBI, JGI, Swiss-Prot) source_id - the
+           ID of the data at the source project_id - the ID of a project
+           encompassing the data at the source @optional source source_id
+           project_id) -> structure: parameter "source" of String, parameter
+           "source_id" of type "source_id" (An ID used for a piece of data at
+           its source. @id external), parameter "project_id" of type
+           "project_id" (An ID used for a project encompassing a piece of data
+           at its source. @id external), parameter "ncbi_taxid" of Long,
+           parameter "location" of type "Location" (Information about a
+           location. lat - latitude of the site, recorded as a decimal number.
+           North latitudes are positive values and south latitudes are negative
+           numbers. lon - longitude of the site, recorded as a decimal number.
+           West longitudes are positive values and east longitudes are negative
+           numbers. elevation - elevation of the site, expressed in meters above
+           sea level. Negative values are allowed. date - date of an event at
+           this location (for example, sample collection), expressed in the
+           format YYYY-MM-DDThh:mm:ss.SSSZ description - a free text description
+           of the location and, if applicable, the associated event. @optional
+           date description) -> structure: parameter "lat" of Double, parameter
+           "lon" of Double, parameter "elevation" of Double, parameter "date" of
+           String, parameter "description" of String, parameter "source" of type
+           "SourceInfo" (Information about the source of a piece of data. source
+           - the name of the source (e.g. NCBI, JGI, Swiss-Prot) source_id - the
+           ID of the data at the source project_id - the ID of a project
+           encompassing the data at the source @optional source source_id
+           project_id) -> structure: parameter "source" of String, parameter
+           "source_id" of type "source_id" (An ID used for a piece of data at
+           its source. @id external), parameter "project_id" of type
+           "project_id" (An ID used for a project encompassing a piece of data
+           at its source. @id external), parameter "insert_size_mean" of Double,
+           parameter "insert_size_std_dev" of Double, parameter "read_count" of
+           Long, parameter "read_size" of Long, parameter "gc_content" of
+           Double, parameter "errors" of mapping from type "read_lib" (A
+           reference to a read library stored in the workspace service, whether
+           of the KBaseAssembly or KBaseFile type. Usage of absolute references
+           (e.g. 256/3/6) is strongly encouraged to avoid race conditions,
+           although any valid reference is allowed.) to type "ConversionError"
+           (An error that occurred when converting a read library. string error
+           - the error message. string type - the type of the error, e.g.
+           ShockError or ValueError. bool transient - whether the error may not
+           recur if the read library is converted again, e.g. a timeout or an
+           unavailable service.) -> structure: parameter "error" of String,
+           parameter "type" of String, parameter "transient" of type "bool" (A
+           boolean. Allowed values are 'false' or 'true'. Any other value is
+           invalid.), parameter "stats" of type "ConversionStats" (Statistics
+           for a conversion. float seconds - the wall clock time of the
+           conversion. mapping<string, StageStats> stages - the statistics for
+           each stage of the conversion, summed over all the read libraries. The
+           stages are ws_fetch, batch_queue, shock_metadata, shock_download,
+           peer_download, gunzip, gzip, mv, split, interleave, and deinterleave.
+           ws_fetch is the workspace calls that fetch the read library objects
+           and resolve the references to them. batch_queue is the time a batch
+           priority conversion waited to start. shock_metadata is the Shock
+           calls for the reads file metadata. Only the stages that ran are
+           included. mapping<string, mapping<string, StageStats>> libraries -
+           the statistics for each stage for each read library, keyed by the
+           absolute reference of the library. The ws_fetch and batch_queue
+           stages run for several libraries at once and are not included.) ->
+           structure: parameter "seconds" of Double, parameter "stages" of
+           mapping from String to type "StageStats" (Statistics for a stage of a
+           conversion. float seconds - the wall clock time spent in the stage.
+           int bytes_read - the number of bytes read by the stage. int
+           bytes_written - the number of bytes written by the stage. float
+           bytes_per_sec - the number of bytes read per second. null if the
+           stage took no measurable time.) -> structure: parameter "seconds" of
+           Double, parameter "bytes_read" of Long, parameter "bytes_written" of
+           Long, parameter "bytes_per_sec" of Double, parameter "libraries" of
+           mapping from String to mapping from String to type "StageStats"
+           (Statistics for a stage of a conversion. float seconds - the wall
+           clock time spent in the stage. int bytes_read - the number of bytes
+           read by the stage. int bytes_written - the number of bytes written by
+           the stage. float bytes_per_sec - the number of bytes read per second.
+           null if the stage took no measurable time.) -> structure: parameter
+           "seconds" of Double, parameter "bytes_read" of Long, parameter
+           "bytes_written" of Long, parameter "bytes_per_sec" of Double,
+           parameter "call_id" of String
         """
         job_id = self._convert_read_library_to_file_submit(params, context)
         while True:
@@ -172,3 +255,327 @@ class kb_read_library_to_file(object):
             job_state = self._check_job(job_id)
             if job_state['finished']:
                 return job_state['result'][0]
+
+    def _submit_convert_read_library_to_file_submit(self, params, context=None):
+        return self._client._submit_job(
+             'kb_read_library_to_file.submit_convert_read_library_to_file', [params],
+             self._service_ver, context)
+
+    def submit_convert_read_library_to_file(self, params, context=None):
+        """
+        Submit a conversion job that runs in the background on the service. The
+           job status and results are available from get_job_status and
+           get_job_result.
+        :param params: instance of type "ConvertReadLibraryParams" (Input
+           parameters for converting libraries to files. list<read_lib>
+           read_libraries - the names of the workspace read library objects to
+           convert. tern gzip - if true, gzip any unzipped files. If false,
+           gunzip any zipped files. If null or missing, leave files as is unless
+           unzipping is required for interleaving or deinterleaving, in which
+           case the files will be left unzipped. tern interleaved - if true,
+           provide the files in interleaved format if they are not already. If
+           false, provide forward and reverse reads files. If null or missing,
+           leave files as is. int chunks - if provided, split each reads file
+           into this many files of approximately equal size, e.g. for sharding
+           the reads across processes. Read pairs are never split, and the nth
+           forward file contains the mates of the reads in the nth reverse file.
+           Must be at least 1 and at most a maximum set by the service, 100 by
+           default. If null or missing, each reads file is provided as a single
+           file. string output_format - the format of the output files, either
+           'fastq' or 'fasta'. FASTA output omits the quality scores. If null or
+           missing, the files are provided in FASTQ format. bool stats - if
+           true, include statistics about the time spent and bytes processed by
+           each stage of the conversion in the output. Defaults to false. bool
+           continue_on_failure - if true, a read library that fails to convert
+           does not fail the call. Instead, the error is reported in the errors
+           field of the output and the other read libraries are converted as
+           usual. Defaults to false. string priority - the priority of the
+           conversion, either 'interactive' or 'batch'. Batch conversions use
+           the capacity interactive conversions leave, and the service may limit
+           how many run at once. If null or missing, conversions that download
+           more than a size set by the service are batch conversions.) ->
+           structure: parameter "read_libraries" of list of type "read_lib" (A
+           reference to a read library stored in the workspace service, whether
+           of the KBaseAssembly or KBaseFile type. Usage of absolute references
+           (e.g. 256/3/6) is strongly encouraged to avoid race conditions,
+           although any valid reference is allowed.), parameter "gzip" of type
+           "tern" (A ternary. Allowed values are 'false', 'true', or null. Any
+           other value is invalid.), parameter "interleaved" of type "tern" (A
+           ternary. Allowed values are 'false', 'true', or null. Any other value
+           is invalid.), parameter "chunks" of Long, parameter "output_format"
+           of String, parameter "stats" of type "bool" (A boolean. Allowed
+           values are 'false' or 'true'. Any other value is invalid.), parameter
+           "continue_on_failure" of type "bool" (A boolean. Allowed values are
+           'false' or 'true'. Any other value is invalid.), parameter "priority"
+           of String
+        :returns: instance of type "job_id" (The ID of an asynchronous
+           conversion job.)
+        """
+        job_id = self._submit_convert_read_library_to_file_submit(params, context)
+        while True:
+            time.sleep(self._client.async_job_check_time)
+            job_state = self._check_job(job_id)
+            if job_state['finished']:
+                return job_state['result'][0]
+
+    def _get_job_status_submit(self, job_id, context=None):
+        return self._client._submit_job(
+             'kb_read_library_to_file.get_job_status', [job_id],
+             self._service_ver, context)
+
+    def get_job_status(self, job_id, context=None):
+        """
+        Get the status of a conversion job.
+        :param job_id: instance of type "job_id" (The ID of an asynchronous
+           conversion job.)
+        :returns: instance of type "JobStatus" (The status of an asynchronous
+           conversion job. job_id job_id - the ID of the job. string status -
+           the status of the job, one of 'queued', 'running', 'complete', or
+           'error'. string error - the error message if the job failed. null
+           otherwise. int submitted - the time the job was submitted in
+           milliseconds since the epoch. int started - the time the job started
+           in milliseconds since the epoch. null if the job has not started. int
+           finished - the time the job finished in milliseconds since the epoch.
+           null if the job has not finished. ConversionProgress progress - the
+           most recently recorded progress of the job. null if the job has not
+           started.) -> structure: parameter "job_id" of type "job_id" (The ID
+           of an asynchronous conversion job.), parameter "status" of String,
+           parameter "error" of String, parameter "submitted" of Long, parameter
+           "started" of Long, parameter "finished" of Long, parameter "progress"
+           of type "ConversionProgress" (The progress of a conversion. int
+           libraries_total - the number of read libraries to convert. int
+           libraries_done - the number of read libraries converted so far.
+           string stage - the stage that is running, or null. int
+           stage_bytes_done - the number of bytes the stage has processed. int
+           stage_bytes_total - the number of bytes the stage will process.) ->
+           structure: parameter "libraries_total" of Long, parameter
+           "libraries_done" of Long, parameter "stage" of String, parameter
+           "stage_bytes_done" of Long, parameter "stage_bytes_total" of Long
+        """
+        job_id = self._get_job_status_submit(job_id, context)
+        while True:
+            time.sleep(self._client.async_job_check_time)
+            job_state = self._check_job(job_id)
+            if job_state['finished']:
+                return job_state['result'][0]
+
+    def _get_job_result_submit(self, job_id, context=None):
+        return self._client._submit_job(
+             'kb_read_library_to_file.get_job_result', [job_id],
+             self._service_ver, context)
+
+    def get_job_result(self, job_id, context=None):
+        """
+        Get the results of a completed conversion job. Throws an error if the
+           job failed or has not yet completed.
+        :param job_id: instance of type "job_id" (The ID of an asynchronous
+           conversion job.)
+        :returns: instance of type "ConvertReadLibraryOutput" (The output of the
+           convert method. mapping<read_lib, ConvertedReadLibrary> files - a
+           mapping of the read library workspace references to information about
+           the converted data for each library. References that point to the
+           same object, e.g. MyWorkspace/MyReads and 256/3/6, share the same
+           converted data. mapping<read_lib, ConversionError> errors - a mapping
+           of the read library workspace references that failed to convert to
+           the error for each library. Failed libraries are not present in the
+           files mapping. Only present if continue_on_failure is true.
+           ConversionStats stats - statistics about the conversion. Only present
+           if requested. string call_id - the ID the service generated for the
+           conversion, which identifies it in the service's logs and progress
+           records. For asynchronous jobs, this is the job ID.) -> structure:
+           parameter "files" of mapping from type "read_lib" (A reference to a
+           read library stored in the workspace service, whether of the
+           KBaseAssembly or KBaseFile type. Usage of absolute references (e.g.
+           256/3/6) is strongly encouraged to avoid race conditions, although
+           any valid reference is allowed.) to type "ConvertedReadLibrary"
+           (Information about each set of reads. ReadsFiles files - the reads
+           files. string ref - the absolute workspace reference of the reads
+           file, e.g workspace_id/object_id/version. tern single_genome -
+           whether the reads are from a single genome or a metagenome. null if
+           unknown. tern read_orientation_outward - whether the read orientation
+           is outward from the set of primers. null if unknown or single ended
+           reads. string sequencing_tech - the sequencing technology used to
+           produce the reads. null if unknown. KBaseCommon.StrainInfo strain -
+           information about the organism strain that was sequenced. null if
+           unavailable. KBaseCommon.SourceInfo source - information about the
+           organism source. null if unavailable. float insert_size_mean - the
+           mean size of the genetic fragments. null if unavailable or single end
+           reads. float insert_size_std_dev - the standard deviation of the size
+           of the genetic fragments. null if unavailable or single end reads.
+           int read_count - the number of reads in the this dataset. null if
+           unavailable. int read_size - the total size of the reads, in bases.
+           null if unavailable. float gc_content - the GC content of the reads.
+           null if unavailable.) -> structure: parameter "files" of type
+           "ReadsFiles" (Reads file locations and gzip status. Only the relevant
+           fields will be present in the structure. string fwd - the path to the
+           forward / left reads. string rev - the path to the reverse / right
+           reads. string inter - the path to the interleaved reads. string sing
+           - the path to the single end reads. bool fwd_gz - whether the forward
+           / left reads are gzipped. bool rev_gz - whether the reverse / right
+           reads are gzipped. bool inter_gz - whether the interleaved reads are
+           gzipped. bool sing_gz - whether the single reads are gzipped.
+           list<string> fwd_chunks - the paths to the forward / left reads
+           chunks. list<string> rev_chunks - the paths to the reverse / right
+           reads chunks. list<string> inter_chunks - the paths to the
+           interleaved reads chunks. list<string> sing_chunks - the paths to the
+           single end reads chunks. The *_chunks fields are provided instead of
+           the fwd, rev, inter, and sing fields when the chunks parameter is
+           set. The files may be hard links to files shared with other
+           conversions and the service's caches, so they must not be modified in
+           place. To change a file, write a new file and replace the old one
+           with it.) -> structure: parameter "fwd" of String, parameter "rev" of
+           String, parameter "inter" of String, parameter "sing" of String,
+           parameter "fwd_chunks" of list of String, parameter "rev_chunks" of
+           list of String, parameter "inter_chunks" of list of String, parameter
+           "sing_chunks" of list of String, parameter "fwd_gz" of type "bool" (A
+           boolean. Allowed values are 'false' or 'true'. Any other value is
+           invalid.), parameter "rev_gz" of type "bool" (A boolean. Allowed
+           values are 'false' or 'true'. Any other value is invalid.), parameter
+           "inter_gz" of type "bool" (A boolean. Allowed values are 'false' or
+           'true'. Any other value is invalid.), parameter "sing_gz" of type
+           "bool" (A boolean. Allowed values are 'false' or 'true'. Any other
+           value is invalid.), parameter "ref" of String, parameter
+           "single_genome" of type "tern" (A ternary. Allowed values are
+           'false', 'true', or null. Any other value is invalid.), parameter
+           "read_orientation_outward" of type "tern" (A ternary. Allowed values
+           are 'false', 'true', or null. Any other value is invalid.), parameter
+           "sequencing_tech" of String, parameter "strain" of type "StrainInfo"
+           (Information about a strain. genetic_code - the genetic code of the
+           strain. See
+           http://www.ncbi.nlm.nih.gov/Taxonomy/Utils/wprintgc.cgi?mode=c genus
+           - the genus of the strain species - the species of the strain strain
+           - the identifier for the strain source - information about the source
+           of the strain organelle - the organelle of interest for the related
+           data (e.g. mitochondria) ncbi_taxid - the NCBI taxonomy ID of the
+           strain location - the location from which the strain was collected
+           @optional genetic_code source ncbi_taxid organelle location) ->
+           structure: parameter "genetic_code" of Long, parameter "genus" of
+           String, parameter "species" of String, parameter "strain" of String,
+           parameter "organelle" of String, parameter "source" of type
+           "SourceInfo" (Information about the source of a piece of data. source
+           - the name of the source (e.g. NCBI, JGI, Swiss-Prot) source_id - the
+           ID of the data at the source project_id - the ID of a project
+           encompassing the data at the source @optional source source_id
+           project_id) -> structure: parameter "source" of String, parameter
+           "source_id" of type "source_id" (An ID used for a piece of data at
+           its source. @id external), parameter "project_id" of type
+           "project_id" (An ID used for a project encompassing a piece of data
+           at its source. @id external), parameter "ncbi_taxid" of Long,
+           parameter "location" of type "Location" (Information about a
+           location. lat - latitude of the site, recorded as a decimal number.
+           North latitudes are positive values and south latitudes are negative
+           numbers. lon - longitude of the site, recorded as a decimal number.
+           West longitudes are positive values and east longitudes are negative
+           numbers. elevation - elevation of the site, expressed in meters above
+           sea level. Negative values are allowed. date - date of an event at
+           this location (for example, sample collection), expressed in the
+           format YYYY-MM-DDThh:mm:ss.SSSZ description - a free text description
+           of the location and, if applicable, the associated event. @optional
+           date description) -> structure: parameter "lat" of Double, parameter
+           "lon" of Double, parameter "elevation" of Double, parameter "date" of
+           String, parameter "description" of String, parameter "source" of type
+           "SourceInfo" (Information about the source of a piece of data. source
+           - the name of the source (e.g. NCBI, JGI, Swiss-Prot) source_id - the
+           ID of the data at the source project_id - the ID of a project
+           encompassing the data at the source @optional source source_id
+           project_id) -> structure: parameter "source" of String, parameter
+           "source_id" of type "source_id" (An ID used for a piece of data at
+           its source. @id external), parameter "project_id" of type
+           "project_id" (An ID used for a project encompassing a piece of data
+           at its source. @id external), parameter "insert_size_mean" of Double,
+           parameter "insert_size_std_dev" of Double, parameter "read_count" of
+           Long, parameter "read_size" of Long, parameter "gc_content" of
+           Double, parameter "errors" of mapping from type "read_lib" (A
+           reference to a read library stored in the workspace service, whether
+           of the KBaseAssembly or KBaseFile type. Usage of absolute references
+           (e.g. 256/3/6) is strongly encouraged to avoid race conditions,
+           although any valid reference is allowed.) to type "ConversionError"
+           (An error that occurred when converting a read library. string error
+           - the error message. string type - the type of the error, e.g.
+           ShockError or ValueError. bool transient - whether the error may not
+           recur if the read library is converted again, e.g. a timeout or an
+           unavailable service.) -> structure: parameter "error" of String,
+           parameter "type" of String, parameter "transient" of type "bool" (A
+           boolean. Allowed values are 'false' or 'true'. Any other value is
+           invalid.), parameter "stats" of type "ConversionStats" (Statistics
+           for a conversion. float seconds - the wall clock time of the
+           conversion. mapping<string, StageStats> stages - the statistics for
+           each stage of the conversion, summed over all the read libraries. The
+           stages are ws_fetch, batch_queue, shock_metadata, shock_download,
+           peer_download, gunzip, gzip, mv, split, interleave, and deinterleave.
+           ws_fetch is the workspace calls that fetch the read library objects
+           and resolve the references to them. batch_queue is the time a batch
+           priority conversion waited to start. shock_metadata is the Shock
+           calls for the reads file metadata. Only the stages that ran are
+           included. mapping<string, mapping<string, StageStats>> libraries -
+           the statistics for each stage for each read library, keyed by the
+           absolute reference of the library. The ws_fetch and batch_queue
+           stages run for several libraries at once and are not included.) ->
+           structure: parameter "seconds" of Double, parameter "stages" of
+           mapping from String to type "StageStats" (Statistics for a stage of a
+           conversion. float seconds - the wall clock time spent in the stage.
+           int bytes_read - the number of bytes read by the stage. int
+           bytes_written - the number of bytes written by the stage. float
+           bytes_per_sec - the number of bytes read per second. null if the
+           stage took no measurable time.) -> structure: parameter "seconds" of
+           Double, parameter "bytes_read" of Long, parameter "bytes_written" of
+           Long, parameter "bytes_per_sec" of Double, parameter "libraries" of
+           mapping from String to mapping from String to type "StageStats"
+           (Statistics for a stage of a conversion. float seconds - the wall
+           clock time spent in the stage. int bytes_read - the number of bytes
+           read by the stage. int bytes_written - the number of bytes written by
+           the stage. float bytes_per_sec - the number of bytes read per second.
+           null if the stage took no measurable time.) -> structure: parameter
+           "seconds" of Double, parameter "bytes_read" of Long, parameter
+           "bytes_written" of Long, parameter "bytes_per_sec" of Double,
+           parameter "call_id" of String
+        """
+        job_id = self._get_job_result_submit(job_id, context)
+        while True:
+            time.sleep(self._client.async_job_check_time)
+            job_state = self._check_job(job_id)
+            if job_state['finished']:
+                return job_state['result'][0]
+
+    def _prefetch_read_libraries_submit(self, params, context=None):
+        return self._client._submit_job(
+             'kb_read_library_to_file.prefetch_read_libraries', [params],
+             self._service_ver, context)
+
+    def prefetch_read_libraries(self, params, context=None):
+        """
+        Download the reads files for read libraries to the service's staging
+           area in the background, so that later conversions of the libraries
+           read the files from local disk. Returns once the references have been
+           resolved. Staged files expire if they are not used for a while and
+           may be evicted if the staging area is full, in which case conversions
+           download the files as usual. Throws an error if the service has no
+           staging area.
+        :param params: instance of type "PrefetchReadLibrariesParams" (Input
+           parameters for prefetching read libraries. list<read_lib>
+           read_libraries - the names of the workspace read library objects to
+           prefetch.) -> structure: parameter "read_libraries" of list of type
+           "read_lib" (A reference to a read library stored in the workspace
+           service, whether of the KBaseAssembly or KBaseFile type. Usage of
+           absolute references (e.g. 256/3/6) is strongly encouraged to avoid
+           race conditions, although any valid reference is allowed.)
+        :returns: instance of type "PrefetchReadLibrariesOutput" (The output of
+           the prefetch method. mapping<read_lib, read_lib> refs - a mapping of
+           the read library workspace references to the absolute references of
+           the objects that will be prefetched.) -> structure: parameter "refs"
+           of mapping from type "read_lib" (A reference to a read library stored
+           in the workspace service, whether of the KBaseAssembly or KBaseFile
+           type. Usage of absolute references (e.g. 256/3/6) is strongly
+           encouraged to avoid race conditions, although any valid reference is
+           allowed.) to type "read_lib" (A reference to a read library stored in
+           the workspace service, whether of the KBaseAssembly or KBaseFile
+           type. Usage of absolute references (e.g. 256/3/6) is strongly
+           encouraged to avoid race conditions, although any valid reference is
+           allowed.)
+        """
+        job_id = self._prefetch_read_libraries_submit(params, context)
+        while True:
+            time.sleep(self._client.async_job_check_time)
+            job_state = self._check_job(job_id)
+            if job_state['finished']:
+                return job_state['result'][0]
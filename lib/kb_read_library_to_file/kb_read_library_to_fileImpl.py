@@ -12,15 +12,255 @@ import errno
 import shutil
 import gzip
 import uuid
+import tempfile
+import copy
+import hashlib
+import itertools
+import threading
+import Queue
+from contextlib import contextmanager
+from kb_read_library_to_file.batch import BatchRunner
+from kb_read_library_to_file.cache import (
+    CachingAuthClient, LRUCache, TokenCache)
+from kb_read_library_to_file.coalesce import Coalescer
+from kb_read_library_to_file.jobs import JobStore, JobRunner
+from kb_read_library_to_file.metrics import RateMeter, Registry
+from kb_read_library_to_file.peers import PeerClient, PeerServer
+from kb_read_library_to_file.prefetch import Prefetcher
+from kb_read_library_to_file.priority import (
+    INTERACTIVE, BATCH, BACKGROUND, SlotPool, SlotTimeoutError)
+from kb_read_library_to_file.downloads import DownloadScheduler
+from kb_read_library_to_file.filecache import FileCache
+from kb_read_library_to_file.progress import ProgressRegistry
+from kb_read_library_to_file.retry import RetryPolicy, is_transient
+from kb_read_library_to_file.scratch import ScratchPlanner, ScratchSweeper
+from kb_read_library_to_file.streams import StreamReader
 
 
 class ShockError(Exception):
-    pass
+    '''
+    An error returned by Shock. status is the HTTP status code of the
+    response.
+    '''
+
+    def __init__(self, message, status=None):
+        super(ShockError, self).__init__(message)
+        self.status = status
 
 
 class InvalidFileError(Exception):
     pass
 
+
+class lazy_property(object):
+    '''
+    A read only property whose value is computed by the decorated method on
+    first access and then stored on the instance, where it can be replaced
+    like any attribute. The value is computed under the instance's
+    _lazy_lock, which must be reentrant if computing one value accesses
+    another.
+    '''
+
+    def __init__(self, func):
+        self.func = func
+        self.__doc__ = func.__doc__
+
+    def __get__(self, obj, cls):
+        if obj is None:
+            return self
+        name = self.func.__name__
+        with obj._lazy_lock:
+            if name not in obj.__dict__:
+                obj.__dict__[name] = self.func(obj)
+            return obj.__dict__[name]
+
+
+class ConversionStats(object):
+    '''
+    Accumulates the time spent and bytes read and written by each stage of a
+    conversion, in total and for the read library currently being converted.
+    Stages are recorded from the thread that fetches workspace objects as well
+    as the conversion thread.
+    '''
+
+    def __init__(self):
+        self.start = time.time()
+        self.stages = {}
+        self.libraries = {}
+        self._library = None
+        self._lock = threading.Lock()
+
+    # a ref of None records the following stages for the conversion only
+    def set_library(self, ref):
+        with self._lock:
+            self._library = None if ref is None \
+                else self.libraries.setdefault(ref, {})
+
+    def _add(self, stages, stage, seconds, read, written):
+        s = stages.setdefault(
+            stage, {'seconds': 0.0, 'bytes_read': 0, 'bytes_written': 0})
+        s['seconds'] += seconds
+        s['bytes_read'] += read
+        s['bytes_written'] += written
+
+    def record(self, stage, seconds, read, written, library=True):
+        '''
+        Records a run of a stage. Stages that run for the whole conversion
+        rather than one read library have library set to False.
+        '''
+        with self._lock:
+            self._add(self.stages, stage, seconds, read, written)
+            if library and self._library is not None:
+                self._add(self._library, stage, seconds, read, written)
+
+    def _with_throughput(self, stages):
+        ret = {}
+        for stage, s in stages.items():
+            ret[stage] = dict(s)
+            ret[stage]['bytes_per_sec'] = (
+                s['bytes_read'] / s['seconds'] if s['seconds'] else None)
+        return ret
+
+    def to_output(self):
+        with self._lock:
+            return {'seconds': time.time() - self.start,
+                    'stages': self._with_throughput(self.stages),
+                    'libraries': {ref: self._with_throughput(stages)
+                                  for ref, stages in self.libraries.items()}}
+
+
+class ShockNode(object):
+    '''
+    The location, size, compression, and MD5 checksum, if known, of a reads
+    file in Shock. request is the ConversionRequest that streams the file, if
+    any.
+    '''
+
+    def __init__(self, url, headers, node_id, size, gzipped, md5=None):
+        self.url = url
+        self.headers = headers
+        self.id = node_id
+        self.size = size
+        self.gzipped = gzipped
+        self.md5 = md5
+        self.request = None
+
+
+class ConversionRequest(object):
+    '''
+    The token and output options for a single call to the converter.
+    stats is a ConversionStats instance if statistics were requested, or
+    None. progress is the Progress instance for the call, or None. user is
+    the user making the call, for scheduling downloads. retry_budget is the
+    RetryBudget for the call, or None. If continue_on_failure is True, errors
+    maps the absolute references of the read libraries that failed to convert
+    to their errors, and is None otherwise.
+    nodes maps node keys to the ShockNodes found when planning the
+    conversion. If stream is True, reads are streamed from Shock rather than
+    downloaded to scratch. files contains the paths of the files the
+    conversion has written to scratch, and intermediates the subset that are
+    deleted once they've been converted. temp_dir is the directory for the
+    conversion's intermediate files. prefetch is True if the request only
+    stages the reads files for later conversions. priority is the priority
+    of the request, or None if it's to be inferred from the size of the
+    reads in each batch the request converts, in which case infer_priority
+    is True. Prefetches are background requests.
+    '''
+
+    def __init__(self, token, gzip, interleave, chunks, fasta, stats=None,
+                 progress=None, user=None, retry_budget=None,
+                 continue_on_failure=False, prefetch=False, priority=None):
+        self.token = token
+        self.gzip = gzip
+        self.interleave = interleave
+        self.chunks = chunks
+        self.fasta = fasta
+        self.stats = stats
+        self.progress = progress
+        self.user = user
+        self.retry_budget = retry_budget
+        self.errors = {} if continue_on_failure else None
+        self.prefetch = prefetch
+        self.priority = BACKGROUND if prefetch else priority
+        self.infer_priority = self.priority is None
+        self.nodes = {}
+        self.stream = False
+        self.files = set()
+        self.intermediates = set()
+        self.temp_dir = None
+
+
+# the suffix for files that are being written
+PARTIAL = '.partial'
+
+
+@contextmanager
+def write_atomically(path, opener=open):
+    '''
+    Opens a temporary file for writing that is renamed to path when the with
+    block completes, so a partially written file is never seen at path. The
+    temporary file is deleted if the with block fails.
+    '''
+    tmp = path + PARTIAL
+    try:
+        with opener(tmp, 'wb') as f:
+            yield f
+    except:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    os.rename(tmp, path)
+
+
+class ReadsWriter(object):
+    '''
+    Writes reads records to one or more files, optionally gzipped. Records
+    are distributed round robin across the files, so each file receives
+    approximately the same number of records. FASTQ records are converted to
+    FASTA records, dropping the quality scores, if fasta is True. The files
+    are written to temporary paths and renamed to their final paths when
+    the with block completes successfully.
+    '''
+
+    def __init__(self, paths, gzipped, fasta=False):
+        self.paths = paths
+        self.fasta = fasta
+        self._count = 0
+        self._files = []
+        try:
+            for p in paths:
+                self._files.append(gzip.open(p + PARTIAL, 'wb') if gzipped
+                                   else open(p + PARTIAL, 'w'))
+        except:
+            self.close(False)
+            raise
+
+    def write(self, lines):
+        if self.fasta:
+            fa = []
+            for i in xrange(0, len(lines), 4):
+                fa.append('>' + lines[i][1:])
+                fa.append(lines[i + 1])
+            lines = fa
+        self._files[self._count % len(self._files)].writelines(lines)
+        self._count += 1
+
+    # If commit is False, the files are deleted rather than renamed.
+    def close(self, commit=True):
+        for f in self._files:
+            f.close()
+        for p in self.paths[:len(self._files)]:
+            if commit:
+                os.rename(p + PARTIAL, p)
+            else:
+                os.remove(p + PARTIAL)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *args):
+        self.close(exc_type is None)
+
 #END_HEADER
 
 
@@ -51,6 +291,7 @@ Operational notes:
 - If a file downloaded from Shock has a .gz suffix, it is assumed to be
   gzipped.
 - Files are assumed to be in correct fastq format.
+- Output files are in fastq format unless fasta format is requested.
     '''
 
     ######## WARNING FOR GEVENT USERS #######
@@ -77,6 +318,17 @@ Operational notes:
     PARAM_IN_LIB = 'read_libraries'
     PARAM_IN_GZIP = 'gzip'
     PARAM_IN_INTERLEAVED = 'interleaved'
+    PARAM_IN_CHUNKS = 'chunks'
+    PARAM_IN_FORMAT = 'output_format'
+    PARAM_IN_STATS = 'stats'
+    PARAM_IN_CONTINUE = 'continue_on_failure'
+    PARAM_IN_PRIORITY = 'priority'
+
+    FASTQ = 'fastq'
+    FASTA = 'fasta'
+    OUTPUT_FORMATS = [FASTQ, FASTA]
+
+    PRIORITIES = [INTERACTIVE, BATCH]
 
     GZIP = '.gz'
 
@@ -85,6 +337,106 @@ Operational notes:
 
     URL_WS = 'workspace-url'
     URL_SHOCK = 'shock-url'
+    CFG_WS_CACHE_SIZE = 'ws-cache-size'
+    CFG_WS_BATCH_SIZE = 'ws-batch-size'
+    CFG_AUTH_CACHE_TTL = 'auth-cache-ttl-sec'
+    CFG_AUTH_CACHE_MAX_SIZE = 'auth-cache-max-size'
+    CFG_JOB_DB = 'job-db'
+    CFG_JOB_WORKERS = 'job-workers'
+    CFG_JOB_MAX_AGE = 'job-max-age-sec'
+    CFG_RPC_BATCH_CONCURRENCY = 'batch-concurrency'
+    CFG_PROGRESS_INTERVAL = 'progress-interval-sec'
+    CFG_PROGRESS_MAX_AGE = 'progress-max-age-sec'
+    CFG_SCRATCH_ADMISSION = 'scratch-admission'
+    CFG_SCRATCH_QUEUE_TIMEOUT = 'scratch-queue-timeout-sec'
+    CFG_GZIP_RATIO = 'scratch-gzip-ratio'
+    CFG_MAX_CHUNKS = 'max-chunks'
+    CFG_SWEEP_INTERVAL = 'scratch-sweep-interval-sec'
+    CFG_SWEEP_MAX_AGE = 'scratch-max-age-sec'
+    CFG_SWEEP_MAX_BYTES = 'scratch-max-bytes'
+    CFG_SWEEP_MIN_AGE = 'scratch-min-age-sec'
+    # the download limits apply to each server process separately, so the
+    # limits for the host are these times the number of processes
+    CFG_DOWNLOAD_CONNECTIONS = 'process-download-connections'
+    CFG_DOWNLOAD_USER_CONNECTIONS = 'process-download-connections-per-user'
+    CFG_DOWNLOAD_BANDWIDTH = 'process-download-bandwidth-bytes-per-sec'
+    CFG_DOWNLOAD_RESERVED = 'process-download-connections-interactive'
+    CFG_DOWNLOAD_BATCH_BANDWIDTH = \
+        'process-download-batch-bandwidth-bytes-per-sec'
+    CFG_INTERACTIVE_MAX_BYTES = 'interactive-max-bytes'
+    CFG_BATCH_CONVERSIONS = 'batch-conversions'
+    CFG_BATCH_QUEUE_TIMEOUT = 'batch-queue-timeout-sec'
+    CFG_RETRY_ATTEMPTS = 'retry-attempts'
+    CFG_RETRY_BASE_DELAY = 'retry-base-delay-sec'
+    CFG_RETRY_MAX_DELAY = 'retry-max-delay-sec'
+    CFG_RETRY_BUDGET = 'retry-budget'
+    CFG_SHOCK_TIMEOUT = 'shock-timeout-sec'
+    CFG_OUTPUT_CACHE_MAX_BYTES = 'output-cache-max-bytes'
+    CFG_NODE_CACHE_MAX_BYTES = 'node-cache-max-bytes'
+    CFG_PEERS = 'peers'
+    CFG_PEER_SECRET = 'peer-secret'
+    CFG_PEER_TIMEOUT = 'peer-timeout-sec'
+    CFG_STAGING_MAX_BYTES = 'staging-max-bytes'
+    CFG_STAGING_MAX_AGE = 'staging-max-age-sec'
+    CFG_PREFETCH_CONNECTIONS = 'prefetch-connections'
+
+    WS_CACHE_SIZE_DEFAULT = 1000
+    WS_BATCH_SIZE_DEFAULT = 50
+    AUTH_CACHE_TTL_DEFAULT = 300
+    AUTH_CACHE_MAX_SIZE_DEFAULT = 1000
+    JOB_DB_DEFAULT = 'jobs.sqlite3'
+    JOB_WORKERS_DEFAULT = 2
+    JOB_MAX_AGE_DEFAULT = 7 * 24 * 3600
+    RPC_BATCH_CONCURRENCY_DEFAULT = 1
+    PROGRESS_INTERVAL_DEFAULT = 1.0
+    PROGRESS_MAX_AGE_DEFAULT = 24 * 3600
+    SCRATCH_ADMISSION_DEFAULT = ScratchPlanner.FAIL
+    SCRATCH_QUEUE_TIMEOUT_DEFAULT = 3600
+    # the assumed ratio of uncompressed to gzipped reads size when estimating
+    # scratch use
+    GZIP_RATIO_DEFAULT = 4.0
+    # each chunk is a file that's open for the whole split
+    MAX_CHUNKS_DEFAULT = 100
+    SWEEP_INTERVAL_DEFAULT = 3600
+    SWEEP_MAX_AGE_DEFAULT = 7 * 24 * 3600
+    SWEEP_MAX_BYTES_DEFAULT = 0
+    SWEEP_MIN_AGE_DEFAULT = 3600
+    DOWNLOAD_CONNECTIONS_DEFAULT = 8
+    DOWNLOAD_USER_CONNECTIONS_DEFAULT = 4
+    DOWNLOAD_BANDWIDTH_DEFAULT = 0
+    DOWNLOAD_RESERVED_DEFAULT = 0
+    DOWNLOAD_BATCH_BANDWIDTH_DEFAULT = 0
+    INTERACTIVE_MAX_BYTES_DEFAULT = 1024 ** 3
+    BATCH_CONVERSIONS_DEFAULT = 0
+    BATCH_QUEUE_TIMEOUT_DEFAULT = 3600
+    RETRY_ATTEMPTS_DEFAULT = 4
+    RETRY_BASE_DELAY_DEFAULT = 0.5
+    RETRY_MAX_DELAY_DEFAULT = 30
+    RETRY_BUDGET_DEFAULT = 20
+    # the maximum time to wait for Shock to connect or send data
+    SHOCK_TIMEOUT_DEFAULT = 300
+    OUTPUT_CACHE_MAX_BYTES_DEFAULT = 0
+    NODE_CACHE_MAX_BYTES_DEFAULT = 0
+    PEER_TIMEOUT_DEFAULT = 30
+    STAGING_MAX_BYTES_DEFAULT = 0
+    STAGING_MAX_AGE_DEFAULT = 24 * 3600
+    PREFETCH_CONNECTIONS_DEFAULT = 1
+
+    PROGRESS_DIR = 'progress'
+    COALESCE_DIR = 'coalesce'
+    OUTPUT_CACHE_DIR = 'output_cache'
+    NODE_CACHE_DIR = 'node_cache'
+    STAGING_DIR = 'staging'
+    SLOTS_DIR = 'slots'
+    # the number of lines between progress updates in the transform stages
+    PROGRESS_LINES = 40000
+    # measuring disk usage walks directories and reads the cache manifests,
+    # so the status method reuses measurements for this many seconds
+    DISK_USAGE_TTL = 10
+    COPY_BUFFER = 1024 * 1024
+    DOWNLOAD_CHUNK = 64 * 1024
+
+    ABS_REF = re.compile(r'^\d+/\d+/\d+$')
 
     SUPPORTED_FILES = ['.fq',
                        '.fastq',
@@ -100,10 +452,161 @@ Operational notes:
 
     SHOCK_TEMP = 'shock_tmp'
 
+    # the subset of the reads object data used by the converter. Paths that
+    # don't exist in a particular type are ignored by the workspace.
+    INCLUDED_PATHS = [
+        # KBaseFile
+        'lib/file', 'lib/type',
+        'lib1/file', 'lib1/type',
+        'lib2/file', 'lib2/type',
+        # KBaseAssembly
+        'handle', 'handle_1', 'handle_2',
+        # metadata
+        'single_genome', 'read_orientation_outward', 'insert_size_mean',
+        'insert_size_std_dev', 'source', 'strain', 'sequencing_tech',
+        'read_count', 'read_size', 'gc_content'
+    ]
+
+    METRIC_PREFIX = 'kb_read_library_to_file_'
+
     def log(self, message, prefix_newline=False):
         print(('\n' if prefix_newline else '') +
               str(time.time()) + ': ' + message)
 
+    def setup_metrics(self):
+        self.metrics = Registry()
+        m = self.METRIC_PREFIX
+        self.m_stage_seconds = self.metrics.histogram(
+            m + 'stage_seconds',
+            'Time spent in each conversion stage, by stage and whether it ' +
+            'succeeded.', ['stage', 'status'])
+        self.m_stage_bytes = self.metrics.counter(
+            m + 'stage_bytes_total',
+            'Bytes read and written by each conversion stage.',
+            ['stage', 'direction'])
+        self.m_shock_seconds = self.metrics.histogram(
+            m + 'shock_response_seconds',
+            'Time until Shock returns the response headers.',
+            ['request', 'code'])
+        self.m_in_flight = self.metrics.gauge(
+            m + 'conversions_in_flight', 'Conversions currently running.')
+        self.m_conversions = self.metrics.counter(
+            m + 'conversions_total', 'Conversions started.')
+        self.m_priorities = self.metrics.counter(
+            m + 'conversions_by_priority_total',
+            'Batches of read libraries started by priority.', ['priority'])
+        self.m_libraries = self.metrics.counter(
+            m + 'libraries_converted_total', 'Read libraries converted.')
+        self.m_errors = self.metrics.counter(
+            m + 'conversion_errors_total',
+            'Failed conversions by error type.', ['type'])
+        self.m_coalesced = self.metrics.counter(
+            m + 'libraries_coalesced_total',
+            'Read libraries linked from the output of a concurrent ' +
+            'conversion of the same library with the same options.')
+        self.m_output_cache = self.metrics.counter(
+            m + 'output_cache_lookups_total',
+            'Lookups of converted read libraries in the output cache.',
+            ['result'])
+        self.m_node_cache = self.metrics.counter(
+            m + 'node_cache_lookups_total',
+            'Lookups of downloaded Shock nodes in the node cache.',
+            ['result'])
+        self.m_staging = self.metrics.counter(
+            m + 'staging_lookups_total',
+            'Lookups of prefetched Shock nodes in the staging area.',
+            ['result'])
+        self.m_prefetched = self.metrics.counter(
+            m + 'prefetched_libraries_total',
+            'Read libraries prefetched to the staging area, by result.',
+            ['result'])
+        self.m_peer_fetches = self.metrics.counter(
+            m + 'peer_fetches_total',
+            'Cache entries requested from peers, by cache and result.',
+            ['cache', 'result'])
+        self.m_library_errors = self.metrics.counter(
+            m + 'library_errors_total',
+            'Read libraries that failed to convert without failing the ' +
+            'conversion, by error type.', ['type'])
+        self.m_download_wait = self.metrics.histogram(
+            m + 'download_wait_seconds',
+            'Time downloads wait for a connection slot.')
+        self.m_retries = self.metrics.counter(
+            m + 'retries_total',
+            'Calls to other services retried after transient errors.',
+            ['operation'])
+        self.m_intermediate_bytes = self.metrics.counter(
+            m + 'intermediate_bytes_deleted_total',
+            'Bytes of downloaded reads deleted once converted.')
+
+    # Times a conversion stage and records the number of bytes it read and
+    # wrote in the metrics and, if a request is provided, the request's
+    # statistics. Byte counts that are only known when the stage is done can
+    # be set in the 'read' and 'written' keys of the yielded dict. total is
+    # the number of bytes the stage will read for progress reporting, if it
+    # differs from read. Stages that run before the request is created, or
+    # for a batch of libraries, pass the request's stats rather than the
+    # request. Stages that fail are recorded as well, with a status of error
+    # in the metrics, and the stage is cleared from the request's progress
+    # when it ends either way.
+    @contextmanager
+    def stage(self, name, read=0, req=None, total=None, stats=None):
+        s = {'read': read, 'written': 0}
+        progress = req.progress if req else None
+        if progress:
+            progress.start_stage(name, read if total is None else total)
+        start = time.time()
+        status = 'error'
+        try:
+            yield s
+            status = 'ok'
+        finally:
+            seconds = time.time() - start
+            self.m_stage_seconds.observe(seconds, stage=name, status=status)
+            self.m_stage_bytes.inc(s['read'], stage=name, direction='read')
+            self.m_stage_bytes.inc(s['written'], stage=name,
+                                   direction='written')
+            if req and req.stats:
+                req.stats.record(name, seconds, s['read'], s['written'])
+            elif stats:
+                stats.record(name, seconds, s['read'], s['written'], False)
+            if progress:
+                progress.finish_stage(name)
+
+    # the position in the file on disk, which for gzipped files is the
+    # position in the compressed data
+    def disk_position(self, f):
+        return (f.fileobj if isinstance(f, gzip.GzipFile) else f).tell()
+
+    def copy(self, source, target, progress=None):
+        while True:
+            buf = source.read(self.COPY_BUFFER)
+            if not buf:
+                break
+            target.write(buf)
+            if progress:
+                progress.update(self.disk_position(source))
+
+    def file_sizes(self, paths):
+        return sum(os.path.getsize(p) for p in paths)
+
+    @contextmanager
+    def track_conversion(self):
+        self.m_conversions.inc()
+        self.m_in_flight.inc()
+        try:
+            yield
+        except Exception as e:
+            self.m_errors.inc(type=type(e).__name__)
+            raise
+        finally:
+            self.m_in_flight.dec()
+
+    def observe_shock_response(self, request, response):
+        self.m_shock_seconds.observe(response.elapsed.total_seconds(),
+                                     request=request,
+                                     code=str(response.status_code))
+
     def file_extension_ok(self, filename):
         for okext in self.SUPPORTED_FILES:
             if filename.lower().endswith(okext):
@@ -121,21 +624,32 @@ Operational notes:
                 self.log("Couldn't parse response error content from Shock: " +
                          response.content)
                 response.raise_for_status()
-            raise ShockError(str(err))
+            raise ShockError(str(err), response.status_code)
 
-    def shock_download(self, token, handle, file_type=None):
-        # Could keep a record of files downloaded to prevent duplicate
-        # downloads if 2 ws objects point to the same shock node, but that
-        # seems rare enough that it's not worth the extra code complexity and
-        # maintenance burden
-        self.log('Downloading from shock via handle:\n' + pformat(handle))
+    # Calls func with retries on transient errors, taking the retries from
+    # the request's budget.
+    def retry(self, func, operation, description, req=None):
+        return self.retry_policy.call(func, operation, description,
+                                      req and req.retry_budget)
+
+    def get_shock_node(self, token, handle, file_type=None, req=None):
+        self.log('Getting shock node info via handle:\n' + pformat(handle))
 
         headers = {'Authorization': 'OAuth ' + token}
         node_url = handle['url'] + '/node/' + handle['id']
-        r = requests.get(node_url, headers=headers)
-        self.check_shock_response(r)
 
-        node_fn = r.json()['data']['file']['name']
+        def get():
+            r = requests.get(node_url, headers=headers,
+                             timeout=self.shock_timeout)
+            self.observe_shock_response('metadata', r)
+            self.check_shock_response(r)
+            return r
+        with self.stage('shock_metadata', req=req):
+            r = self.retry(get, 'shock_metadata',
+                           'Getting Shock node ' + handle['id'], req)
+
+        node_file = r.json()['data']['file']
+        node_fn = node_file['name']
 
         handle_fn = handle['file_name'] if 'file_name' in handle else None
 
@@ -164,19 +678,202 @@ Operational notes:
                  'Acceptable extensions: {}').format(
                     file_type, handle_fn, node_fn,
                     ' '.join(self.SUPPORTED_FILES)))
+        return ShockNode(node_url, headers, handle['id'], node_file['size'],
+                         gzipped, (node_file.get('checksum') or {}).get('md5'))
 
-        file_path = os.path.join(self.shock_temp, handle['id'] +
-                                 (self.GZIP if gzipped else ''))
-        with open(file_path, 'w') as fhandle:
+    def open_shock_stream(self, node):
+        r = requests.get(node.url + '?download', stream=True,
+                         headers=node.headers, timeout=self.shock_timeout)
+        self.observe_shock_response('download', r)
+        self.check_shock_response(r)
+        return r
+
+    # Waits for a download slot for the request. The slot must be released
+    # with self.downloads.release(user, req). Streams are nested since
+    # interleaving streams two files at once.
+    def acquire_download(self, req, nested=False):
+        user = req.user if req else None
+        self.m_download_wait.observe(self.downloads.acquire(
+            user, req, nested, self.download_priority(req)))
+        return user
+
+    # requests are interactive until their priority is known
+    def download_priority(self, req):
+        return (req and req.priority) or INTERACTIVE
+
+    # Failed downloads are restarted from the beginning.
+    def download_node(self, node, file_path, req=None):
+        with self.stage('shock_download', req=req, total=node.size) as s:
             self.log('downloading reads file: ' + str(file_path))
-            r = requests.get(node_url + '?download', stream=True,
-                             headers=headers)
-            self.check_shock_response(r)
-            for chunk in r.iter_content(1024):
-                if not chunk:
-                    break
-                fhandle.write(chunk)
-        return file_path, gzipped
+
+            def download():
+                s['read'] = 0
+                user = self.acquire_download(req)
+                try:
+                    with write_atomically(file_path) as fhandle:
+                        r = self.open_shock_stream(node)
+                        for chunk in r.iter_content(self.DOWNLOAD_CHUNK):
+                            if not chunk:
+                                break
+                            self.downloads.throttle(
+                                len(chunk), self.download_priority(req))
+                            fhandle.write(chunk)
+                            s['read'] += len(chunk)
+                            if req and req.progress:
+                                req.progress.update(s['read'])
+                finally:
+                    self.downloads.release(user, req)
+            self.retry(download, 'shock_download',
+                       'Downloading Shock node ' + node.id, req)
+            s['written'] = s['read']
+
+    # Returns the file path of the downloaded reads, or, if the request is
+    # streaming its input, the ShockNode to stream the reads from.
+    def shock_download(self, token, handle, file_type=None, req=None):
+        # Could keep a record of files downloaded to prevent duplicate
+        # downloads if 2 ws objects point to the same shock node, but that
+        # seems rare enough that it's not worth the extra code complexity and
+        # maintenance burden
+        self.log('Downloading from shock via handle:\n' + pformat(handle))
+        node = req.nodes.get(self.node_key(handle, file_type)) if req else None
+        if not node:
+            node = self.get_shock_node(token, handle, file_type, req)
+        if req and req.stream:
+            node.request = req
+            return node, node.gzipped
+        file_path = os.path.join((req and req.temp_dir) or self.shock_temp,
+                                 handle['id'] +
+                                 (self.GZIP if node.gzipped else ''))
+        if req:
+            req.files.add(file_path)
+            req.intermediates.add(file_path)
+        self.fetch_node(node, file_path, req)
+        return file_path, node.gzipped
+
+    # Shock nodes can't be changed, so the file depends only on the node.
+    def node_cache_key(self, node):
+        return json.dumps([node.url, node.md5])
+
+    # Gets the file for a Shock node from the staging area, the node cache, a
+    # peer, or Shock, in that order, and adds it to the node cache. Prefetches
+    # have already checked the staging area.
+    def fetch_node(self, node, file_path, req=None):
+        key = self.node_cache_key(node)
+        if not (req and req.prefetch) and self.link_cached_node(
+                self.staging, self.m_staging, 'staged', key, node,
+                file_path):
+            return
+        if self.link_cached_node(self.node_cache, self.m_node_cache,
+                                 'cached', key, node, file_path):
+            return
+        if not self.fetch_node_from_peers(node, key, file_path, req):
+            self.download_node(node, file_path, req)
+        self.cache_files(self.node_cache, key, [file_path])
+
+    # Links the file for a Shock node from a cache to file_path. Returns
+    # False if the cache doesn't have the file.
+    def link_cached_node(self, cache, metric, description, key, node,
+                         file_path):
+        if not cache.max_bytes:
+            return False
+        entry = cache.get(key)
+        if entry:
+            try:
+                os.link(entry[1].values()[0], file_path)
+                self.log('Using {} file for Shock node {}'.format(
+                    description, node.id))
+                metric.inc(result='hit')
+                return True
+            except OSError as e:  # the entry was evicted
+                self.log('Could not link {} Shock node: {}'.format(
+                    description, e))
+        metric.inc(result='miss')
+        return False
+
+    # Files from peers are checked against the size and checksum Shock
+    # reports for the node, so nodes without a checksum are never fetched
+    # from peers.
+    def fetch_node_from_peers(self, node, key, file_path, req=None):
+        if not self.peer_client or not node.md5:
+            return False
+        directory = tempfile.mkdtemp(dir=os.path.dirname(file_path))
+        try:
+            entry = self.fetch_from_peers(
+                'node', key, directory, lambda meta, paths: self.file_matches(
+                    paths.values()[0], node.size, node.md5), req)
+            if not entry:
+                return False
+            os.rename(entry[1].values()[0], file_path)
+            self.log('Got the file for Shock node {} from a peer'.format(
+                node.id))
+            return True
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def file_matches(self, path, size, md5):
+        return os.path.getsize(path) == size and self.md5(path) == md5
+
+    def md5(self, path):
+        h = hashlib.md5()
+        with open(path, 'rb') as f:
+            for buf in iter(lambda: f.read(self.COPY_BUFFER), ''):
+                h.update(buf)
+        return h.hexdigest()
+
+    # Downloads a cache entry from the first peer that has it into directory.
+    # Returns a tuple of the entry's metadata and a mapping of the names of
+    # the files to their paths, or None if no peer has the entry or
+    # verify(meta, paths) returns False for the entry.
+    def fetch_from_peers(self, cache, key, directory, verify, req=None):
+        with self.stage('peer_download', req=req) as s:
+            entry = self.peer_client.fetch(cache, FileCache.digest(key),
+                                           directory)
+            if entry:
+                s['read'] = s['written'] = self.file_sizes(
+                    entry[1].values())
+        result = 'hit' if entry else 'miss'
+        if entry and not verify(*entry):
+            self.log(('The {} cache entry from a peer does not match its ' +
+                      'size or checksum').format(cache))
+            entry = None
+            result = 'invalid'
+        self.m_peer_fetches.inc(cache=cache, result=result)
+        return entry
+
+    # Checks that the output files from a peer match the sizes and checksums
+    # recorded when they were converted. Outputs without checksums don't
+    # match.
+    def output_matches(self, meta, paths):
+        checksums = (meta or {}).get('checksums') or {}
+        return set(checksums) == set(paths) and all(
+            self.file_matches(p, *checksums[n]) for n, p in paths.items())
+
+    # Deletes a downloaded reads file once it's been converted. Streamed reads
+    # and files that have been moved to the output are ignored.
+    def remove_intermediate(self, req, path):
+        if not req or path not in req.intermediates:
+            return
+        req.intermediates.discard(path)
+        req.files.discard(path)
+        size = os.path.getsize(path)
+        self.log('Removing intermediate file ' + path)
+        os.remove(path)
+        self.m_intermediate_bytes.inc(size)
+
+    # the files being written or read by running conversions, which the
+    # scratch sweeper must not delete
+    def files_in_use(self):
+        with self._active_lock:
+            files = set().union(*[r.files for r in self._active])
+        return files | set(f + PARTIAL for f in files)
+
+    def track_files(self, req):
+        with self._active_lock:
+            self._active.add(req)
+
+    def untrack_files(self, req):
+        with self._active_lock:
+            self._active.discard(req)
 
     def make_ref(self, object_info):
         return str(object_info[6]) + '/' + str(object_info[0]) + \
@@ -204,40 +901,95 @@ Operational notes:
     def copy_field(self, source, field, target):
         target[field] = source.get(field)
 
+    # filepath may be a ShockNode if the input is streamed, in which case the
+    # download slot is held until the reader is closed.
+    def open_reads(self, filepath, isgz):
+        if isinstance(filepath, ShockNode):
+            req = filepath.request
+            user = self.acquire_download(req, True)
+            try:
+                # only opening the stream can be retried, as the reads that
+                # have been read can't be read again
+                r = self.retry(lambda: self.open_shock_stream(filepath),
+                               'shock_download',
+                               'Opening Shock node ' + filepath.id, req)
+            except:
+                self.downloads.release(user, req)
+                raise
+            return StreamReader(self.downloads.wrap(
+                r.raw, user, req, self.download_priority(req)), isgz)
+        return gzip.open(filepath, 'rb') if isgz else open(filepath, 'r')
+
+    def input_size(self, filepath):
+        if isinstance(filepath, ShockNode):
+            return filepath.size
+        return os.path.getsize(filepath)
+
+    # Shock nodes are keyed by the handle as well as the node ID since the
+    # file type, and therefore the compression, comes from the object.
+    def node_key(self, handle, file_type):
+        return (handle['url'], handle['id'], file_type)
+
     # this assumes that the FASTQ file is properly formatted, which it should
     # be if it's in KBase. Credit:
     # https://www.biostars.org/p/19446/#117160
-    def deinterleave(self, filepath, fwdpath, revpath):
+    def deinterleave(self, filepath, isgz, fwdwriter, revwriter,
+                     progress=None):
         self.log('Deinterleaving file {} to files {} and {}'.format(
-            filepath, fwdpath, revpath))
-        with open(filepath, 'r') as s:
-            with open(fwdpath, 'w') as f, open(revpath, 'w') as r:
-                for i, line in enumerate(s):
+            filepath, fwdwriter.paths, revwriter.paths))
+        with self.open_reads(filepath, isgz) as s:
+            record = []
+            for i, line in enumerate(s):
+                if progress and i % self.PROGRESS_LINES == 0:
+                    progress.update(self.disk_position(s))
+                record.append(line)
+                if i % 4 == 3:
                     if i % 8 < 4:
-                        f.write(line)
+                        fwdwriter.write(record)
                     else:
-                        r.write(line)
+                        revwriter.write(record)
+                    record = []
 
     # this assumes that the FASTQ files are properly formatted and matched,
     # which they should be if they're in KBase. Credit:
     # https://sourceforge.net/p/denovoassembler/ray-testsuite/ci/master/tree/scripts/interleave-fastq.py
-    def interleave(self, fwdpath, revpath, targetpath):
+    def interleave(self, fwdpath, fwdisgz, revpath, revisgz, writer,
+                   progress=None):
         self.log('Interleaving files {} and {} to {}'.format(
-            fwdpath, revpath, targetpath))
-        with open(targetpath, 'w') as t:
-            with open(fwdpath, 'r') as f, open(revpath, 'r') as r:
-                while True:
-                    line = f.readline()
-                    # since FASTQ cannot contain blank lines
-                    if not line or not line.strip():
-                        break
-                    t.write(line.strip() + '\n')
-
-                    for _ in xrange(3):
-                        t.write(f.readline().strip() + '\n')
-
-                    for _ in xrange(4):
-                        t.write(r.readline().strip() + '\n')
+            fwdpath, revpath, writer.paths))
+        with self.open_reads(fwdpath, fwdisgz) as f, \
+                self.open_reads(revpath, revisgz) as r:
+            for i in itertools.count():
+                if progress and i % (self.PROGRESS_LINES // 8) == 0:
+                    progress.update(self.disk_position(f) +
+                                    self.disk_position(r))
+                line = f.readline()
+                # since FASTQ cannot contain blank lines
+                if not line or not line.strip():
+                    break
+                pair = [line.strip() + '\n']
+
+                for _ in xrange(3):
+                    pair.append(f.readline().strip() + '\n')
+
+                for _ in xrange(4):
+                    pair.append(r.readline().strip() + '\n')
+                writer.write(pair)
+
+    # lines is the number of lines that must be kept together in the same
+    # file - 4 for a FASTQ record, 8 for an interleaved pair of records
+    def split(self, filepath, isgz, writer, lines, progress=None):
+        self.log('Splitting file {} to files {}'.format(
+            filepath, writer.paths))
+        with self.open_reads(filepath, isgz) as s:
+            record = []
+            for i, line in enumerate(s):
+                if progress and i % self.PROGRESS_LINES == 0:
+                    progress.update(self.disk_position(s))
+                record.append(line)
+                if len(record) == lines:
+                    writer.write(record)
+                    record = []
 
     def set_up_reads_return(self, single, kbasefile, reads):
         data = reads['data']
@@ -283,10 +1035,15 @@ Operational notes:
     def get_file_prefix(self):
         return os.path.join(self.scratch, str(uuid.uuid4()))
 
+    # If info_only is True, returns the ShockNode for the reads rather than
+    # downloading them.
     def get_shock_data_and_handle_errors(
-            self, source_obj_ref, source_obj_name, token, handle, file_type):
+            self, source_obj_ref, source_obj_name, token, handle, file_type,
+            req=None, info_only=False):
         try:
-            return self.shock_download(token, handle, file_type)
+            if info_only:
+                return self.get_shock_node(token, handle, file_type, req)
+            return self.shock_download(token, handle, file_type, req)
         except (ShockError, InvalidFileError) as e:
             msg = ('Error downloading reads for object {} ({}) from ' +
                    'Shock node {}: ').format(
@@ -297,125 +1054,300 @@ Operational notes:
                 e.message = msg + e.message
             raise
 
+    def get_output_paths(self, prefix, suffix, gzipped, req):
+        ext = '.' + (self.FASTA if req.fasta else self.FASTQ) + \
+            (self.GZIP if gzipped else '')
+        if req.chunks is None:
+            paths = [prefix + suffix + ext]
+        else:
+            paths = [prefix + suffix + '.' + str(i) + ext
+                     for i in xrange(req.chunks)]
+        req.files.update(paths)
+        return paths
+
+    def set_output_files(self, ret, key, paths, gzipped, chunks):
+        if chunks is None:
+            ret[key] = paths[0]
+        else:
+            ret[key + '_chunks'] = paths
+        ret[key + '_gz'] = self.bool_outgoing(gzipped)
+
+    # handles output for a reads file that doesn't need to be interleaved or
+    # deinterleaved
+    def process_file(self, shockfile, isgz, req, prefix, key, lines, ret):
+        if req.chunks is None and not req.fasta:
+            ret[key], ret[key + '_gz'] = self.handle_gzip(
+                shockfile, req.gzip, isgz, prefix + '.' + key + '.fastq', req)
+            return
+        outgz = isgz if req.gzip is None else req.gzip
+        paths = self.get_output_paths(prefix, '.' + key, outgz, req)
+        with self.stage('split', self.input_size(shockfile), req) as s:
+            with ReadsWriter(paths, outgz, req.fasta) as w:
+                self.split(shockfile, isgz, w, lines, req.progress)
+            s['written'] = self.file_sizes(paths)
+        self.remove_intermediate(req, shockfile)
+        self.set_output_files(ret, key, paths, outgz, req.chunks)
+
     # there's got to be better way to do this than these processing methods.
-    # make some input classes for starters to fix these gross method sigs
 
-    def process_interleaved(self, source_obj_ref, source_obj_name, token,
-                            handle, gzip, interleave, file_type=None):
+    def process_interleaved(self, source_obj_ref, source_obj_name, req,
+                            handle, file_type=None):
 
         shockfile, isgz = self.get_shock_data_and_handle_errors(
-            source_obj_ref, source_obj_name, token, handle, file_type)
+            source_obj_ref, source_obj_name, req.token, handle, file_type,
+            req)
 
         ret = {}
-        if interleave is not False:  # e.g. True or None
-            ret['inter'], ret['inter_gz'] = self.handle_gzip(
-                shockfile, gzip, isgz, self.get_file_prefix() + '.inter.fastq')
+        prefix = self.get_file_prefix()
+        if req.interleave is not False:  # e.g. True or None
+            self.process_file(shockfile, isgz, req, prefix, 'inter', 8, ret)
         else:
-            if isgz:
-                # we expect the job runner to clean up for us
-                shockfile = self.gunzip(shockfile)
-            fwdpath = os.path.join(self.scratch, self.get_file_prefix() +
-                                   '.fwd.fastq')
-            revpath = os.path.join(self.scratch, self.get_file_prefix() +
-                                   '.rev.fastq')
-            self.deinterleave(shockfile, fwdpath, revpath)
-            if gzip:
-                fwdpath = self.gzip(fwdpath)
-                revpath = self.gzip(revpath)
-            gzip = self.bool_outgoing(gzip)
-            ret['fwd'] = fwdpath
-            ret['fwd_gz'] = gzip
-            ret['rev'] = revpath
-            ret['rev_gz'] = gzip
+            fwdpaths = self.get_output_paths(prefix, '.fwd', req.gzip, req)
+            revpaths = self.get_output_paths(prefix, '.rev', req.gzip, req)
+            with self.stage('deinterleave', self.input_size(shockfile),
+                            req) as s:
+                with ReadsWriter(fwdpaths, req.gzip, req.fasta) as f, \
+                        ReadsWriter(revpaths, req.gzip, req.fasta) as r:
+                    self.deinterleave(shockfile, isgz, f, r, req.progress)
+                s['written'] = self.file_sizes(fwdpaths + revpaths)
+            self.remove_intermediate(req, shockfile)
+            self.set_output_files(ret, 'fwd', fwdpaths, req.gzip, req.chunks)
+            self.set_output_files(ret, 'rev', revpaths, req.gzip, req.chunks)
         return ret
 
-    def process_paired(self, source_obj_ref, source_obj_name, token,
-                       fwdhandle, revhandle, gzip, interleave,
-                       fwd_file_type=None, rev_file_type=None):
+    def process_paired(self, source_obj_ref, source_obj_name, req,
+                       fwdhandle, revhandle, fwd_file_type=None,
+                       rev_file_type=None):
 
         fwdshock, fwdisgz = self.get_shock_data_and_handle_errors(
-            source_obj_ref, source_obj_name, token, fwdhandle, fwd_file_type)
+            source_obj_ref, source_obj_name, req.token, fwdhandle,
+            fwd_file_type, req)
         revshock, revisgz = self.get_shock_data_and_handle_errors(
-            source_obj_ref, source_obj_name, token, revhandle, rev_file_type)
+            source_obj_ref, source_obj_name, req.token, revhandle,
+            rev_file_type, req)
 
         ret = {}
-        if interleave:
-            # we expect the job runner to clean up for us
-            if fwdisgz:
-                fwdshock = self.gunzip(fwdshock)
-            if revisgz:
-                revshock = self.gunzip(revshock)
-            intpath = os.path.join(self.scratch, self.get_file_prefix() +
-                                   '.inter.fastq')
-            self.interleave(fwdshock, revshock, intpath)
-            if gzip:
-                intpath = self.gzip(intpath)
-            ret['inter'] = intpath
-            ret['inter_gz'] = self.bool_outgoing(gzip)
+        prefix = self.get_file_prefix()
+        if req.interleave:
+            intpaths = self.get_output_paths(prefix, '.inter', req.gzip, req)
+            with self.stage('interleave', self.input_size(fwdshock) +
+                            self.input_size(revshock), req) as s:
+                with ReadsWriter(intpaths, req.gzip, req.fasta) as w:
+                    self.interleave(fwdshock, fwdisgz, revshock, revisgz, w,
+                                    req.progress)
+                s['written'] = self.file_sizes(intpaths)
+            self.remove_intermediate(req, fwdshock)
+            self.remove_intermediate(req, revshock)
+            self.set_output_files(
+                ret, 'inter', intpaths, req.gzip, req.chunks)
         else:
-            ret['fwd'], ret['fwd_gz'] = self.handle_gzip(
-                fwdshock, gzip, fwdisgz, self.get_file_prefix() + '.fwd.fastq')
-
-            ret['rev'], ret['rev_gz'] = self.handle_gzip(
-                revshock, gzip, revisgz, self.get_file_prefix() + '.rev.fastq')
+            # the forward and reverse files are split identically, so the
+            # nth chunks contain matching reads
+            self.process_file(fwdshock, fwdisgz, req, prefix, 'fwd', 4, ret)
+            self.process_file(revshock, revisgz, req, prefix, 'rev', 4, ret)
         return ret
 
-    def process_single_end(self, source_obj_ref, source_obj_name, token,
-                           handle, gzip, file_type=None):
+    def process_single_end(self, source_obj_ref, source_obj_name, req,
+                           handle, file_type=None):
 
         shockfile, isgz = self.get_shock_data_and_handle_errors(
-            source_obj_ref, source_obj_name, token, handle, file_type)
-        f, iszip = self.handle_gzip(shockfile, gzip, isgz,
-                                    self.get_file_prefix() + '.sing.fastq')
-        return {'sing': f, 'sing_gz': iszip}
+            source_obj_ref, source_obj_name, req.token, handle, file_type,
+            req)
+        ret = {}
+        self.process_file(shockfile, isgz, req, self.get_file_prefix(),
+                          'sing', 4, ret)
+        return ret
 
     # there's almost certainly a better way to do this
-    def handle_gzip(self, oldfile, shouldzip, iszip, prefix):
+    def handle_gzip(self, oldfile, shouldzip, iszip, prefix, req=None):
+        if isinstance(oldfile, ShockNode):
+            return self.handle_gzip_stream(oldfile, shouldzip, iszip, prefix,
+                                           req)
         zipped = False
+        if req:
+            # the output file name depends on the compression chosen below
+            req.files.add(os.path.join(self.scratch, prefix + self.GZIP))
+            req.files.add(os.path.join(self.scratch, prefix))
         if shouldzip:
             prefix += self.GZIP
             zipped = True
             if iszip:
-                self.mv(oldfile, os.path.join(self.scratch, prefix))
+                self.mv(oldfile, os.path.join(self.scratch, prefix), req)
             else:
-                self.gzip(oldfile, os.path.join(self.scratch, prefix))
+                self.gzip(oldfile, os.path.join(self.scratch, prefix), req)
         elif shouldzip is None:
             if iszip:
                 prefix += self.GZIP
                 zipped = True
-            self.mv(oldfile, os.path.join(self.scratch, prefix))
+            self.mv(oldfile, os.path.join(self.scratch, prefix), req)
         else:
             if iszip:
-                self.gunzip(oldfile, os.path.join(self.scratch, prefix))
+                self.gunzip(oldfile, os.path.join(self.scratch, prefix), req)
             else:
-                self.mv(oldfile, os.path.join(self.scratch, prefix))
+                self.mv(oldfile, os.path.join(self.scratch, prefix), req)
+        self.remove_intermediate(req, oldfile)
         return prefix, self.bool_outgoing(zipped)
 
-    def mv(self, oldfile, newfile):
-        self.log('Moving {} to {}'.format(oldfile, newfile))
-        shutil.move(oldfile, newfile)
+    # converts the compression while streaming the file from Shock
+    def handle_gzip_stream(self, node, shouldzip, iszip, prefix, req=None):
+        zipped = iszip if shouldzip is None else shouldzip
+        if zipped:
+            prefix += self.GZIP
+        newfile = os.path.join(self.scratch, prefix)
+        if req:
+            req.files.add(newfile)
+        if zipped == iszip:
+            self.download_node(node, newfile, req)
+        else:
+            with self.stage('gzip' if zipped else 'gunzip', node.size,
+                            req) as st:
+                with self.open_reads(node, iszip) as s, write_atomically(
+                        newfile, gzip.open if zipped else open) as t:
+                    self.copy(s, t, req and req.progress)
+                st['written'] = os.path.getsize(newfile)
+        return prefix, self.bool_outgoing(zipped)
 
-    def gzip(self, oldfile, newfile=None):
+    def mv(self, oldfile, newfile, req=None):
+        self.log('Moving {} to {}'.format(oldfile, newfile))
+        size = os.path.getsize(oldfile)
+        with self.stage('mv', size, req) as s:
+            shutil.move(oldfile, newfile)
+            s['written'] = size
+        if req:
+            req.intermediates.discard(oldfile)
+            req.files.discard(oldfile)
+
+    def gzip(self, oldfile, newfile=None, req=None):
         if oldfile.lower().endswith(self.GZIP):
             raise ValueError('File {} is already gzipped'.format(oldfile))
         if not newfile:
             newfile = oldfile + self.GZIP
         self.log('gzipping {} to {}'.format(oldfile, newfile))
-        with open(oldfile, 'rb') as s, gzip.open(newfile, 'wb') as t:
-            shutil.copyfileobj(s, t)
+        with self.stage('gzip', os.path.getsize(oldfile), req) as st:
+            with open(oldfile, 'rb') as s, \
+                    write_atomically(newfile, gzip.open) as t:
+                self.copy(s, t, req and req.progress)
+            st['written'] = os.path.getsize(newfile)
         return newfile
 
-    def gunzip(self, oldfile, newfile=None):
+    def gunzip(self, oldfile, newfile=None, req=None):
         if not oldfile.lower().endswith(self.GZIP):
             raise ValueError('File {} is not gzipped'.format(oldfile))
         if not newfile:
             newfile = oldfile[: -len(self.GZIP)]
         self.log('gunzipping {} to {}'.format(oldfile, newfile))
-        with gzip.open(oldfile, 'rb') as s, open(newfile, 'wb') as t:
-            shutil.copyfileobj(s, t)
+        with self.stage('gunzip', os.path.getsize(oldfile), req) as st:
+            with gzip.open(oldfile, 'rb') as s, \
+                    write_atomically(newfile) as t:
+                self.copy(s, t, req and req.progress)
+            st['written'] = os.path.getsize(newfile)
         return newfile
 
-    def process_reads(self, reads, gzip, interleave, token):
+    # Returns a list of (handle, file type) tuples for the reads files in a
+    # reads object, with the forward reads first for paired end reads.
+    def get_reads_handles(self, data, single, kbasefile):
+        # lib1 = KBaseFile, handle_1 = KBaseAssembly
+        if kbasefile:
+            libs = ['lib'] if single else ['lib1', 'lib2']
+            return [(data[l]['file'], data[l]['type'])
+                    for l in libs if l in data]
+        handles = ['handle'] if single else ['handle_1', 'handle_2']
+        return [(data[h], None) for h in handles if h in data]
+
+    # Checks the reads objects and gets the Shock node for each reads file
+    # before anything is downloaded. Returns the estimated peak scratch space
+    # use of the downloaded reads, a mapping of the coalesce keys of the
+    # libraries to the estimated sizes of their outputs, and the total size
+    # of the reads to download. The outputs of all the libraries are kept,
+    # but downloaded files are deleted once the library is converted. The
+    # outputs are keyed so that a library's output is only reserved once
+    # when concurrent conversions coalesce.
+    #
+    # Read libraries that fail to be planned are left out of the estimate if
+    # the request continues on failure.
+    def plan_conversion(self, reads, req):
+        downloads = 0
+        size = 0
+        outputs = {}
+        for ref, read in reads:
+            if self.library_has_failed(req, ref):
+                continue
+            if req.stats:
+                req.stats.set_library(ref)
+            try:
+                libdownloads, libout = self.plan_library(read, req)
+            except Exception as e:
+                if req.errors is None:
+                    raise
+                self.library_failed(req, ref, e)
+                continue
+            downloads = max(downloads, libdownloads)
+            size += libdownloads
+            if libout:
+                outputs[self.coalesce_key(ref, req)] = int(libout)
+        return int(downloads), outputs, size
+
+    # Returns the size of the reads to download for a library and the
+    # estimated size of its output. Both are 0 if the output is in the
+    # local output cache, since it's linked rather than converted.
+    def plan_library(self, read, req):
+        single, kbasefile = self.check_reads(read)
+        ref = self.make_ref(read['info'])
+        files = self.get_reads_handles(read['data'], single, kbasefile)
+        # interleaving and deinterleaving only write gzipped files if
+        # requested
+        transform = ((len(files) > 1 and req.interleave) or
+                     (not single and len(files) == 1 and
+                      req.interleave is False))
+        downloads = 0
+        out = 0
+        for handle, file_type in files:
+            node = self.get_shock_data_and_handle_errors(
+                ref, read['info'][1], req.token, handle, file_type, req,
+                True)
+            req.nodes[self.node_key(handle, file_type)] = node
+            raw = node.size * self.gzip_ratio if node.gzipped \
+                else node.size
+            outgz = bool(req.gzip) if transform else (
+                node.gzipped if req.gzip is None else req.gzip)
+            out += raw / self.gzip_ratio if outgz else raw
+            downloads += node.size
+        key = self.output_cache_key(req, single, files)
+        if key and self.output_cache.contains(key):
+            return 0, 0
+        return downloads, out
+
+    def library_has_failed(self, req, ref):
+        return req.errors is not None and ref in req.errors
+
+    # Records the error for a read library that failed to convert when the
+    # request continues on failure.
+    def library_failed(self, req, ref, error):
+        self.log('Converting read library {} failed: {}: {}'.format(
+            ref, type(error).__name__, error))
+        self.m_library_errors.inc(type=type(error).__name__)
+        req.errors[ref] = error
+
+    # Deletes the files a failed read library conversion wrote to scratch so
+    # the space is available to the rest of the conversion.
+    def remove_outputs(self, req, paths):
+        for path in paths:
+            req.files.discard(path)
+            req.intermediates.discard(path)
+            for p in [path, path + PARTIAL]:
+                try:
+                    os.remove(p)
+                except OSError as e:
+                    if e.errno != errno.ENOENT:
+                        self.log('Could not delete {}: {}'.format(p, e))
+
+    def error_output(self, error):
+        return {'error': str(error),
+                'type': type(error).__name__,
+                'transient': self.bool_outgoing(is_transient(error))
+                }
+
+    def process_reads(self, reads, req):
         data = reads['data']
         info = reads['info']
         # Object Info Contents
@@ -437,41 +1369,455 @@ Operational notes:
         ref = ret['ref']
         self.log('Type: ' + info[2])
 
-        # lib1 = KBaseFile, handle_1 = KBaseAssembly
-        if kbasefile:
-            if single:
-                reads = data['lib']['file']
-                type_ = data['lib']['type']
-                ret['files'] = self.process_single_end(
-                    ref, obj_name, token, reads, gzip, type_)
+        files = self.get_reads_handles(data, single, kbasefile)
+        key = self.output_cache_key(req, single, files)
+        cached = self.get_cached_output(key, req) if key else None
+        if cached:
+            self.log('Using cached output for read library ' + ref)
+            ret['files'] = cached
+        else:
+            ret['files'] = self.coalesce(ref, req, lambda: self.cache_output(
+                key, self.process_files(ref, obj_name, req, single, files)))
+        return ret
+
+    def process_files(self, ref, obj_name, req, single, files):
+        if single:
+            return self.process_single_end(ref, obj_name, req, *files[0])
+        elif len(files) > 1:  # not interleaved
+            (fwd_reads, fwd_type), (rev_reads, rev_type) = files
+            return self.process_paired(
+                ref, obj_name, req, fwd_reads, rev_reads, fwd_type, rev_type)
+        else:
+            return self.process_interleaved(ref, obj_name, req, *files[0])
+
+    # Runs convert() to convert the files for a read library, unless another
+    # request is converting the same library with the same options, in which
+    # case this request waits for it and hard links its output files instead.
+    # ref must be an absolute reference.
+    def coalesce(self, ref, req, convert):
+        files, shared = self.coalescer.run(
+            self.coalesce_key(ref, req), convert, lambda files: self.link_files(files, req))
+        if shared:
+            self.log('Linked the output of a concurrent conversion of ' + ref)
+            self.m_coalesced.inc()
+        return files
+
+    def coalesce_key(self, ref, req):
+        return json.dumps([ref, req.gzip, req.interleave, req.chunks,
+                           req.fasta])
+
+    # Returns a copy of the files for a converted read library with func
+    # applied to each path.
+    def map_paths(self, files, func):
+        ret = {}
+        for key, value in files.items():
+            if key.endswith('_gz'):
+                ret[key] = value
+            elif isinstance(value, list):
+                ret[key] = [func(p) for p in value]
             else:
-                fwd_reads = data['lib1']['file']
-                fwd_type = data['lib1']['type']
-                if 'lib2' in data:  # not interleaved
-                    rev_reads = data['lib2']['file']
-                    rev_type = data['lib2']['type']
-                    ret['files'] = self.process_paired(
-                        ref, obj_name, token, fwd_reads, rev_reads, gzip,
-                        interleave, fwd_type, rev_type)
-                else:
-                    ret['files'] = self.process_interleaved(
-                        ref, obj_name, token, fwd_reads, gzip, interleave,
-                        fwd_type)
-        else:  # KBaseAssembly
-            if single:
-                ret['files'] = self.process_single_end(
-                    ref, obj_name, token, data['handle'], gzip)
+                ret[key] = func(value)
+        return ret
+
+    def output_paths(self, files):
+        paths = []
+        self.map_paths(files, paths.append)
+        return paths
+
+    # Hard links the output files of another conversion, or from the output
+    # cache, to new output files for the request. The files are shared, so
+    # callers must replace rather than modify them, as the spec documents.
+    def link_files(self, files, req):
+        prefix = self.get_file_prefix()
+        linked = []
+
+        def link(path):
+            # keep the suffix, e.g. .fwd.0.fastq.gz
+            newpath = prefix + '.' + os.path.basename(path).split('.', 1)[1]
+            req.files.add(newpath)
+            linked.append(newpath)
+            os.link(path, newpath)
+            # so the scratch sweeper treats the file as new
+            os.utime(newpath, None)
+            return newpath
+        try:
+            return self.map_paths(files, link)
+        except Exception:
+            self.remove_outputs(req, linked)
+            raise
+
+    # The key for the converted output of a read library in the output cache,
+    # or None if the cache is disabled or the Shock nodes for the library are
+    # unknown. Shock nodes can't be changed, so the output depends only on
+    # the nodes and the conversion options.
+    def output_cache_key(self, req, single, files):
+        if not self.output_cache.max_bytes:
+            return None
+        nodes = [req.nodes.get(self.node_key(handle, file_type))
+                 for handle, file_type in files]
+        if not all(nodes):
+            return None
+        return json.dumps([single, [[n.url, n.md5, n.gzipped] for n in nodes],
+                           req.gzip, req.interleave, req.chunks, req.fasta])
+
+    # Returns the output files for the request linked from the output cache,
+    # or None if the output isn't cached.
+    # Outputs that aren't cached locally are fetched from peers if possible.
+    def get_cached_output(self, key, req):
+        entry = self.output_cache.get(key)
+        result = 'hit'
+        directory = None
+        try:
+            if not entry and self.peer_client:
+                directory = tempfile.mkdtemp(
+                    dir=req.temp_dir or self.shock_temp)
+                entry = self.fetch_from_peers('output', key, directory,
+                                              self.output_matches, req)
+                result = 'peer'
+            # entries cached before checksums were recorded have no files
+            # key
+            if entry and 'files' in (entry[0] or {}):
+                meta, paths = entry
+                names = meta['files']
+                try:
+                    files = self.link_files(
+                        self.map_paths(names, lambda n: paths[n]), req)
+                    if directory:
+                        self.cache_files(self.output_cache, key,
+                                         paths.values(), meta)
+                    self.m_output_cache.inc(result=result)
+                    return files
+                except OSError as e:  # the entry was evicted
+                    self.log('Could not link cached output: ' + str(e))
+        finally:
+            if directory:
+                shutil.rmtree(directory, ignore_errors=True)
+        self.m_output_cache.inc(result='miss')
+        return None
+
+    # Adds the output files for a read library to the output cache and
+    # returns them. If the output cache is shared with peers, the sizes and
+    # checksums of the files are recorded so peers can check them.
+    def cache_output(self, key, files):
+        if key:
+            paths = self.output_paths(files)
+            checksums = {os.path.basename(p): [os.path.getsize(p),
+                                               self.md5(p)]
+                         for p in paths} if self.peer_server else None
+            self.cache_files(self.output_cache, key, paths, {
+                'files': self.map_paths(files, os.path.basename),
+                'checksums': checksums})
+        return files
+
+    # Failing to cache files doesn't fail the conversion.
+    def cache_files(self, cache, key, paths, meta=None):
+        try:
+            cache.put(key, paths, meta)
+        except (IOError, OSError) as e:
+            self.log('Could not cache {}: {}'.format(', '.join(paths), e))
+
+    # Absolute references always point to the same data, so the data can be
+    # cached. The cache is keyed by the token as well as the reference so
+    # that objects are only returned from the cache to users that have
+    # already successfully read them from the workspace.
+    #
+    # If errors is provided, objects that can't be fetched are None in the
+    # returned list and their errors are added to errors. If fetched, a
+    # mapping of absolute references to objects already fetched for the
+    # request, is provided, those objects are removed from it and returned
+    # rather than fetched again.
+    def get_reads_objects(self, ws, token, refs, budget=None, errors=None,
+                          stats=None, fetched=None):
+        objs = {}
+        fetch = []
+        for ref in refs:
+            obj = fetched.pop(ref, None) if fetched else None
+            if obj:
+                objs[ref] = obj
+                continue
+            if self.ABS_REF.match(ref):
+                obj = self.ws_cache.get(self.ws_cache_key(token, ref))
+            if obj:
+                self.log('Using cached workspace data for object ' + ref)
+                objs[ref] = copy.deepcopy(obj)
             else:
-                if 'handle_2' in data:  # not interleaved
-                    ret['files'] = self.process_paired(
-                        ref, obj_name, token, data['handle_1'],
-                        data['handle_2'], gzip, interleave)
-                else:
-                    ret['files'] = self.process_interleaved(
-                        ref, obj_name, token, data['handle_1'], gzip,
-                        interleave)
+                fetch.append(ref)
+        if not fetch:
+            return [objs[ref] for ref in refs]
 
-        return ret
+        try:
+            reads = self.fetch_reads_objects(ws, fetch, budget, stats)
+        except Exception as e:
+            if errors is None:
+                raise
+            if len(fetch) == 1:
+                errors[fetch[0]] = e
+                reads = [None]
+            else:
+                # fetch the objects one at a time to find the ones that fail
+                reads = []
+                for ref in fetch:
+                    try:
+                        reads.extend(self.fetch_reads_objects(ws, [ref],
+                                                              budget, stats))
+                    except Exception as e:
+                        errors[ref] = e
+                        reads.append(None)
+        for ref, obj in zip(fetch, reads):
+            if obj is None:
+                continue
+            if self.ABS_REF.match(ref):
+                self.ws_cache.put(self.ws_cache_key(token, ref),
+                                  copy.deepcopy(obj))
+            objs[ref] = obj
+        return [objs.get(ref) for ref in refs]
+
+    def ws_cache_key(self, token, ref):
+        return hashlib.sha256(token or '').hexdigest(), ref
+
+    def fetch_reads_objects(self, ws, refs, budget=None, stats=None):
+        ws_reads_ids = []
+        for ref in refs:
+            ws_reads_ids.append({'ref': ref,
+                                 'included': self.INCLUDED_PATHS})
+        try:
+            with self.stage('ws_fetch', stats=stats):
+                return self.retry_policy.call(
+                    lambda: ws.get_objects2({'objects': ws_reads_ids}),
+                    'ws_fetch', 'Getting reads objects from the workspace',
+                    budget)['data']
+        except WorkspaceException as e:
+            self.log('Logging stacktrace from workspace exception:\n' + e.data)
+            raise
+
+    # Returns a mapping of each reference to the absolute reference of the
+    # object it points to. Absolute references map to themselves. The other
+    # references are resolved from the info of their reads objects. If
+    # fetched is provided, those objects are added to it keyed by their
+    # absolute references, so that passing it to iter_reads_objects() avoids
+    # fetching them again. If errors is provided, references that can't be
+    # resolved are left out of the mapping and their errors are added to
+    # errors.
+    def resolve_refs(self, ws, token, refs, budget=None, errors=None,
+                     stats=None, fetched=None):
+        absrefs = {ref: ref for ref in refs if self.ABS_REF.match(ref)}
+        relrefs = [ref for ref in refs if ref not in absrefs]
+        bs = self.ws_batch_size
+        for i in xrange(0, len(relrefs), bs):
+            batch = relrefs[i:i + bs]
+            objs = self.get_reads_objects(ws, token, batch, budget, errors,
+                                          stats)
+            for ref, obj in zip(batch, objs):
+                if obj:
+                    absrefs[ref] = self.make_ref(obj['info'])
+                    if fetched is not None:
+                        fetched[absrefs[ref]] = obj
+        return absrefs
+
+    # Fetches the reads objects in batches, yielding (ref, object) tuples.
+    # The next batch is fetched in the background while the current batch
+    # is processed, which bounds memory use and allows conversions to start
+    # before all the objects have been fetched. If errors is provided, the
+    # object is None for objects that can't be fetched and their errors are
+    # added to errors. Objects in fetched are used rather than fetched again,
+    # see get_reads_objects().
+    def iter_reads_objects(self, ws, token, refs, budget=None, errors=None,
+                           stats=None, fetched=None):
+        bs = self.ws_batch_size
+        batches = [refs[i:i + bs] for i in xrange(0, len(refs), bs)]
+        if len(batches) == 1:
+            for ref, obj in zip(refs, self.get_reads_objects(
+                    ws, token, refs, budget, errors, stats, fetched)):
+                yield ref, obj
+            return
+
+        q = Queue.Queue(maxsize=1)
+        done = threading.Event()
+
+        def fetch():
+            for batch in batches:
+                try:
+                    item = (batch,
+                            self.get_reads_objects(ws, token, batch, budget,
+                                                   errors, stats, fetched),
+                            None)
+                except Exception as e:
+                    item = (batch, None, e)
+                # don't block forever if the consumer has gone away
+                while not done.is_set():
+                    try:
+                        q.put(item, timeout=1)
+                        break
+                    except Queue.Full:
+                        pass
+                if item[2] or done.is_set():
+                    return
+
+        t = threading.Thread(target=fetch, name='ws_fetch')
+        t.daemon = True
+        t.start()
+        try:
+            for _ in batches:
+                batch, objs, err = q.get()
+                if err:
+                    raise err
+                for ref, obj in zip(batch, objs):
+                    yield ref, obj
+        finally:
+            done.set()
+
+    # Converts the reads objects in reads, an iterable of (absolute ref,
+    # object) tuples. names maps the refs to the names the user gave them.
+    # Returns the converted files keyed by ref. All the files for the request
+    # are written to a temporary directory of its own or to new, uniquely
+    # named output files, so requests can safely run concurrently.
+    #
+    # If the request continues on failure, the read libraries that fail,
+    # including those already in req.errors, are left out of the returned
+    # files and their errors are in req.errors.
+    #
+    # The reads are converted in batches of up to ws-batch-size libraries as
+    # they arrive, so the workspace fetch of the next batch overlaps the
+    # conversion of the current one. Each batch is planned, prioritized, and
+    # admitted to scratch separately.
+    def convert_reads(self, reads, names, req):
+        output = {}
+        self.track_files(req)
+        req.temp_dir = tempfile.mkdtemp(dir=self.shock_temp)
+        try:
+            reads = iter(reads)
+            while True:
+                batch = list(itertools.islice(reads, self.ws_batch_size))
+                if not batch:
+                    break
+                self.convert_batch(batch, names, req, output)
+        except Exception as e:
+            self.progress.finish(req.progress, str(e))
+            raise
+        finally:
+            # removes any leftovers from a failed conversion
+            shutil.rmtree(req.temp_dir, ignore_errors=True)
+            self.untrack_files(req)
+        self.progress.finish(req.progress)
+        return output
+
+    # Converts a list of (absolute ref, object) tuples and adds the converted
+    # files to output. The sizes of all the reads files in the batch are
+    # needed up front to check there's enough scratch space.
+    def convert_batch(self, reads, names, req, output):
+        reserved = 0
+        outputs = None
+        slot = None
+        try:
+            downloads, planned, size = self.plan_conversion(reads, req)
+            if req.stats:
+                req.stats.set_library(None)
+            slot = self.admit_priority(req, size)
+            stream_need = sum(planned.values())
+            self.log(('Estimated peak scratch use: {} bytes, or {} bytes if ' +
+                      'streaming the reads').format(
+                          downloads + stream_need, stream_need))
+            reserved, req.stream = self.scratch_planner.admit(
+                downloads, 0, planned)
+            outputs = planned
+            if req.stream:
+                self.log('Not enough scratch space to download the reads, ' +
+                         'streaming them instead')
+            for ref, read in reads:
+                if self.library_has_failed(req, ref):
+                    req.progress.finish_library()
+                    continue
+                self.log('=== processing read library {} ({}) ===\n'
+                         .format(ref, ', '.join(names[ref])),
+                         prefix_newline=True)
+                if req.stats:
+                    req.stats.set_library(ref)
+                files = set(req.files)
+                try:
+                    output[ref] = self.process_reads(read, req)
+                except Exception as e:
+                    if req.errors is None:
+                        raise
+                    self.library_failed(req, ref, e)
+                    self.remove_outputs(req, req.files - files)
+                else:
+                    self.m_libraries.inc()
+                    self.library_rate.add()
+                req.progress.finish_library()
+        finally:
+            # the outputs are on disk once converted, and the free space
+            # accounts for them
+            self.scratch_planner.release(reserved, outputs)
+            self.batch_slots.release(slot)
+
+    # Sets the priority of a request that doesn't have one from size, the
+    # size of the reads the batch downloads, and waits for a slot for batch
+    # requests. Returns the slot, which must be released.
+    def admit_priority(self, req, size):
+        if req.infer_priority:
+            req.priority = BATCH if size > self.interactive_max_bytes \
+                else INTERACTIVE
+        self.log('Conversion priority: ' + req.priority)
+        self.m_priorities.inc(priority=req.priority)
+        if req.priority != BATCH:
+            return None
+        with self.stage('batch_queue', req=req):
+            try:
+                return self.batch_slots.acquire()
+            except SlotTimeoutError as e:
+                raise SlotTimeoutError(
+                    'Too many batch conversions are running. ' + str(e))
+
+    # Downloads the reads files for the reads objects at refs, a list of
+    # absolute references, to the staging area. Runs in the background, so
+    # failures are logged rather than raised.
+    def prefetch(self, token, user, refs, fetched=None):
+        ws = workspaceService(self.workspaceURL, token=token)
+        req = ConversionRequest(token, None, None, None, False, user=user,
+                                retry_budget=self.retry_policy.new_budget(),
+                                prefetch=True)
+        errors = {}
+        self.track_files(req)
+        req.temp_dir = tempfile.mkdtemp(dir=self.shock_temp)
+        try:
+            for ref, read in self.iter_reads_objects(
+                    ws, token, refs, req.retry_budget, errors,
+                    fetched=fetched):
+                try:
+                    if read is None:
+                        raise errors[ref]
+                    self.prefetch_library(read, req)
+                except Exception as e:
+                    self.log('Prefetching read library {} failed: {}: {}'
+                             .format(ref, type(e).__name__, e))
+                    self.m_prefetched.inc(result='error')
+                else:
+                    self.m_prefetched.inc(result='staged')
+        finally:
+            shutil.rmtree(req.temp_dir, ignore_errors=True)
+            self.untrack_files(req)
+            self.staging.evict()
+
+    def prefetch_library(self, read, req):
+        single, kbasefile = self.check_reads(read)
+        for handle, file_type in self.get_reads_handles(
+                read['data'], single, kbasefile):
+            # also checks the user can read the node
+            node = self.get_shock_node(req.token, handle, file_type, req)
+            key = self.node_cache_key(node)
+            if self.staging.get(key):
+                self.log('Shock node {} is already staged'.format(node.id))
+                continue
+            if node.size > self.staging.max_bytes:
+                raise ValueError(
+                    'Shock node {} is too large to stage: {} bytes'.format(
+                        node.id, node.size))
+            file_path = os.path.join(req.temp_dir, handle['id'])
+            req.files.add(file_path)
+            self.fetch_node(node, file_path, req)
+            self.staging.put(key, [file_path])
+            os.remove(file_path)
+            req.files.discard(file_path)
 
     def process_ternary(self, params, boolname):
         if boolname not in params or params[boolname] is None:
@@ -485,7 +1831,44 @@ Operational notes:
                               'Allowed values are "true", "false", and null.')
                              .format(boolname, params[boolname]))
 
-    def process_params(self, params):
+    def process_bool(self, params, boolname):
+        if boolname not in params or params[boolname] is None:
+            params[boolname] = False
+        elif params[boolname] == self.TRUE:
+            params[boolname] = True
+        elif params[boolname] == self.FALSE:
+            params[boolname] = False
+        else:
+            raise ValueError(('Illegal value for boolean parameter {}: {}. ' +
+                              'Allowed values are "true" and "false".')
+                             .format(boolname, params[boolname]))
+
+    def process_chunks(self, params):
+        chunks = params.get(self.PARAM_IN_CHUNKS)
+        if chunks is None:
+            params[self.PARAM_IN_CHUNKS] = None
+        elif type(chunks) not in (int, long) or chunks < 1:
+            raise ValueError(('Illegal value for parameter {}: {}. Must be ' +
+                              'an integer greater than 0.').format(
+                                  self.PARAM_IN_CHUNKS, chunks))
+        elif chunks > self.max_chunks:
+            raise ValueError(
+                ('Illegal value for parameter {}: {}. Must be at most {}, ' +
+                 'the {} setting of the service.').format(
+                     self.PARAM_IN_CHUNKS, chunks, self.max_chunks,
+                     self.CFG_MAX_CHUNKS))
+
+    def process_output_format(self, params):
+        fmt = params.get(self.PARAM_IN_FORMAT)
+        if fmt is None:
+            params[self.PARAM_IN_FORMAT] = self.FASTQ
+        elif fmt not in self.OUTPUT_FORMATS:
+            raise ValueError(('Illegal value for parameter {}: {}. Allowed ' +
+                              'values are {}.').format(
+                                  self.PARAM_IN_FORMAT, fmt,
+                                  ', '.join(self.OUTPUT_FORMATS)))
+
+    def process_read_libraries(self, params):
         if self.PARAM_IN_LIB not in params:
             raise ValueError(self.PARAM_IN_LIB + ' parameter is required')
         reads = params[self.PARAM_IN_LIB]
@@ -493,14 +1876,159 @@ Operational notes:
             raise ValueError(self.PARAM_IN_LIB + ' must be a list')
         if not reads:
             raise ValueError('At least one reads library must be provided')
-        reads = list(set(reads))
+        unique = []
+        seen = set()
         for read_name in reads:
             if not read_name:
                 raise ValueError('Invalid workspace object name ' + read_name)
-        params[self.PARAM_IN_LIB] = reads
+            if read_name not in seen:
+                seen.add(read_name)
+                unique.append(read_name)
+        params[self.PARAM_IN_LIB] = unique
+
+    def process_priority(self, params):
+        priority = params.get(self.PARAM_IN_PRIORITY)
+        if priority is None:
+            params[self.PARAM_IN_PRIORITY] = None
+        elif priority not in self.PRIORITIES:
+            raise ValueError(('Illegal value for parameter {}: {}. Allowed ' +
+                              'values are {}.').format(
+                                  self.PARAM_IN_PRIORITY, priority,
+                                  ', '.join(self.PRIORITIES)))
 
+    def process_params(self, params):
+        self.process_read_libraries(params)
         self.process_ternary(params, self.PARAM_IN_GZIP)
         self.process_ternary(params, self.PARAM_IN_INTERLEAVED)
+        self.process_chunks(params)
+        self.process_output_format(params)
+        self.process_bool(params, self.PARAM_IN_STATS)
+        self.process_bool(params, self.PARAM_IN_CONTINUE)
+        self.process_priority(params)
+
+    # Asynchronous jobs are tracked by their job ID. Other calls get a new ID
+    # rather than the JSON-RPC ID, which the client chooses and so may
+    # collide with other users' calls.
+    def get_call_id(self, ctx):
+        return str(ctx.get('job_id') or uuid.uuid4())
+
+    # The job runner is created on first use so that processes that never
+    # run jobs, like the async CLI, don't open the job database.
+    def get_job_runner(self):
+        with self._jobs_lock:
+            if not self._jobs:
+                self._jobs = JobRunner(
+                    JobStore(self.job_db), self.job_workers,
+                    lambda ctx, params: self.convert_read_library_to_file(
+                        ctx, params)[0])
+            return self._jobs
+
+    def get_job(self, ctx, job_id):
+        job = self.get_job_runner().store.get(job_id)
+        # don't reveal the existence of other users' jobs
+        if not job or job['user'] != ctx.get('user_id'):
+            raise ValueError('No job with ID ' + str(job_id))
+        return job
+
+    # Counts the queued and running jobs without creating the job database
+    # or the job runner, so that checking the status has no side effects.
+    def job_counts(self):
+        store = self.existing_job_store()
+        if not store:
+            return {'queued': 0, 'running': 0}
+        return {'queued': store.count(JobStore.QUEUED),
+                'running': store.count(JobStore.RUNNING)}
+
+    # Returns the job store without creating the job database, or None if
+    # the database doesn't exist.
+    def existing_job_store(self):
+        with self._jobs_lock:
+            if self._jobs:
+                return self._jobs.store
+        if not os.path.exists(self.job_db):
+            return None
+        return JobStore(self.job_db, create=False)
+
+    # Deletes the records of finished jobs and conversions, and coalesced
+    # work, that are older than their maximum ages. Runs after each scratch
+    # sweep, which skips their directories.
+    def prune_records(self):
+        store = self.existing_job_store()
+        if store and self.job_max_age > 0:
+            jobs = store.delete_finished(
+                int((time.time() - self.job_max_age) * 1000))
+            if jobs:
+                self.log('Deleted {} finished jobs'.format(jobs))
+        if self.progress_max_age > 0:
+            self.progress.prune(self.progress_max_age)
+        if self.sweeper.max_age:
+            self.coalescer.prune(self.sweeper.max_age)
+
+    def dir_size(self, path):
+        size = 0
+        for root, _, files in os.walk(path):
+            for f in files:
+                try:
+                    size += os.lstat(os.path.join(root, f)).st_size
+                except OSError:  # deleted since the directory was listed
+                    pass
+        return size
+
+    def disk_usage(self):
+        with self._disk_lock:
+            if self._disk and time.time() - self._disk[0] < \
+                    self.DISK_USAGE_TTL:
+                return self._disk[1]
+        usage = {'scratch_free_bytes': self.scratch_planner.free_bytes(),
+                 'shock_tmp_bytes': self.dir_size(self.shock_temp),
+                 'caches': {}}
+        for name, cache in self.caches():
+            usage['caches'][name] = cache.size()
+        with self._disk_lock:
+            self._disk = (time.time(), usage)
+        return usage
+
+    def caches(self):
+        return [('output', self.output_cache), ('node', self.node_cache),
+                ('staging', self.staging)]
+
+    # the fraction of the lookups in a cache lookup metric that found the
+    # entry, or None if there have been no lookups
+    def hit_rate(self, metric):
+        hits = metric.get(result='hit') + metric.get(result='peer')
+        lookups = hits + metric.get(result='miss')
+        return float(hits) / lookups if lookups else None
+
+    # Cheap measurements of the current load on this process, and on the
+    # host for the disk and job counts, for the status method.
+    def live_status(self):
+        stages = {}
+        for p in self.progress.snapshot().values():
+            if p['stage']:
+                stages[p['stage']] = stages.get(p['stage'], 0) + 1
+        downloads, waiting = self.downloads.counts()
+        disk = self.disk_usage()
+        caches = {}
+        for (name, _), metric in zip(self.caches(), [
+                self.m_output_cache, self.m_node_cache, self.m_staging]):
+            entries, size = disk['caches'][name]
+            caches[name] = {'entries': entries,
+                            'bytes': size,
+                            'hit_rate': self.hit_rate(metric)}
+        return {'conversions': {'active': int(self.m_in_flight.get()),
+                                'stages': stages},
+                'jobs': self.job_counts(),
+                'prefetches_queued': self.prefetcher.queued(),
+                'downloads': {'active': downloads, 'waiting': waiting},
+                'disk': {'scratch_free_bytes': disk['scratch_free_bytes'],
+                         'scratch_reserved_bytes':
+                             self.scratch_planner.reserved,
+                         'shock_tmp_bytes': disk['shock_tmp_bytes']},
+                'throughput': {
+                    'download_bytes_per_sec':
+                        self.downloads.throughput.rate(),
+                    'libraries_per_sec': self.library_rate.rate()},
+                'caches': caches}
 
     def mkdir_p(self, path):
         try:
@@ -511,18 +2039,252 @@ Operational notes:
             else:
                 raise
 
+    # The server hooks below are called from the server's
+    # BEGIN_SERVER_HOOK blocks, which must be restored if the server is
+    # regenerated.
+
+    # Wraps the server's auth client to avoid a round trip to the auth
+    # service for recently seen tokens.
+    def cached_auth_client(self, client):
+        return CachingAuthClient(client, self.token_cache)
+
+    # Handles the requests in a JSON-RPC batch call with handle(ctx,
+    # request), running up to batch-concurrency requests at once. See
+    # BatchRunner.run().
+    def handle_batch(self, ctx, requests, handle):
+        return self.rpc_batches.run(ctx, requests, handle)
+
+    # Serves the HTTP requests that aren't JSON-RPC calls, i.e. metrics
+    # scrapes and requests from peers for cache entries. Returns None for
+    # other requests, which the server handles as usual. The server calls
+    # this for every request, so it also starts the scratch sweeper, which
+    # only long running servers run, not the async CLI.
+    def handle_http(self, environ, start_response):
+        self.sweeper.start()
+        if (environ['REQUEST_METHOD'] == 'GET' and
+                environ.get('PATH_INFO', '').rstrip('/') == '/metrics'):
+            # metrics are per process, so with multiple uwsgi workers each
+            # scrape sees the metrics of whichever worker serves it
+            return self.metrics.serve(start_response)
+        if self.peer_server and self.peer_server.handles(environ):
+            return self.peer_server(environ, start_response)
+        return None
+
+    # Returns the path of a directory in scratch, creating it if needed.
+    def scratch_dir(self, name):
+        path = os.path.join(self.scratch, name)
+        self.mkdir_p(path)
+        return path
+
+    # The subsystems below are built on first use.
+
+    @lazy_property
+    def sweeper(self):
+        # the directories are excluded whether or not they exist yet
+        dirs = [os.path.join(self.scratch, d) for d in [
+            self.PROGRESS_DIR, self.COALESCE_DIR, self.OUTPUT_CACHE_DIR,
+            self.NODE_CACHE_DIR, self.STAGING_DIR, self.SLOTS_DIR]]
+        return ScratchSweeper(
+            self.scratch, self.sweep_max_age, self.sweep_max_bytes,
+            self.sweep_min_age, self.sweep_interval,
+            # sqlite may keep a journal next to the database
+            [self.job_db, self.job_db + '-journal', self.job_db + '-wal',
+             self.job_db + '-shm'] + dirs,
+            self.files_in_use, self.log, [self.prune_records])
+
+    @lazy_property
+    def rpc_batches(self):
+        return BatchRunner(self.rpc_batch_concurrency)
+
+    @lazy_property
+    def downloads(self):
+        return DownloadScheduler(
+            self.download_connections, self.download_user_connections,
+            self.download_bandwidth, self.prefetch_connections,
+            self.download_reserved, self.download_batch_bandwidth)
+
+    @lazy_property
+    def batch_slots(self):
+        # the limit is shared by all the server processes
+        return SlotPool(self.scratch_dir(self.SLOTS_DIR),
+                        self.batch_conversions,
+                        timeout=self.batch_queue_timeout)
+
+    @lazy_property
+    def coalescer(self):
+        return Coalescer(self.scratch_dir(self.COALESCE_DIR), self.log)
+
+    # the caches are limited by their own size budgets
+    @lazy_property
+    def output_cache(self):
+        return FileCache(self.scratch_dir(self.OUTPUT_CACHE_DIR),
+                         self.output_cache_max_bytes, self.log)
+
+    @lazy_property
+    def node_cache(self):
+        return FileCache(self.scratch_dir(self.NODE_CACHE_DIR),
+                         self.node_cache_max_bytes, self.log)
+
+    # prefetched files are kept apart from the node cache so that other
+    # conversions don't evict them before they're used
+    @lazy_property
+    def staging(self):
+        return FileCache(self.scratch_dir(self.STAGING_DIR),
+                         self.staging_max_bytes, self.log,
+                         self.staging_max_age)
+
+    @lazy_property
+    def prefetcher(self):
+        return Prefetcher(self.prefetch, self.prefetch_connections, self.log)
+
+    # peers fetch from this instance's caches, and this instance from
+    # theirs
+    @lazy_property
+    def peer_server(self):
+        if not self.peer_secret:
+            return None
+        return PeerServer(self.peer_secret, {
+            'node': self.node_cache, 'output': self.output_cache})
+
+    @lazy_property
+    def peer_client(self):
+        if not self.peers:
+            return None
+        return PeerClient(self.peers, self.peer_secret, self.peer_timeout,
+                          self.log)
+
     #END_CLASS_HEADER
 
     # config contains contents of config file in a hash or None if it couldn't
     # be found
     def __init__(self, config):
         #BEGIN_CONSTRUCTOR
+        self.setup_metrics()
         self.workspaceURL = config[self.URL_WS]
         self.shockURL = config[self.URL_SHOCK]
         self.scratch = os.path.abspath(config['scratch'])
         self.mkdir_p(self.scratch)
         self.shock_temp = os.path.join(self.scratch, self.SHOCK_TEMP)
         self.mkdir_p(self.shock_temp)
+        self.ws_cache = LRUCache(int(config.get(
+            self.CFG_WS_CACHE_SIZE, self.WS_CACHE_SIZE_DEFAULT)))
+        self.ws_batch_size = int(config.get(
+            self.CFG_WS_BATCH_SIZE, self.WS_BATCH_SIZE_DEFAULT))
+        if self.ws_batch_size < 1:
+            raise ValueError(self.CFG_WS_BATCH_SIZE + ' must be at least 1')
+        self.token_cache = TokenCache(
+            int(config.get(self.CFG_AUTH_CACHE_MAX_SIZE,
+                           self.AUTH_CACHE_MAX_SIZE_DEFAULT)),
+            int(config.get(self.CFG_AUTH_CACHE_TTL,
+                           self.AUTH_CACHE_TTL_DEFAULT)))
+        self.job_db = os.path.join(self.scratch, config.get(
+            self.CFG_JOB_DB, self.JOB_DB_DEFAULT))
+        self.job_workers = int(config.get(
+            self.CFG_JOB_WORKERS, self.JOB_WORKERS_DEFAULT))
+        if self.job_workers < 1:
+            raise ValueError(self.CFG_JOB_WORKERS + ' must be at least 1')
+        self.job_max_age = float(config.get(
+            self.CFG_JOB_MAX_AGE, self.JOB_MAX_AGE_DEFAULT))
+        self._jobs = None
+        self._jobs_lock = threading.Lock()
+        self.rpc_batch_concurrency = int(config.get(
+            self.CFG_RPC_BATCH_CONCURRENCY,
+            self.RPC_BATCH_CONCURRENCY_DEFAULT))
+        if self.rpc_batch_concurrency < 1:
+            raise ValueError(self.CFG_RPC_BATCH_CONCURRENCY +
+                             ' must be at least 1')
+        # guards the subsystems that are built on first use, see
+        # lazy_property
+        self._lazy_lock = threading.RLock()
+        self.progress_max_age = float(config.get(
+            self.CFG_PROGRESS_MAX_AGE, self.PROGRESS_MAX_AGE_DEFAULT))
+        self.progress = ProgressRegistry(
+            self.scratch_dir(self.PROGRESS_DIR), float(config.get(
+                self.CFG_PROGRESS_INTERVAL, self.PROGRESS_INTERVAL_DEFAULT)))
+        self.scratch_planner = ScratchPlanner(
+            self.scratch,
+            config.get(self.CFG_SCRATCH_ADMISSION,
+                       self.SCRATCH_ADMISSION_DEFAULT),
+            float(config.get(self.CFG_SCRATCH_QUEUE_TIMEOUT,
+                             self.SCRATCH_QUEUE_TIMEOUT_DEFAULT)))
+        self.gzip_ratio = float(config.get(
+            self.CFG_GZIP_RATIO, self.GZIP_RATIO_DEFAULT))
+        if self.gzip_ratio < 1:
+            raise ValueError(self.CFG_GZIP_RATIO + ' must be at least 1')
+        self.max_chunks = int(config.get(
+            self.CFG_MAX_CHUNKS, self.MAX_CHUNKS_DEFAULT))
+        if self.max_chunks < 1:
+            raise ValueError(self.CFG_MAX_CHUNKS + ' must be at least 1')
+        self._active = set()
+        self._active_lock = threading.Lock()
+        # The subsystems below are built from these settings on first use,
+        # so that starting the service, e.g. to run one method with the
+        # async CLI, doesn't create directories or start threads it won't
+        # use. The settings are parsed here so that malformed ones still
+        # fail at start up.
+        self.prefetch_connections = int(config.get(
+            self.CFG_PREFETCH_CONNECTIONS, self.PREFETCH_CONNECTIONS_DEFAULT))
+        if self.prefetch_connections < 1:
+            raise ValueError(self.CFG_PREFETCH_CONNECTIONS +
+                             ' must be at least 1')
+        self.sweep_max_age = float(config.get(
+            self.CFG_SWEEP_MAX_AGE, self.SWEEP_MAX_AGE_DEFAULT))
+        self.sweep_max_bytes = int(config.get(
+            self.CFG_SWEEP_MAX_BYTES, self.SWEEP_MAX_BYTES_DEFAULT))
+        self.sweep_min_age = float(config.get(
+            self.CFG_SWEEP_MIN_AGE, self.SWEEP_MIN_AGE_DEFAULT))
+        self.sweep_interval = float(config.get(
+            self.CFG_SWEEP_INTERVAL, self.SWEEP_INTERVAL_DEFAULT))
+        self.download_connections = int(config.get(
+            self.CFG_DOWNLOAD_CONNECTIONS, self.DOWNLOAD_CONNECTIONS_DEFAULT))
+        self.download_user_connections = int(config.get(
+            self.CFG_DOWNLOAD_USER_CONNECTIONS,
+            self.DOWNLOAD_USER_CONNECTIONS_DEFAULT))
+        self.download_bandwidth = float(config.get(
+            self.CFG_DOWNLOAD_BANDWIDTH, self.DOWNLOAD_BANDWIDTH_DEFAULT))
+        self.download_reserved = int(config.get(
+            self.CFG_DOWNLOAD_RESERVED, self.DOWNLOAD_RESERVED_DEFAULT))
+        self.download_batch_bandwidth = float(config.get(
+            self.CFG_DOWNLOAD_BATCH_BANDWIDTH,
+            self.DOWNLOAD_BATCH_BANDWIDTH_DEFAULT))
+        self.interactive_max_bytes = int(config.get(
+            self.CFG_INTERACTIVE_MAX_BYTES,
+            self.INTERACTIVE_MAX_BYTES_DEFAULT))
+        self.batch_conversions = int(config.get(
+            self.CFG_BATCH_CONVERSIONS, self.BATCH_CONVERSIONS_DEFAULT))
+        self.batch_queue_timeout = float(config.get(
+            self.CFG_BATCH_QUEUE_TIMEOUT, self.BATCH_QUEUE_TIMEOUT_DEFAULT))
+        self.retry_policy = RetryPolicy(
+            int(config.get(self.CFG_RETRY_ATTEMPTS,
+                           self.RETRY_ATTEMPTS_DEFAULT)),
+            float(config.get(self.CFG_RETRY_BASE_DELAY,
+                             self.RETRY_BASE_DELAY_DEFAULT)),
+            float(config.get(self.CFG_RETRY_MAX_DELAY,
+                             self.RETRY_MAX_DELAY_DEFAULT)),
+            int(config.get(self.CFG_RETRY_BUDGET, self.RETRY_BUDGET_DEFAULT)),
+            self.log, lambda op: self.m_retries.inc(operation=op))
+        self.shock_timeout = float(config.get(
+            self.CFG_SHOCK_TIMEOUT, self.SHOCK_TIMEOUT_DEFAULT))
+        self.output_cache_max_bytes = int(config.get(
+            self.CFG_OUTPUT_CACHE_MAX_BYTES,
+            self.OUTPUT_CACHE_MAX_BYTES_DEFAULT))
+        self.node_cache_max_bytes = int(config.get(
+            self.CFG_NODE_CACHE_MAX_BYTES, self.NODE_CACHE_MAX_BYTES_DEFAULT))
+        self.staging_max_bytes = int(config.get(
+            self.CFG_STAGING_MAX_BYTES, self.STAGING_MAX_BYTES_DEFAULT))
+        self.staging_max_age = float(config.get(
+            self.CFG_STAGING_MAX_AGE, self.STAGING_MAX_AGE_DEFAULT))
+        self.library_rate = RateMeter()
+        self._disk = None
+        self._disk_lock = threading.Lock()
+        self.peers = [p.strip() for p in
+                      config.get(self.CFG_PEERS, '').split(',') if p.strip()]
+        self.peer_secret = config.get(self.CFG_PEER_SECRET) or None
+        if self.peers and not self.peer_secret:
+            raise ValueError(self.CFG_PEER_SECRET + ' is required when ' +
+                             self.CFG_PEERS + ' are configured')
+        self.peer_timeout = float(config.get(
+            self.CFG_PEER_TIMEOUT, self.PEER_TIMEOUT_DEFAULT))
         #END_CONSTRUCTOR
         pass
     
@@ -532,163 +2294,275 @@ Operational notes:
         Convert read libraries to files
         :param params: instance of type "ConvertReadLibraryParams" (Input
            parameters for converting libraries to files. list<read_lib>
-           read_libraries - the names of the workspace read library objects
-           to convert. tern gzip - if true, gzip any unzipped files. If
-           false, gunzip any zipped files. If null or missing, leave files as
-           is unless unzipping is required for interleaving or
-           deinterleaving, in which case the files will be left unzipped.
-           tern interleaved - if true, provide the files in interleaved
-           format if they are not already. If false, provide forward and
-           reverse reads files. If null or missing, leave files as is.) ->
-           structure: parameter "read_libraries" of list of type "read_lib"
-           (A reference to a read library stored in the workspace service,
-           whether of the KBaseAssembly or KBaseFile type. Usage of absolute
-           references (e.g. 256/3/6) is strongly encouraged to avoid race
-           conditions, although any valid reference is allowed.), parameter
-           "gzip" of type "tern" (A ternary. Allowed values are 'false',
-           'true', or null. Any other value is invalid.), parameter
-           "interleaved" of type "tern" (A ternary. Allowed values are
-           'false', 'true', or null. Any other value is invalid.)
-        :returns: instance of type "ConvertReadLibraryOutput" (The output of
-           the convert method. mapping<read_lib, ConvertedReadLibrary> files
-           - a mapping of the read library workspace references to
-           information about the converted data for each library.) ->
-           structure: parameter "files" of mapping from type "read_lib" (A
-           reference to a read library stored in the workspace service,
-           whether of the KBaseAssembly or KBaseFile type. Usage of absolute
-           references (e.g. 256/3/6) is strongly encouraged to avoid race
-           conditions, although any valid reference is allowed.) to type
-           "ConvertedReadLibrary" (Information about each set of reads.
-           ReadsFiles files - the reads files. string ref - the absolute
-           workspace reference of the reads file, e.g
-           workspace_id/object_id/version. tern single_genome - whether the
-           reads are from a single genome or a metagenome. null if unknown.
-           tern read_orientation_outward - whether the read orientation is
-           outward from the set of primers. null if unknown or single ended
+           read_libraries - the names of the workspace read library objects to
+           convert. tern gzip - if true, gzip any unzipped files. If false,
+           gunzip any zipped files. If null or missing, leave files as is unless
+           unzipping is required for interleaving or deinterleaving, in which
+           case the files will be left unzipped. tern interleaved - if true,
+           provide the files in interleaved format if they are not already. If
+           false, provide forward and reverse reads files. If null or missing,
+           leave files as is. int chunks - if provided, split each reads file
+           into this many files of approximately equal size, e.g. for sharding
+           the reads across processes. Read pairs are never split, and the nth
+           forward file contains the mates of the reads in the nth reverse file.
+           Must be at least 1 and at most a maximum set by the service, 100 by
+           default. If null or missing, each reads file is provided as a single
+           file. string output_format - the format of the output files, either
+           'fastq' or 'fasta'. FASTA output omits the quality scores. If null or
+           missing, the files are provided in FASTQ format. bool stats - if
+           true, include statistics about the time spent and bytes processed by
+           each stage of the conversion in the output. Defaults to false. bool
+           continue_on_failure - if true, a read library that fails to convert
+           does not fail the call. Instead, the error is reported in the errors
+           field of the output and the other read libraries are converted as
+           usual. Defaults to false. string priority - the priority of the
+           conversion, either 'interactive' or 'batch'. Batch conversions use
+           the capacity interactive conversions leave, and the service may limit
+           how many run at once. If null or missing, conversions that download
+           more than a size set by the service are batch conversions.) ->
+           structure: parameter "read_libraries" of list of type "read_lib" (A
+           reference to a read library stored in the workspace service, whether
+           of the KBaseAssembly or KBaseFile type. Usage of absolute references
+           (e.g. 256/3/6) is strongly encouraged to avoid race conditions,
+           although any valid reference is allowed.), parameter "gzip" of type
+           "tern" (A ternary. Allowed values are 'false', 'true', or null. Any
+           other value is invalid.), parameter "interleaved" of type "tern" (A
+           ternary. Allowed values are 'false', 'true', or null. Any other value
+           is invalid.), parameter "chunks" of Long, parameter "output_format"
+           of String, parameter "stats" of type "bool" (A boolean. Allowed
+           values are 'false' or 'true'. Any other value is invalid.), parameter
+           "continue_on_failure" of type "bool" (A boolean. Allowed values are
+           'false' or 'true'. Any other value is invalid.), parameter "priority"
+           of String
+        :returns: instance of type "ConvertReadLibraryOutput" (The output of the
+           convert method. mapping<read_lib, ConvertedReadLibrary> files - a
+           mapping of the read library workspace references to information about
+           the converted data for each library. References that point to the
+           same object, e.g. MyWorkspace/MyReads and 256/3/6, share the same
+           converted data. mapping<read_lib, ConversionError> errors - a mapping
+           of the read library workspace references that failed to convert to
+           the error for each library. Failed libraries are not present in the
+           files mapping. Only present if continue_on_failure is true.
+           ConversionStats stats - statistics about the conversion. Only present
+           if requested. string call_id - the ID the service generated for the
+           conversion, which identifies it in the service's logs and progress
+           records. For asynchronous jobs, this is the job ID.) -> structure:
+           parameter "files" of mapping from type "read_lib" (A reference to a
+           read library stored in the workspace service, whether of the
+           KBaseAssembly or KBaseFile type. Usage of absolute references (e.g.
+           256/3/6) is strongly encouraged to avoid race conditions, although
+           any valid reference is allowed.) to type "ConvertedReadLibrary"
+           (Information about each set of reads. ReadsFiles files - the reads
+           files. string ref - the absolute workspace reference of the reads
+           file, e.g workspace_id/object_id/version. tern single_genome -
+           whether the reads are from a single genome or a metagenome. null if
+           unknown. tern read_orientation_outward - whether the read orientation
+           is outward from the set of primers. null if unknown or single ended
            reads. string sequencing_tech - the sequencing technology used to
-           produce the reads. null if unknown. KBaseCommon.StrainInfo strain
-           - information about the organism strain that was sequenced. null
-           if unavailable. KBaseCommon.SourceInfo source - information about
-           the organism source. null if unavailable. float insert_size_mean -
-           the mean size of the genetic fragments. null if unavailable or
-           single end reads. float insert_size_std_dev - the standard
-           deviation of the size of the genetic fragments. null if
-           unavailable or single end reads. int read_count - the number of
-           reads in the this dataset. null if unavailable. int read_size -
-           the total size of the reads, in bases. null if unavailable. float
-           gc_content - the GC content of the reads. null if unavailable.) ->
-           structure: parameter "files" of type "ReadsFiles" (Reads file
-           locations and gzip status. Only the relevant fields will be
-           present in the structure. string fwd - the path to the forward /
-           left reads. string rev - the path to the reverse / right reads.
-           string inter - the path to the interleaved reads. string sing -
-           the path to the single end reads. bool fwd_gz - whether the
-           forward / left reads are gzipped. bool rev_gz - whether the
-           reverse / right reads are gzipped. bool inter_gz - whether the
-           interleaved reads are gzipped. bool sing_gz - whether the single
-           reads are gzipped.) -> structure: parameter "fwd" of String,
-           parameter "rev" of String, parameter "inter" of String, parameter
-           "sing" of String, parameter "fwd_gz" of type "bool" (A boolean.
-           Allowed values are 'false' or 'true'. Any other value is
+           produce the reads. null if unknown. KBaseCommon.StrainInfo strain -
+           information about the organism strain that was sequenced. null if
+           unavailable. KBaseCommon.SourceInfo source - information about the
+           organism source. null if unavailable. float insert_size_mean - the
+           mean size of the genetic fragments. null if unavailable or single end
+           reads. float insert_size_std_dev - the standard deviation of the size
+           of the genetic fragments. null if unavailable or single end reads.
+           int read_count - the number of reads in the this dataset. null if
+           unavailable. int read_size - the total size of the reads, in bases.
+           null if unavailable. float gc_content - the GC content of the reads.
+           null if unavailable.) -> structure: parameter "files" of type
+           "ReadsFiles" (Reads file locations and gzip status. Only the relevant
+           fields will be present in the structure. string fwd - the path to the
+           forward / left reads. string rev - the path to the reverse / right
+           reads. string inter - the path to the interleaved reads. string sing
+           - the path to the single end reads. bool fwd_gz - whether the forward
+           / left reads are gzipped. bool rev_gz - whether the reverse / right
+           reads are gzipped. bool inter_gz - whether the interleaved reads are
+           gzipped. bool sing_gz - whether the single reads are gzipped.
+           list<string> fwd_chunks - the paths to the forward / left reads
+           chunks. list<string> rev_chunks - the paths to the reverse / right
+           reads chunks. list<string> inter_chunks - the paths to the
+           interleaved reads chunks. list<string> sing_chunks - the paths to the
+           single end reads chunks. The *_chunks fields are provided instead of
+           the fwd, rev, inter, and sing fields when the chunks parameter is
+           set. The files may be hard links to files shared with other
+           conversions and the service's caches, so they must not be modified in
+           place. To change a file, write a new file and replace the old one
+           with it.) -> structure: parameter "fwd" of String, parameter "rev" of
+           String, parameter "inter" of String, parameter "sing" of String,
+           parameter "fwd_chunks" of list of String, parameter "rev_chunks" of
+           list of String, parameter "inter_chunks" of list of String, parameter
+           "sing_chunks" of list of String, parameter "fwd_gz" of type "bool" (A
+           boolean. Allowed values are 'false' or 'true'. Any other value is
            invalid.), parameter "rev_gz" of type "bool" (A boolean. Allowed
-           values are 'false' or 'true'. Any other value is invalid.),
-           parameter "inter_gz" of type "bool" (A boolean. Allowed values are
-           'false' or 'true'. Any other value is invalid.), parameter
-           "sing_gz" of type "bool" (A boolean. Allowed values are 'false' or
-           'true'. Any other value is invalid.), parameter "ref" of String,
-           parameter "single_genome" of type "tern" (A ternary. Allowed
-           values are 'false', 'true', or null. Any other value is invalid.),
-           parameter "read_orientation_outward" of type "tern" (A ternary.
-           Allowed values are 'false', 'true', or null. Any other value is
-           invalid.), parameter "sequencing_tech" of String, parameter
-           "strain" of type "StrainInfo" (Information about a strain.
-           genetic_code - the genetic code of the strain. See
-           http://www.ncbi.nlm.nih.gov/Taxonomy/Utils/wprintgc.cgi?mode=c
-           genus - the genus of the strain species - the species of the
-           strain strain - the identifier for the strain source - information
-           about the source of the strain organelle - the organelle of
-           interest for the related data (e.g. mitochondria) ncbi_taxid - the
-           NCBI taxonomy ID of the strain location - the location from which
-           the strain was collected @optional genetic_code source ncbi_taxid
-           organelle location) -> structure: parameter "genetic_code" of
-           Long, parameter "genus" of String, parameter "species" of String,
-           parameter "strain" of String, parameter "organelle" of String,
-           parameter "source" of type "SourceInfo" (Information about the
-           source of a piece of data. source - the name of the source (e.g.
-           NCBI, JGI, Swiss-Prot) source_id - the ID of the data at the
-           source project_id - the ID of a project encompassing the data at
-           the source @optional source source_id project_id) -> structure:
-           parameter "source" of String, parameter "source_id" of type
-           "source_id" (An ID used for a piece of data at its source. @id
-           external), parameter "project_id" of type "project_id" (An ID used
-           for a project encompassing a piece of data at its source. @id
-           external), parameter "ncbi_taxid" of Long, parameter "location" of
-           type "Location" (Information about a location. lat - latitude of
-           the site, recorded as a decimal number. North latitudes are
-           positive values and south latitudes are negative numbers. lon -
-           longitude of the site, recorded as a decimal number. West
-           longitudes are positive values and east longitudes are negative
-           numbers. elevation - elevation of the site, expressed in meters
-           above sea level. Negative values are allowed. date - date of an
-           event at this location (for example, sample collection), expressed
-           in the format YYYY-MM-DDThh:mm:ss.SSSZ description - a free text
-           description of the location and, if applicable, the associated
-           event. @optional date description) -> structure: parameter "lat"
-           of Double, parameter "lon" of Double, parameter "elevation" of
-           Double, parameter "date" of String, parameter "description" of
-           String, parameter "source" of type "SourceInfo" (Information about
-           the source of a piece of data. source - the name of the source
-           (e.g. NCBI, JGI, Swiss-Prot) source_id - the ID of the data at the
-           source project_id - the ID of a project encompassing the data at
-           the source @optional source source_id project_id) -> structure:
-           parameter "source" of String, parameter "source_id" of type
-           "source_id" (An ID used for a piece of data at its source. @id
-           external), parameter "project_id" of type "project_id" (An ID used
-           for a project encompassing a piece of data at its source. @id
-           external), parameter "insert_size_mean" of Double, parameter
-           "insert_size_std_dev" of Double, parameter "read_count" of Long,
-           parameter "read_size" of Long, parameter "gc_content" of Double
+           values are 'false' or 'true'. Any other value is invalid.), parameter
+           "inter_gz" of type "bool" (A boolean. Allowed values are 'false' or
+           'true'. Any other value is invalid.), parameter "sing_gz" of type
+           "bool" (A boolean. Allowed values are 'false' or 'true'. Any other
+           value is invalid.), parameter "ref" of String, parameter
+           "single_genome" of type "tern" (A ternary. Allowed values are
+           'false', 'true', or null. Any other value is invalid.), parameter
+           "read_orientation_outward" of type "tern" (A ternary. Allowed values
+           are 'false', 'true', or null. Any other value is invalid.), parameter
+           "sequencing_tech" of String, parameter "strain" of type "StrainInfo"
+           (Information about a strain. genetic_code - the genetic code of the
+           strain. See
+           http://www.ncbi.nlm.nih.gov/Taxonomy/Utils/wprintgc.cgi?mode=c genus
+           - the genus of the strain species - the species of the strain strain
+           - the identifier for the strain source - information about the source
+           of the strain organelle - the organelle of interest for the related
+           data (e.g. mitochondria) ncbi_taxid - the NCBI taxonomy ID of the
+           strain location - the location from which the strain was collected
+           @optional genetic_code source ncbi_taxid organelle location) ->
+           structure: parameter "genetic_code" of Long, parameter "genus" of
+           String, parameter "species" of String, parameter "strain" of String,
+           parameter "organelle" of String, parameter "source" of type
+           "SourceInfo" (Information about the source of a piece of data. source
+           - the name of the source (e.g. NCBI, JGI, Swiss-Prot) source_id - the
+           ID of the data at the source project_id - the ID of a project
+           encompassing the data at the source @optional source source_id
+           project_id) -> structure: parameter "source" of String, parameter
+           "source_id" of type "source_id" (An ID used for a piece of data at
+           its source. @id external), parameter "project_id" of type
+           "project_id" (An ID used for a project encompassing a piece of data
+           at its source. @id external), parameter "ncbi_taxid" of Long,
+           parameter "location" of type "Location" (Information about a
+           location. lat - latitude of the site, recorded as a decimal number.
+           North latitudes are positive values and south latitudes are negative
+           numbers. lon - longitude of the site, recorded as a decimal number.
+           West longitudes are positive values and east longitudes are negative
+           numbers. elevation - elevation of the site, expressed in meters above
+           sea level. Negative values are allowed. date - date of an event at
+           this location (for example, sample collection), expressed in the
+           format YYYY-MM-DDThh:mm:ss.SSSZ description - a free text description
+           of the location and, if applicable, the associated event. @optional
+           date description) -> structure: parameter "lat" of Double, parameter
+           "lon" of Double, parameter "elevation" of Double, parameter "date" of
+           String, parameter "description" of String, parameter "source" of type
+           "SourceInfo" (Information about the source of a piece of data. source
+           - the name of the source (e.g. NCBI, JGI, Swiss-Prot) source_id - the
+           ID of the data at the source project_id - the ID of a project
+           encompassing the data at the source @optional source source_id
+           project_id) -> structure: parameter "source" of String, parameter
+           "source_id" of type "source_id" (An ID used for a piece of data at
+           its source. @id external), parameter "project_id" of type
+           "project_id" (An ID used for a project encompassing a piece of data
+           at its source. @id external), parameter "insert_size_mean" of Double,
+           parameter "insert_size_std_dev" of Double, parameter "read_count" of
+           Long, parameter "read_size" of Long, parameter "gc_content" of
+           Double, parameter "errors" of mapping from type "read_lib" (A
+           reference to a read library stored in the workspace service, whether
+           of the KBaseAssembly or KBaseFile type. Usage of absolute references
+           (e.g. 256/3/6) is strongly encouraged to avoid race conditions,
+           although any valid reference is allowed.) to type "ConversionError"
+           (An error that occurred when converting a read library. string error
+           - the error message. string type - the type of the error, e.g.
+           ShockError or ValueError. bool transient - whether the error may not
+           recur if the read library is converted again, e.g. a timeout or an
+           unavailable service.) -> structure: parameter "error" of String,
+           parameter "type" of String, parameter "transient" of type "bool" (A
+           boolean. Allowed values are 'false' or 'true'. Any other value is
+           invalid.), parameter "stats" of type "ConversionStats" (Statistics
+           for a conversion. float seconds - the wall clock time of the
+           conversion. mapping<string, StageStats> stages - the statistics for
+           each stage of the conversion, summed over all the read libraries. The
+           stages are ws_fetch, batch_queue, shock_metadata, shock_download,
+           peer_download, gunzip, gzip, mv, split, interleave, and deinterleave.
+           ws_fetch is the workspace calls that fetch the read library objects
+           and resolve the references to them. batch_queue is the time a batch
+           priority conversion waited to start. shock_metadata is the Shock
+           calls for the reads file metadata. Only the stages that ran are
+           included. mapping<string, mapping<string, StageStats>> libraries -
+           the statistics for each stage for each read library, keyed by the
+           absolute reference of the library. The ws_fetch and batch_queue
+           stages run for several libraries at once and are not included.) ->
+           structure: parameter "seconds" of Double, parameter "stages" of
+           mapping from String to type "StageStats" (Statistics for a stage of a
+           conversion. float seconds - the wall clock time spent in the stage.
+           int bytes_read - the number of bytes read by the stage. int
+           bytes_written - the number of bytes written by the stage. float
+           bytes_per_sec - the number of bytes read per second. null if the
+           stage took no measurable time.) -> structure: parameter "seconds" of
+           Double, parameter "bytes_read" of Long, parameter "bytes_written" of
+           Long, parameter "bytes_per_sec" of Double, parameter "libraries" of
+           mapping from String to mapping from String to type "StageStats"
+           (Statistics for a stage of a conversion. float seconds - the wall
+           clock time spent in the stage. int bytes_read - the number of bytes
+           read by the stage. int bytes_written - the number of bytes written by
+           the stage. float bytes_per_sec - the number of bytes read per second.
+           null if the stage took no measurable time.) -> structure: parameter
+           "seconds" of Double, parameter "bytes_read" of Long, parameter
+           "bytes_written" of Long, parameter "bytes_per_sec" of Double,
+           parameter "call_id" of String
         """
         # ctx is the context object
         # return variables are: output
         #BEGIN convert_read_library_to_file
         ''' potential improvements:
-            Add continue_on_failure mode that reports errors for each failed
-                conversion rather than failing completely.
             Parallelize - probably not worth it, this is all IO bound. Try if
-                there's nothing better to do. If so, each process/thread needs
-                its own shock_tmp folder.
+                there's nothing better to do.
             Add user specified failure conditions - e.g. fail if is/is not
                 metagenome, outwards reads, etc.
         '''
 
-        self.log('Running convert_read_library_to_file with params:\n' +
-                 pformat(params))
+        with self.track_conversion():
+            self.log('Running convert_read_library_to_file with params:\n' +
+                     pformat(params))
 
-        token = ctx['token']
+            token = ctx['token']
+            call_id = self.get_call_id(ctx)
+            self.log('Call ID: ' + call_id)
 
-        self.process_params(params)
+            self.process_params(params)
 #         self.log('\n' + pformat(params))
 
-        # Get the reads library
-        ws = workspaceService(self.workspaceURL, token=token)
-        ws_reads_ids = []
-        for read_name in params[self.PARAM_IN_LIB]:
-            ws_reads_ids.append({'ref': read_name})
-        try:
-            reads = ws.get_objects(ws_reads_ids)
-        except WorkspaceException as e:
-            self.log('Logging stacktrace from workspace exception:\n' + e.data)
-            raise
-
-        output = {}
-        for read_name, read in zip(params[self.PARAM_IN_LIB], reads):
-            self.log('=== processing read library ' + read_name + '===\n',
-                     prefix_newline=True)
-            output[read_name] = self.process_reads(
-                read, params[self.PARAM_IN_GZIP],
-                params[self.PARAM_IN_INTERLEAVED], token)
-        output = {'files': output}
+            # Get the reads library
+            ws = workspaceService(self.workspaceURL, token=token)
+            budget = self.retry_policy.new_budget()
+            cont = params[self.PARAM_IN_CONTINUE]
+            # errors for references that can't be resolved
+            referrors = {} if cont else None
+            stats = ConversionStats() if params[self.PARAM_IN_STATS] \
+                else None
+            # the objects fetched to resolve references
+            fetched = {}
+            absrefs = self.resolve_refs(ws, token, params[self.PARAM_IN_LIB],
+                                        budget, referrors, stats, fetched)
+            # different references to the same object are only converted once
+            names = {}
+            uniquerefs = []
+            for read_name in params[self.PARAM_IN_LIB]:
+                if read_name not in absrefs:
+                    continue
+                names.setdefault(absrefs[read_name], []).append(read_name)
+                if absrefs[read_name] not in uniquerefs:
+                    uniquerefs.append(absrefs[read_name])
+
+            req = ConversionRequest(token, params[self.PARAM_IN_GZIP],
+                                    params[self.PARAM_IN_INTERLEAVED],
+                                    params[self.PARAM_IN_CHUNKS],
+                                    params[self.PARAM_IN_FORMAT] == self.FASTA,
+                                    stats,
+                                    self.progress.start(call_id,
+                                                        len(uniquerefs)),
+                                    ctx.get('user_id'), budget, cont,
+                                    priority=params[self.PARAM_IN_PRIORITY])
+            reads = self.iter_reads_objects(ws, token, uniquerefs, budget,
+                                            req.errors, stats, fetched)
+            converted = self.convert_reads(reads, names, req)
+            output = {}
+            errors = referrors
+            for ref in uniquerefs:
+                for read_name in names[ref]:
+                    if ref in converted:
+                        output[read_name] = converted[ref]
+                    else:
+                        errors[read_name] = req.errors[ref]
+        output = {'files': output, 'call_id': call_id}
+        if errors is not None:
+            output['errors'] = {read_name: self.error_output(e)
+                                for read_name, e in errors.items()}
+        if req.stats:
+            output['stats'] = req.stats.to_output()
         #END convert_read_library_to_file
 
         # At some point might do deeper type checking...
@@ -698,6 +2572,374 @@ Operational notes:
         # return the results
         return [output]
 
+    def submit_convert_read_library_to_file(self, ctx, params):
+        """
+        Submit a conversion job that runs in the background on the service. The
+           job status and results are available from get_job_status and
+           get_job_result.
+        :param params: instance of type "ConvertReadLibraryParams" (Input
+           parameters for converting libraries to files. list<read_lib>
+           read_libraries - the names of the workspace read library objects to
+           convert. tern gzip - if true, gzip any unzipped files. If false,
+           gunzip any zipped files. If null or missing, leave files as is unless
+           unzipping is required for interleaving or deinterleaving, in which
+           case the files will be left unzipped. tern interleaved - if true,
+           provide the files in interleaved format if they are not already. If
+           false, provide forward and reverse reads files. If null or missing,
+           leave files as is. int chunks - if provided, split each reads file
+           into this many files of approximately equal size, e.g. for sharding
+           the reads across processes. Read pairs are never split, and the nth
+           forward file contains the mates of the reads in the nth reverse file.
+           Must be at least 1 and at most a maximum set by the service, 100 by
+           default. If null or missing, each reads file is provided as a single
+           file. string output_format - the format of the output files, either
+           'fastq' or 'fasta'. FASTA output omits the quality scores. If null or
+           missing, the files are provided in FASTQ format. bool stats - if
+           true, include statistics about the time spent and bytes processed by
+           each stage of the conversion in the output. Defaults to false. bool
+           continue_on_failure - if true, a read library that fails to convert
+           does not fail the call. Instead, the error is reported in the errors
+           field of the output and the other read libraries are converted as
+           usual. Defaults to false. string priority - the priority of the
+           conversion, either 'interactive' or 'batch'. Batch conversions use
+           the capacity interactive conversions leave, and the service may limit
+           how many run at once. If null or missing, conversions that download
+           more than a size set by the service are batch conversions.) ->
+           structure: parameter "read_libraries" of list of type "read_lib" (A
+           reference to a read library stored in the workspace service, whether
+           of the KBaseAssembly or KBaseFile type. Usage of absolute references
+           (e.g. 256/3/6) is strongly encouraged to avoid race conditions,
+           although any valid reference is allowed.), parameter "gzip" of type
+           "tern" (A ternary. Allowed values are 'false', 'true', or null. Any
+           other value is invalid.), parameter "interleaved" of type "tern" (A
+           ternary. Allowed values are 'false', 'true', or null. Any other value
+           is invalid.), parameter "chunks" of Long, parameter "output_format"
+           of String, parameter "stats" of type "bool" (A boolean. Allowed
+           values are 'false' or 'true'. Any other value is invalid.), parameter
+           "continue_on_failure" of type "bool" (A boolean. Allowed values are
+           'false' or 'true'. Any other value is invalid.), parameter "priority"
+           of String
+        :returns: instance of type "job_id" (The ID of an asynchronous
+           conversion job.)
+        """
+        # ctx is the context object
+        # return variables are: job_id
+        #BEGIN submit_convert_read_library_to_file
+        # fail fast on bad parameters rather than when the job runs
+        self.process_params(copy.deepcopy(params))
+        jobctx = {'token': ctx['token'],
+                  'user_id': ctx.get('user_id'),
+                  'authenticated': ctx.get('authenticated')
+                  }
+        job_id = self.get_job_runner().submit(jobctx, params)
+        self.log('Submitted conversion job ' + job_id)
+        #END submit_convert_read_library_to_file
+
+        # At some point might do deeper type checking...
+        if not isinstance(job_id, basestring):
+            raise ValueError('Method submit_convert_read_library_to_file return value ' +
+                             'job_id is not type basestring as required.')
+        # return the results
+        return [job_id]
+
+    def get_job_status(self, ctx, job_id):
+        """
+        Get the status of a conversion job.
+        :param job_id: instance of type "job_id" (The ID of an asynchronous
+           conversion job.)
+        :returns: instance of type "JobStatus" (The status of an asynchronous
+           conversion job. job_id job_id - the ID of the job. string status -
+           the status of the job, one of 'queued', 'running', 'complete', or
+           'error'. string error - the error message if the job failed. null
+           otherwise. int submitted - the time the job was submitted in
+           milliseconds since the epoch. int started - the time the job started
+           in milliseconds since the epoch. null if the job has not started. int
+           finished - the time the job finished in milliseconds since the epoch.
+           null if the job has not finished. ConversionProgress progress - the
+           most recently recorded progress of the job. null if the job has not
+           started.) -> structure: parameter "job_id" of type "job_id" (The ID
+           of an asynchronous conversion job.), parameter "status" of String,
+           parameter "error" of String, parameter "submitted" of Long, parameter
+           "started" of Long, parameter "finished" of Long, parameter "progress"
+           of type "ConversionProgress" (The progress of a conversion. int
+           libraries_total - the number of read libraries to convert. int
+           libraries_done - the number of read libraries converted so far.
+           string stage - the stage that is running, or null. int
+           stage_bytes_done - the number of bytes the stage has processed. int
+           stage_bytes_total - the number of bytes the stage will process.) ->
+           structure: parameter "libraries_total" of Long, parameter
+           "libraries_done" of Long, parameter "stage" of String, parameter
+           "stage_bytes_done" of Long, parameter "stage_bytes_total" of Long
+        """
+        # ctx is the context object
+        # return variables are: status
+        #BEGIN get_job_status
+        job = self.get_job(ctx, job_id)
+        status = {'job_id': job['job_id'],
+                  'status': job['status'],
+                  'error': job['error'],
+                  'submitted': job['submitted'],
+                  'started': job['started'],
+                  'finished': job['finished'],
+                  'progress': self.progress.read(job['job_id'])
+                  if job['started'] else None
+                  }
+        #END get_job_status
+
+        # At some point might do deeper type checking...
+        if not isinstance(status, dict):
+            raise ValueError('Method get_job_status return value ' +
+                             'status is not type dict as required.')
+        # return the results
+        return [status]
+
+    def get_job_result(self, ctx, job_id):
+        """
+        Get the results of a completed conversion job. Throws an error if the
+           job failed or has not yet completed.
+        :param job_id: instance of type "job_id" (The ID of an asynchronous
+           conversion job.)
+        :returns: instance of type "ConvertReadLibraryOutput" (The output of the
+           convert method. mapping<read_lib, ConvertedReadLibrary> files - a
+           mapping of the read library workspace references to information about
+           the converted data for each library. References that point to the
+           same object, e.g. MyWorkspace/MyReads and 256/3/6, share the same
+           converted data. mapping<read_lib, ConversionError> errors - a mapping
+           of the read library workspace references that failed to convert to
+           the error for each library. Failed libraries are not present in the
+           files mapping. Only present if continue_on_failure is true.
+           ConversionStats stats - statistics about the conversion. Only present
+           if requested. string call_id - the ID the service generated for the
+           conversion, which identifies it in the service's logs and progress
+           records. For asynchronous jobs, this is the job ID.) -> structure:
+           parameter "files" of mapping from type "read_lib" (A reference to a
+           read library stored in the workspace service, whether of the
+           KBaseAssembly or KBaseFile type. Usage of absolute references (e.g.
+           256/3/6) is strongly encouraged to avoid race conditions, although
+           any valid reference is allowed.) to type "ConvertedReadLibrary"
+           (Information about each set of reads. ReadsFiles files - the reads
+           files. string ref - the absolute workspace reference of the reads
+           file, e.g workspace_id/object_id/version. tern single_genome -
+           whether the reads are from a single genome or a metagenome. null if
+           unknown. tern read_orientation_outward - whether the read orientation
+           is outward from the set of primers. null if unknown or single ended
+           reads. string sequencing_tech - the sequencing technology used to
+           produce the reads. null if unknown. KBaseCommon.StrainInfo strain -
+           information about the organism strain that was sequenced. null if
+           unavailable. KBaseCommon.SourceInfo source - information about the
+           organism source. null if unavailable. float insert_size_mean - the
+           mean size of the genetic fragments. null if unavailable or single end
+           reads. float insert_size_std_dev - the standard deviation of the size
+           of the genetic fragments. null if unavailable or single end reads.
+           int read_count - the number of reads in the this dataset. null if
+           unavailable. int read_size - the total size of the reads, in bases.
+           null if unavailable. float gc_content - the GC content of the reads.
+           null if unavailable.) -> structure: parameter "files" of type
+           "ReadsFiles" (Reads file locations and gzip status. Only the relevant
+           fields will be present in the structure. string fwd - the path to the
+           forward / left reads. string rev - the path to the reverse / right
+           reads. string inter - the path to the interleaved reads. string sing
+           - the path to the single end reads. bool fwd_gz - whether the forward
+           / left reads are gzipped. bool rev_gz - whether the reverse / right
+           reads are gzipped. bool inter_gz - whether the interleaved reads are
+           gzipped. bool sing_gz - whether the single reads are gzipped.
+           list<string> fwd_chunks - the paths to the forward / left reads
+           chunks. list<string> rev_chunks - the paths to the reverse / right
+           reads chunks. list<string> inter_chunks - the paths to the
+           interleaved reads chunks. list<string> sing_chunks - the paths to the
+           single end reads chunks. The *_chunks fields are provided instead of
+           the fwd, rev, inter, and sing fields when the chunks parameter is
+           set. The files may be hard links to files shared with other
+           conversions and the service's caches, so they must not be modified in
+           place. To change a file, write a new file and replace the old one
+           with it.) -> structure: parameter "fwd" of String, parameter "rev" of
+           String, parameter "inter" of String, parameter "sing" of String,
+           parameter "fwd_chunks" of list of String, parameter "rev_chunks" of
+           list of String, parameter "inter_chunks" of list of String, parameter
+           "sing_chunks" of list of String, parameter "fwd_gz" of type "bool" (A
+           boolean. Allowed values are 'false' or 'true'. Any other value is
+           invalid.), parameter "rev_gz" of type "bool" (A boolean. Allowed
+           values are 'false' or 'true'. Any other value is invalid.), parameter
+           "inter_gz" of type "bool" (A boolean. Allowed values are 'false' or
+           'true'. Any other value is invalid.), parameter "sing_gz" of type
+           "bool" (A boolean. Allowed values are 'false' or 'true'. Any other
+           value is invalid.), parameter "ref" of String, parameter
+           "single_genome" of type "tern" (A ternary. Allowed values are
+           'false', 'true', or null. Any other value is invalid.), parameter
+           "read_orientation_outward" of type "tern" (A ternary. Allowed values
+           are 'false', 'true', or null. Any other value is invalid.), parameter
+           "sequencing_tech" of String, parameter "strain" of type "StrainInfo"
+           (Information about a strain. genetic_code - the genetic code of the
+           strain. See
+           http://www.ncbi.nlm.nih.gov/Taxonomy/Utils/wprintgc.cgi?mode=c genus
+           - the genus of the strain species - the species of the strain strain
+           - the identifier for the strain source - information about the source
+           of the strain organelle - the organelle of interest for the related
+           data (e.g. mitochondria) ncbi_taxid - the NCBI taxonomy ID of the
+           strain location - the location from which the strain was collected
+           @optional genetic_code source ncbi_taxid organelle location) ->
+           structure: parameter "genetic_code" of Long, parameter "genus" of
+           String, parameter "species" of String, parameter "strain" of String,
+           parameter "organelle" of String, parameter "source" of type
+           "SourceInfo" (Information about the source of a piece of data. source
+           - the name of the source (e.g. NCBI, JGI, Swiss-Prot) source_id - the
+           ID of the data at the source project_id - the ID of a project
+           encompassing the data at the source @optional source source_id
+           project_id) -> structure: parameter "source" of String, parameter
+           "source_id" of type "source_id" (An ID used for a piece of data at
+           its source. @id external), parameter "project_id" of type
+           "project_id" (An ID used for a project encompassing a piece of data
+           at its source. @id external), parameter "ncbi_taxid" of Long,
+           parameter "location" of type "Location" (Information about a
+           location. lat - latitude of the site, recorded as a decimal number.
+           North latitudes are positive values and south latitudes are negative
+           numbers. lon - longitude of the site, recorded as a decimal number.
+           West longitudes are positive values and east longitudes are negative
+           numbers. elevation - elevation of the site, expressed in meters above
+           sea level. Negative values are allowed. date - date of an event at
+           this location (for example, sample collection), expressed in the
+           format YYYY-MM-DDThh:mm:ss.SSSZ description - a free text description
+           of the location and, if applicable, the associated event. @optional
+           date description) -> structure: parameter "lat" of Double, parameter
+           "lon" of Double, parameter "elevation" of Double, parameter "date" of
+           String, parameter "description" of String, parameter "source" of type
+           "SourceInfo" (Information about the source of a piece of data. source
+           - the name of the source (e.g. NCBI, JGI, Swiss-Prot) source_id - the
+           ID of the data at the source project_id - the ID of a project
+           encompassing the data at the source @optional source source_id
+           project_id) -> structure: parameter "source" of String, parameter
+           "source_id" of type "source_id" (An ID used for a piece of data at
+           its source. @id external), parameter "project_id" of type
+           "project_id" (An ID used for a project encompassing a piece of data
+           at its source. @id external), parameter "insert_size_mean" of Double,
+           parameter "insert_size_std_dev" of Double, parameter "read_count" of
+           Long, parameter "read_size" of Long, parameter "gc_content" of
+           Double, parameter "errors" of mapping from type "read_lib" (A
+           reference to a read library stored in the workspace service, whether
+           of the KBaseAssembly or KBaseFile type. Usage of absolute references
+           (e.g. 256/3/6) is strongly encouraged to avoid race conditions,
+           although any valid reference is allowed.) to type "ConversionError"
+           (An error that occurred when converting a read library. string error
+           - the error message. string type - the type of the error, e.g.
+           ShockError or ValueError. bool transient - whether the error may not
+           recur if the read library is converted again, e.g. a timeout or an
+           unavailable service.) -> structure: parameter "error" of String,
+           parameter "type" of String, parameter "transient" of type "bool" (A
+           boolean. Allowed values are 'false' or 'true'. Any other value is
+           invalid.), parameter "stats" of type "ConversionStats" (Statistics
+           for a conversion. float seconds - the wall clock time of the
+           conversion. mapping<string, StageStats> stages - the statistics for
+           each stage of the conversion, summed over all the read libraries. The
+           stages are ws_fetch, batch_queue, shock_metadata, shock_download,
+           peer_download, gunzip, gzip, mv, split, interleave, and deinterleave.
+           ws_fetch is the workspace calls that fetch the read library objects
+           and resolve the references to them. batch_queue is the time a batch
+           priority conversion waited to start. shock_metadata is the Shock
+           calls for the reads file metadata. Only the stages that ran are
+           included. mapping<string, mapping<string, StageStats>> libraries -
+           the statistics for each stage for each read library, keyed by the
+           absolute reference of the library. The ws_fetch and batch_queue
+           stages run for several libraries at once and are not included.) ->
+           structure: parameter "seconds" of Double, parameter "stages" of
+           mapping from String to type "StageStats" (Statistics for a stage of a
+           conversion. float seconds - the wall clock time spent in the stage.
+           int bytes_read - the number of bytes read by the stage. int
+           bytes_written - the number of bytes written by the stage. float
+           bytes_per_sec - the number of bytes read per second. null if the
+           stage took no measurable time.) -> structure: parameter "seconds" of
+           Double, parameter "bytes_read" of Long, parameter "bytes_written" of
+           Long, parameter "bytes_per_sec" of Double, parameter "libraries" of
+           mapping from String to mapping from String to type "StageStats"
+           (Statistics for a stage of a conversion. float seconds - the wall
+           clock time spent in the stage. int bytes_read - the number of bytes
+           read by the stage. int bytes_written - the number of bytes written by
+           the stage. float bytes_per_sec - the number of bytes read per second.
+           null if the stage took no measurable time.) -> structure: parameter
+           "seconds" of Double, parameter "bytes_read" of Long, parameter
+           "bytes_written" of Long, parameter "bytes_per_sec" of Double,
+           parameter "call_id" of String
+        """
+        # ctx is the context object
+        # return variables are: output
+        #BEGIN get_job_result
+        job = self.get_job(ctx, job_id)
+        if job['status'] == JobStore.ERROR:
+            raise ValueError('Job {} failed: {}'.format(job_id, job['error']))
+        if job['status'] != JobStore.COMPLETE:
+            raise ValueError('Job {} is not complete. Status: {}'.format(
+                job_id, job['status']))
+        output = job['result']
+        #END get_job_result
+
+        # At some point might do deeper type checking...
+        if not isinstance(output, dict):
+            raise ValueError('Method get_job_result return value ' +
+                             'output is not type dict as required.')
+        # return the results
+        return [output]
+
+    def prefetch_read_libraries(self, ctx, params):
+        """
+        Download the reads files for read libraries to the service's staging
+           area in the background, so that later conversions of the libraries
+           read the files from local disk. Returns once the references have been
+           resolved. Staged files expire if they are not used for a while and
+           may be evicted if the staging area is full, in which case conversions
+           download the files as usual. Throws an error if the service has no
+           staging area.
+        :param params: instance of type "PrefetchReadLibrariesParams" (Input
+           parameters for prefetching read libraries. list<read_lib>
+           read_libraries - the names of the workspace read library objects to
+           prefetch.) -> structure: parameter "read_libraries" of list of type
+           "read_lib" (A reference to a read library stored in the workspace
+           service, whether of the KBaseAssembly or KBaseFile type. Usage of
+           absolute references (e.g. 256/3/6) is strongly encouraged to avoid
+           race conditions, although any valid reference is allowed.)
+        :returns: instance of type "PrefetchReadLibrariesOutput" (The output of
+           the prefetch method. mapping<read_lib, read_lib> refs - a mapping of
+           the read library workspace references to the absolute references of
+           the objects that will be prefetched.) -> structure: parameter "refs"
+           of mapping from type "read_lib" (A reference to a read library stored
+           in the workspace service, whether of the KBaseAssembly or KBaseFile
+           type. Usage of absolute references (e.g. 256/3/6) is strongly
+           encouraged to avoid race conditions, although any valid reference is
+           allowed.) to type "read_lib" (A reference to a read library stored in
+           the workspace service, whether of the KBaseAssembly or KBaseFile
+           type. Usage of absolute references (e.g. 256/3/6) is strongly
+           encouraged to avoid race conditions, although any valid reference is
+           allowed.)
+        """
+        # ctx is the context object
+        # return variables are: output
+        #BEGIN prefetch_read_libraries
+        self.log('Running prefetch_read_libraries with params:\n' +
+                 pformat(params))
+        if not self.staging.max_bytes:
+            raise ValueError('Prefetching is disabled as the service has ' +
+                             'no staging area')
+        self.process_read_libraries(params)
+        token = ctx['token']
+        ws = workspaceService(self.workspaceURL, token=token)
+        fetched = {}
+        absrefs = self.resolve_refs(ws, token, params[self.PARAM_IN_LIB],
+                                    self.retry_policy.new_budget(),
+                                    fetched=fetched)
+        uniquerefs = []
+        for read_name in params[self.PARAM_IN_LIB]:
+            if absrefs[read_name] not in uniquerefs:
+                uniquerefs.append(absrefs[read_name])
+        self.prefetcher.submit(token, ctx.get('user_id'), uniquerefs,
+                               fetched)
+        output = {'refs': absrefs}
+        #END prefetch_read_libraries
+
+        # At some point might do deeper type checking...
+        if not isinstance(output, dict):
+            raise ValueError('Method prefetch_read_libraries return value ' +
+                             'output is not type dict as required.')
+        # return the results
+        return [output]
+
     def status(self, ctx):
         #BEGIN_STATUS
         returnVal = {'state': 'OK',
@@ -705,6 +2947,7 @@ Operational notes:
                      'version': self.VERSION,
                      'git_url': self.GIT_URL,
                      'git_commit_hash': self.GIT_COMMIT_HASH}
+        returnVal.update(self.live_status())
         ctx['token']  # shut up pep8
         #END_STATUS
         return [returnVal]
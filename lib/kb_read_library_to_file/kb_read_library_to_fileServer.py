@@ -1,21 +1,19 @@
 #!/usr/bin/env python
-from wsgiref.simple_server import make_server
 import sys
 import json
 import traceback
 import datetime
-from multiprocessing import Process
 from getopt import getopt, GetoptError
 from jsonrpcbase import JSONRPCService, InvalidParamsError, KeywordError,\
     JSONRPCError, InvalidRequestError
 from jsonrpcbase import ServerError as JSONServerError
 from os import environ
 from ConfigParser import ConfigParser
-from biokbase import log
-import biokbase.nexus
+import importlib
 import requests as _requests
 import random as _random
 import os
+import threading
 import requests.packages.urllib3
 
 DEPLOY = 'KB_DEPLOYMENT_CONFIG'
@@ -44,6 +42,8 @@ def get_config():
 config = get_config()
 
 from kb_read_library_to_file.kb_read_library_to_fileImpl import kb_read_library_to_file
+# built on import, since every method call, including from the async CLI,
+# needs it
 impl_kb_read_library_to_file = kb_read_library_to_file(config)
 
 
@@ -152,8 +152,11 @@ class JSONRPCServiceCustom(JSONRPCService):
                 self._fill_request(request_, rdata_)
                 requests.append(request_)
 
-            for request_ in requests:
-                respond = self._handle_request(ctx, request_)
+            #BEGIN_SERVER_HOOK
+            responds_ = impl_kb_read_library_to_file.handle_batch(
+                ctx, requests, self._handle_request)
+            #END_SERVER_HOOK
+            for respond in responds_:
                 # Don't respond to notifications
                 if respond is not None:
                     responds.append(respond)
@@ -302,45 +305,123 @@ def getIPAddress(environ):
     return environ.get('REMOTE_ADDR')
 
 
+class LazyProxy(object):
+    '''
+    Builds the wrapped object on first attribute access.
+    '''
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._obj = None
+
+    def __getattr__(self, name):
+        if self._obj is None:
+            self._obj = self._factory()
+        return getattr(self._obj, name)
+
+
+# only imported when something logs, which the async CLI often doesn't
+log = LazyProxy(lambda: importlib.import_module('biokbase.log'))
+
+
 class Application(object):
     # Wrap the wsgi handler in a class definition so that we can
     # do some initialization and avoid regenerating stuff over
     # and over
 
     def logcallback(self):
-        self.serverlog.set_log_file(self.userlog.get_log_file())
+        if self._serverlog:
+            self._serverlog.set_log_file(self._userlog.get_log_file())
 
     def log(self, level, context, message):
         self.serverlog.log_message(level, message, context['client_ip'],
                                    context['user_id'], context['module'],
                                    context['method'], context['call_id'])
 
+    # The loggers and the auth client are built on first use, so that the
+    # async CLI, which runs a single method and exits, doesn't pay for what it
+    # doesn't use.
+    def _init_logs(self):
+        with self._lazy_lock:
+            if self._userlog:
+                return
+            submod = get_service_name() or 'kb_read_library_to_file'
+            self._userlog = log.log(
+                submod, ip_address=True, authuser=True, module=True,
+                method=True, call_id=True, changecallback=self.logcallback,
+                config=get_config_file())
+            serverlog = log.log(
+                submod, ip_address=True, authuser=True, module=True,
+                method=True, call_id=True,
+                logfile=self._userlog.get_log_file())
+            serverlog.set_log_level(6)
+            self._serverlog = serverlog
+
+    @property
+    def userlog(self):
+        self._init_logs()
+        return self._userlog
+
+    @property
+    def serverlog(self):
+        self._init_logs()
+        return self._serverlog
+
+    @property
+    def auth_client(self):
+        with self._lazy_lock:
+            if not self._auth_client:
+                import biokbase.nexus
+                self._auth_client = biokbase.nexus.Client(
+                    config={'server': 'nexus.api.globusonline.org',
+                            'verify_ssl': True,
+                            'client': None,
+                            'client_secret': None})
+                #BEGIN_SERVER_HOOK
+                self._auth_client = \
+                    impl_kb_read_library_to_file.cached_auth_client(
+                        self._auth_client)
+                #END_SERVER_HOOK
+            return self._auth_client
+
     def __init__(self):
-        submod = get_service_name() or 'kb_read_library_to_file'
-        self.userlog = log.log(
-            submod, ip_address=True, authuser=True, module=True, method=True,
-            call_id=True, changecallback=self.logcallback,
-            config=get_config_file())
-        self.serverlog = log.log(
-            submod, ip_address=True, authuser=True, module=True, method=True,
-            call_id=True, logfile=self.userlog.get_log_file())
-        self.serverlog.set_log_level(6)
+        self._lazy_lock = threading.RLock()
+        self._userlog = None
+        self._serverlog = None
+        self._auth_client = None
         self.rpc_service = JSONRPCServiceCustom()
         self.method_authentication = dict()
         self.rpc_service.add(impl_kb_read_library_to_file.convert_read_library_to_file,
                              name='kb_read_library_to_file.convert_read_library_to_file',
                              types=[dict])
         self.method_authentication['kb_read_library_to_file.convert_read_library_to_file'] = 'required'
+        self.rpc_service.add(impl_kb_read_library_to_file.submit_convert_read_library_to_file,
+                             name='kb_read_library_to_file.submit_convert_read_library_to_file',
+                             types=[dict])
+        self.method_authentication['kb_read_library_to_file.submit_convert_read_library_to_file'] = 'required'
+        self.rpc_service.add(impl_kb_read_library_to_file.get_job_status,
+                             name='kb_read_library_to_file.get_job_status',
+                             types=[basestring])
+        self.method_authentication['kb_read_library_to_file.get_job_status'] = 'required'
+        self.rpc_service.add(impl_kb_read_library_to_file.get_job_result,
+                             name='kb_read_library_to_file.get_job_result',
+                             types=[basestring])
+        self.method_authentication['kb_read_library_to_file.get_job_result'] = 'required'
+        self.rpc_service.add(impl_kb_read_library_to_file.prefetch_read_libraries,
+                             name='kb_read_library_to_file.prefetch_read_libraries',
+                             types=[dict])
+        self.method_authentication['kb_read_library_to_file.prefetch_read_libraries'] = 'required'
         self.rpc_service.add(impl_kb_read_library_to_file.status,
                              name='kb_read_library_to_file.status',
                              types=[dict])
-        self.auth_client = biokbase.nexus.Client(
-            config={'server': 'nexus.api.globusonline.org',
-                    'verify_ssl': True,
-                    'client': None,
-                    'client_secret': None})
 
     def __call__(self, environ, start_response):
+        #BEGIN_SERVER_HOOK
+        response = impl_kb_read_library_to_file.handle_http(
+            environ, start_response)
+        if response is not None:
+            return response
+        #END_SERVER_HOOK
         # Context object, equivalent to the perl impl CallContext
         ctx = MethodContext(self.userlog)
         ctx['client_ip'] = getIPAddress(environ)
@@ -517,6 +598,8 @@ def start_server(host='localhost', port=0, newprocess=False):
     global _proc
     if _proc:
         raise RuntimeError('server is already running')
+    from wsgiref.simple_server import make_server
+    from multiprocessing import Process
     httpd = make_server(host, port, application)
     port = httpd.server_address[1]
     print "Listening on port %s" % port
@@ -542,7 +625,8 @@ def process_async_cli(input_file_path, output_file_path, token):
         req['version'] = '1.1'
     if 'id' not in req: 
         req['id'] = str(_random.random())[2:]
-    ctx = MethodContext(application.userlog)
+    # only build the logger if the method logs
+    ctx = MethodContext(LazyProxy(lambda: application.userlog))
     if token:
         user, _, _ = application.auth_client.validate_token(token)
         ctx['user_id'] = user
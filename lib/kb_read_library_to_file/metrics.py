@@ -0,0 +1,248 @@
+'''
+Thread safe counters, gauges and histograms that can be rendered in the
+Prometheus text exposition format, and meters for recent rates.
+
+Metrics are held in memory, so when the server runs multiple worker processes
+each process reports its own metrics.
+'''
+
+import threading
+import time
+from collections import deque
+
+# bucket upper bounds in seconds, from 10ms to an hour
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 900, 3600)
+
+
+def _escape(value):
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace(
+        '\n', r'\n')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join('{}="{}"'.format(n, _escape(v))
+                          for n, v in pairs) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value))
+
+
+class _Metric(object):
+
+    TYPE = None
+
+    def __init__(self, name, help_, labels=()):
+        self.name = name
+        self.help = help_
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+        if not self.labels:
+            # report unlabeled metrics before anything is recorded
+            self._values[()] = self._new_value()
+
+    def _new_value(self):
+        return 0
+
+    def _key(self, labels):
+        if set(labels) != set(self.labels):
+            raise ValueError('Metric {} requires labels {}, got {}'.format(
+                self.name, list(self.labels), sorted(labels)))
+        return tuple(labels[l] for l in self.labels)
+
+    def render(self):
+        lines = ['# HELP {} {}'.format(self.name, self.help),
+                 '# TYPE {} {}'.format(self.name, self.TYPE)]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_value(key, value))
+        return lines
+
+    def _render_value(self, key, value):
+        return ['{}{} {}'.format(self.name, _format_labels(self.labels, key),
+                                 _format_value(value))]
+
+
+class Counter(_Metric):
+    '''
+    A value that only ever increases.
+    '''
+
+    TYPE = 'counter'
+
+    def inc(self, amount=1, **labels):
+        if amount < 0:
+            raise ValueError('Counters can only be increased')
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    '''
+    A value that can go up and down.
+    '''
+
+    TYPE = 'gauge'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def get(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Histogram(_Metric):
+    '''
+    Counts observations in cumulative buckets and tracks their sum.
+    '''
+
+    TYPE = 'histogram'
+
+    def __init__(self, name, help_, labels=(), buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        super(Histogram, self).__init__(name, help_, labels)
+
+    def _new_value(self):
+        return ([0] * len(self.buckets), [0.0])
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            if key not in self._values:
+                self._values[key] = self._new_value()
+            counts, total = self._values[key]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            total[0] += value
+
+    def get_count(self, **labels):
+        with self._lock:
+            counts, _ = self._values.get(self._key(labels), ([0], None))
+            return sum(counts)
+
+    def _render_value(self, key, value):
+        counts, total = value
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, counts):
+            cumulative += count
+            lines.append('{}_bucket{} {}'.format(
+                self.name,
+                _format_labels(self.labels, key,
+                               [('le', _format_value(bound))]),
+                cumulative))
+        labels = _format_labels(self.labels, key)
+        lines.append('{}_sum{} {}'.format(self.name, labels,
+                                          _format_value(total[0])))
+        lines.append('{}_count{} {}'.format(self.name, labels, cumulative))
+        return lines
+
+
+class RateMeter(object):
+    '''
+    Measures the rate per second of a count, e.g. bytes downloaded, over the
+    last window seconds. Counts are kept in one second buckets.
+    '''
+
+    def __init__(self, window=60):
+        if window < 1:
+            raise ValueError('window must be at least 1')
+        self.window = window
+        self._start = time.time()
+        # [second, count] pairs, oldest first
+        self._buckets = deque()
+        self._lock = threading.Lock()
+
+    def _trim(self, now):
+        while self._buckets and self._buckets[0][0] <= now - self.window:
+            self._buckets.popleft()
+
+    def add(self, amount=1):
+        now = int(time.time())
+        with self._lock:
+            if self._buckets and self._buckets[-1][0] == now:
+                self._buckets[-1][1] += amount
+            else:
+                self._buckets.append([now, amount])
+            self._trim(now)
+
+    def rate(self):
+        '''
+        Returns the rate per second over the window, or over the time since
+        the meter was created if that's shorter.
+        '''
+        now = time.time()
+        with self._lock:
+            self._trim(int(now))
+            total = sum(b[1] for b in self._buckets)
+        return total / max(min(self.window, now - self._start), 1.0)
+
+
+class Registry(object):
+    '''
+    A collection of metrics that are rendered together.
+    '''
+
+    CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+    def __init__(self):
+        self._metrics = []
+        self._names = set()
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            if metric.name in self._names:
+                raise ValueError('Duplicate metric name: ' + metric.name)
+            self._names.add(metric.name)
+            self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, help_, labels=()):
+        return self._register(Counter(name, help_, labels))
+
+    def gauge(self, name, help_, labels=()):
+        return self._register(Gauge(name, help_, labels))
+
+    def histogram(self, name, help_, labels=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, help_, labels, buckets))
+
+    def render(self):
+        lines = []
+        for m in list(self._metrics):
+            lines.extend(m.render())
+        return '\n'.join(lines) + '\n'
+
+    def serve(self, start_response):
+        '''
+        Responds to a WSGI request with the rendered metrics.
+        '''
+        body = self.render()
+        start_response('200 OK', [('content-type', self.CONTENT_TYPE),
+                                  ('content-length', str(len(body)))])
+        return [body]
@@ -0,0 +1,165 @@
+'''
+Sharing of cached files between instances of the service over HTTP, so an
+instance can get files from its peers rather than from Shock.
+
+A peer serves the entries of its file caches at
+GET /peer/<cache>/<digest>, which returns the entry's manifest as JSON, and
+GET /peer/<cache>/<digest>/<name>, which returns one of the entry's files.
+The digest is FileCache.digest() of the cache key. Requests must include the
+secret shared by the peers in the X-Peer-Secret header.
+'''
+
+import hmac
+import json
+import os
+import re
+import urllib
+
+import requests
+
+PATH_PREFIX = '/peer/'
+SECRET_HEADER = 'X-Peer-Secret'
+_WSGI_SECRET = 'HTTP_' + SECRET_HEADER.upper().replace('-', '_')
+_PATH = re.compile('^' + PATH_PREFIX + r'(\w+)/([0-9a-f]{64})(?:/([^/]+))?$')
+_CHUNK = 1024 * 1024
+
+
+def _valid_name(name):
+    return name == os.path.basename(name) and not name.startswith('.')
+
+
+class PeerServer(object):
+    '''
+    A WSGI handler that serves the entries of caches, a mapping of cache
+    names to FileCaches, to peers that present the secret.
+    '''
+
+    def __init__(self, secret, caches):
+        if not secret:
+            raise ValueError('A secret is required')
+        self.secret = secret
+        self.caches = caches
+
+    def handles(self, environ):
+        return (environ['REQUEST_METHOD'] == 'GET' and
+                environ.get('PATH_INFO', '').startswith(PATH_PREFIX))
+
+    def _respond(self, start_response, status, body=''):
+        start_response(status, [('content-type', 'text/plain'),
+                                ('content-length', str(len(body)))])
+        return [body]
+
+    def __call__(self, environ, start_response):
+        if not hmac.compare_digest(str(environ.get(_WSGI_SECRET, '')),
+                                   str(self.secret)):
+            return self._respond(start_response, '403 Forbidden')
+        m = _PATH.match(environ.get('PATH_INFO', ''))
+        cache = self.caches.get(m.group(1)) if m else None
+        entry = cache.get_digest(m.group(2)) if cache else None
+        if not entry:
+            return self._respond(start_response, '404 Not Found')
+        meta, paths = entry
+        name = m.group(3)
+        if name is None:
+            body = json.dumps({'names': sorted(paths), 'meta': meta})
+            start_response('200 OK', [('content-type', 'application/json'),
+                                      ('content-length', str(len(body)))])
+            return [body]
+        if name not in paths:
+            return self._respond(start_response, '404 Not Found')
+        try:
+            f = open(paths[name], 'rb')
+        except IOError:  # evicted since the entry was found
+            return self._respond(start_response, '404 Not Found')
+        start_response('200 OK', [
+            ('content-type', 'application/octet-stream'),
+            ('content-length', str(os.fstat(f.fileno()).st_size))])
+        wrapper = environ.get('wsgi.file_wrapper')
+        if wrapper:
+            return wrapper(f, _CHUNK)
+        return self._iter_file(f)
+
+    def _iter_file(self, f):
+        try:
+            while True:
+                data = f.read(_CHUNK)
+                if not data:
+                    break
+                yield data
+        finally:
+            f.close()
+
+
+class PeerClient(object):
+    '''
+    Gets cache entries from peers, a list of the base URLs of other instances
+    of the service, which are asked in order. timeout is the maximum time to
+    wait for a peer to connect or send data. Peers that fail are skipped and
+    the errors logged.
+    '''
+
+    def __init__(self, peers, secret, timeout=30, log=None):
+        if not secret:
+            raise ValueError('A secret is required')
+        self.peers = [p.rstrip('/') for p in peers]
+        self.secret = secret
+        self.timeout = timeout
+        self.log = log
+
+    def _log(self, message):
+        if self.log:
+            self.log(message)
+
+    def _get(self, url, **kwargs):
+        r = requests.get(url, headers={SECRET_HEADER: self.secret},
+                         timeout=self.timeout, **kwargs)
+        if r.status_code == 404:
+            return None
+        r.raise_for_status()
+        return r
+
+    def _download(self, url, path):
+        r = self._get(url, stream=True)
+        if r is None:
+            raise IOError('No longer available: ' + url)
+        tmp = path + '.peer'
+        try:
+            with open(tmp, 'wb') as f:
+                for chunk in r.iter_content(_CHUNK):
+                    f.write(chunk)
+            os.rename(tmp, path)
+        finally:
+            r.close()
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def fetch(self, cache, digest, directory):
+        '''
+        Downloads the files for the entry with the digest in the named cache
+        from the first peer that has the entry into directory. Returns a
+        tuple of the entry's metadata and a mapping of the names of the files
+        to their paths, or None if no peer has the entry.
+        '''
+        for peer in self.peers:
+            url = peer + PATH_PREFIX + cache + '/' + digest
+            paths = {}
+            try:
+                r = self._get(url)
+                if r is None:
+                    continue
+                manifest = r.json()
+                for name in manifest['names']:
+                    if not _valid_name(name):
+                        raise ValueError('Invalid file name: ' + name)
+                    paths[name] = os.path.join(directory, name)
+                    self._download(url + '/' + urllib.quote(name),
+                                   paths[name])
+                return manifest['meta'], paths
+            except (requests.RequestException, IOError, OSError, ValueError,
+                    KeyError) as e:
+                self._log('Could not get {} from peer {}: {}'.format(
+                    digest, peer, e))
+                for p in paths.values():
+                    if os.path.exists(p):
+                        os.remove(p)
+        return None
@@ -0,0 +1,70 @@
+'''
+Background prefetching of read libraries.
+'''
+
+import Queue
+import threading
+import traceback
+
+
+class Prefetcher(object):
+    '''
+    Runs prefetches on a pool of background threads in the order they were
+    submitted. Nobody waits on a prefetch, so failures are only logged. The
+    threads are started on the first submission, so that servers that fork
+    worker processes after loading the application don't lose them.
+    '''
+
+    def __init__(self, prefetch, workers=1, log=None):
+        '''
+        prefetch - the function that runs a prefetch. It's called with the
+            arguments passed to submit().
+        workers - the number of worker threads.
+        '''
+        if workers < 1:
+            raise ValueError('workers must be at least 1')
+        self.workers = workers
+        self.log = log
+        self._prefetch = prefetch
+        self._queue = Queue.Queue()
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def _start(self):
+        with self._lock:
+            if self._threads:
+                return
+            for i in xrange(self.workers):
+                t = threading.Thread(target=self._work,
+                                     name='prefetch_worker_' + str(i))
+                t.daemon = True
+                t.start()
+                self._threads.append(t)
+
+    def _work(self):
+        while True:
+            args = self._queue.get()
+            try:
+                self._prefetch(*args)
+            except Exception as e:
+                traceback.print_exc()
+                if self.log:
+                    self.log('Prefetch failed: ' + str(e))
+            finally:
+                self._queue.task_done()
+
+    def submit(self, *args):
+        '''
+        Queues a prefetch and returns immediately.
+        '''
+        self._start()
+        self._queue.put(args)
+
+    def queued(self):
+        return self._queue.qsize()
+
+    def join(self):
+        '''
+        Waits until all the submitted prefetches have finished.
+        '''
+        self._queue.join()
@@ -0,0 +1,80 @@
+'''
+Priority classes for conversions.
+
+Interactive conversions have a user waiting on them. Batch conversions are
+large or bulk conversions that use the capacity interactive conversions
+leave, and background work like prefetching only uses capacity nothing else
+wants.
+'''
+
+import errno
+import fcntl
+import os
+import time
+
+INTERACTIVE = 'interactive'
+BATCH = 'batch'
+BACKGROUND = 'background'
+# highest priority first
+PRIORITIES = [INTERACTIVE, BATCH, BACKGROUND]
+
+
+class SlotTimeoutError(Exception):
+    pass
+
+
+class SlotPool(object):
+    '''
+    Limits the number of holders of a slot at once to slots, across all the
+    processes that share directory. A slots of 0 disables the limit. Slots
+    are lock files, so a slot held by a process that dies is freed. Waiting
+    for a slot fails after timeout seconds, unless timeout is None.
+    '''
+
+    LOCK = 'slot-{}.lock'
+
+    def __init__(self, directory, slots, poll=0.5, timeout=None):
+        if slots < 0:
+            raise ValueError('slots must be >= 0')
+        self.directory = directory
+        self.slots = slots
+        self.poll = poll
+        self.timeout = timeout
+
+    def _try(self, i):
+        fd = os.open(os.path.join(self.directory, self.LOCK.format(i)),
+                     os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return fd
+        except IOError as e:
+            os.close(fd)
+            if e.errno not in (errno.EAGAIN, errno.EACCES):
+                raise
+            return None
+
+    def acquire(self):
+        '''
+        Waits for a free slot and returns it, or None if there's no limit.
+        The slot must be released with release(). Raises SlotTimeoutError if
+        no slot is free within the timeout.
+        '''
+        if not self.slots:
+            return None
+        deadline = None if self.timeout is None \
+            else time.time() + self.timeout
+        while True:
+            for i in xrange(self.slots):
+                fd = self._try(i)
+                if fd is not None:
+                    return fd
+            if deadline is not None and time.time() >= deadline:
+                raise SlotTimeoutError(
+                    ('Timed out after {} seconds waiting for one of the {} ' +
+                     'slots').format(self.timeout, self.slots))
+            time.sleep(self.poll if deadline is None
+                       else max(min(self.poll, deadline - time.time()), 0))
+
+    def release(self, slot):
+        if slot is not None:
+            os.close(slot)
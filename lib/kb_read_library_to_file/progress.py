@@ -0,0 +1,191 @@
+'''
+Progress tracking for conversions.
+'''
+
+import errno
+import json
+import os
+import re
+import threading
+import time
+
+
+class Progress(object):
+    '''
+    Tracks the progress of a conversion: the number of read libraries
+    converted, and the bytes done and total for the stage that is currently
+    running. The state is published to an optional JSON file at most once per
+    interval seconds, so update() is cheap enough to call for every block of
+    data processed.
+    '''
+
+    RUNNING = 'running'
+    COMPLETE = 'complete'
+    ERROR = 'error'
+
+    def __init__(self, call_id, libraries, path=None, interval=1.0):
+        self.call_id = call_id
+        self.path = path
+        self.interval = interval
+        self._state = {'call_id': call_id,
+                       'state': self.RUNNING,
+                       'error': None,
+                       'libraries_total': libraries,
+                       'libraries_done': 0,
+                       'stage': None,
+                       'stage_bytes_done': 0,
+                       'stage_bytes_total': 0,
+                       'started': time.time(),
+                       'updated': time.time()}
+        self._published = 0
+        self._lock = threading.Lock()
+        self._publish(True)
+
+    def start_stage(self, stage, total):
+        with self._lock:
+            self._state['stage'] = stage
+            self._state['stage_bytes_done'] = 0
+            self._state['stage_bytes_total'] = total
+        self._publish(False)
+
+    def finish_stage(self, stage):
+        '''
+        Clears the current stage if it's stage, so a stage that has ended,
+        successfully or not, isn't reported as running.
+        '''
+        with self._lock:
+            if self._state['stage'] != stage:
+                return
+            self._state['stage'] = None
+            self._state['stage_bytes_done'] = 0
+            self._state['stage_bytes_total'] = 0
+        self._publish(False)
+
+    def update(self, done):
+        '''
+        Sets the number of bytes done for the current stage.
+        '''
+        with self._lock:
+            self._state['stage_bytes_done'] = done
+        self._publish(False)
+
+    def finish_library(self):
+        with self._lock:
+            self._state['libraries_done'] += 1
+        self._publish(True)
+
+    def finish(self, error=None):
+        with self._lock:
+            self._state['state'] = self.ERROR if error else self.COMPLETE
+            self._state['error'] = error
+            self._state['stage'] = None
+        self._publish(True)
+
+    def to_dict(self):
+        with self._lock:
+            return dict(self._state)
+
+    def _publish(self, force):
+        now = time.time()
+        if not force and now - self._published < self.interval:
+            return
+        self._published = now
+        with self._lock:
+            self._state['updated'] = now
+            state = dict(self._state)
+        if not self.path:
+            return
+        # write then rename so readers never see a partial file
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(state, f)
+        os.rename(tmp, self.path)
+
+
+class ProgressRegistry(object):
+    '''
+    Keeps track of the progress of the conversions running in this process.
+    If a directory is provided, the progress of each conversion is also
+    written to <directory>/<call id>.json.
+    '''
+
+    # the fields read() returns
+    FIELDS = ['libraries_total', 'libraries_done', 'stage',
+              'stage_bytes_done', 'stage_bytes_total']
+
+    def __init__(self, directory=None, interval=1.0):
+        self.directory = directory
+        self.interval = interval
+        self._progress = {}
+        self._lock = threading.Lock()
+
+    def _path(self, call_id):
+        if not self.directory:
+            return None
+        return os.path.join(self.directory,
+                            re.sub(r'[^\w.-]', '_', call_id) + '.json')
+
+    def start(self, call_id, libraries):
+        p = Progress(call_id, libraries, self._path(call_id), self.interval)
+        with self._lock:
+            self._progress[call_id] = p
+        return p
+
+    def finish(self, progress, error=None):
+        progress.finish(error)
+        with self._lock:
+            if self._progress.get(progress.call_id) is progress:
+                del self._progress[progress.call_id]
+
+    def prune(self, max_age):
+        '''
+        Deletes the progress files that haven't been updated for max_age
+        seconds, other than those of conversions running in this process.
+        Returns the number of files deleted.
+        '''
+        if not self.directory:
+            return 0
+        with self._lock:
+            running = set(self._path(c) for c in self._progress)
+        cutoff = time.time() - max_age
+        deleted = 0
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if path in running:
+                continue
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    deleted += 1
+            except OSError as e:
+                if e.errno != errno.ENOENT:
+                    raise
+        return deleted
+
+    def read(self, call_id):
+        '''
+        Returns the progress of a conversion, from this process if the
+        conversion is running here or from its progress file, without the
+        call ID and times. Returns None if the progress is unknown.
+        '''
+        with self._lock:
+            progress = self._progress.get(call_id)
+        if progress:
+            state = progress.to_dict()
+        elif not self.directory:
+            return None
+        else:
+            try:
+                with open(self._path(call_id)) as f:
+                    state = json.load(f)
+            except (IOError, ValueError):
+                return None
+        return {k: state[k] for k in self.FIELDS}
+
+    def snapshot(self):
+        '''
+        Returns the progress of the running conversions, keyed by call ID.
+        '''
+        with self._lock:
+            progress = list(self._progress.values())
+        return {p.call_id: p.to_dict() for p in progress}
@@ -0,0 +1,126 @@
+'''
+Retries for transient failures of calls to other services.
+'''
+
+import errno
+import random
+import socket
+import threading
+import time
+
+import requests
+
+# HTTP status codes that indicate the service may succeed if called again
+RETRY_STATUSES = frozenset([408, 429, 500, 502, 503, 504])
+
+
+def get_status(error):
+    '''
+    Returns the HTTP status code associated with an error, if any.
+    '''
+    status = getattr(error, 'status', None)
+    if status is None:
+        response = getattr(error, 'response', None)
+        status = getattr(response, 'status_code', None)
+    return status
+
+
+def is_transient(error, idempotent=True):
+    '''
+    Returns True if the call that raised the error may succeed if retried.
+    Calls that are not idempotent are only retried if the request never
+    reached the service.
+    '''
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if not idempotent:
+        return False
+    if isinstance(error, (requests.exceptions.ConnectionError,
+                          requests.exceptions.Timeout,
+                          requests.exceptions.ChunkedEncodingError)):
+        return True
+    if isinstance(error, socket.error):
+        return error.errno in (errno.ECONNRESET, errno.ECONNREFUSED,
+                               errno.ETIMEDOUT, errno.EPIPE)
+    return get_status(error) in RETRY_STATUSES
+
+
+class RetryBudget(object):
+    '''
+    The number of retries a request may make across all of its calls, so a
+    request against a failing service gives up rather than retrying each of
+    many calls the maximum number of times.
+    '''
+
+    def __init__(self, retries):
+        self.remaining = retries
+        self._lock = threading.Lock()
+
+    def take(self):
+        '''
+        Uses a retry from the budget. Returns False if the budget is spent.
+        '''
+        with self._lock:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+
+class RetryPolicy(object):
+    '''
+    Retries calls that fail with transient errors up to attempts times in
+    total, sleeping for a random delay of up to base_delay * 2 ^ retry
+    seconds, capped at max_delay seconds, between attempts. log is called
+    with a message for every retry and on_retry, if provided, with the
+    operation that is retried.
+    '''
+
+    def __init__(self, attempts, base_delay, max_delay, budget, log=None,
+                 on_retry=None):
+        if attempts < 1:
+            raise ValueError('attempts must be at least 1')
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self.log = log
+        self.on_retry = on_retry
+
+    def new_budget(self):
+        '''
+        Returns a retry budget for a new request.
+        '''
+        return RetryBudget(self.budget)
+
+    def delay(self, retry):
+        return random.uniform(0, min(self.max_delay,
+                                     self.base_delay * 2 ** retry))
+
+    def call(self, func, operation, description, budget=None,
+             idempotent=True):
+        '''
+        Calls func with no arguments and returns the result, retrying on
+        transient errors. operation is the kind of call, such as
+        shock_download, and description describes the call in log messages.
+        If budget is provided, each retry is taken from it.
+        '''
+        attempt = 1
+        while True:
+            try:
+                return func()
+            except Exception as e:
+                if (attempt >= self.attempts or
+                        not is_transient(e, idempotent) or
+                        (budget and not budget.take())):
+                    raise
+                delay = self.delay(attempt - 1)
+                if self.log:
+                    self.log(('{} failed on attempt {} of {}, retrying in ' +
+                              '{:.2f}s: {}: {}').format(
+                        description, attempt, self.attempts, delay,
+                        type(e).__name__, e))
+                if self.on_retry:
+                    self.on_retry(operation)
+                time.sleep(delay)
+                attempt += 1
@@ -0,0 +1,232 @@
+'''
+Admission control and garbage collection for the scratch file system.
+'''
+
+import errno
+import os
+import threading
+import time
+
+
+class ScratchSpaceError(Exception):
+    pass
+
+
+class ScratchPlanner(object):
+    '''
+    Admits conversions based on their estimated peak scratch space use and
+    the free space on the scratch file system, less the space reserved by
+    conversions that are already running in this process. Outputs that
+    conversions share, such as the hard linked output of coalesced
+    conversions, are only reserved once.
+
+    The strategy determines what happens when there is not enough space for a
+    conversion:
+    fail - fail immediately.
+    queue - wait for space to become available, failing after timeout
+        seconds.
+    stream - admit the conversion with its lower streaming estimate if that
+        fits, and fail otherwise.
+    '''
+
+    FAIL = 'fail'
+    QUEUE = 'queue'
+    STREAM = 'stream'
+    STRATEGIES = [FAIL, QUEUE, STREAM]
+
+    def __init__(self, path, strategy, timeout=3600, poll=5):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(('Unknown scratch admission strategy: {}. ' +
+                              'Allowed values are {}.').format(
+                                 strategy, ', '.join(self.STRATEGIES)))
+        self.path = path
+        self.strategy = strategy
+        self.timeout = timeout
+        self.poll = poll
+        self.reserved = 0
+        # output key -> [size, number of conversions that reserved it]
+        self._outputs = {}
+        self._cond = threading.Condition()
+
+    def free_bytes(self):
+        st = os.statvfs(self.path)
+        return st.f_bavail * st.f_frsize
+
+    def admit(self, need, stream_need, outputs=None):
+        '''
+        Reserves space for a conversion. Returns a tuple of the number of
+        bytes reserved, which must be passed to release() when the conversion
+        is done, and whether the conversion must stream its input.
+        need - the estimated peak scratch use when downloading the input.
+        stream_need - the estimated peak scratch use when streaming the input.
+        outputs - a mapping of keys identifying outputs of the conversion to
+            their estimated sizes, which are added to both estimates unless
+            another conversion has already reserved the output. The same
+            outputs must be passed to release(). The returned number of bytes
+            doesn't include the outputs.
+        '''
+        outputs = outputs or {}
+        deadline = time.time() + self.timeout
+        with self._cond:
+            while True:
+                new = sum(size for key, size in outputs.items()
+                          if key not in self._outputs)
+                available = self.free_bytes() - self.reserved
+                if need + new <= available:
+                    self._reserve_outputs(outputs)
+                    self.reserved += need
+                    return need, False
+                if (self.strategy == self.STREAM and
+                        stream_need + new <= available):
+                    self._reserve_outputs(outputs)
+                    self.reserved += stream_need
+                    return stream_need, True
+                remaining = deadline - time.time()
+                if self.strategy != self.QUEUE or remaining <= 0:
+                    raise ScratchSpaceError(
+                        ('Not enough scratch space for the conversion. An ' +
+                         'estimated {} bytes are needed, but only {} bytes ' +
+                         'are available in {}.').format(
+                            (stream_need if self.strategy == self.STREAM
+                             else need) + new, max(available, 0), self.path))
+                # space may also be freed outside this process, so poll
+                self._cond.wait(min(self.poll, remaining))
+
+    # must be called with the lock held
+    def _reserve_outputs(self, outputs):
+        for key, size in outputs.items():
+            if key in self._outputs:
+                self._outputs[key][1] += 1
+            else:
+                self._outputs[key] = [size, 1]
+                self.reserved += size
+
+    def release(self, reserved, outputs=None):
+        with self._cond:
+            self.reserved -= reserved
+            for key in outputs or {}:
+                entry = self._outputs[key]
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._outputs[key]
+                    self.reserved -= entry[0]
+            self._cond.notify_all()
+
+
+class ScratchSweeper(object):
+    '''
+    Periodically deletes files under the scratch directory that were last
+    modified more than max_age seconds ago, and then the oldest files until
+    the files under the directory take up no more than max_bytes. A limit of
+    0 disables that limit.
+
+    Files modified in the last min_age seconds, files in the set returned by
+    in_use(), and files in or at the excluded paths are never deleted.
+    Directories are left in place.
+
+    The functions in tasks are called after each sweep, for cleaning up the
+    excluded paths.
+    '''
+
+    def __init__(self, path, max_age, max_bytes, min_age, interval,
+                 exclude=(), in_use=None, log=None, tasks=()):
+        self.path = path
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.min_age = min_age
+        self.interval = interval
+        self.exclude = [os.path.abspath(e) for e in exclude]
+        self.in_use = in_use
+        self.log = log
+        self.tasks = list(tasks)
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _excluded(self, path):
+        return any(path == e or path.startswith(e + os.sep)
+                   for e in self.exclude)
+
+    def _files(self):
+        for root, dirs, files in os.walk(self.path):
+            dirs[:] = [d for d in dirs
+                       if not self._excluded(os.path.join(root, d))]
+            for f in files:
+                p = os.path.join(root, f)
+                if self._excluded(p):
+                    continue
+                try:
+                    st = os.lstat(p)
+                except OSError:  # deleted since the directory was listed
+                    continue
+                yield p, st.st_mtime, st.st_size
+
+    def sweep(self):
+        '''
+        Deletes files that exceed the limits. Returns a tuple of the number
+        of files deleted and the number of bytes freed.
+        '''
+        now = time.time()
+        in_use = set(self.in_use()) if self.in_use else set()
+        files = sorted(self._files(), key=lambda f: f[1])
+        total = sum(f[2] for f in files)
+        deleted = 0
+        freed = 0
+        for path, mtime, size in files:
+            if path in in_use or now - mtime < self.min_age:
+                continue
+            old = self.max_age and now - mtime > self.max_age
+            full = self.max_bytes and total > self.max_bytes
+            if not old and not full:
+                break  # the remaining files are newer
+            try:
+                os.remove(path)
+            except OSError as e:
+                # another process may have deleted the file already
+                if e.errno != errno.ENOENT:
+                    self._log('Could not delete {}: {}'.format(path, e))
+                    continue
+            total -= size
+            deleted += 1
+            freed += size
+        return deleted, freed
+
+    def _log(self, message):
+        if self.log:
+            self.log(message)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                deleted, freed = self.sweep()
+                if deleted:
+                    self._log('Deleted {} files ({} bytes) from {}'.format(
+                        deleted, freed, self.path))
+            except Exception as e:
+                self._log('Sweeping {} failed: {}'.format(self.path, e))
+            for task in self.tasks:
+                try:
+                    task()
+                except Exception as e:
+                    self._log('Cleaning up {} failed: {}'.format(
+                        self.path, e))
+
+    def start(self):
+        '''
+        Starts sweeping every interval seconds in a daemon thread, unless the
+        interval is 0, or both limits are 0 and there are no tasks. Calling
+        start() again does nothing.
+        '''
+        if self.interval <= 0 or not (self.max_age or self.max_bytes or
+                                      self.tasks):
+            return
+        with self._lock:
+            if self._thread:
+                return
+            self._thread = threading.Thread(target=self._run,
+                                            name='scratch-sweeper')
+            self._thread.daemon = True
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,96 @@
+'''
+File-like access to non-seekable streams, such as HTTP responses.
+'''
+
+import zlib
+
+# the wbits value that makes zlib expect a gzip header and trailer
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+class StreamReader(object):
+    '''
+    A read only, buffered file-like object over a non-seekable stream that
+    optionally gunzips the data, including data with multiple gzip members.
+    Supports read(), readline(), and line iteration. tell() returns the number
+    of bytes read from the underlying stream, which for gzipped data is the
+    position in the compressed data.
+    '''
+
+    def __init__(self, stream, gzipped, bufsize=1024 * 1024):
+        self._stream = stream
+        self._decomp = zlib.decompressobj(_GZIP_WBITS) if gzipped else None
+        self._bufsize = bufsize
+        self._buf = ''
+        self._off = 0
+        self._pos = 0
+        self._eof = False
+
+    def _decompress(self, raw):
+        data = self._decomp.decompress(raw)
+        # the start of the next gzip member, if any, is left unused
+        while self._decomp.unused_data:
+            unused = self._decomp.unused_data
+            self._decomp = zlib.decompressobj(_GZIP_WBITS)
+            data += self._decomp.decompress(unused)
+        return data
+
+    def _fill(self):
+        '''
+        Reads more data into the buffer. Returns False if the stream is
+        exhausted.
+        '''
+        while not self._eof:
+            raw = self._stream.read(self._bufsize)
+            if raw:
+                self._pos += len(raw)
+                data = self._decompress(raw) if self._decomp else raw
+            else:
+                self._eof = True
+                data = self._decomp.flush() if self._decomp else ''
+            if data:
+                self._buf = self._buf[self._off:] + data
+                self._off = 0
+                return True
+        return False
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buf) - self._off < size:
+            if not self._fill():
+                break
+        end = len(self._buf) if size < 0 else min(self._off + size,
+                                                  len(self._buf))
+        data = self._buf[self._off:end]
+        self._off = end
+        return data
+
+    def readline(self):
+        while True:
+            i = self._buf.find('\n', self._off)
+            if i >= 0:
+                line = self._buf[self._off:i + 1]
+                self._off = i + 1
+                return line
+            if not self._fill():
+                return self.read()
+
+    def __iter__(self):
+        return self
+
+    def next(self):
+        line = self.readline()
+        if not line:
+            raise StopIteration
+        return line
+
+    def tell(self):
+        return self._pos
+
+    def close(self):
+        self._stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,103 @@
+
+package us.kbase.kbreadlibrarytofile;
+
+import java.util.HashMap;
+import java.util.Map;
+import javax.annotation.Generated;
+import com.fasterxml.jackson.annotation.JsonAnyGetter;
+import com.fasterxml.jackson.annotation.JsonAnySetter;
+import com.fasterxml.jackson.annotation.JsonInclude;
+import com.fasterxml.jackson.annotation.JsonProperty;
+import com.fasterxml.jackson.annotation.JsonPropertyOrder;
+
+
+/**
+ * <p>Original spec-file type: ConversionError</p>
+ * <pre>
+ * An error that occurred when converting a read library.
+ * string error - the error message.
+ * string type - the type of the error, e.g. ShockError or
+ *     ValueError.
+ * bool transient - whether the error may not recur if the read library
+ *     is converted again, e.g. a timeout or an unavailable service.
+ * </pre>
+ * 
+ */
+@JsonInclude(JsonInclude.Include.NON_NULL)
+@Generated("com.googlecode.jsonschema2pojo")
+@JsonPropertyOrder({
+    "error",
+    "type",
+    "transient"
+})
+public class ConversionError {
+
+    @JsonProperty("error")
+    private String error;
+    @JsonProperty("type")
+    private String type;
+    @JsonProperty("transient")
+    private String _transient;
+    private Map<String, Object> additionalProperties = new HashMap<String, Object>();
+
+    @JsonProperty("error")
+    public String getError() {
+        return error;
+    }
+
+    @JsonProperty("error")
+    public void setError(String error) {
+        this.error = error;
+    }
+
+    public ConversionError withError(String error) {
+        this.error = error;
+        return this;
+    }
+
+    @JsonProperty("type")
+    public String getType() {
+        return type;
+    }
+
+    @JsonProperty("type")
+    public void setType(String type) {
+        this.type = type;
+    }
+
+    public ConversionError withType(String type) {
+        this.type = type;
+        return this;
+    }
+
+    @JsonProperty("transient")
+    public String getTransient() {
+        return _transient;
+    }
+
+    @JsonProperty("transient")
+    public void setTransient(String _transient) {
+        this._transient = _transient;
+    }
+
+    public ConversionError withTransient(String _transient) {
+        this._transient = _transient;
+        return this;
+    }
+
+    @JsonAnyGetter
+    public Map<String, Object> getAdditionalProperties() {
+        return this.additionalProperties;
+    }
+
+    @JsonAnySetter
+    public void setAdditionalProperties(String name, Object value) {
+        this.additionalProperties.put(name, value);
+    }
+
+    @Override
+    public String toString() {
+        return ((((((((("ConversionError"+" [error=")+ error)+", type=")+ type)+", _transient=")+ _transient)+", additionalProperties=")+ additionalProperties)+"]");
+    }
+
+}
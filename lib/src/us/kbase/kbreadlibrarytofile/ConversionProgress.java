@@ -0,0 +1,139 @@
+
+package us.kbase.kbreadlibrarytofile;
+
+import java.util.HashMap;
+import java.util.Map;
+import javax.annotation.Generated;
+import com.fasterxml.jackson.annotation.JsonAnyGetter;
+import com.fasterxml.jackson.annotation.JsonAnySetter;
+import com.fasterxml.jackson.annotation.JsonInclude;
+import com.fasterxml.jackson.annotation.JsonProperty;
+import com.fasterxml.jackson.annotation.JsonPropertyOrder;
+
+
+/**
+ * <p>Original spec-file type: ConversionProgress</p>
+ * <pre>
+ * The progress of a conversion.
+ * int libraries_total - the number of read libraries to convert.
+ * int libraries_done - the number of read libraries converted so far.
+ * string stage - the stage that is running, or null.
+ * int stage_bytes_done - the number of bytes the stage has processed.
+ * int stage_bytes_total - the number of bytes the stage will process.
+ * </pre>
+ * 
+ */
+@JsonInclude(JsonInclude.Include.NON_NULL)
+@Generated("com.googlecode.jsonschema2pojo")
+@JsonPropertyOrder({
+    "libraries_total",
+    "libraries_done",
+    "stage",
+    "stage_bytes_done",
+    "stage_bytes_total"
+})
+public class ConversionProgress {
+
+    @JsonProperty("libraries_total")
+    private Long librariesTotal;
+    @JsonProperty("libraries_done")
+    private Long librariesDone;
+    @JsonProperty("stage")
+    private String stage;
+    @JsonProperty("stage_bytes_done")
+    private Long stageBytesDone;
+    @JsonProperty("stage_bytes_total")
+    private Long stageBytesTotal;
+    private Map<String, Object> additionalProperties = new HashMap<String, Object>();
+
+    @JsonProperty("libraries_total")
+    public Long getLibrariesTotal() {
+        return librariesTotal;
+    }
+
+    @JsonProperty("libraries_total")
+    public void setLibrariesTotal(Long librariesTotal) {
+        this.librariesTotal = librariesTotal;
+    }
+
+    public ConversionProgress withLibrariesTotal(Long librariesTotal) {
+        this.librariesTotal = librariesTotal;
+        return this;
+    }
+
+    @JsonProperty("libraries_done")
+    public Long getLibrariesDone() {
+        return librariesDone;
+    }
+
+    @JsonProperty("libraries_done")
+    public void setLibrariesDone(Long librariesDone) {
+        this.librariesDone = librariesDone;
+    }
+
+    public ConversionProgress withLibrariesDone(Long librariesDone) {
+        this.librariesDone = librariesDone;
+        return this;
+    }
+
+    @JsonProperty("stage")
+    public String getStage() {
+        return stage;
+    }
+
+    @JsonProperty("stage")
+    public void setStage(String stage) {
+        this.stage = stage;
+    }
+
+    public ConversionProgress withStage(String stage) {
+        this.stage = stage;
+        return this;
+    }
+
+    @JsonProperty("stage_bytes_done")
+    public Long getStageBytesDone() {
+        return stageBytesDone;
+    }
+
+    @JsonProperty("stage_bytes_done")
+    public void setStageBytesDone(Long stageBytesDone) {
+        this.stageBytesDone = stageBytesDone;
+    }
+
+    public ConversionProgress withStageBytesDone(Long stageBytesDone) {
+        this.stageBytesDone = stageBytesDone;
+        return this;
+    }
+
+    @JsonProperty("stage_bytes_total")
+    public Long getStageBytesTotal() {
+        return stageBytesTotal;
+    }
+
+    @JsonProperty("stage_bytes_total")
+    public void setStageBytesTotal(Long stageBytesTotal) {
+        this.stageBytesTotal = stageBytesTotal;
+    }
+
+    public ConversionProgress withStageBytesTotal(Long stageBytesTotal) {
+        this.stageBytesTotal = stageBytesTotal;
+        return this;
+    }
+
+    @JsonAnyGetter
+    public Map<String, Object> getAdditionalProperties() {
+        return this.additionalProperties;
+    }
+
+    @JsonAnySetter
+    public void setAdditionalProperties(String name, Object value) {
+        this.additionalProperties.put(name, value);
+    }
+
+    @Override
+    public String toString() {
+        return ((((((((((((("ConversionProgress"+" [librariesTotal=")+ librariesTotal)+", librariesDone=")+ librariesDone)+", stage=")+ stage)+", stageBytesDone=")+ stageBytesDone)+", stageBytesTotal=")+ stageBytesTotal)+", additionalProperties=")+ additionalProperties)+"]");
+    }
+
+}
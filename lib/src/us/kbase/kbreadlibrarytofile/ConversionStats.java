@@ -0,0 +1,112 @@
+
+package us.kbase.kbreadlibrarytofile;
+
+import java.util.HashMap;
+import java.util.Map;
+import javax.annotation.Generated;
+import com.fasterxml.jackson.annotation.JsonAnyGetter;
+import com.fasterxml.jackson.annotation.JsonAnySetter;
+import com.fasterxml.jackson.annotation.JsonInclude;
+import com.fasterxml.jackson.annotation.JsonProperty;
+import com.fasterxml.jackson.annotation.JsonPropertyOrder;
+
+
+/**
+ * <p>Original spec-file type: ConversionStats</p>
+ * <pre>
+ * Statistics for a conversion.
+ * float seconds - the wall clock time of the conversion.
+ * mapping<string, StageStats> stages - the statistics for each stage
+ *     of the conversion, summed over all the read libraries. The
+ *     stages are ws_fetch, batch_queue, shock_metadata, shock_download,
+ *     peer_download, gunzip, gzip, mv, split, interleave, and
+ *     deinterleave. ws_fetch is the workspace calls that fetch the read
+ *     library objects and resolve the references to them. batch_queue
+ *     is the time a batch priority conversion waited to start.
+ *     shock_metadata is the Shock calls for the reads file metadata.
+ *     Only the stages that ran are included.
+ * mapping<string, mapping<string, StageStats>> libraries - the
+ *     statistics for each stage for each read library, keyed by the
+ *     absolute reference of the library. The ws_fetch and batch_queue
+ *     stages run for several libraries at once and are not included.
+ * </pre>
+ * 
+ */
+@JsonInclude(JsonInclude.Include.NON_NULL)
+@Generated("com.googlecode.jsonschema2pojo")
+@JsonPropertyOrder({
+    "seconds",
+    "stages",
+    "libraries"
+})
+public class ConversionStats {
+
+    @JsonProperty("seconds")
+    private Double seconds;
+    @JsonProperty("stages")
+    private Map<String, StageStats> stages;
+    @JsonProperty("libraries")
+    private Map<String, Map<String, StageStats>> libraries;
+    private Map<java.lang.String, Object> additionalProperties = new HashMap<java.lang.String, Object>();
+
+    @JsonProperty("seconds")
+    public Double getSeconds() {
+        return seconds;
+    }
+
+    @JsonProperty("seconds")
+    public void setSeconds(Double seconds) {
+        this.seconds = seconds;
+    }
+
+    public ConversionStats withSeconds(Double seconds) {
+        this.seconds = seconds;
+        return this;
+    }
+
+    @JsonProperty("stages")
+    public Map<String, StageStats> getStages() {
+        return stages;
+    }
+
+    @JsonProperty("stages")
+    public void setStages(Map<String, StageStats> stages) {
+        this.stages = stages;
+    }
+
+    public ConversionStats withStages(Map<String, StageStats> stages) {
+        this.stages = stages;
+        return this;
+    }
+
+    @JsonProperty("libraries")
+    public Map<String, Map<String, StageStats>> getLibraries() {
+        return libraries;
+    }
+
+    @JsonProperty("libraries")
+    public void setLibraries(Map<String, Map<String, StageStats>> libraries) {
+        this.libraries = libraries;
+    }
+
+    public ConversionStats withLibraries(Map<String, Map<String, StageStats>> libraries) {
+        this.libraries = libraries;
+        return this;
+    }
+
+    @JsonAnyGetter
+    public Map<java.lang.String, Object> getAdditionalProperties() {
+        return this.additionalProperties;
+    }
+
+    @JsonAnySetter
+    public void setAdditionalProperties(java.lang.String name, Object value) {
+        this.additionalProperties.put(name, value);
+    }
+
+    @Override
+    public java.lang.String toString() {
+        return ((((((((("ConversionStats"+" [seconds=")+ seconds)+", stages=")+ stages)+", libraries=")+ libraries)+", additionalProperties=")+ additionalProperties)+"]");
+    }
+
+}
@@ -17,19 +17,60 @@ import com.fasterxml.jackson.annotation.JsonPropertyOrder;
  * The output of the convert method.
  * mapping<read_lib, ConvertedReadLibrary> files - a mapping
  *     of the read library workspace references to information
- *     about the converted data for each library.
+ *     about the converted data for each library. References that
+ *     point to the same object, e.g. MyWorkspace/MyReads and 256/3/6,
+ *     share the same converted data.
+ * mapping<read_lib, ConversionError> errors - a mapping of the read
+ *     library workspace references that failed to convert to the
+ *     error for each library. Failed libraries are not present in the
+ *     files mapping. Only present if continue_on_failure is true.
+ * ConversionStats stats - statistics about the conversion. Only
+ *     present if requested.
+ * string call_id - the ID the service generated for the conversion,
+ *     which identifies it in the service's logs and progress records.
+ *     For asynchronous jobs, this is the job ID.
  * </pre>
  * 
  */
 @JsonInclude(JsonInclude.Include.NON_NULL)
 @Generated("com.googlecode.jsonschema2pojo")
 @JsonPropertyOrder({
-    "files"
+    "files",
+    "errors",
+    "stats",
+    "call_id"
 })
 public class ConvertReadLibraryOutput {
 
     @JsonProperty("files")
     private Map<String, ConvertedReadLibrary> files;
+    @JsonProperty("errors")
+    private Map<String, ConversionError> errors;
+    /**
+     * <p>Original spec-file type: ConversionStats</p>
+     * <pre>
+     * Statistics for a conversion.
+     * float seconds - the wall clock time of the conversion.
+     * mapping<string, StageStats> stages - the statistics for each stage
+     *     of the conversion, summed over all the read libraries. The
+     *     stages are ws_fetch, batch_queue, shock_metadata, shock_download,
+     *     peer_download, gunzip, gzip, mv, split, interleave, and
+     *     deinterleave. ws_fetch is the workspace calls that fetch the read
+     *     library objects and resolve the references to them. batch_queue
+     *     is the time a batch priority conversion waited to start.
+     *     shock_metadata is the Shock calls for the reads file metadata.
+     *     Only the stages that ran are included.
+     * mapping<string, mapping<string, StageStats>> libraries - the
+     *     statistics for each stage for each read library, keyed by the
+     *     absolute reference of the library. The ws_fetch and batch_queue
+     *     stages run for several libraries at once and are not included.
+     * </pre>
+     * 
+     */
+    @JsonProperty("stats")
+    private ConversionStats stats;
+    @JsonProperty("call_id")
+    private java.lang.String callId;
     private Map<java.lang.String, Object> additionalProperties = new HashMap<java.lang.String, Object>();
 
     @JsonProperty("files")
@@ -47,6 +88,93 @@ public class ConvertReadLibraryOutput {
         return this;
     }
 
+    @JsonProperty("errors")
+    public Map<String, ConversionError> getErrors() {
+        return errors;
+    }
+
+    @JsonProperty("errors")
+    public void setErrors(Map<String, ConversionError> errors) {
+        this.errors = errors;
+    }
+
+    public ConvertReadLibraryOutput withErrors(Map<String, ConversionError> errors) {
+        this.errors = errors;
+        return this;
+    }
+
+    /**
+     * <p>Original spec-file type: ConversionStats</p>
+     * <pre>
+     * Statistics for a conversion.
+     * float seconds - the wall clock time of the conversion.
+     * mapping<string, StageStats> stages - the statistics for each stage
+     *     of the conversion, summed over all the read libraries. The
+     *     stages are ws_fetch, batch_queue, shock_metadata, shock_download,
+     *     peer_download, gunzip, gzip, mv, split, interleave, and
+     *     deinterleave. ws_fetch is the workspace calls that fetch the read
+     *     library objects and resolve the references to them. batch_queue
+     *     is the time a batch priority conversion waited to start.
+     *     shock_metadata is the Shock calls for the reads file metadata.
+     *     Only the stages that ran are included.
+     * mapping<string, mapping<string, StageStats>> libraries - the
+     *     statistics for each stage for each read library, keyed by the
+     *     absolute reference of the library. The ws_fetch and batch_queue
+     *     stages run for several libraries at once and are not included.
+     * </pre>
+     * 
+     */
+    @JsonProperty("stats")
+    public ConversionStats getStats() {
+        return stats;
+    }
+
+    /**
+     * <p>Original spec-file type: ConversionStats</p>
+     * <pre>
+     * Statistics for a conversion.
+     * float seconds - the wall clock time of the conversion.
+     * mapping<string, StageStats> stages - the statistics for each stage
+     *     of the conversion, summed over all the read libraries. The
+     *     stages are ws_fetch, batch_queue, shock_metadata, shock_download,
+     *     peer_download, gunzip, gzip, mv, split, interleave, and
+     *     deinterleave. ws_fetch is the workspace calls that fetch the read
+     *     library objects and resolve the references to them. batch_queue
+     *     is the time a batch priority conversion waited to start.
+     *     shock_metadata is the Shock calls for the reads file metadata.
+     *     Only the stages that ran are included.
+     * mapping<string, mapping<string, StageStats>> libraries - the
+     *     statistics for each stage for each read library, keyed by the
+     *     absolute reference of the library. The ws_fetch and batch_queue
+     *     stages run for several libraries at once and are not included.
+     * </pre>
+     * 
+     */
+    @JsonProperty("stats")
+    public void setStats(ConversionStats stats) {
+        this.stats = stats;
+    }
+
+    public ConvertReadLibraryOutput withStats(ConversionStats stats) {
+        this.stats = stats;
+        return this;
+    }
+
+    @JsonProperty("call_id")
+    public java.lang.String getCallId() {
+        return callId;
+    }
+
+    @JsonProperty("call_id")
+    public void setCallId(java.lang.String callId) {
+        this.callId = callId;
+    }
+
+    public ConvertReadLibraryOutput withCallId(java.lang.String callId) {
+        this.callId = callId;
+        return this;
+    }
+
     @JsonAnyGetter
     public Map<java.lang.String, Object> getAdditionalProperties() {
         return this.additionalProperties;
@@ -59,7 +187,7 @@ public class ConvertReadLibraryOutput {
 
     @Override
     public java.lang.String toString() {
-        return ((((("ConvertReadLibraryOutput"+" [files=")+ files)+", additionalProperties=")+ additionalProperties)+"]");
+        return ((((((((((("ConvertReadLibraryOutput"+" [files=")+ files)+", errors=")+ errors)+", stats=")+ stats)+", callId=")+ callId)+", additionalProperties=")+ additionalProperties)+"]");
     }
 
 }
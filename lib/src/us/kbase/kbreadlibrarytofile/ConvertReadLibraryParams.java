@@ -25,6 +25,28 @@ import com.fasterxml.jackson.annotation.JsonPropertyOrder;
  * tern interleaved - if true, provide the files in interleaved format if
  *     they are not already. If false, provide forward and reverse reads
  *     files. If null or missing, leave files as is.
+ * int chunks - if provided, split each reads file into this many files
+ *     of approximately equal size, e.g. for sharding the reads across
+ *     processes. Read pairs are never split, and the nth forward file
+ *     contains the mates of the reads in the nth reverse file. Must be
+ *     at least 1 and at most a maximum set by the service, 100 by
+ *     default. If null or missing, each reads file is provided as a
+ *     single file.
+ * string output_format - the format of the output files, either
+ *     'fastq' or 'fasta'. FASTA output omits the quality scores. If null
+ *     or missing, the files are provided in FASTQ format.
+ * bool stats - if true, include statistics about the time spent and
+ *     bytes processed by each stage of the conversion in the output.
+ *     Defaults to false.
+ * bool continue_on_failure - if true, a read library that fails to
+ *     convert does not fail the call. Instead, the error is reported in
+ *     the errors field of the output and the other read libraries are
+ *     converted as usual. Defaults to false.
+ * string priority - the priority of the conversion, either
+ *     'interactive' or 'batch'. Batch conversions use the capacity
+ *     interactive conversions leave, and the service may limit how
+ *     many run at once. If null or missing, conversions that download
+ *     more than a size set by the service are batch conversions.
  * </pre>
  * 
  */
@@ -33,7 +55,12 @@ import com.fasterxml.jackson.annotation.JsonPropertyOrder;
 @JsonPropertyOrder({
     "read_libraries",
     "gzip",
-    "interleaved"
+    "interleaved",
+    "chunks",
+    "output_format",
+    "stats",
+    "continue_on_failure",
+    "priority"
 })
 public class ConvertReadLibraryParams {
 
@@ -43,6 +70,16 @@ public class ConvertReadLibraryParams {
     private java.lang.String gzip;
     @JsonProperty("interleaved")
     private java.lang.String interleaved;
+    @JsonProperty("chunks")
+    private Long chunks;
+    @JsonProperty("output_format")
+    private java.lang.String outputFormat;
+    @JsonProperty("stats")
+    private java.lang.String stats;
+    @JsonProperty("continue_on_failure")
+    private java.lang.String continueOnFailure;
+    @JsonProperty("priority")
+    private java.lang.String priority;
     private Map<java.lang.String, Object> additionalProperties = new HashMap<java.lang.String, Object>();
 
     @JsonProperty("read_libraries")
@@ -90,6 +127,81 @@ public class ConvertReadLibraryParams {
         return this;
     }
 
+    @JsonProperty("chunks")
+    public Long getChunks() {
+        return chunks;
+    }
+
+    @JsonProperty("chunks")
+    public void setChunks(Long chunks) {
+        this.chunks = chunks;
+    }
+
+    public ConvertReadLibraryParams withChunks(Long chunks) {
+        this.chunks = chunks;
+        return this;
+    }
+
+    @JsonProperty("output_format")
+    public java.lang.String getOutputFormat() {
+        return outputFormat;
+    }
+
+    @JsonProperty("output_format")
+    public void setOutputFormat(java.lang.String outputFormat) {
+        this.outputFormat = outputFormat;
+    }
+
+    public ConvertReadLibraryParams withOutputFormat(java.lang.String outputFormat) {
+        this.outputFormat = outputFormat;
+        return this;
+    }
+
+    @JsonProperty("stats")
+    public java.lang.String getStats() {
+        return stats;
+    }
+
+    @JsonProperty("stats")
+    public void setStats(java.lang.String stats) {
+        this.stats = stats;
+    }
+
+    public ConvertReadLibraryParams withStats(java.lang.String stats) {
+        this.stats = stats;
+        return this;
+    }
+
+    @JsonProperty("continue_on_failure")
+    public java.lang.String getContinueOnFailure() {
+        return continueOnFailure;
+    }
+
+    @JsonProperty("continue_on_failure")
+    public void setContinueOnFailure(java.lang.String continueOnFailure) {
+        this.continueOnFailure = continueOnFailure;
+    }
+
+    public ConvertReadLibraryParams withContinueOnFailure(java.lang.String continueOnFailure) {
+        this.continueOnFailure = continueOnFailure;
+        return this;
+    }
+
+    @JsonProperty("priority")
+    public java.lang.String getPriority() {
+        return priority;
+    }
+
+    @JsonProperty("priority")
+    public void setPriority(java.lang.String priority) {
+        this.priority = priority;
+    }
+
+    public ConvertReadLibraryParams withPriority(java.lang.String priority) {
+        this.priority = priority;
+        return this;
+    }
+
     @JsonAnyGetter
     public Map<java.lang.String, Object> getAdditionalProperties() {
         return this.additionalProperties;
@@ -102,7 +214,7 @@ public class ConvertReadLibraryParams {
 
     @Override
     public java.lang.String toString() {
-        return ((((((((("ConvertReadLibraryParams"+" [readLibraries=")+ readLibraries)+", gzip=")+ gzip)+", interleaved=")+ interleaved)+", additionalProperties=")+ additionalProperties)+"]");
+        return ((((((((((((((((((("ConvertReadLibraryParams"+" [readLibraries=")+ readLibraries)+", gzip=")+ gzip)+", interleaved=")+ interleaved)+", chunks=")+ chunks)+", outputFormat=")+ outputFormat)+", stats=")+ stats)+", continueOnFailure=")+ continueOnFailure)+", priority=")+ priority)+", additionalProperties=")+ additionalProperties)+"]");
     }
 
 }
@@ -74,6 +74,17 @@ public class ConvertedReadLibrary {
      * bool rev_gz - whether the reverse / right reads are gzipped.
      * bool inter_gz - whether the interleaved reads are gzipped.
      * bool sing_gz - whether the single reads are gzipped.
+     * list<string> fwd_chunks - the paths to the forward / left reads
+     *     chunks.
+     * list<string> rev_chunks - the paths to the reverse / right reads
+     *     chunks.
+     * list<string> inter_chunks - the paths to the interleaved reads chunks.
+     * list<string> sing_chunks - the paths to the single end reads chunks.
+     * The *_chunks fields are provided instead of the fwd, rev, inter, and
+     * sing fields when the chunks parameter is set.
+     * The files may be hard links to files shared with other conversions
+     * and the service's caches, so they must not be modified in place. To
+     * change a file, write a new file and replace the old one with it.
      * </pre>
      * 
      */
@@ -145,6 +156,17 @@ public class ConvertedReadLibrary {
      * bool rev_gz - whether the reverse / right reads are gzipped.
      * bool inter_gz - whether the interleaved reads are gzipped.
      * bool sing_gz - whether the single reads are gzipped.
+     * list<string> fwd_chunks - the paths to the forward / left reads
+     *     chunks.
+     * list<string> rev_chunks - the paths to the reverse / right reads
+     *     chunks.
+     * list<string> inter_chunks - the paths to the interleaved reads chunks.
+     * list<string> sing_chunks - the paths to the single end reads chunks.
+     * The *_chunks fields are provided instead of the fwd, rev, inter, and
+     * sing fields when the chunks parameter is set.
+     * The files may be hard links to files shared with other conversions
+     * and the service's caches, so they must not be modified in place. To
+     * change a file, write a new file and replace the old one with it.
      * </pre>
      * 
      */
@@ -166,6 +188,17 @@ public class ConvertedReadLibrary {
      * bool rev_gz - whether the reverse / right reads are gzipped.
      * bool inter_gz - whether the interleaved reads are gzipped.
      * bool sing_gz - whether the single reads are gzipped.
+     * list<string> fwd_chunks - the paths to the forward / left reads
+     *     chunks.
+     * list<string> rev_chunks - the paths to the reverse / right reads
+     *     chunks.
+     * list<string> inter_chunks - the paths to the interleaved reads chunks.
+     * list<string> sing_chunks - the paths to the single end reads chunks.
+     * The *_chunks fields are provided instead of the fwd, rev, inter, and
+     * sing fields when the chunks parameter is set.
+     * The files may be hard links to files shared with other conversions
+     * and the service's caches, so they must not be modified in place. To
+     * change a file, write a new file and replace the old one with it.
      * </pre>
      * 
      */
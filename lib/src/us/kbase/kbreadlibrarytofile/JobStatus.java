@@ -0,0 +1,218 @@
+
+package us.kbase.kbreadlibrarytofile;
+
+import java.util.HashMap;
+import java.util.Map;
+import javax.annotation.Generated;
+import com.fasterxml.jackson.annotation.JsonAnyGetter;
+import com.fasterxml.jackson.annotation.JsonAnySetter;
+import com.fasterxml.jackson.annotation.JsonInclude;
+import com.fasterxml.jackson.annotation.JsonProperty;
+import com.fasterxml.jackson.annotation.JsonPropertyOrder;
+
+
+/**
+ * <p>Original spec-file type: JobStatus</p>
+ * <pre>
+ * The status of an asynchronous conversion job.
+ * job_id job_id - the ID of the job.
+ * string status - the status of the job, one of 'queued', 'running',
+ *     'complete', or 'error'.
+ * string error - the error message if the job failed. null otherwise.
+ * int submitted - the time the job was submitted in milliseconds since
+ *     the epoch.
+ * int started - the time the job started in milliseconds since the
+ *     epoch. null if the job has not started.
+ * int finished - the time the job finished in milliseconds since the
+ *     epoch. null if the job has not finished.
+ * ConversionProgress progress - the most recently recorded progress of
+ *     the job. null if the job has not started.
+ * </pre>
+ * 
+ */
+@JsonInclude(JsonInclude.Include.NON_NULL)
+@Generated("com.googlecode.jsonschema2pojo")
+@JsonPropertyOrder({
+    "job_id",
+    "status",
+    "error",
+    "submitted",
+    "started",
+    "finished",
+    "progress"
+})
+public class JobStatus {
+
+    @JsonProperty("job_id")
+    private String jobId;
+    @JsonProperty("status")
+    private String status;
+    @JsonProperty("error")
+    private String error;
+    @JsonProperty("submitted")
+    private Long submitted;
+    @JsonProperty("started")
+    private Long started;
+    @JsonProperty("finished")
+    private Long finished;
+    /**
+     * <p>Original spec-file type: ConversionProgress</p>
+     * <pre>
+     * The progress of a conversion.
+     * int libraries_total - the number of read libraries to convert.
+     * int libraries_done - the number of read libraries converted so far.
+     * string stage - the stage that is running, or null.
+     * int stage_bytes_done - the number of bytes the stage has processed.
+     * int stage_bytes_total - the number of bytes the stage will process.
+     * </pre>
+     * 
+     */
+    @JsonProperty("progress")
+    private ConversionProgress progress;
+    private Map<String, Object> additionalProperties = new HashMap<String, Object>();
+
+    @JsonProperty("job_id")
+    public String getJobId() {
+        return jobId;
+    }
+
+    @JsonProperty("job_id")
+    public void setJobId(String jobId) {
+        this.jobId = jobId;
+    }
+
+    public JobStatus withJobId(String jobId) {
+        this.jobId = jobId;
+        return this;
+    }
+
+    @JsonProperty("status")
+    public String getStatus() {
+        return status;
+    }
+
+    @JsonProperty("status")
+    public void setStatus(String status) {
+        this.status = status;
+    }
+
+    public JobStatus withStatus(String status) {
+        this.status = status;
+        return this;
+    }
+
+    @JsonProperty("error")
+    public String getError() {
+        return error;
+    }
+
+    @JsonProperty("error")
+    public void setError(String error) {
+        this.error = error;
+    }
+
+    public JobStatus withError(String error) {
+        this.error = error;
+        return this;
+    }
+
+    @JsonProperty("submitted")
+    public Long getSubmitted() {
+        return submitted;
+    }
+
+    @JsonProperty("submitted")
+    public void setSubmitted(Long submitted) {
+        this.submitted = submitted;
+    }
+
+    public JobStatus withSubmitted(Long submitted) {
+        this.submitted = submitted;
+        return this;
+    }
+
+    @JsonProperty("started")
+    public Long getStarted() {
+        return started;
+    }
+
+    @JsonProperty("started")
+    public void setStarted(Long started) {
+        this.started = started;
+    }
+
+    public JobStatus withStarted(Long started) {
+        this.started = started;
+        return this;
+    }
+
+    @JsonProperty("finished")
+    public Long getFinished() {
+        return finished;
+    }
+
+    @JsonProperty("finished")
+    public void setFinished(Long finished) {
+        this.finished = finished;
+    }
+
+    public JobStatus withFinished(Long finished) {
+        this.finished = finished;
+        return this;
+    }
+
+    /**
+     * <p>Original spec-file type: ConversionProgress</p>
+     * <pre>
+     * The progress of a conversion.
+     * int libraries_total - the number of read libraries to convert.
+     * int libraries_done - the number of read libraries converted so far.
+     * string stage - the stage that is running, or null.
+     * int stage_bytes_done - the number of bytes the stage has processed.
+     * int stage_bytes_total - the number of bytes the stage will process.
+     * </pre>
+     * 
+     */
+    @JsonProperty("progress")
+    public ConversionProgress getProgress() {
+        return progress;
+    }
+
+    /**
+     * <p>Original spec-file type: ConversionProgress</p>
+     * <pre>
+     * The progress of a conversion.
+     * int libraries_total - the number of read libraries to convert.
+     * int libraries_done - the number of read libraries converted so far.
+     * string stage - the stage that is running, or null.
+     * int stage_bytes_done - the number of bytes the stage has processed.
+     * int stage_bytes_total - the number of bytes the stage will process.
+     * </pre>
+     * 
+     */
+    @JsonProperty("progress")
+    public void setProgress(ConversionProgress progress) {
+        this.progress = progress;
+    }
+
+    public JobStatus withProgress(ConversionProgress progress) {
+        this.progress = progress;
+        return this;
+    }
+
+    @JsonAnyGetter
+    public Map<String, Object> getAdditionalProperties() {
+        return this.additionalProperties;
+    }
+
+    @JsonAnySetter
+    public void setAdditionalProperties(String name, Object value) {
+        this.additionalProperties.put(name, value);
+    }
+
+    @Override
+    public String toString() {
+        return ((((((((((((((((("JobStatus"+" [jobId=")+ jobId)+", status=")+ status)+", error=")+ error)+", submitted=")+ submitted)+", started=")+ started)+", finished=")+ finished)+", progress=")+ progress)+", additionalProperties=")+ additionalProperties)+"]");
+    }
+
+}
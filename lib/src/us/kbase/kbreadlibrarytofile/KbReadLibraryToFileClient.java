@@ -35,6 +35,7 @@ import us.kbase.common.service.UnauthorizedException;
  * - If a file downloaded from Shock has a .gz suffix, it is assumed to be
  *   gzipped.
  * - Files are assumed to be in correct fastq format.
+ * - Output files are in fastq format unless fasta format is requested.
  * </pre>
  */
 public class KbReadLibraryToFileClient {
@@ -231,4 +232,222 @@ public class KbReadLibraryToFileClient {
                 return res.getResult().get(0);
         }
     }
+
+    /**
+     * <p>Original spec-file function name: submit_convert_read_library_to_file</p>
+     * <pre>
+     * Submit a conversion job that runs in the background on the service.
+     * The job status and results are available from get_job_status and
+     * get_job_result.
+     * </pre>
+     * @param   params   instance of type {@link us.kbase.kbreadlibrarytofile.ConvertReadLibraryParams ConvertReadLibraryParams}
+     * @return   parameter "jobId" of original type "job_id" (The ID of an asynchronous conversion job.)
+     * @throws IOException if an IO exception occurs
+     * @throws JsonClientException if a JSON RPC exception occurs
+     */
+    protected String _submitConvertReadLibraryToFileSubmit(ConvertReadLibraryParams params, RpcContext... jsonRpcContext) throws IOException, JsonClientException {
+        if (asyncVersion != null) {
+            if (jsonRpcContext == null || jsonRpcContext.length == 0 || jsonRpcContext[0] == null)
+                jsonRpcContext = new RpcContext[] {new RpcContext()};
+            jsonRpcContext[0].getAdditionalProperties().put("service_ver", asyncVersion);
+        }
+        List<Object> args = new ArrayList<Object>();
+        args.add(params);
+        TypeReference<List<String>> retType = new TypeReference<List<String>>() {};
+        List<String> res = caller.jsonrpcCall("kb_read_library_to_file._submit_convert_read_library_to_file_submit", args, retType, true, true, jsonRpcContext);
+        return res.get(0);
+    }
+
+    /**
+     * <p>Original spec-file function name: submit_convert_read_library_to_file</p>
+     * <pre>
+     * Submit a conversion job that runs in the background on the service.
+     * The job status and results are available from get_job_status and
+     * get_job_result.
+     * </pre>
+     * @param   params   instance of type {@link us.kbase.kbreadlibrarytofile.ConvertReadLibraryParams ConvertReadLibraryParams}
+     * @return   parameter "jobId" of original type "job_id" (The ID of an asynchronous conversion job.)
+     * @throws IOException if an IO exception occurs
+     * @throws JsonClientException if a JSON RPC exception occurs
+     */
+    public String submitConvertReadLibraryToFile(ConvertReadLibraryParams params, RpcContext... jsonRpcContext) throws IOException, JsonClientException {
+        String jobId = _submitConvertReadLibraryToFileSubmit(params, jsonRpcContext);
+        TypeReference<List<JobState<List<String>>>> retType = new TypeReference<List<JobState<List<String>>>>() {};
+        while (true) {
+            if (Thread.currentThread().isInterrupted())
+                throw new JsonClientException("Thread was interrupted");
+            try { 
+                Thread.sleep(this.asyncJobCheckTimeMs);
+            } catch(Exception ex) {
+                throw new JsonClientException("Thread was interrupted", ex);
+            }
+            JobState<List<String>> res = _checkJob(jobId, retType);
+            if (res.getFinished() != 0L)
+                return res.getResult().get(0);
+        }
+    }
+
+    /**
+     * <p>Original spec-file function name: get_job_status</p>
+     * <pre>
+     * Get the status of a conversion job.
+     * </pre>
+     * @param   jobId   instance of original type "job_id" (The ID of an asynchronous conversion job.)
+     * @return   parameter "status" of type {@link us.kbase.kbreadlibrarytofile.JobStatus JobStatus}
+     * @throws IOException if an IO exception occurs
+     * @throws JsonClientException if a JSON RPC exception occurs
+     */
+    protected String _getJobStatusSubmit(String jobId, RpcContext... jsonRpcContext) throws IOException, JsonClientException {
+        if (asyncVersion != null) {
+            if (jsonRpcContext == null || jsonRpcContext.length == 0 || jsonRpcContext[0] == null)
+                jsonRpcContext = new RpcContext[] {new RpcContext()};
+            jsonRpcContext[0].getAdditionalProperties().put("service_ver", asyncVersion);
+        }
+        List<Object> args = new ArrayList<Object>();
+        args.add(jobId);
+        TypeReference<List<String>> retType = new TypeReference<List<String>>() {};
+        List<String> res = caller.jsonrpcCall("kb_read_library_to_file._get_job_status_submit", args, retType, true, true, jsonRpcContext);
+        return res.get(0);
+    }
+
+    /**
+     * <p>Original spec-file function name: get_job_status</p>
+     * <pre>
+     * Get the status of a conversion job.
+     * </pre>
+     * @param   jobId   instance of original type "job_id" (The ID of an asynchronous conversion job.)
+     * @return   parameter "status" of type {@link us.kbase.kbreadlibrarytofile.JobStatus JobStatus}
+     * @throws IOException if an IO exception occurs
+     * @throws JsonClientException if a JSON RPC exception occurs
+     */
+    public JobStatus getJobStatus(String jobId, RpcContext... jsonRpcContext) throws IOException, JsonClientException {
+        String asyncJobId = _getJobStatusSubmit(jobId, jsonRpcContext);
+        TypeReference<List<JobState<List<JobStatus>>>> retType = new TypeReference<List<JobState<List<JobStatus>>>>() {};
+        while (true) {
+            if (Thread.currentThread().isInterrupted())
+                throw new JsonClientException("Thread was interrupted");
+            try { 
+                Thread.sleep(this.asyncJobCheckTimeMs);
+            } catch(Exception ex) {
+                throw new JsonClientException("Thread was interrupted", ex);
+            }
+            JobState<List<JobStatus>> res = _checkJob(asyncJobId, retType);
+            if (res.getFinished() != 0L)
+                return res.getResult().get(0);
+        }
+    }
+
+    /**
+     * <p>Original spec-file function name: get_job_result</p>
+     * <pre>
+     * Get the results of a completed conversion job. Throws an error if the
+     * job failed or has not yet completed.
+     * </pre>
+     * @param   jobId   instance of original type "job_id" (The ID of an asynchronous conversion job.)
+     * @return   parameter "output" of type {@link us.kbase.kbreadlibrarytofile.ConvertReadLibraryOutput ConvertReadLibraryOutput}
+     * @throws IOException if an IO exception occurs
+     * @throws JsonClientException if a JSON RPC exception occurs
+     */
+    protected String _getJobResultSubmit(String jobId, RpcContext... jsonRpcContext) throws IOException, JsonClientException {
+        if (asyncVersion != null) {
+            if (jsonRpcContext == null || jsonRpcContext.length == 0 || jsonRpcContext[0] == null)
+                jsonRpcContext = new RpcContext[] {new RpcContext()};
+            jsonRpcContext[0].getAdditionalProperties().put("service_ver", asyncVersion);
+        }
+        List<Object> args = new ArrayList<Object>();
+        args.add(jobId);
+        TypeReference<List<String>> retType = new TypeReference<List<String>>() {};
+        List<String> res = caller.jsonrpcCall("kb_read_library_to_file._get_job_result_submit", args, retType, true, true, jsonRpcContext);
+        return res.get(0);
+    }
+
+    /**
+     * <p>Original spec-file function name: get_job_result</p>
+     * <pre>
+     * Get the results of a completed conversion job. Throws an error if the
+     * job failed or has not yet completed.
+     * </pre>
+     * @param   jobId   instance of original type "job_id" (The ID of an asynchronous conversion job.)
+     * @return   parameter "output" of type {@link us.kbase.kbreadlibrarytofile.ConvertReadLibraryOutput ConvertReadLibraryOutput}
+     * @throws IOException if an IO exception occurs
+     * @throws JsonClientException if a JSON RPC exception occurs
+     */
+    public ConvertReadLibraryOutput getJobResult(String jobId, RpcContext... jsonRpcContext) throws IOException, JsonClientException {
+        String asyncJobId = _getJobResultSubmit(jobId, jsonRpcContext);
+        TypeReference<List<JobState<List<ConvertReadLibraryOutput>>>> retType = new TypeReference<List<JobState<List<ConvertReadLibraryOutput>>>>() {};
+        while (true) {
+            if (Thread.currentThread().isInterrupted())
+                throw new JsonClientException("Thread was interrupted");
+            try { 
+                Thread.sleep(this.asyncJobCheckTimeMs);
+            } catch(Exception ex) {
+                throw new JsonClientException("Thread was interrupted", ex);
+            }
+            JobState<List<ConvertReadLibraryOutput>> res = _checkJob(asyncJobId, retType);
+            if (res.getFinished() != 0L)
+                return res.getResult().get(0);
+        }
+    }
+
+    /**
+     * <p>Original spec-file function name: prefetch_read_libraries</p>
+     * <pre>
+     * Download the reads files for read libraries to the service's staging
+     * area in the background, so that later conversions of the libraries
+     * read the files from local disk. Returns once the references have
+     * been resolved. Staged files expire if they are not used for a while
+     * and may be evicted if the staging area is full, in which case
+     * conversions download the files as usual. Throws an error if the
+     * service has no staging area.
+     * </pre>
+     * @param   params   instance of type {@link us.kbase.kbreadlibrarytofile.PrefetchReadLibrariesParams PrefetchReadLibrariesParams}
+     * @return   parameter "output" of type {@link us.kbase.kbreadlibrarytofile.PrefetchReadLibrariesOutput PrefetchReadLibrariesOutput}
+     * @throws IOException if an IO exception occurs
+     * @throws JsonClientException if a JSON RPC exception occurs
+     */
+    protected String _prefetchReadLibrariesSubmit(PrefetchReadLibrariesParams params, RpcContext... jsonRpcContext) throws IOException, JsonClientException {
+        if (asyncVersion != null) {
+            if (jsonRpcContext == null || jsonRpcContext.length == 0 || jsonRpcContext[0] == null)
+                jsonRpcContext = new RpcContext[] {new RpcContext()};
+            jsonRpcContext[0].getAdditionalProperties().put("service_ver", asyncVersion);
+        }
+        List<Object> args = new ArrayList<Object>();
+        args.add(params);
+        TypeReference<List<String>> retType = new TypeReference<List<String>>() {};
+        List<String> res = caller.jsonrpcCall("kb_read_library_to_file._prefetch_read_libraries_submit", args, retType, true, true, jsonRpcContext);
+        return res.get(0);
+    }
+
+    /**
+     * <p>Original spec-file function name: prefetch_read_libraries</p>
+     * <pre>
+     * Download the reads files for read libraries to the service's staging
+     * area in the background, so that later conversions of the libraries
+     * read the files from local disk. Returns once the references have
+     * been resolved. Staged files expire if they are not used for a while
+     * and may be evicted if the staging area is full, in which case
+     * conversions download the files as usual. Throws an error if the
+     * service has no staging area.
+     * </pre>
+     * @param   params   instance of type {@link us.kbase.kbreadlibrarytofile.PrefetchReadLibrariesParams PrefetchReadLibrariesParams}
+     * @return   parameter "output" of type {@link us.kbase.kbreadlibrarytofile.PrefetchReadLibrariesOutput PrefetchReadLibrariesOutput}
+     * @throws IOException if an IO exception occurs
+     * @throws JsonClientException if a JSON RPC exception occurs
+     */
+    public PrefetchReadLibrariesOutput prefetchReadLibraries(PrefetchReadLibrariesParams params, RpcContext... jsonRpcContext) throws IOException, JsonClientException {
+        String jobId = _prefetchReadLibrariesSubmit(params, jsonRpcContext);
+        TypeReference<List<JobState<List<PrefetchReadLibrariesOutput>>>> retType = new TypeReference<List<JobState<List<PrefetchReadLibrariesOutput>>>>() {};
+        while (true) {
+            if (Thread.currentThread().isInterrupted())
+                throw new JsonClientException("Thread was interrupted");
+            try { 
+                Thread.sleep(this.asyncJobCheckTimeMs);
+            } catch(Exception ex) {
+                throw new JsonClientException("Thread was interrupted", ex);
+            }
+            JobState<List<PrefetchReadLibrariesOutput>> res = _checkJob(jobId, retType);
+            if (res.getFinished() != 0L)
+                return res.getResult().get(0);
+        }
+    }
 }
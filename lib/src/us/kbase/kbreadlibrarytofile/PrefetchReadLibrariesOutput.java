@@ -0,0 +1,65 @@
+
+package us.kbase.kbreadlibrarytofile;
+
+import java.util.HashMap;
+import java.util.Map;
+import javax.annotation.Generated;
+import com.fasterxml.jackson.annotation.JsonAnyGetter;
+import com.fasterxml.jackson.annotation.JsonAnySetter;
+import com.fasterxml.jackson.annotation.JsonInclude;
+import com.fasterxml.jackson.annotation.JsonProperty;
+import com.fasterxml.jackson.annotation.JsonPropertyOrder;
+
+
+/**
+ * <p>Original spec-file type: PrefetchReadLibrariesOutput</p>
+ * <pre>
+ * The output of the prefetch method.
+ * mapping<read_lib, read_lib> refs - a mapping of the read library
+ *     workspace references to the absolute references of the objects
+ *     that will be prefetched.
+ * </pre>
+ * 
+ */
+@JsonInclude(JsonInclude.Include.NON_NULL)
+@Generated("com.googlecode.jsonschema2pojo")
+@JsonPropertyOrder({
+    "refs"
+})
+public class PrefetchReadLibrariesOutput {
+
+    @JsonProperty("refs")
+    private Map<String, String> refs;
+    private Map<java.lang.String, Object> additionalProperties = new HashMap<java.lang.String, Object>();
+
+    @JsonProperty("refs")
+    public Map<String, String> getRefs() {
+        return refs;
+    }
+
+    @JsonProperty("refs")
+    public void setRefs(Map<String, String> refs) {
+        this.refs = refs;
+    }
+
+    public PrefetchReadLibrariesOutput withRefs(Map<String, String> refs) {
+        this.refs = refs;
+        return this;
+    }
+
+    @JsonAnyGetter
+    public Map<java.lang.String, Object> getAdditionalProperties() {
+        return this.additionalProperties;
+    }
+
+    @JsonAnySetter
+    public void setAdditionalProperties(java.lang.String name, Object value) {
+        this.additionalProperties.put(name, value);
+    }
+
+    @Override
+    public java.lang.String toString() {
+        return ((((("PrefetchReadLibrariesOutput"+" [refs=")+ refs)+", additionalProperties=")+ additionalProperties)+"]");
+    }
+
+}
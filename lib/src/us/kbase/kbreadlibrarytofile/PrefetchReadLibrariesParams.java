@@ -0,0 +1,65 @@
+
+package us.kbase.kbreadlibrarytofile;
+
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+import javax.annotation.Generated;
+import com.fasterxml.jackson.annotation.JsonAnyGetter;
+import com.fasterxml.jackson.annotation.JsonAnySetter;
+import com.fasterxml.jackson.annotation.JsonInclude;
+import com.fasterxml.jackson.annotation.JsonProperty;
+import com.fasterxml.jackson.annotation.JsonPropertyOrder;
+
+
+/**
+ * <p>Original spec-file type: PrefetchReadLibrariesParams</p>
+ * <pre>
+ * Input parameters for prefetching read libraries.
+ * list<read_lib> read_libraries - the names of the workspace read
+ *     library objects to prefetch.
+ * </pre>
+ * 
+ */
+@JsonInclude(JsonInclude.Include.NON_NULL)
+@Generated("com.googlecode.jsonschema2pojo")
+@JsonPropertyOrder({
+    "read_libraries"
+})
+public class PrefetchReadLibrariesParams {
+
+    @JsonProperty("read_libraries")
+    private List<String> readLibraries;
+    private Map<java.lang.String, Object> additionalProperties = new HashMap<java.lang.String, Object>();
+
+    @JsonProperty("read_libraries")
+    public List<String> getReadLibraries() {
+        return readLibraries;
+    }
+
+    @JsonProperty("read_libraries")
+    public void setReadLibraries(List<String> readLibraries) {
+        this.readLibraries = readLibraries;
+    }
+
+    public PrefetchReadLibrariesParams withReadLibraries(List<String> readLibraries) {
+        this.readLibraries = readLibraries;
+        return this;
+    }
+
+    @JsonAnyGetter
+    public Map<java.lang.String, Object> getAdditionalProperties() {
+        return this.additionalProperties;
+    }
+
+    @JsonAnySetter
+    public void setAdditionalProperties(java.lang.String name, Object value) {
+        this.additionalProperties.put(name, value);
+    }
+
+    @Override
+    public java.lang.String toString() {
+        return ((((("PrefetchReadLibrariesParams"+" [readLibraries=")+ readLibraries)+", additionalProperties=")+ additionalProperties)+"]");
+    }
+
+}
@@ -2,6 +2,7 @@
 package us.kbase.kbreadlibrarytofile;
 
 import java.util.HashMap;
+import java.util.List;
 import java.util.Map;
 import javax.annotation.Generated;
 import com.fasterxml.jackson.annotation.JsonAnyGetter;
@@ -24,6 +25,17 @@ import com.fasterxml.jackson.annotation.JsonPropertyOrder;
  * bool rev_gz - whether the reverse / right reads are gzipped.
  * bool inter_gz - whether the interleaved reads are gzipped.
  * bool sing_gz - whether the single reads are gzipped.
+ * list<string> fwd_chunks - the paths to the forward / left reads
+ *     chunks.
+ * list<string> rev_chunks - the paths to the reverse / right reads
+ *     chunks.
+ * list<string> inter_chunks - the paths to the interleaved reads chunks.
+ * list<string> sing_chunks - the paths to the single end reads chunks.
+ * The *_chunks fields are provided instead of the fwd, rev, inter, and
+ * sing fields when the chunks parameter is set.
+ * The files may be hard links to files shared with other conversions
+ * and the service's caches, so they must not be modified in place. To
+ * change a file, write a new file and replace the old one with it.
  * </pre>
  * 
  */
@@ -34,6 +46,10 @@ import com.fasterxml.jackson.annotation.JsonPropertyOrder;
     "rev",
     "inter",
     "sing",
+    "fwd_chunks",
+    "rev_chunks",
+    "inter_chunks",
+    "sing_chunks",
     "fwd_gz",
     "rev_gz",
     "inter_gz",
@@ -42,156 +58,224 @@ import com.fasterxml.jackson.annotation.JsonPropertyOrder;
 public class ReadsFiles {
 
     @JsonProperty("fwd")
-    private String fwd;
+    private java.lang.String fwd;
     @JsonProperty("rev")
-    private String rev;
+    private java.lang.String rev;
     @JsonProperty("inter")
-    private String inter;
+    private java.lang.String inter;
     @JsonProperty("sing")
-    private String sing;
+    private java.lang.String sing;
+    @JsonProperty("fwd_chunks")
+    private List<String> fwdChunks;
+    @JsonProperty("rev_chunks")
+    private List<String> revChunks;
+    @JsonProperty("inter_chunks")
+    private List<String> interChunks;
+    @JsonProperty("sing_chunks")
+    private List<String> singChunks;
     @JsonProperty("fwd_gz")
-    private String fwdGz;
+    private java.lang.String fwdGz;
     @JsonProperty("rev_gz")
-    private String revGz;
+    private java.lang.String revGz;
     @JsonProperty("inter_gz")
-    private String interGz;
+    private java.lang.String interGz;
     @JsonProperty("sing_gz")
-    private String singGz;
-    private Map<String, Object> additionalProperties = new HashMap<String, Object>();
+    private java.lang.String singGz;
+    private Map<java.lang.String, Object> additionalProperties = new HashMap<java.lang.String, Object>();
 
     @JsonProperty("fwd")
-    public String getFwd() {
+    public java.lang.String getFwd() {
         return fwd;
     }
 
     @JsonProperty("fwd")
-    public void setFwd(String fwd) {
+    public void setFwd(java.lang.String fwd) {
         this.fwd = fwd;
     }
 
-    public ReadsFiles withFwd(String fwd) {
+    public ReadsFiles withFwd(java.lang.String fwd) {
         this.fwd = fwd;
         return this;
     }
 
     @JsonProperty("rev")
-    public String getRev() {
+    public java.lang.String getRev() {
         return rev;
     }
 
     @JsonProperty("rev")
-    public void setRev(String rev) {
+    public void setRev(java.lang.String rev) {
         this.rev = rev;
     }
 
-    public ReadsFiles withRev(String rev) {
+    public ReadsFiles withRev(java.lang.String rev) {
         this.rev = rev;
         return this;
     }
 
     @JsonProperty("inter")
-    public String getInter() {
+    public java.lang.String getInter() {
         return inter;
     }
 
     @JsonProperty("inter")
-    public void setInter(String inter) {
+    public void setInter(java.lang.String inter) {
         this.inter = inter;
     }
 
-    public ReadsFiles withInter(String inter) {
+    public ReadsFiles withInter(java.lang.String inter) {
         this.inter = inter;
         return this;
     }
 
     @JsonProperty("sing")
-    public String getSing() {
+    public java.lang.String getSing() {
         return sing;
     }
 
     @JsonProperty("sing")
-    public void setSing(String sing) {
+    public void setSing(java.lang.String sing) {
         this.sing = sing;
     }
 
-    public ReadsFiles withSing(String sing) {
+    public ReadsFiles withSing(java.lang.String sing) {
         this.sing = sing;
         return this;
     }
 
+    @JsonProperty("fwd_chunks")
+    public List<String> getFwdChunks() {
+        return fwdChunks;
+    }
+
+    @JsonProperty("fwd_chunks")
+    public void setFwdChunks(List<String> fwdChunks) {
+        this.fwdChunks = fwdChunks;
+    }
+
+    public ReadsFiles withFwdChunks(List<String> fwdChunks) {
+        this.fwdChunks = fwdChunks;
+        return this;
+    }
+
+    @JsonProperty("rev_chunks")
+    public List<String> getRevChunks() {
+        return revChunks;
+    }
+
+    @JsonProperty("rev_chunks")
+    public void setRevChunks(List<String> revChunks) {
+        this.revChunks = revChunks;
+    }
+
+    public ReadsFiles withRevChunks(List<String> revChunks) {
+        this.revChunks = revChunks;
+        return this;
+    }
+
+    @JsonProperty("inter_chunks")
+    public List<String> getInterChunks() {
+        return interChunks;
+    }
+
+    @JsonProperty("inter_chunks")
+    public void setInterChunks(List<String> interChunks) {
+        this.interChunks = interChunks;
+    }
+
+    public ReadsFiles withInterChunks(List<String> interChunks) {
+        this.interChunks = interChunks;
+        return this;
+    }
+
+    @JsonProperty("sing_chunks")
+    public List<String> getSingChunks() {
+        return singChunks;
+    }
+
+    @JsonProperty("sing_chunks")
+    public void setSingChunks(List<String> singChunks) {
+        this.singChunks = singChunks;
+    }
+
+    public ReadsFiles withSingChunks(List<String> singChunks) {
+        this.singChunks = singChunks;
+        return this;
+    }
+
     @JsonProperty("fwd_gz")
-    public String getFwdGz() {
+    public java.lang.String getFwdGz() {
         return fwdGz;
     }
 
     @JsonProperty("fwd_gz")
-    public void setFwdGz(String fwdGz) {
+    public void setFwdGz(java.lang.String fwdGz) {
         this.fwdGz = fwdGz;
     }
 
-    public ReadsFiles withFwdGz(String fwdGz) {
+    public ReadsFiles withFwdGz(java.lang.String fwdGz) {
         this.fwdGz = fwdGz;
         return this;
     }
 
     @JsonProperty("rev_gz")
-    public String getRevGz() {
+    public java.lang.String getRevGz() {
         return revGz;
     }
 
     @JsonProperty("rev_gz")
-    public void setRevGz(String revGz) {
+    public void setRevGz(java.lang.String revGz) {
         this.revGz = revGz;
     }
 
-    public ReadsFiles withRevGz(String revGz) {
+    public ReadsFiles withRevGz(java.lang.String revGz) {
         this.revGz = revGz;
         return this;
     }
 
     @JsonProperty("inter_gz")
-    public String getInterGz() {
+    public java.lang.String getInterGz() {
         return interGz;
     }
 
     @JsonProperty("inter_gz")
-    public void setInterGz(String interGz) {
+    public void setInterGz(java.lang.String interGz) {
         this.interGz = interGz;
     }
 
-    public ReadsFiles withInterGz(String interGz) {
+    public ReadsFiles withInterGz(java.lang.String interGz) {
         this.interGz = interGz;
         return this;
     }
 
     @JsonProperty("sing_gz")
-    public String getSingGz() {
+    public java.lang.String getSingGz() {
         return singGz;
     }
 
     @JsonProperty("sing_gz")
-    public void setSingGz(String singGz) {
+    public void setSingGz(java.lang.String singGz) {
         this.singGz = singGz;
     }
 
-    public ReadsFiles withSingGz(String singGz) {
+    public ReadsFiles withSingGz(java.lang.String singGz) {
         this.singGz = singGz;
         return this;
     }
 
     @JsonAnyGetter
-    public Map<String, Object> getAdditionalProperties() {
+    public Map<java.lang.String, Object> getAdditionalProperties() {
         return this.additionalProperties;
     }
 
     @JsonAnySetter
-    public void setAdditionalProperties(String name, Object value) {
+    public void setAdditionalProperties(java.lang.String name, Object value) {
         this.additionalProperties.put(name, value);
     }
 
     @Override
-    public String toString() {
-        return ((((((((((((((((((("ReadsFiles"+" [fwd=")+ fwd)+", rev=")+ rev)+", inter=")+ inter)+", sing=")+ sing)+", fwdGz=")+ fwdGz)+", revGz=")+ revGz)+", interGz=")+ interGz)+", singGz=")+ singGz)+", additionalProperties=")+ additionalProperties)+"]");
+    public java.lang.String toString() {
+        return ((((((((((((((((((((((((((("ReadsFiles"+" [fwd=")+ fwd)+", rev=")+ rev)+", inter=")+ inter)+", sing=")+ sing)+", fwdChunks=")+ fwdChunks)+", revChunks=")+ revChunks)+", interChunks=")+ interChunks)+", singChunks=")+ singChunks)+", fwdGz=")+ fwdGz)+", revGz=")+ revGz)+", interGz=")+ interGz)+", singGz=")+ singGz)+", additionalProperties=")+ additionalProperties)+"]");
     }
 
 }
@@ -0,0 +1,121 @@
+
+package us.kbase.kbreadlibrarytofile;
+
+import java.util.HashMap;
+import java.util.Map;
+import javax.annotation.Generated;
+import com.fasterxml.jackson.annotation.JsonAnyGetter;
+import com.fasterxml.jackson.annotation.JsonAnySetter;
+import com.fasterxml.jackson.annotation.JsonInclude;
+import com.fasterxml.jackson.annotation.JsonProperty;
+import com.fasterxml.jackson.annotation.JsonPropertyOrder;
+
+
+/**
+ * <p>Original spec-file type: StageStats</p>
+ * <pre>
+ * Statistics for a stage of a conversion.
+ * float seconds - the wall clock time spent in the stage.
+ * int bytes_read - the number of bytes read by the stage.
+ * int bytes_written - the number of bytes written by the stage.
+ * float bytes_per_sec - the number of bytes read per second. null if
+ *     the stage took no measurable time.
+ * </pre>
+ * 
+ */
+@JsonInclude(JsonInclude.Include.NON_NULL)
+@Generated("com.googlecode.jsonschema2pojo")
+@JsonPropertyOrder({
+    "seconds",
+    "bytes_read",
+    "bytes_written",
+    "bytes_per_sec"
+})
+public class StageStats {
+
+    @JsonProperty("seconds")
+    private Double seconds;
+    @JsonProperty("bytes_read")
+    private Long bytesRead;
+    @JsonProperty("bytes_written")
+    private Long bytesWritten;
+    @JsonProperty("bytes_per_sec")
+    private Double bytesPerSec;
+    private Map<String, Object> additionalProperties = new HashMap<String, Object>();
+
+    @JsonProperty("seconds")
+    public Double getSeconds() {
+        return seconds;
+    }
+
+    @JsonProperty("seconds")
+    public void setSeconds(Double seconds) {
+        this.seconds = seconds;
+    }
+
+    public StageStats withSeconds(Double seconds) {
+        this.seconds = seconds;
+        return this;
+    }
+
+    @JsonProperty("bytes_read")
+    public Long getBytesRead() {
+        return bytesRead;
+    }
+
+    @JsonProperty("bytes_read")
+    public void setBytesRead(Long bytesRead) {
+        this.bytesRead = bytesRead;
+    }
+
+    public StageStats withBytesRead(Long bytesRead) {
+        this.bytesRead = bytesRead;
+        return this;
+    }
+
+    @JsonProperty("bytes_written")
+    public Long getBytesWritten() {
+        return bytesWritten;
+    }
+
+    @JsonProperty("bytes_written")
+    public void setBytesWritten(Long bytesWritten) {
+        this.bytesWritten = bytesWritten;
+    }
+
+    public StageStats withBytesWritten(Long bytesWritten) {
+        this.bytesWritten = bytesWritten;
+        return this;
+    }
+
+    @JsonProperty("bytes_per_sec")
+    public Double getBytesPerSec() {
+        return bytesPerSec;
+    }
+
+    @JsonProperty("bytes_per_sec")
+    public void setBytesPerSec(Double bytesPerSec) {
+        this.bytesPerSec = bytesPerSec;
+    }
+
+    public StageStats withBytesPerSec(Double bytesPerSec) {
+        this.bytesPerSec = bytesPerSec;
+        return this;
+    }
+
+    @JsonAnyGetter
+    public Map<String, Object> getAdditionalProperties() {
+        return this.additionalProperties;
+    }
+
+    @JsonAnySetter
+    public void setAdditionalProperties(String name, Object value) {
+        this.additionalProperties.put(name, value);
+    }
+
+    @Override
+    public String toString() {
+        return ((((((((((("StageStats"+" [seconds=")+ seconds)+", bytesRead=")+ bytesRead)+", bytesWritten=")+ bytesWritten)+", bytesPerSec=")+ bytesPerSec)+", additionalProperties=")+ additionalProperties)+"]");
+    }
+
+}
@@ -0,0 +1,56 @@
+'''
+Measures the wall clock time of a minimal job run through the async CLI, which
+is dominated by the start up time of the server module, and fails if the
+median time exceeds a threshold.
+Requires KB_DEPLOYMENT_CONFIG to be set and lib to be on the PYTHONPATH.
+'''
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+SERVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                      'lib', 'kb_read_library_to_file',
+                      'kb_read_library_to_fileServer.py')
+
+# The CLI took about 0.15s on a developer machine when the threshold was set.
+# It leaves room for slower machines and catches start up regressions that
+# are large enough to matter for short jobs.
+MAX_MEDIAN_SEC_DEFAULT = 1.0
+
+if __name__ == "__main__":
+    if len(sys.argv) > 3:
+        print("Usage: <program> [number of runs, default 10] " +
+              "[maximum median seconds, default {}]".format(
+                  MAX_MEDIAN_SEC_DEFAULT))
+        sys.exit(1)
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    max_median = float(sys.argv[2]) if len(sys.argv) > 2 \
+        else MAX_MEDIAN_SEC_DEFAULT
+    tempdir = tempfile.mkdtemp()
+    try:
+        infile = os.path.join(tempdir, 'input.json')
+        outfile = os.path.join(tempdir, 'output.json')
+        with open(infile, 'w') as f:
+            json.dump({'method': 'kb_read_library_to_file.status',
+                       'params': []}, f)
+        times = []
+        for _ in range(runs):
+            start = time.time()
+            subprocess.check_call([sys.executable, SERVER, infile, outfile])
+            times.append(time.time() - start)
+        times.sort()
+        median = times[len(times) // 2]
+        print(('Async CLI runs: {}, min: {:.3f}s, median: {:.3f}s, ' +
+               'max: {:.3f}s').format(runs, times[0], median, times[-1]))
+    finally:
+        shutil.rmtree(tempdir)
+    if median > max_median:
+        print('FAIL: the median exceeds the threshold of {:.3f}s'.format(
+            max_median))
+        sys.exit(1)
+    print('OK: the median is within the threshold of {:.3f}s'.format(
+        max_median))
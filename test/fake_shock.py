@@ -0,0 +1,152 @@
+'''
+A local fake Shock server and a base test case that converts reads objects
+with files in it, shared by the tests that run conversions.
+'''
+import unittest
+import gzip
+import hashlib
+import json
+import shutil
+import tempfile
+import threading
+from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from io import BytesIO
+from SocketServer import ThreadingMixIn
+
+from kb_read_library_to_file.kb_read_library_to_fileImpl import kb_read_library_to_file  # @IgnorePep8
+
+
+FWD = ''.join('@r{}/1\nACGTACGT\n+\nIIIIIIII\n'.format(i)
+              for i in xrange(20000))
+REV = ''.join('@r{}/2\nTTGGCCAA\n+\nIIIIIIII\n'.format(i)
+              for i in xrange(20000))
+_FWD_LINES = FWD.splitlines(True)
+_REV_LINES = REV.splitlines(True)
+INTER = ''.join(''.join(_FWD_LINES[i:i + 4] + _REV_LINES[i:i + 4])
+                for i in xrange(0, len(_FWD_LINES), 4))
+
+
+def gz(data):
+    b = BytesIO()
+    g = gzip.GzipFile(fileobj=b, mode='wb')
+    g.write(data)
+    g.close()
+    return b.getvalue()
+
+
+# node id -> (file name, contents)
+NODES = {'fwd': ('fwd.fastq.gz', gz(FWD)),
+         'rev': ('rev.fastq', REV),
+         'inter': ('inter.fq.gz', gz(INTER)),
+         'flaky': ('inter.fq.gz', gz(INTER)),
+         # claims to be gzipped but isn't
+         'corrupt': ('rev.fastq.gz', REV)}
+# request path -> the number of times to fail the request
+FAILURES = {}
+# the paths of the requests the server has received
+REQUESTS = []
+
+
+class ShockHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        REQUESTS.append(self.path)
+        if FAILURES.get(self.path):
+            FAILURES[self.path] -= 1
+            self.send_response(503)
+            self.end_headers()
+            self.wfile.write(json.dumps({'error': ['try again']}))
+            return
+        path, _, query = self.path.partition('?')
+        node = path.split('/')[-1]
+        if node not in NODES:
+            self.send_response(404)
+            self.end_headers()
+            self.wfile.write(json.dumps({'error': ['Node not found']}))
+            return
+        name, data = NODES[node]
+        if query != 'download':
+            data = json.dumps({'data': {'file': {
+                'name': name,
+                'size': len(data),
+                'checksum': {'md5': hashlib.md5(data).hexdigest()}}}})
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class FakeShockTestCase(unittest.TestCase):
+    '''
+    Runs a fake Shock server for the test case and creates an Impl with its
+    own scratch directory for each test.
+    '''
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), ShockHandler)
+        t = threading.Thread(target=cls.server.serve_forever)
+        t.daemon = True
+        t.start()
+        cls.shock_url = 'http://127.0.0.1:{}'.format(cls.server.server_port)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        del REQUESTS[:]
+        FAILURES.clear()
+        self.scratch = tempfile.mkdtemp()
+        self.impl = self.make_impl(self.scratch)
+
+    def tearDown(self):
+        shutil.rmtree(self.scratch)
+
+    def make_impl(self, scratch, **config):
+        cfg = {'workspace-url': 'http://localhost:1',
+               'shock-url': self.shock_url,
+               'scratch': scratch,
+               'process-download-connections': 4,
+               'retry-base-delay-sec': 0.01}
+        cfg.update(config)
+        return kb_read_library_to_file(cfg)
+
+    # for paired reads, node is a gzipped reverse reads node
+    def reads(self, paired, node=None, ref=None):
+        handle = lambda node: {'url': self.shock_url, 'id': node}
+        if paired:
+            data = {'lib1': {'file': handle('fwd'), 'type': 'fq.gz'},
+                    'lib2': {'file': handle(node or 'rev'),
+                             'type': 'fq.gz' if node else 'fq'}}
+            ref = ref or '1/1/1'
+        else:
+            data = {'lib1': {'file': handle(node or 'inter'),
+                             'type': 'fq.gz'}}
+            ref = ref or '1/2/1'
+        info = [int(ref.split('/')[1]), 'reads' + ref[2], 'KBaseFile.' +
+                'PairedEndLibrary-2.0', None, 1, 'user', 1, 'ws', None, 0,
+                None]
+        return ref, {'info': info, 'data': data}
+
+    def read_file(self, path, gzipped):
+        with (gzip.open if gzipped else open)(path, 'rb') as f:
+            return f.read()
+
+    def check_files(self, files):
+        if 'inter' in files:
+            self.assertEqual(INTER, self.read_file(
+                files['inter'], files['inter_gz'] == 'true'))
+        else:
+            self.assertEqual(FWD, self.read_file(
+                files['fwd'], files['fwd_gz'] == 'true'))
+            self.assertEqual(REV, self.read_file(
+                files['rev'], files['rev_gz'] == 'true'))
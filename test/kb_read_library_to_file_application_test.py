@@ -0,0 +1,187 @@
+import unittest
+import json
+import sys
+import threading
+import time
+import traceback
+from io import BytesIO
+
+from jsonrpcbase import ServerError as JSONServerError
+
+from kb_read_library_to_file import kb_read_library_to_fileServer as server
+from kb_read_library_to_file.kb_read_library_to_fileServer import JSONRPCServiceCustom  # @IgnorePep8
+from kb_read_library_to_file.batch import BatchRunner
+from kb_read_library_to_file.cache import TokenCache
+
+
+class FakeAuthClient(object):
+
+    def __init__(self):
+        self.calls = []
+
+    def validate_token(self, token):
+        self.calls.append(token)
+        if token != 'good':
+            raise ValueError('Invalid token')
+        return 'user1', None, None
+
+
+class BatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+        self.ran = []
+        self.all_running = threading.Event()
+        self.blocking = threading.Event()
+        self.impl = server.impl_kb_read_library_to_file
+        self.rpc_batches = self.impl.rpc_batches
+
+    def tearDown(self):
+        self.impl.rpc_batches = self.rpc_batches
+
+    # the server runs batches with the Impl's runner
+    def service(self, batch_concurrency):
+        self.impl.rpc_batches = BatchRunner(batch_concurrency)
+        s = JSONRPCServiceCustom()
+        s.add(self.sleep, name='sleep', types=[float])
+        s.add(self.wait, name='wait', types=[int])
+        s.add(self.block, name='block')
+        s.add(self.error, name='error')
+        return s
+
+    def enter(self, name):
+        with self.lock:
+            self.ran.append(name)
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            return self.running
+
+    def leave(self):
+        with self.lock:
+            self.running -= 1
+
+    def sleep(self, ctx, seconds):
+        self.enter(seconds)
+        time.sleep(seconds)
+        self.leave()
+        return [seconds]
+
+    def wait(self, ctx, count):
+        # waits for count requests to be running at once
+        if self.enter(count) == count:
+            self.all_running.set()
+        self.all_running.wait(5)
+        self.leave()
+        return [count]
+
+    def block(self, ctx):
+        self.enter('block')
+        self.blocking.set()
+        time.sleep(0.2)
+        self.leave()
+        return []
+
+    def error(self, ctx):
+        # fails while the block request is running, if run concurrently
+        self.blocking.wait(5)
+        self.enter('error')
+        self.leave()
+        raise ValueError('failed')
+
+    def batch(self, service, calls):
+        return service.call_py({}, [
+            {'version': '1.1', 'id': i, 'method': m, 'params': p}
+            for i, (m, p) in enumerate(calls)])
+
+    def test_order(self):
+        s = self.service(3)
+        # later requests finish first
+        res = self.batch(s, [('sleep', [0.3]), ('sleep', [0.2]),
+                             ('sleep', [0.1])])
+        self.assertEqual([0, 1, 2], [r['id'] for r in res])
+        self.assertEqual([[0.3], [0.2], [0.1]], [r['result'] for r in res])
+
+    def test_concurrent(self):
+        s = self.service(3)
+        res = self.batch(s, [('wait', [3])] * 3)
+        self.assertTrue(self.all_running.is_set())
+        self.assertEqual(3, self.max_running)
+        self.assertEqual([[3]] * 3, [r['result'] for r in res])
+
+    def test_sequential(self):
+        s = self.service(1)
+        res = self.batch(s, [('sleep', [0.01])] * 3)
+        self.assertEqual(1, self.max_running)
+        self.assertEqual([0, 1, 2], [r['id'] for r in res])
+
+    def check_failure(self, batch_concurrency):
+        s = self.service(batch_concurrency)
+        calls = [('block', []), ('error', []), ('sleep', [0.01]),
+                 ('sleep', [0.02])]
+        try:
+            self.batch(s, calls)
+        except JSONServerError as e:
+            self.assertEqual('failed', e.data)
+            self.assertIn('ValueError: failed', e.trace)
+            # the traceback is from the failed request, not the batch handler
+            tb = traceback.extract_tb(sys.exc_info()[2])
+            self.assertEqual('_call_method', tb[-1][2])
+        else:
+            self.fail('expected the batch to fail')
+        return self.ran
+
+    def test_failure_sequential(self):
+        self.assertEqual(['block', 'error'], self.check_failure(1))
+
+    def test_failure_concurrent(self):
+        # the request running alongside the failure finishes, but no
+        # further requests are started
+        self.assertEqual(['block', 'error'], self.check_failure(2))
+        self.assertEqual(2, self.max_running)
+
+
+class TokenCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.app = server.Application()
+        self.auth = FakeAuthClient()
+        self.impl = server.impl_kb_read_library_to_file
+        self.token_cache = self.impl.token_cache
+        self.impl.token_cache = TokenCache(10, 0.5)
+        self.app._auth_client = self.impl.cached_auth_client(self.auth)
+        self.app.rpc_service.add(lambda ctx: [ctx['user_id']],
+                                 name='test.whoami')
+        self.app.method_authentication['test.whoami'] = 'required'
+
+    def tearDown(self):
+        self.impl.token_cache = self.token_cache
+        self.impl.sweeper.stop()
+
+    def call(self, token):
+        body = json.dumps({'version': '1.1', 'id': '1',
+                           'method': 'test.whoami', 'params': []})
+        environ = {'REQUEST_METHOD': 'POST', 'REMOTE_ADDR': '127.0.0.1',
+                   'CONTENT_LENGTH': str(len(body)),
+                   'HTTP_AUTHORIZATION': token, 'wsgi.input': BytesIO(body)}
+        return json.loads(''.join(self.app(environ, lambda s, h: None)))
+
+    def test_cached_token(self):
+        self.assertEqual(['user1'], self.call('good')['result'])
+        self.assertEqual(['user1'], self.call('good')['result'])
+        self.assertEqual(['good'], self.auth.calls)
+
+    def test_expired_token(self):
+        self.call('good')
+        time.sleep(0.6)
+        self.assertEqual(['user1'], self.call('good')['result'])
+        self.assertEqual(['good', 'good'], self.auth.calls)
+
+    def test_invalid_token(self):
+        for _ in range(2):
+            res = self.call('bad')
+            self.assertEqual('Token validation failed: Invalid token',
+                             res['error']['message'])
+        self.assertEqual(['bad', 'bad'], self.auth.calls)
+        self.assertEqual(0, len(self.impl.token_cache))
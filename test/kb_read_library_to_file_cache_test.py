@@ -0,0 +1,72 @@
+import unittest
+import time
+
+from kb_read_library_to_file.cache import LRUCache
+from kb_read_library_to_file.cache import TokenCache
+
+
+class LRUCacheTest(unittest.TestCase):
+
+    def test_evict_least_recently_used(self):
+        c = LRUCache(2)
+        c.put('a', 1)
+        c.put('b', 2)
+        self.assertEqual(1, c.get('a'))
+        c.put('c', 3)
+        self.assertEqual(1, c.get('a'))
+        self.assertEqual(None, c.get('b'))
+        self.assertEqual(3, c.get('c'))
+        self.assertEqual(2, len(c))
+        self.assertEqual(3, c.hits)
+        self.assertEqual(1, c.misses)
+
+    def test_disabled(self):
+        c = LRUCache(0)
+        c.put('a', 1)
+        self.assertEqual(None, c.get('a'))
+        self.assertEqual(0, len(c))
+
+    def test_bad_size(self):
+        with self.assertRaises(ValueError) as context:
+            LRUCache(-1)
+        self.assertEqual('maxsize must be >= 0', str(context.exception))
+
+
+class TokenCacheTest(unittest.TestCase):
+
+    def test_get_user(self):
+        c = TokenCache(10, 300)
+        c.add_valid_token('token1', 'user1')
+        c.add_valid_token('token2', 'user2')
+        self.assertEqual('user1', c.get_user('token1'))
+        self.assertEqual('user2', c.get_user('token2'))
+        self.assertEqual(None, c.get_user('token3'))
+
+    def test_tokens_not_stored_in_clear(self):
+        c = TokenCache(10, 300)
+        c.add_valid_token('token1', 'user1')
+        self.assertNotIn('token1', c._cache)
+
+    def test_expiry(self):
+        c = TokenCache(10, 1)
+        c.add_valid_token('token1', 'user1')
+        self.assertEqual('user1', c.get_user('token1'))
+        time.sleep(1.1)
+        self.assertEqual(None, c.get_user('token1'))
+        self.assertEqual(0, len(c))
+
+    def test_max_size(self):
+        c = TokenCache(2, 300)
+        c.add_valid_token('token1', 'user1')
+        c.add_valid_token('token2', 'user2')
+        c.add_valid_token('token3', 'user3')
+        self.assertEqual(2, len(c))
+        self.assertEqual(None, c.get_user('token1'))
+        self.assertEqual('user2', c.get_user('token2'))
+        self.assertEqual('user3', c.get_user('token3'))
+
+    def test_disabled(self):
+        for size, ttl in [(0, 300), (10, 0)]:
+            c = TokenCache(size, ttl)
+            c.add_valid_token('token1', 'user1')
+            self.assertEqual(None, c.get_user('token1'))
@@ -0,0 +1,237 @@
+import unittest
+import fcntl
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from kb_read_library_to_file.coalesce import Coalescer
+from kb_read_library_to_file.kb_read_library_to_fileImpl import ConversionRequest  # @IgnorePep8
+from kb_read_library_to_file.kb_read_library_to_fileImpl import ConversionStats  # @IgnorePep8
+
+from fake_shock import FakeShockTestCase, REQUESTS
+
+
+class CoalescerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.calls = []
+        self.release = threading.Event()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def work(self, result='done'):
+        def func():
+            self.calls.append(result)
+            self.release.wait()
+            return result
+        return func
+
+    def start(self, coalescer, results, i, func, share=lambda r: r + '-copy'):
+        def run():
+            try:
+                results[i] = coalescer.run('key', func, share)
+            except Exception as e:
+                results[i] = e
+        t = threading.Thread(target=run)
+        t.start()
+        return t
+
+    def wait_for_calls(self, count):
+        for _ in xrange(200):
+            if len(self.calls) >= count:
+                return
+            time.sleep(0.01)
+        self.fail('expected {} calls, got {}'.format(count, self.calls))
+
+    def test_followers_share_the_result(self):
+        c = Coalescer(self.dir)
+        results = [None] * 4
+        threads = [self.start(c, results, 0, self.work())]
+        self.wait_for_calls(1)
+        threads += [self.start(c, results, i, self.work('other'))
+                    for i in xrange(1, 4)]
+        time.sleep(0.1)
+        self.release.set()
+        for t in threads:
+            t.join()
+        self.assertEqual(['done'], self.calls)
+        self.assertEqual([('done', False)] + [('done-copy', True)] * 3,
+                         results)
+
+    def test_leader_failure(self):
+        c = Coalescer(self.dir)
+
+        def fail():
+            self.calls.append('fail')
+            self.release.wait()
+            raise ValueError('whoops')
+        results = [None] * 2
+        threads = [self.start(c, results, 0, fail)]
+        self.wait_for_calls(1)
+        threads.append(self.start(c, results, 1, self.work()))
+        self.release.set()
+        for t in threads:
+            t.join()
+        self.assertEqual(['fail', 'done'], self.calls)
+        self.assertEqual('whoops', str(results[0]))
+        self.assertEqual(('done', False), results[1])
+
+    def test_share_failure(self):
+        log = []
+        c = Coalescer(self.dir, log.append)
+
+        def share(result):
+            raise OSError('gone')
+        results = [None] * 2
+        threads = [self.start(c, results, 0, self.work('first'))]
+        self.wait_for_calls(1)
+        threads.append(self.start(c, results, 1, self.work('second'), share))
+        time.sleep(0.1)
+        self.release.set()
+        for t in threads:
+            t.join()
+        self.assertEqual(['first', 'second'], self.calls)
+        self.assertEqual([('first', False), ('second', False)], results)
+        self.assertEqual(['Could not share the result of coalesced work: ' +
+                          'gone'], log)
+
+    def test_across_processes(self):
+        # coalescers with their own state stand in for other processes
+        results = [None] * 2
+        threads = [self.start(Coalescer(self.dir), results, 0, self.work())]
+        self.wait_for_calls(1)
+        threads.append(self.start(Coalescer(self.dir), results, 1,
+                                  self.work('other')))
+        time.sleep(0.1)
+        self.release.set()
+        for t in threads:
+            t.join()
+        self.assertEqual(['done'], self.calls)
+        self.assertEqual([('done', False), ('done-copy', True)], results)
+
+    def test_no_reuse_of_finished_work(self):
+        self.release.set()
+        c = Coalescer(self.dir)
+        self.assertEqual(('done', False), c.run('key', self.work(), None))
+        self.assertEqual(('again', False),
+                         Coalescer(self.dir).run('key', self.work('again'),
+                                                 None))
+        self.assertEqual(['done', 'again'], self.calls)
+
+    def test_deleted_lock_file(self):
+        self.release.set()
+        c = Coalescer(self.dir)
+        c.run('key', self.work(), None)
+        for f in os.listdir(self.dir):
+            os.remove(os.path.join(self.dir, f))
+        self.assertEqual(('again', False), c.run('key', self.work('again'),
+                                                 None))
+
+    def test_prune(self):
+        self.release.set()
+        c = Coalescer(self.dir)
+        c.run('key', self.work(), None)
+        c.run('key2', self.work(), None)
+        self.assertEqual(0, c.prune(3600))
+        old = time.time() - 7200
+        for f in os.listdir(self.dir):
+            os.utime(os.path.join(self.dir, f), (old, old))
+        # a lock file that's held is kept
+        lock = c._paths('key2')[0]
+        with open(lock) as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            self.assertEqual(3, c.prune(3600))
+        self.assertEqual([os.path.basename(lock)], os.listdir(self.dir))
+        self.assertEqual(('again', False), c.run('key', self.work('again'),
+                                                 None))
+
+
+class LinkFilesTest(FakeShockTestCase):
+
+    def test_link_files(self):
+        req = ConversionRequest(
+            'token', None, None, 2, False,
+            progress=self.impl.progress.start('call', 1))
+        reads = [self.reads(True)]
+        files = self.impl.convert_reads(
+            reads, {ref: [ref] for ref, _ in reads}, req)['1/1/1']['files']
+        other = ConversionRequest('token', None, None, 2, False)
+        linked = self.impl.link_files(files, other)
+        self.assertEqual(sorted(files.keys()), sorted(linked.keys()))
+        self.assertEqual(files['fwd_gz'], linked['fwd_gz'])
+        for key in ['fwd_chunks', 'rev_chunks']:
+            self.assertEqual(2, len(linked[key]))
+            for path, linkpath in zip(files[key], linked[key]):
+                self.assertNotEqual(path, linkpath)
+                self.assertEqual(path.split('.', 1)[1],
+                                 linkpath.split('.', 1)[1])
+                self.assertTrue(os.path.samefile(path, linkpath))
+        self.assertEqual(set(linked['fwd_chunks'] + linked['rev_chunks']),
+                         other.files)
+
+
+class CoalescedConversionTest(FakeShockTestCase):
+    '''
+    Converts the same read library twice at once, holding up the first
+    conversion until the second one waits for it.
+    '''
+
+    def setUp(self):
+        super(CoalescedConversionTest, self).setUp()
+        self.release = threading.Event()
+        self.calls = []
+        process_files = self.impl.process_files
+
+        def blocking_process_files(*args):
+            self.calls.append(args[0])
+            self.release.wait()
+            return process_files(*args)
+        self.impl.process_files = blocking_process_files
+
+    def convert(self, results, i):
+        def run():
+            try:
+                req = ConversionRequest(
+                    'token', True, None, None, False, ConversionStats(),
+                    progress=self.impl.progress.start('call' + str(i), 1))
+                reads = [self.reads(True)]
+                files = self.impl.convert_reads(
+                    reads, {ref: [ref] for ref, _ in reads}, req)['1/1/1']
+                results[i] = files['files'], req.stats.to_output()['stages']
+            except Exception as e:
+                results[i] = e
+        t = threading.Thread(target=run)
+        t.start()
+        return t
+
+    def test_follower_links_leader_output(self):
+        results = [None] * 2
+        threads = [self.convert(results, 0)]
+        for _ in xrange(200):
+            if self.calls:
+                break
+            time.sleep(0.01)
+        threads.append(self.convert(results, 1))
+        time.sleep(0.1)
+        self.release.set()
+        for t in threads:
+            t.join()
+        for r in results:
+            if isinstance(r, Exception):
+                raise r
+        (leader, _), (follower, stages) = results
+        self.check_files(follower)
+        # only the leader converted the files
+        self.assertEqual(['1/1/1'], self.calls)
+        self.assertEqual(2, len([r for r in REQUESTS
+                                 if r.endswith('?download')]))
+        # the follower neither downloaded nor rewrote the files
+        self.assertEqual(['shock_metadata'], stages.keys())
+        for key in ['fwd', 'rev']:
+            self.assertNotEqual(leader[key], follower[key])
+            self.assertEqual(os.stat(leader[key]).st_ino,
+                             os.stat(follower[key]).st_ino)
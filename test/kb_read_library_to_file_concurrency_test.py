@@ -0,0 +1,58 @@
+import unittest
+import os
+import threading
+
+from kb_read_library_to_file.kb_read_library_to_fileImpl import ConversionRequest  # @IgnorePep8
+from kb_read_library_to_file.kb_read_library_to_fileImpl import PARTIAL
+
+from fake_shock import FakeShockTestCase
+
+
+class ConcurrencyTest(FakeShockTestCase):
+    '''
+    Runs many conversions of the same Shock nodes at once.
+    '''
+
+    def convert(self, results, i):
+        try:
+            # vary the options so every code path runs concurrently
+            zipped = [None, True, False][i % 3]
+            interleave = [None, True, False][(i // 3) % 3]
+            req = ConversionRequest(
+                'token', zipped, interleave, None, False,
+                progress=self.impl.progress.start('call' + str(i), 2),
+                user='user' + str(i % 4))
+            req.stream = i % 2 == 0
+            reads = [self.reads(True), self.reads(False)]
+            out = self.impl.convert_reads(
+                reads, {ref: [ref] for ref, _ in reads}, req)
+            results[i] = out
+        except Exception as e:
+            results[i] = e
+
+    def test_concurrent_conversions(self):
+        count = 24
+        results = [None] * count
+        threads = [threading.Thread(target=self.convert, args=(results, i))
+                   for i in xrange(count)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        outputs = []
+        for r in results:
+            if isinstance(r, Exception):
+                raise r
+            for files in r.values():
+                self.check_files(files['files'])
+                outputs.extend(v for v in files['files'].values()
+                               if v and v.startswith(self.scratch))
+        # every conversion wrote its own output files
+        self.assertEqual(len(outputs), len(set(outputs)))
+        shock_temp = os.path.join(self.scratch, 'shock_tmp')
+        self.assertEqual([], os.listdir(shock_temp))
+        for f in os.listdir(self.scratch):
+            self.assertFalse(f.endswith(PARTIAL))
+        self.assertEqual((0, 0), self.impl.downloads.counts())
+        self.assertEqual(set(), self.impl.files_in_use())
+        self.assertEqual(0, self.impl.scratch_planner.reserved)
@@ -0,0 +1,55 @@
+import unittest
+import os
+
+from kb_read_library_to_file.kb_read_library_to_fileImpl import ConversionRequest  # @IgnorePep8
+
+from fake_shock import FakeShockTestCase
+
+
+class ContinueOnFailureTest(FakeShockTestCase):
+
+    def test_continue_on_failure(self):
+        req = ConversionRequest(
+            'token', False, None, None, False,
+            progress=self.impl.progress.start('call', 3),
+            continue_on_failure=True)
+        reads = [self.reads(True, 'corrupt', '1/3/1'),
+                 self.reads(False, 'missing', '1/4/1'),
+                 self.reads(True)]
+        out = self.impl.convert_reads(
+            reads, {ref: [ref] for ref, _ in reads}, req)
+        self.assertEqual(['1/1/1'], out.keys())
+        files = out['1/1/1']['files']
+        self.check_files(files)
+        self.assertEqual(['1/3/1', '1/4/1'], sorted(req.errors))
+        self.assertEqual(
+            {'error': 'Not a gzipped file', 'type': 'IOError',
+             'transient': 'false'},
+            self.impl.error_output(req.errors['1/3/1']))
+        self.assertEqual(
+            {'error': 'Error downloading reads for object 1/4/1 (reads4) ' +
+                      'from Shock node missing: Node not found',
+             'type': 'ShockError', 'transient': 'false'},
+            self.impl.error_output(req.errors['1/4/1']))
+        self.assertEqual(2, self.impl.m_library_errors.get(type='IOError') +
+                         self.impl.m_library_errors.get(type='ShockError'))
+        # the forward reads converted before the failure are deleted
+        outputs = [f for f in os.listdir(self.scratch)
+                   if os.path.isfile(os.path.join(self.scratch, f))]
+        self.assertEqual(sorted([files['fwd'], files['rev']]),
+                         sorted(os.path.join(self.scratch, f)
+                                for f in outputs))
+        self.assertEqual([], os.listdir(os.path.join(self.scratch,
+                                                     'shock_tmp')))
+        self.assertEqual(set(), self.impl.files_in_use())
+
+    def test_failure_without_continue(self):
+        req = ConversionRequest(
+            'token', False, None, None, False,
+            progress=self.impl.progress.start('call', 2))
+        self.assertIsNone(req.errors)
+        reads = [self.reads(True), self.reads(True, 'corrupt', '1/3/1')]
+        with self.assertRaises(IOError) as context:
+            self.impl.convert_reads(
+                reads, {ref: [ref] for ref, _ in reads}, req)
+        self.assertEqual('Not a gzipped file', str(context.exception))
@@ -0,0 +1,182 @@
+import unittest
+import threading
+import time
+from io import BytesIO
+
+from kb_read_library_to_file.downloads import DownloadScheduler, TokenBucket
+from kb_read_library_to_file.priority import INTERACTIVE, BATCH, BACKGROUND
+
+
+class DownloadsTest(unittest.TestCase):
+
+    def wait_for(self, cond, timeout=5):
+        end = time.time() + timeout
+        while not cond():
+            if time.time() > end:
+                raise AssertionError('Timed out')
+            time.sleep(0.01)
+
+    def start(self, scheduler, user, request, started, priority=INTERACTIVE):
+        def run():
+            scheduler.acquire(user, request, priority=priority)
+            started.append((user, request))
+        t = threading.Thread(target=run)
+        t.daemon = True
+        t.start()
+        return t
+
+    def test_connection_limits(self):
+        s = DownloadScheduler(3, 2)
+        started = []
+        for r in ['r1', 'r2', 'r3']:
+            self.start(s, 'u1', r, started)
+        self.start(s, 'u2', 'r4', started)
+        self.start(s, 'u2', 'r5', started)
+        # u1 is limited to 2 downloads, and the total to 3
+        self.wait_for(lambda: len(started) == 3)
+        time.sleep(0.1)
+        self.assertEqual((3, 2), s.counts())
+        self.assertEqual([('u1', 'r1'), ('u1', 'r2'), ('u2', 'r4')],
+                         sorted(started))
+        s.release('u2', 'r4')
+        self.wait_for(lambda: len(started) == 4)
+        time.sleep(0.1)
+        self.assertEqual(('u2', 'r5'), started[3])
+        s.release('u1', 'r1')
+        self.wait_for(lambda: len(started) == 5)
+        self.assertEqual((3, 0), s.counts())
+
+    def test_nested(self):
+        s = DownloadScheduler(1, 1)
+        started = []
+        s.acquire('u1', 'r1', True)
+        self.start(s, 'u2', 'r2', started)
+        self.wait_for(lambda: s.counts() == (1, 1))
+        # r1 jumps the queue and exceeds the limits
+        s.acquire('u1', 'r1', True)
+        self.assertEqual((2, 1), s.counts())
+        s.release('u1', 'r1')
+        s.release('u1', 'r1')
+        self.wait_for(lambda: started)
+        self.assertEqual((1, 0), s.counts())
+
+    def test_fair_admission(self):
+        s = DownloadScheduler(1)
+        s.acquire('u0', 'hold')
+        started = []
+        # the big request queues two downloads before the small request
+        # queues its one
+        for user, request in [('u1', 'big'), ('u1', 'big'),
+                              ('u2', 'small')]:
+            n = s.counts()[1] + 1
+            self.start(s, user, request, started)
+            self.wait_for(lambda: s.counts()[1] == n)
+        s.release('u0', 'hold')
+        for i in xrange(3):
+            self.wait_for(lambda: len(started) == i + 1)
+            time.sleep(0.05)
+            self.assertEqual(i + 1, len(started))
+            s.release(*started[i])
+        self.assertEqual([('u1', 'big'), ('u2', 'small'), ('u1', 'big')],
+                         started)
+
+    def test_background(self):
+        s = DownloadScheduler(3, 0, 0, 1)
+        s.acquire('u0', 'hold')
+        s.acquire('u0', 'hold')
+        started = []
+        self.start(s, 'u1', 'prefetch1', started, BACKGROUND)
+        self.start(s, 'u1', 'prefetch2', started, BACKGROUND)
+        # one background download runs in the free slot
+        self.wait_for(lambda: len(started) == 1)
+        time.sleep(0.1)
+        self.assertEqual((3, 1), s.counts())
+        s.release(*started[0])
+        self.wait_for(lambda: len(started) == 2)
+        # other downloads go first
+        self.start(s, 'u2', 'r1', started)
+        self.start(s, 'u3', 'r2', started)
+        self.wait_for(lambda: s.counts() == (3, 2))
+        self.start(s, 'u1', 'prefetch3', started, BACKGROUND)
+        self.wait_for(lambda: s.counts() == (3, 3))
+        s.release(*started[1])
+        self.wait_for(lambda: len(started) == 3)
+        s.release('u0', 'hold')
+        self.wait_for(lambda: len(started) == 4)
+        time.sleep(0.1)
+        self.assertEqual([('u2', 'r1'), ('u3', 'r2')], sorted(started[2:]))
+        s.release('u0', 'hold')
+        self.wait_for(lambda: len(started) == 5)
+        self.assertEqual(('u1', 'prefetch3'), started[4])
+        self.assertEqual((3, 0), s.counts())
+
+    def test_priorities(self):
+        s = DownloadScheduler(3, 0, 0, 1, 1)
+        started = []
+        for r in ['b1', 'b2', 'b3']:
+            self.start(s, 'u1', r, started, BATCH)
+        # one connection is reserved for interactive downloads
+        self.wait_for(lambda: s.counts() == (2, 1))
+        self.start(s, 'u2', 'i1', started)
+        self.wait_for(lambda: len(started) == 3)
+        self.assertEqual(('u2', 'i1'), started[2])
+        self.start(s, 'u2', 'i2', started)
+        self.wait_for(lambda: s.counts() == (3, 2))
+        # interactive downloads go first
+        s.release('u1', started[0][1])
+        self.wait_for(lambda: len(started) == 4)
+        time.sleep(0.1)
+        self.assertEqual(('u2', 'i2'), started[3])
+        self.assertEqual((3, 1), s.counts())
+        for user, request in started[1:4]:
+            s.release(user, request)
+        self.wait_for(lambda: len(started) == 5)
+        self.assertTrue(started[4][1].startswith('b'))
+        self.assertEqual((1, 0), s.counts())
+
+    def test_batch_bandwidth(self):
+        s = DownloadScheduler(2, 0, 0, 1, 0, 1000)
+        start = time.time()
+        s.throttle(2000, INTERACTIVE)
+        self.assertLess(time.time() - start, 0.1)
+        s.throttle(1000, BATCH)
+        s.throttle(500, BACKGROUND)
+        self.assertGreater(time.time() - start, 0.4)
+
+    def test_bad_priority(self):
+        with self.assertRaises(ValueError) as context:
+            DownloadScheduler(1).acquire('u1', 'r1', priority='urgent')
+        self.assertEqual('Invalid priority: urgent', str(context.exception))
+
+    def test_wrap(self):
+        s = DownloadScheduler(1, 0, 1000000)
+        s.acquire('u1', 'r1')
+        stream = s.wrap(BytesIO('abc'), 'u1', 'r1')
+        self.assertEqual('ab', stream.read(2))
+        self.assertEqual((1, 0), s.counts())
+        stream.close()
+        stream.close()
+        self.assertEqual((0, 0), s.counts())
+
+    def test_token_bucket(self):
+        b = TokenBucket(1000)
+        start = time.time()
+        self.assertEqual(0, b.consume(1000))
+        self.assertGreater(b.consume(500), 0.4)
+        self.assertGreater(time.time() - start, 0.4)
+
+    def test_bad_connections(self):
+        with self.assertRaises(ValueError) as context:
+            DownloadScheduler(0)
+        self.assertEqual('connections must be at least 1',
+                         str(context.exception))
+        with self.assertRaises(ValueError) as context:
+            DownloadScheduler(1, background=0)
+        self.assertEqual('background must be at least 1',
+                         str(context.exception))
+        for reserved in [-1, 1]:
+            with self.assertRaises(ValueError) as context:
+                DownloadScheduler(1, reserved=reserved)
+            self.assertEqual(
+                'reserved must be at least 0 and less than connections',
+                str(context.exception))
@@ -0,0 +1,179 @@
+import unittest
+import os
+import shutil
+import tempfile
+import time
+
+from kb_read_library_to_file.filecache import FileCache
+from kb_read_library_to_file.kb_read_library_to_fileImpl import ConversionRequest  # @IgnorePep8
+from kb_read_library_to_file.kb_read_library_to_fileImpl import ConversionStats  # @IgnorePep8
+
+from fake_shock import FakeShockTestCase, REQUESTS
+
+
+class FileCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.cachedir = os.path.join(self.dir, 'cache')
+        os.mkdir(self.cachedir)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def make_file(self, name, size):
+        path = os.path.join(self.dir, name)
+        with open(path, 'w') as f:
+            f.write('x' * size)
+        return path
+
+    def test_get_and_put(self):
+        c = FileCache(self.cachedir, 100)
+        self.assertIsNone(c.get('key'))
+        paths = [self.make_file('a.fq', 10), self.make_file('b.fq', 20)]
+        self.assertTrue(c.put('key', paths, {'fwd': 'a.fq'}))
+        meta, cached = c.get('key')
+        self.assertEqual({'fwd': 'a.fq'}, meta)
+        self.assertEqual(['a.fq', 'b.fq'], sorted(cached.keys()))
+        for p in paths:
+            self.assertTrue(os.path.samefile(
+                p, cached[os.path.basename(p)]))
+        # deleting the originals doesn't affect the cache
+        for p in paths:
+            os.remove(p)
+        with open(c.get('key')[1]['b.fq']) as f:
+            self.assertEqual('x' * 20, f.read())
+        self.assertEqual((1, 30), c.size())
+        self.assertEqual((2, 1), (c.hits, c.misses))
+        # the temporary directory is gone
+        self.assertEqual([FileCache.LOCK, os.path.basename(
+            os.path.dirname(cached['a.fq']))], sorted(os.listdir(
+                self.cachedir)))
+
+    def test_put_existing(self):
+        c = FileCache(self.cachedir, 100)
+        self.assertTrue(c.put('key', [self.make_file('a.fq', 10)], 1))
+        self.assertTrue(c.put('key', [self.make_file('b.fq', 10)], 2))
+        self.assertEqual(1, c.get('key')[0])
+
+    def test_disabled(self):
+        c = FileCache(self.cachedir, 0)
+        self.assertFalse(c.put('key', [self.make_file('a.fq', 10)]))
+        self.assertIsNone(c.get('key'))
+        self.assertEqual([], os.listdir(self.cachedir))
+
+    def test_too_large(self):
+        c = FileCache(self.cachedir, 10)
+        self.assertFalse(c.put('key', [self.make_file('a.fq', 11)]))
+        self.assertIsNone(c.get('key'))
+
+    def test_lru_eviction(self):
+        c = FileCache(self.cachedir, 25)
+        c.put('k1', [self.make_file('1.fq', 10)])
+        c.put('k2', [self.make_file('2.fq', 10)])
+        # make k1 the oldest entry, and then use it
+        manifest = os.path.join(c._entry('k1'), FileCache.MANIFEST)
+        os.utime(manifest, (time.time() - 10, time.time() - 10))
+        self.assertIsNotNone(c.get('k1'))
+        c.put('k3', [self.make_file('3.fq', 10)])
+        self.assertIsNotNone(c.get('k1'))
+        self.assertIsNone(c.get('k2'))
+        self.assertIsNotNone(c.get('k3'))
+        self.assertEqual((2, 20), c.size())
+
+    def test_expiry(self):
+        c = FileCache(self.cachedir, 100, max_age=60)
+        c.put('k1', [self.make_file('1.fq', 10)])
+        c.put('k2', [self.make_file('2.fq', 10)])
+        manifest = os.path.join(c._entry('k1'), FileCache.MANIFEST)
+        os.utime(manifest, (time.time() - 61, time.time() - 61))
+        self.assertIsNone(c.get('k1'))
+        self.assertIsNotNone(c.get('k2'))
+        self.assertEqual((2, 20), c.size())
+        c.evict()
+        self.assertEqual((1, 10), c.size())
+        self.assertFalse(os.path.exists(c._entry('k1')))
+
+    def test_stale_temporary_directories(self):
+        c = FileCache(self.cachedir, 100)
+        old = os.path.join(self.cachedir, FileCache.TMP_PREFIX + 'old')
+        new = os.path.join(self.cachedir, FileCache.TMP_PREFIX + 'new')
+        for d in [old, new]:
+            os.mkdir(d)
+        then = time.time() - FileCache.TMP_MAX_AGE - 1
+        os.utime(old, (then, then))
+        c.put('key', [self.make_file('a.fq', 10)])
+        self.assertFalse(os.path.exists(old))
+        self.assertTrue(os.path.exists(new))
+
+    def test_invalid_max_bytes(self):
+        with self.assertRaises(ValueError) as context:
+            FileCache(self.cachedir, -1)
+        self.assertEqual('max_bytes must be >= 0', str(context.exception))
+        with self.assertRaises(ValueError) as context:
+            FileCache(self.cachedir, 1, max_age=0)
+        self.assertEqual('max_age must be > 0', str(context.exception))
+
+
+class OutputCacheTest(FakeShockTestCase):
+
+    def test_output_cache(self):
+        self.impl.output_cache.max_bytes = 10 ** 9
+        reads = [self.reads(True), self.reads(False)]
+        outputs = []
+        for i in xrange(2):
+            del REQUESTS[:]
+            req = ConversionRequest(
+                'token', True, True, None, False,
+                progress=self.impl.progress.start('call' + str(i), 2))
+            out = self.impl.convert_reads(
+                reads, {ref: [ref] for ref, _ in reads}, req)
+            outputs.append(out)
+            for lib in out.values():
+                self.check_files(lib['files'])
+        # the second conversion only fetched the node metadata
+        self.assertEqual(['/node/fwd', '/node/rev', '/node/inter'], REQUESTS)
+        self.assertEqual(2, self.impl.m_output_cache.get(result='miss'))
+        self.assertEqual(2, self.impl.m_output_cache.get(result='hit'))
+        for ref in ['1/1/1', '1/2/1']:
+            first = outputs[0][ref]['files']['inter']
+            second = outputs[1][ref]['files']['inter']
+            self.assertNotEqual(first, second)
+            self.assertTrue(os.path.samefile(first, second))
+        self.assertEqual(2, self.impl.output_cache.size()[0])
+
+        # different options are cached separately
+        req = ConversionRequest(
+            'token', False, True, None, False,
+            progress=self.impl.progress.start('call', 1))
+        out = self.impl.convert_reads(reads[1:], {'1/2/1': ['1/2/1']}, req)
+        self.check_files(out['1/2/1']['files'])
+        self.assertEqual(3, self.impl.m_output_cache.get(result='miss'))
+        self.assertEqual(3, self.impl.output_cache.size()[0])
+
+    def test_cached_output_linked(self):
+        self.impl.output_cache.max_bytes = 10 ** 9
+        self.impl.node_cache.max_bytes = 10 ** 9
+        reads = [self.reads(True)]
+
+        def convert(name):
+            req = ConversionRequest(
+                'token', True, None, None, False, ConversionStats(),
+                progress=self.impl.progress.start(name, 1))
+            files = self.impl.convert_reads(
+                reads, {ref: [ref] for ref, _ in reads}, req)['1/1/1']
+            return files['files'], req.stats.to_output()['stages']
+        files, _ = convert('call1')
+        cached = [os.path.join(d, f) for d, _, fs in os.walk(
+            self.impl.output_cache.directory) for f in fs
+            if f.endswith('.gz')]
+        self.assertEqual(2, len(cached))
+        linked, stages = convert('call2')
+        self.check_files(linked)
+        # the cached output is linked rather than copied or converted
+        self.assertEqual(['shock_metadata'], stages.keys())
+        for key in ['fwd', 'rev']:
+            self.assertNotEqual(files[key], linked[key])
+            self.assertTrue(os.path.samefile(files[key], linked[key]))
+            self.assertTrue(any(os.path.samefile(linked[key], c)
+                                for c in cached))
@@ -0,0 +1,119 @@
+import unittest
+import os
+import shutil
+import socket
+import subprocess
+import tempfile
+import time
+
+from kb_read_library_to_file.jobs import JobStore, JobRunner
+
+
+class JobsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.dbpath = os.path.join(self.tempdir, 'jobs.sqlite3')
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def wait_for(self, store, job_id, timeout=10):
+        end = time.time() + timeout
+        while time.time() < end:
+            job = store.get(job_id)
+            if job['status'] in (JobStore.COMPLETE, JobStore.ERROR):
+                return job
+            time.sleep(0.05)
+        raise AssertionError('Job {} did not finish'.format(job_id))
+
+    def test_store_lifecycle(self):
+        store = JobStore(self.dbpath)
+        job_id = store.create('user1', 'host:1', {'foo': 'bar'})
+        job = store.get(job_id)
+        self.assertEqual(JobStore.QUEUED, job['status'])
+        self.assertEqual('user1', job['user'])
+        self.assertIsNotNone(job['submitted'])
+        self.assertIsNone(job['started'])
+        self.assertEqual(1, store.count(JobStore.QUEUED))
+
+        store.set_running(job_id)
+        self.assertEqual(JobStore.RUNNING, store.get(job_id)['status'])
+        self.assertIsNotNone(store.get(job_id)['started'])
+
+        store.set_complete(job_id, {'files': {'a': 'b'}})
+        job = store.get(job_id)
+        self.assertEqual(JobStore.COMPLETE, job['status'])
+        self.assertEqual({'files': {'a': 'b'}}, job['result'])
+        self.assertIsNotNone(job['finished'])
+
+        self.assertIsNone(store.get('nonexistent'))
+
+    def test_store_persists(self):
+        store = JobStore(self.dbpath)
+        job_id = store.create('user1', 'host:1', {})
+        store.set_complete(job_id, {'files': {}})
+        self.assertEqual({'files': {}}, JobStore(self.dbpath).get(job_id)[
+            'result'])
+
+    def test_delete_finished(self):
+        store = JobStore(self.dbpath)
+        done = store.create('user1', 'host:1', {})
+        store.set_complete(done, {'files': {}})
+        failed = store.create('user1', 'host:1', {})
+        store.set_error(failed, 'oops')
+        running = store.create('user1', 'host:1', {})
+        store.set_running(running)
+        self.assertEqual(0, store.delete_finished(
+            store.get(done)['finished']))
+        self.assertEqual(2, store.delete_finished(int(time.time() * 1000) +
+                                                  1))
+        self.assertIsNone(store.get(done))
+        self.assertIsNone(store.get(failed))
+        self.assertEqual(JobStore.RUNNING, store.get(running)['status'])
+
+    def test_fail_orphans(self):
+        store = JobStore(self.dbpath)
+        dead = store.create('user1', 'host1:1', {})
+        alive = store.create('user1', 'host1:2', {})
+        otherhost = store.create('user1', 'host2:1', {})
+        done = store.create('user1', 'host1:1', {})
+        store.set_complete(done, {})
+        store.fail_orphans('host1', lambda pid: pid == 2, 'restarted')
+        self.assertEqual(JobStore.ERROR, store.get(dead)['status'])
+        self.assertEqual('restarted', store.get(dead)['error'])
+        self.assertEqual(JobStore.QUEUED, store.get(alive)['status'])
+        self.assertEqual(JobStore.QUEUED, store.get(otherhost)['status'])
+        self.assertEqual(JobStore.COMPLETE, store.get(done)['status'])
+
+    def test_runner(self):
+        def run(ctx, params):
+            if params.get('fail'):
+                raise ValueError('failed ' + ctx['user_id'])
+            return {'result': params['val'], 'job_id': ctx['job_id']}
+        runner = JobRunner(JobStore(self.dbpath), 2, run)
+        ok = runner.submit({'user_id': 'user1'}, {'val': 1})
+        fail = runner.submit({'user_id': 'user2'}, {'fail': 1})
+        job = self.wait_for(runner.store, ok)
+        self.assertEqual(JobStore.COMPLETE, job['status'])
+        self.assertEqual({'result': 1, 'job_id': ok}, job['result'])
+        self.assertEqual('user1', job['user'])
+        job = self.wait_for(runner.store, fail)
+        self.assertEqual(JobStore.ERROR, job['status'])
+        self.assertEqual('failed user2', job['error'])
+
+    def test_runner_fails_jobs_from_dead_processes(self):
+        store = JobStore(self.dbpath)
+        p = subprocess.Popen(['true'])
+        p.wait()
+        job_id = store.create(
+            'user1', socket.gethostname() + ':' + str(p.pid), {})
+        JobRunner(store, 1, None)
+        job = store.get(job_id)
+        self.assertEqual(JobStore.ERROR, job['status'])
+        self.assertEqual(JobRunner.RESTART_ERROR, job['error'])
+
+    def test_bad_workers(self):
+        with self.assertRaises(ValueError) as context:
+            JobRunner(JobStore(self.dbpath), 0, None)
+        self.assertEqual('workers must be at least 1', str(context.exception))
@@ -0,0 +1,150 @@
+import unittest
+
+from kb_read_library_to_file.kb_read_library_to_fileImpl import ConversionRequest  # @IgnorePep8
+from kb_read_library_to_file.kb_read_library_to_fileImpl import ConversionStats  # @IgnorePep8
+from kb_read_library_to_file.metrics import RateMeter, Registry
+from kb_read_library_to_file.priority import SlotPool
+
+from fake_shock import FakeShockTestCase
+
+
+class MetricsTest(unittest.TestCase):
+
+    def test_counter(self):
+        r = Registry()
+        c = r.counter('requests_total', 'Requests.', ['method'])
+        c.inc(method='get')
+        c.inc(2, method='get')
+        c.inc(method='put')
+        self.assertEqual(3, c.get(method='get'))
+        self.assertEqual(0, c.get(method='post'))
+        self.assertEqual(
+            '# HELP requests_total Requests.\n' +
+            '# TYPE requests_total counter\n' +
+            'requests_total{method="get"} 3.0\n' +
+            'requests_total{method="put"} 1.0\n',
+            r.render())
+        with self.assertRaises(ValueError) as context:
+            c.inc(-1, method='get')
+        self.assertEqual('Counters can only be increased',
+                         str(context.exception))
+
+    def test_gauge(self):
+        r = Registry()
+        g = r.gauge('in_flight', 'In flight.')
+        self.assertEqual('# HELP in_flight In flight.\n' +
+                         '# TYPE in_flight gauge\n' +
+                         'in_flight 0.0\n', r.render())
+        g.inc()
+        g.inc()
+        g.dec()
+        self.assertEqual(1, g.get())
+        g.set(5)
+        self.assertEqual(5, g.get())
+
+    def test_histogram(self):
+        r = Registry()
+        h = r.histogram('latency_seconds', 'Latency.', ['stage'], [1, 5])
+        h.observe(0.5, stage='a')
+        h.observe(3, stage='a')
+        h.observe(10, stage='a')
+        self.assertEqual(3, h.get_count(stage='a'))
+        self.assertEqual(
+            '# HELP latency_seconds Latency.\n' +
+            '# TYPE latency_seconds histogram\n' +
+            'latency_seconds_bucket{stage="a",le="1.0"} 1\n' +
+            'latency_seconds_bucket{stage="a",le="5.0"} 2\n' +
+            'latency_seconds_bucket{stage="a",le="+Inf"} 3\n' +
+            'latency_seconds_sum{stage="a"} 13.5\n' +
+            'latency_seconds_count{stage="a"} 3\n',
+            r.render())
+
+    def test_label_escaping(self):
+        r = Registry()
+        c = r.counter('errors_total', 'Errors.', ['type'])
+        c.inc(type='a"b\\c\nd')
+        self.assertIn('errors_total{type="a\\"b\\\\c\\nd"} 1.0',
+                      r.render())
+
+    def test_bad_labels(self):
+        c = Registry().counter('errors_total', 'Errors.', ['type'])
+        with self.assertRaises(ValueError) as context:
+            c.inc(kind='foo')
+        self.assertEqual("Metric errors_total requires labels ['type'], " +
+                         "got ['kind']", str(context.exception))
+
+    def test_duplicate_name(self):
+        r = Registry()
+        r.counter('errors_total', 'Errors.')
+        with self.assertRaises(ValueError) as context:
+            r.gauge('errors_total', 'Errors.')
+        self.assertEqual('Duplicate metric name: errors_total',
+                         str(context.exception))
+
+    def test_serve(self):
+        r = Registry()
+        r.gauge('in_flight', 'In flight.')
+        res = []
+        body = ''.join(r.serve(lambda status, headers: res.extend(
+            [status, dict(headers)])))
+        self.assertEqual(r.render(), body)
+        self.assertEqual(['200 OK', {
+            'content-type': 'text/plain; version=0.0.4; charset=utf-8',
+            'content-length': str(len(body))}], res)
+
+    def test_rate_meter(self):
+        m = RateMeter(10)
+        self.assertEqual(0, m.rate())
+        m.add(5)
+        m.add(15)
+        # less than a second has passed, so the rate is per second
+        self.assertEqual(20, m.rate())
+        m._start -= 4
+        self.assertAlmostEqual(5, m.rate(), places=1)
+        # counts older than the window are dropped
+        m._start -= 60
+        m._buckets[0][0] -= 10
+        self.assertEqual(0, m.rate())
+        with self.assertRaises(ValueError) as context:
+            RateMeter(0)
+        self.assertEqual('window must be at least 1', str(context.exception))
+
+
+class StageStatsTest(FakeShockTestCase):
+
+    def test_stats(self):
+        self.impl.interactive_max_bytes = 0
+        self.impl.batch_slots = SlotPool(self.impl.batch_slots.directory, 1)
+        stats = ConversionStats()
+        # stages before the request exists are only recorded in total
+        with self.impl.stage('ws_fetch', stats=stats):
+            pass
+        req = ConversionRequest('token', None, None, None, False, stats,
+                                progress=self.impl.progress.start('call', 1))
+        reads = [self.reads(True)]
+        self.impl.convert_reads(reads, {'1/1/1': ['1/1/1']}, req)
+        out = stats.to_output()
+        self.assertEqual(['batch_queue', 'mv', 'shock_download',
+                          'shock_metadata', 'ws_fetch'],
+                         sorted(out['stages']))
+        self.assertEqual(['mv', 'shock_download', 'shock_metadata'],
+                         sorted(out['libraries']['1/1/1']))
+
+    def test_failed_stage(self):
+        stats = ConversionStats()
+        req = ConversionRequest('token', None, None, None, False, stats,
+                                progress=self.impl.progress.start('call', 1))
+        with self.assertRaises(ValueError):
+            with self.impl.stage('gzip', 10, req) as s:
+                s['written'] = 5
+                raise ValueError('whoops')
+        with self.impl.stage('gzip', 10, req):
+            pass
+        seconds = self.impl.m_stage_seconds
+        self.assertEqual(1, seconds.get_count(stage='gzip', status='error'))
+        self.assertEqual(1, seconds.get_count(stage='gzip', status='ok'))
+        self.assertEqual(5, self.impl.m_stage_bytes.get(
+            stage='gzip', direction='written'))
+        self.assertEqual(20, stats.to_output()['stages']['gzip']['bytes_read'])
+        # the progress doesn't report the stage as running once it ends
+        self.assertIsNone(req.progress.to_dict()['stage'])
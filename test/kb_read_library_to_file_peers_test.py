@@ -0,0 +1,248 @@
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+from wsgiref.simple_server import make_server, WSGIRequestHandler
+
+from kb_read_library_to_file.filecache import FileCache
+from kb_read_library_to_file.peers import PeerClient, PeerServer
+from kb_read_library_to_file.kb_read_library_to_fileImpl import kb_read_library_to_file  # @IgnorePep8
+from kb_read_library_to_file.kb_read_library_to_fileImpl import ConversionRequest  # @IgnorePep8
+
+from fake_shock import FakeShockTestCase, REQUESTS
+
+
+class QuietHandler(WSGIRequestHandler):
+
+    def log_message(self, *args):
+        pass
+
+
+class PeersTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.cache = FileCache(self.mkdir('cache'), 10 ** 7)
+        self.server = make_server('127.0.0.1', 0, PeerServer(
+            'secret', {'output': self.cache}), handler_class=QuietHandler)
+        t = threading.Thread(target=self.server.serve_forever)
+        t.daemon = True
+        t.start()
+        self.url = 'http://127.0.0.1:{}'.format(self.server.server_port)
+        self.log = []
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.dir)
+
+    def mkdir(self, name):
+        path = os.path.join(self.dir, name)
+        os.mkdir(path)
+        return path
+
+    def add(self, key, files):
+        paths = []
+        for name, data in files.items():
+            paths.append(os.path.join(self.dir, name))
+            with open(paths[-1], 'w') as f:
+                f.write(data)
+        self.cache.put(key, paths, {'meta': 'data'})
+
+    def client(self, peers, secret='secret'):
+        return PeerClient(peers, secret, 5, self.log.append)
+
+    def test_fetch(self):
+        self.add('key', {'a.fq': 'aaa', 'b.fq': 'b' * 3000000})
+        out = self.mkdir('out')
+        meta, paths = self.client([self.url + '/']).fetch(
+            'output', FileCache.digest('key'), out)
+        self.assertEqual({'meta': 'data'}, meta)
+        self.assertEqual({'a.fq': os.path.join(out, 'a.fq'),
+                          'b.fq': os.path.join(out, 'b.fq')}, paths)
+        for name, data in [('a.fq', 'aaa'), ('b.fq', 'b' * 3000000)]:
+            with open(paths[name]) as f:
+                self.assertEqual(data, f.read())
+        self.assertEqual(['a.fq', 'b.fq'], sorted(os.listdir(out)))
+        self.assertEqual([], self.log)
+
+    def test_missing(self):
+        out = self.mkdir('out')
+        self.assertIsNone(self.client([self.url]).fetch(
+            'output', FileCache.digest('key'), out))
+        self.assertIsNone(self.client([self.url]).fetch(
+            'node', FileCache.digest('key'), out))
+        self.assertEqual([], self.log)
+
+    def test_bad_secret(self):
+        self.add('key', {'a.fq': 'aaa'})
+        out = self.mkdir('out')
+        self.assertIsNone(self.client([self.url], 'wrong').fetch(
+            'output', FileCache.digest('key'), out))
+        self.assertEqual(1, len(self.log))
+        self.assertIn('403', self.log[0])
+        self.assertEqual([], os.listdir(out))
+
+    def test_failed_peer_skipped(self):
+        self.add('key', {'a.fq': 'aaa'})
+        out = self.mkdir('out')
+        meta, paths = self.client(['http://127.0.0.1:1', self.url]).fetch(
+            'output', FileCache.digest('key'), out)
+        self.assertEqual(['a.fq'], paths.keys())
+        self.assertEqual(1, len(self.log))
+        self.assertTrue(self.log[0].startswith(
+            'Could not get {} from peer http://127.0.0.1:1: '.format(
+                FileCache.digest('key'))))
+
+    def test_paths(self):
+        self.add('key', {'a.fq': 'aaa'})
+        server = PeerServer('secret', {'output': self.cache})
+        digest = FileCache.digest('key')
+        for path, status in [
+                ('/peer/output/' + digest, '200 OK'),
+                ('/peer/output/' + digest + '/a.fq', '200 OK'),
+                ('/peer/output/' + digest + '/b.fq', '404 Not Found'),
+                ('/peer/output/' + digest + '/../cache', '404 Not Found'),
+                ('/peer/output/' + digest + '/manifest.json',
+                 '404 Not Found'),
+                ('/peer/output/' + digest[:-1], '404 Not Found'),
+                ('/peer/node/' + digest, '404 Not Found'),
+                ('/peer/output', '404 Not Found')]:
+            statuses = []
+            server({'REQUEST_METHOD': 'GET', 'PATH_INFO': path,
+                    'HTTP_X_PEER_SECRET': 'secret'},
+                   lambda s, headers: statuses.append(s))
+            self.assertEqual([status], statuses, path)
+
+    def test_secret_required(self):
+        for cls, args in [(PeerServer, ('', {})), (PeerClient, ([], None))]:
+            with self.assertRaises(ValueError) as context:
+                cls(*args)
+            self.assertEqual('A secret is required', str(context.exception))
+
+
+class PeerSharingTest(FakeShockTestCase):
+
+    # Starts a peer instance serving its caches and points self.impl at it.
+    # Returns the peer and its server, which must be shut down.
+    def start_peer(self):
+        peer = kb_read_library_to_file({
+            'workspace-url': 'http://localhost:1',
+            'shock-url': self.shock_url,
+            'scratch': os.path.join(self.scratch, 'peer'),
+            'output-cache-max-bytes': 10 ** 9,
+            'node-cache-max-bytes': 10 ** 9,
+            'peer-secret': 'secret',
+            'scratch-sweep-interval-sec': 0})
+        # serves peer requests as the service's server does
+        server = make_server('127.0.0.1', 0, peer.handle_http,
+                             handler_class=QuietHandler)
+        t = threading.Thread(target=server.serve_forever)
+        t.daemon = True
+        t.start()
+        self.impl = kb_read_library_to_file({
+            'workspace-url': 'http://localhost:1',
+            'shock-url': self.shock_url,
+            'scratch': os.path.join(self.scratch, 'host'),
+            'output-cache-max-bytes': 10 ** 9,
+            'node-cache-max-bytes': 10 ** 9,
+            'peers': 'http://127.0.0.1:1, http://127.0.0.1:{}'.format(
+                server.server_port),
+            'peer-secret': 'secret'})
+        return peer, server
+
+    def convert_paired(self, impl, interleave):
+        reads = [self.reads(True)]
+        req = ConversionRequest(
+            'token', None, interleave, None, False,
+            progress=impl.progress.start('call', 1))
+        out = impl.convert_reads(reads, {'1/1/1': ['1/1/1']}, req)
+        self.check_files(out['1/1/1']['files'])
+
+    def test_peer_sharing(self):
+        peer, server = self.start_peer()
+        try:
+            convert = self.convert_paired
+            convert(peer, True)
+
+            # the output is fetched from the peer
+            del REQUESTS[:]
+            convert(self.impl, True)
+            self.assertEqual(['/node/fwd', '/node/rev'], REQUESTS)
+            self.assertEqual(1, self.impl.m_output_cache.get(result='peer'))
+            self.assertEqual(1, self.impl.output_cache.size()[0])
+
+            # the Shock files are fetched from the peer
+            del REQUESTS[:]
+            convert(self.impl, None)
+            self.assertEqual(['/node/fwd', '/node/rev'], REQUESTS)
+            self.assertEqual(2, self.impl.m_peer_fetches.get(
+                cache='node', result='hit'))
+            self.assertEqual(2, self.impl.node_cache.size()[0])
+
+            # and are then cached locally
+            convert(self.impl, False)
+            self.assertEqual(2, self.impl.m_node_cache.get(result='hit'))
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_peer_data_verified(self):
+        peer, server = self.start_peer()
+        try:
+            self.convert_paired(peer, True)
+            self.convert_paired(peer, None)
+            # corrupt every file in the peer's caches, keeping their sizes
+            for cache in [peer.output_cache, peer.node_cache]:
+                for d, _, files in os.walk(cache.directory):
+                    for f in files:
+                        if f.endswith(('.fq', '.fastq', '.gz')):
+                            path = os.path.join(d, f)
+                            size = os.path.getsize(path)
+                            with open(path, 'r+b') as fh:
+                                fh.write('X' * min(size, 10))
+
+            # the corrupt files are rejected and the files are converted from
+            # Shock
+            del REQUESTS[:]
+            self.convert_paired(self.impl, True)
+            self.assertEqual(['/node/fwd', '/node/fwd?download', '/node/rev',
+                              '/node/rev?download'], sorted(REQUESTS))
+            self.assertEqual(1, self.impl.m_peer_fetches.get(
+                cache='output', result='invalid'))
+            self.assertEqual(2, self.impl.m_peer_fetches.get(
+                cache='node', result='invalid'))
+            self.assertEqual(0, self.impl.m_output_cache.get(result='peer'))
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_peer_requires_checksum(self):
+        peer, server = self.start_peer()
+        try:
+            self.convert_paired(peer, None)
+            node = peer.get_shock_data_and_handle_errors(
+                '1/1/1', 'reads1', 'token',
+                {'url': self.shock_url, 'id': 'rev'}, 'fq', None, True)
+            # the peer has the node under its key
+            key = self.impl.node_cache_key(node)
+            node.md5 = None
+            path = os.path.join(self.impl.shock_temp, 'rev.fq')
+            self.assertFalse(self.impl.fetch_node_from_peers(node, key, path))
+            self.assertFalse(os.path.exists(path))
+            self.assertEqual(0, self.impl.m_peer_fetches.get(
+                cache='node', result='hit'))
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_peer_secret_required(self):
+        with self.assertRaises(ValueError) as context:
+            kb_read_library_to_file({
+                'workspace-url': 'http://localhost:1',
+                'shock-url': self.shock_url,
+                'scratch': self.scratch,
+                'peers': 'http://localhost:2'})
+        self.assertEqual('peer-secret is required when peers are configured',
+                         str(context.exception))
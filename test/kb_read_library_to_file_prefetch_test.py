@@ -0,0 +1,67 @@
+import unittest
+import os
+import tempfile
+
+from kb_read_library_to_file.kb_read_library_to_fileImpl import ConversionRequest  # @IgnorePep8
+
+from fake_shock import FakeShockTestCase, NODES, REQUESTS
+
+
+class PrefetchTest(FakeShockTestCase):
+
+    def test_prefetch(self):
+        self.impl.staging.max_bytes = 10 ** 9
+        ref, read = self.reads(True)
+        req = ConversionRequest('token', None, None, None, False,
+                                user='user', prefetch=True)
+        req.temp_dir = tempfile.mkdtemp(dir=self.impl.shock_temp)
+        del REQUESTS[:]
+        self.impl.prefetch_library(read, req)
+        self.assertEqual(['/node/fwd', '/node/fwd?download', '/node/rev',
+                          '/node/rev?download'], REQUESTS)
+        self.assertEqual((2, len(NODES['fwd'][1]) + len(NODES['rev'][1])),
+                         self.impl.staging.size())
+        self.assertEqual([], os.listdir(req.temp_dir))
+        self.assertEqual(set(), req.files)
+
+        # staged nodes aren't downloaded again
+        del REQUESTS[:]
+        self.impl.prefetch_library(read, req)
+        self.assertEqual(['/node/fwd', '/node/rev'], REQUESTS)
+
+        # conversions use the staged files
+        del REQUESTS[:]
+        req = ConversionRequest(
+            'token', None, True, None, False,
+            progress=self.impl.progress.start('call', 1))
+        out = self.impl.convert_reads([(ref, read)], {ref: [ref]}, req)
+        self.check_files(out[ref]['files'])
+        self.assertEqual(['/node/fwd', '/node/rev'], REQUESTS)
+        self.assertEqual(2, self.impl.m_staging.get(result='hit'))
+
+    def test_prefetch_in_background(self):
+        size = len(NODES['inter'][1]) + len(NODES['fwd'][1])
+        self.impl.staging.max_bytes = size
+
+        def iter_reads_objects(ws, token, refs, budget, errors, fetched):
+            self.assertEqual(['1/2/1', '1/3/1', '1/1/1'], refs)
+            errors['1/3/1'] = ValueError('No such object')
+            return [self.reads(False), ('1/3/1', None), self.reads(True)]
+        self.impl.iter_reads_objects = iter_reads_objects
+        self.impl.prefetcher.submit('token', 'user',
+                                    ['1/2/1', '1/3/1', '1/1/1'])
+        self.impl.prefetcher.join()
+        self.assertEqual(1, self.impl.m_prefetched.get(result='staged'))
+        # the reverse reads are too large for the staging area
+        self.assertEqual(2, self.impl.m_prefetched.get(result='error'))
+        self.assertEqual((2, size), self.impl.staging.size())
+        self.assertEqual([], os.listdir(self.impl.shock_temp))
+        self.assertEqual(set(), self.impl.files_in_use())
+        self.assertEqual((0, 0), self.impl.downloads.counts())
+
+    def test_prefetch_disabled(self):
+        with self.assertRaises(ValueError) as context:
+            self.impl.prefetch_read_libraries(
+                {'token': 'token'}, {'read_libraries': ['1/1/1']})
+        self.assertEqual('Prefetching is disabled as the service has no ' +
+                         'staging area', str(context.exception))
@@ -0,0 +1,115 @@
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from kb_read_library_to_file.kb_read_library_to_fileImpl import ConversionRequest  # @IgnorePep8
+from kb_read_library_to_file.priority import INTERACTIVE, BATCH
+from kb_read_library_to_file.priority import SlotPool, SlotTimeoutError
+
+from fake_shock import FakeShockTestCase, NODES
+
+
+class SlotPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_limit(self):
+        # pools with their own state stand in for other processes
+        pools = [SlotPool(self.dir, 2, 0.01) for _ in xrange(3)]
+        slots = [p.acquire() for p in pools[:2]]
+        acquired = []
+        t = threading.Thread(target=lambda: acquired.append(
+            pools[2].acquire()))
+        t.daemon = True
+        t.start()
+        time.sleep(0.1)
+        self.assertEqual([], acquired)
+        pools[0].release(slots[0])
+        t.join(5)
+        self.assertEqual(1, len(acquired))
+        for p, slot in [(pools[1], slots[1]), (pools[2], acquired[0])]:
+            p.release(slot)
+
+    def test_timeout(self):
+        held = SlotPool(self.dir, 1)
+        slot = held.acquire()
+        p = SlotPool(self.dir, 1, 0.01, 0.1)
+        start = time.time()
+        with self.assertRaises(SlotTimeoutError) as context:
+            p.acquire()
+        self.assertGreaterEqual(time.time() - start, 0.1)
+        self.assertEqual('Timed out after 0.1 seconds waiting for one of ' +
+                         'the 1 slots', str(context.exception))
+        held.release(slot)
+        p.release(p.acquire())
+
+    def test_unlimited(self):
+        p = SlotPool(self.dir, 0)
+        self.assertEqual([None] * 5, [p.acquire() for _ in xrange(5)])
+        p.release(None)
+
+    def test_invalid_slots(self):
+        with self.assertRaises(ValueError) as context:
+            SlotPool(self.dir, -1)
+        self.assertEqual('slots must be >= 0', str(context.exception))
+
+
+class ConversionPriorityTest(FakeShockTestCase):
+
+    def test_priority(self):
+        self.impl.interactive_max_bytes = len(NODES['inter'][1])
+        slotsdir = self.impl.batch_slots.directory
+        self.impl.batch_slots = SlotPool(slotsdir, 1, 0.01)
+        # another process holds the only batch slot
+        other = SlotPool(slotsdir, 1)
+        slot = other.acquire()
+        reqs = {}
+        results = {}
+
+        def convert(name, reads, priority=None):
+            reqs[name] = ConversionRequest(
+                'token', None, None, None, False,
+                progress=self.impl.progress.start(name, 1),
+                priority=priority)
+            results[name] = self.impl.convert_reads(
+                reads, {ref: [ref] for ref, _ in reads}, reqs[name])
+        # the single end reads are small enough to be interactive
+        convert('small', [self.reads(False)])
+        self.assertEqual(INTERACTIVE, reqs['small'].priority)
+        # the paired end reads are not, and wait for a batch slot
+        t = threading.Thread(target=convert,
+                             args=('large', [self.reads(True)]))
+        t.daemon = True
+        t.start()
+        convert('forced', [self.reads(True)], INTERACTIVE)
+        time.sleep(0.1)
+        self.assertEqual(BATCH, reqs['large'].priority)
+        self.assertNotIn('large', results)
+        other.release(slot)
+        t.join(10)
+        self.check_files(results['large']['1/1/1']['files'])
+        self.assertEqual(2, self.impl.m_priorities.get(priority=INTERACTIVE))
+        self.assertEqual(1, self.impl.m_priorities.get(priority=BATCH))
+
+    def test_priority_timeout(self):
+        self.impl.interactive_max_bytes = 0
+        slotsdir = self.impl.batch_slots.directory
+        self.impl.batch_slots = SlotPool(slotsdir, 1, 0.01, 0.1)
+        slot = SlotPool(slotsdir, 1).acquire()
+        reads = [self.reads(False)]
+        req = ConversionRequest('token', None, None, None, False,
+                                progress=self.impl.progress.start('call', 1))
+        with self.assertRaises(SlotTimeoutError) as context:
+            self.impl.convert_reads(reads, {'1/2/1': ['1/2/1']}, req)
+        self.assertEqual('Too many batch conversions are running. Timed ' +
+                         'out after 0.1 seconds waiting for one of the 1 ' +
+                         'slots', str(context.exception))
+        self.assertEqual(0, self.impl.scratch_planner.reserved)
+        os.close(slot)
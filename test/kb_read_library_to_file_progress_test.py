@@ -0,0 +1,121 @@
+import unittest
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from kb_read_library_to_file.progress import Progress, ProgressRegistry
+
+
+class ProgressTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def read(self, path):
+        with open(path) as f:
+            return json.load(f)
+
+    def test_progress(self):
+        path = os.path.join(self.tempdir, 'p.json')
+        p = Progress('call1', 2, path, 0)
+        state = self.read(path)
+        self.assertEqual('call1', state['call_id'])
+        self.assertEqual(Progress.RUNNING, state['state'])
+        self.assertEqual(2, state['libraries_total'])
+        self.assertEqual(0, state['libraries_done'])
+        self.assertIsNone(state['stage'])
+
+        p.start_stage('shock_download', 100)
+        p.update(40)
+        state = self.read(path)
+        self.assertEqual('shock_download', state['stage'])
+        self.assertEqual(40, state['stage_bytes_done'])
+        self.assertEqual(100, state['stage_bytes_total'])
+        self.assertEqual(state, p.to_dict())
+        # only the current stage is cleared
+        p.finish_stage('gzip')
+        self.assertEqual('shock_download', p.to_dict()['stage'])
+        p.finish_stage('shock_download')
+        state = self.read(path)
+        self.assertIsNone(state['stage'])
+        self.assertEqual(0, state['stage_bytes_done'])
+        self.assertEqual(0, state['stage_bytes_total'])
+
+        p.finish_library()
+        p.finish()
+        state = self.read(path)
+        self.assertEqual(Progress.COMPLETE, state['state'])
+        self.assertEqual(1, state['libraries_done'])
+        self.assertIsNone(state['stage'])
+        self.assertIsNone(state['error'])
+        self.assertEqual(['p.json'], os.listdir(self.tempdir))
+
+    def test_rate_limit(self):
+        path = os.path.join(self.tempdir, 'p.json')
+        p = Progress('call1', 1, path, 3600)
+        p.start_stage('gzip', 100)
+        p.update(50)
+        # updates are only published to the file once per interval...
+        self.assertIsNone(self.read(path)['stage'])
+        # ...but are available in memory immediately
+        self.assertEqual(50, p.to_dict()['stage_bytes_done'])
+        p.finish('oops')
+        state = self.read(path)
+        self.assertEqual(Progress.ERROR, state['state'])
+        self.assertEqual('oops', state['error'])
+        self.assertEqual(50, state['stage_bytes_done'])
+
+    def test_registry(self):
+        r = ProgressRegistry(self.tempdir, 0)
+        p1 = r.start('call/1', 1)
+        p2 = r.start('call2', 3)
+        self.assertEqual(['call/1', 'call2'], sorted(r.snapshot().keys()))
+        self.assertEqual(3, r.snapshot()['call2']['libraries_total'])
+        self.assertEqual(
+            'call/1',
+            self.read(os.path.join(self.tempdir, 'call_1.json'))['call_id'])
+        r.finish(p1)
+        self.assertEqual(['call2'], r.snapshot().keys())
+        r.finish(p2, 'error')
+        self.assertEqual({}, r.snapshot())
+
+    def test_registry_no_directory(self):
+        r = ProgressRegistry()
+        p = r.start('call1', 1)
+        self.assertIsNone(p.path)
+        self.assertEqual(['call1'], r.snapshot().keys())
+
+    def test_registry_read(self):
+        r = ProgressRegistry(self.tempdir, 0)
+        p = r.start('call1', 2)
+        p.start_stage('gzip', 100)
+        p.update(40)
+        expected = {'libraries_total': 2, 'libraries_done': 0,
+                    'stage': 'gzip', 'stage_bytes_done': 40,
+                    'stage_bytes_total': 100}
+        self.assertEqual(expected, r.read('call1'))
+        # conversions in other processes are read from their files
+        self.assertEqual(expected, ProgressRegistry(self.tempdir).read(
+            'call1'))
+        r.finish(p)
+        self.assertEqual(dict(expected, stage=None), r.read('call1'))
+        self.assertIsNone(r.read('call2'))
+        self.assertIsNone(ProgressRegistry().read('call1'))
+
+    def test_registry_prune(self):
+        r = ProgressRegistry(self.tempdir, 0)
+        r.finish(r.start('done', 1))
+        r.start('running', 1)
+        r.finish(r.start('recent', 1))
+        old = time.time() - 7200
+        for name in ['done.json', 'running.json']:
+            os.utime(os.path.join(self.tempdir, name), (old, old))
+        self.assertEqual(1, r.prune(3600))
+        self.assertEqual(['recent.json', 'running.json'],
+                         sorted(os.listdir(self.tempdir)))
+        self.assertEqual(0, ProgressRegistry().prune(3600))
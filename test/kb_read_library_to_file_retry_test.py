@@ -0,0 +1,148 @@
+import unittest
+import errno
+import socket
+
+import requests
+
+from kb_read_library_to_file.retry import RetryBudget, RetryPolicy
+from kb_read_library_to_file.retry import is_transient
+from kb_read_library_to_file.kb_read_library_to_fileImpl import ConversionRequest  # @IgnorePep8
+from kb_read_library_to_file.kb_read_library_to_fileImpl import ShockError
+
+from fake_shock import FakeShockTestCase, FAILURES
+
+
+class StatusError(Exception):
+
+    def __init__(self, status):
+        super(StatusError, self).__init__('status ' + str(status))
+        self.status = status
+
+
+class Flaky(object):
+
+    def __init__(self, errors, result='ok'):
+        self.errors = list(errors)
+        self.result = result
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return self.result
+
+
+class RetryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.logs = []
+        self.retried = []
+        self.policy = RetryPolicy(3, 0.001, 0.01, 10, self.logs.append,
+                                  self.retried.append)
+
+    def test_is_transient(self):
+        for e in [requests.exceptions.ConnectionError(),
+                  requests.exceptions.ReadTimeout(),
+                  requests.exceptions.ConnectTimeout(),
+                  requests.exceptions.ChunkedEncodingError(),
+                  socket.error(errno.ECONNRESET, 'reset'),
+                  StatusError(503), StatusError(500), StatusError(429)]:
+            self.assertTrue(is_transient(e), repr(e))
+        for e in [ValueError('foo'), StatusError(404), StatusError(401),
+                  socket.error(errno.EACCES, 'denied')]:
+            self.assertFalse(is_transient(e), repr(e))
+
+        response = requests.Response()
+        response.status_code = 502
+        self.assertTrue(is_transient(
+            requests.exceptions.HTTPError(response=response)))
+
+    def test_not_idempotent(self):
+        self.assertTrue(is_transient(requests.exceptions.ConnectTimeout(),
+                                     False))
+        self.assertFalse(is_transient(requests.exceptions.ReadTimeout(),
+                                      False))
+        self.assertFalse(is_transient(StatusError(503), False))
+
+    def test_retry(self):
+        f = Flaky([StatusError(503), requests.exceptions.ConnectionError()])
+        self.assertEqual('ok', self.policy.call(f, 'op', 'Doing foo'))
+        self.assertEqual(3, f.calls)
+        self.assertEqual(['op', 'op'], self.retried)
+        self.assertEqual(2, len(self.logs))
+        self.assertTrue(self.logs[0].startswith(
+            'Doing foo failed on attempt 1 of 3, retrying in '))
+        self.assertTrue(self.logs[0].endswith('StatusError: status 503'))
+
+    def test_give_up(self):
+        f = Flaky([StatusError(503)] * 3)
+        with self.assertRaises(StatusError):
+            self.policy.call(f, 'op', 'Doing foo')
+        self.assertEqual(3, f.calls)
+
+    def test_permanent_error(self):
+        f = Flaky([ValueError('bad')])
+        with self.assertRaises(ValueError):
+            self.policy.call(f, 'op', 'Doing foo')
+        self.assertEqual(1, f.calls)
+        self.assertEqual([], self.logs)
+
+    def test_budget(self):
+        budget = RetryBudget(1)
+        f = Flaky([StatusError(503), StatusError(503)])
+        with self.assertRaises(StatusError):
+            self.policy.call(f, 'op', 'Doing foo', budget)
+        self.assertEqual(2, f.calls)
+        self.assertEqual(0, budget.remaining)
+        f = Flaky([StatusError(503)])
+        with self.assertRaises(StatusError):
+            self.policy.call(f, 'op', 'Doing foo', budget)
+        self.assertEqual(1, f.calls)
+        self.assertEqual(10, self.policy.new_budget().remaining)
+
+    def test_delay(self):
+        p = RetryPolicy(10, 1, 5, 10)
+        for retry in xrange(10):
+            d = p.delay(retry)
+            self.assertTrue(0 <= d <= min(5, 2 ** retry), d)
+
+    def test_bad_attempts(self):
+        with self.assertRaises(ValueError) as context:
+            RetryPolicy(0, 1, 1, 1)
+        self.assertEqual('attempts must be at least 1', str(context.exception))
+
+
+class ShockRetryTest(FakeShockTestCase):
+
+    def convert_flaky(self, stream):
+        req = ConversionRequest(
+            'token', None, None, None, False,
+            progress=self.impl.progress.start('call', 1),
+            retry_budget=self.impl.retry_policy.new_budget())
+        req.stream = stream
+        reads = [self.reads(False, 'flaky')]
+        return req, self.impl.convert_reads(
+            reads, {ref: [ref] for ref, _ in reads}, req)
+
+    def test_retry_transient_shock_errors(self):
+        for stream in [False, True]:
+            FAILURES['/node/flaky'] = 2
+            FAILURES['/node/flaky?download'] = 1
+            req, out = self.convert_flaky(stream)
+            self.check_files(out['1/2/1']['files'])
+            self.assertEqual(17, req.retry_budget.remaining)
+        self.assertEqual(4, self.impl.m_retries.get(
+            operation='shock_metadata'))
+        self.assertEqual(2, self.impl.m_retries.get(
+            operation='shock_download'))
+
+    def test_retry_gives_up(self):
+        FAILURES['/node/flaky'] = 4
+        with self.assertRaises(ShockError) as context:
+            self.convert_flaky(False)
+        self.assertEqual(503, context.exception.status)
+        self.assertIn('Error downloading reads for object 1/2/1 (reads2) ' +
+                      'from Shock node flaky: try again',
+                      str(context.exception))
+        self.assertEqual(0, FAILURES['/node/flaky'])
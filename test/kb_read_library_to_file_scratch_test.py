@@ -0,0 +1,211 @@
+import unittest
+import gzip
+import os
+import shutil
+import tempfile
+import threading
+import time
+from io import BytesIO
+
+from kb_read_library_to_file.scratch import ScratchPlanner, ScratchSpaceError
+from kb_read_library_to_file.scratch import ScratchSweeper
+from kb_read_library_to_file.streams import StreamReader
+
+from fake_shock import FakeShockTestCase
+
+
+class FixedPlanner(ScratchPlanner):
+
+    def __init__(self, free, *args, **kwargs):
+        super(FixedPlanner, self).__init__(*args, **kwargs)
+        self.free = free
+
+    def free_bytes(self):
+        return self.free
+
+
+class ScratchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def gz(self, data):
+        b = BytesIO()
+        g = gzip.GzipFile(fileobj=b, mode='wb')
+        g.write(data)
+        g.close()
+        return b.getvalue()
+
+    def make_file(self, name, size, age):
+        path = os.path.join(self.tempdir, name)
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(path, 'w') as f:
+            f.write('a' * size)
+        t = time.time() - age
+        os.utime(path, (t, t))
+        return path
+
+    def test_stream_reader(self):
+        data = ''.join('@read{}\nACGT\n+\nIIII\n'.format(i)
+                       for i in xrange(1000))
+        # multiple gzip members, as produced by concatenating gzip files
+        gzdata = self.gz(data[:5000]) + self.gz(data[5000:])
+        for raw, isgz in [(data, False), (gzdata, True)]:
+            s = StreamReader(BytesIO(raw), isgz, bufsize=100)
+            self.assertEqual('@read0\n', s.readline())
+            self.assertEqual('ACGT', s.read(4))
+            self.assertEqual(data[11:], ''.join(s))
+            self.assertEqual(len(raw), s.tell())
+            self.assertEqual('', s.readline())
+            self.assertEqual('', s.read())
+
+    def test_stream_reader_no_trailing_newline(self):
+        with StreamReader(BytesIO('a\nb'), False) as s:
+            self.assertEqual(['a\n', 'b'], list(s))
+
+    def test_real_free_space(self):
+        p = ScratchPlanner(self.tempdir, ScratchPlanner.FAIL)
+        self.assertGreater(p.free_bytes(), 0)
+
+    def test_fail(self):
+        p = FixedPlanner(100, self.tempdir, ScratchPlanner.FAIL)
+        self.assertEqual((60, False), p.admit(60, 10))
+        with self.assertRaises(ScratchSpaceError) as context:
+            p.admit(60, 10)
+        self.assertEqual(
+            ('Not enough scratch space for the conversion. An estimated 60 ' +
+             'bytes are needed, but only 40 bytes are available in {}.')
+            .format(self.tempdir), str(context.exception))
+        p.release(60)
+        self.assertEqual((60, False), p.admit(60, 10))
+
+    def test_stream(self):
+        p = FixedPlanner(100, self.tempdir, ScratchPlanner.STREAM)
+        self.assertEqual((60, False), p.admit(60, 10))
+        self.assertEqual((10, True), p.admit(60, 10))
+        with self.assertRaises(ScratchSpaceError) as context:
+            p.admit(60, 40)
+        self.assertIn('An estimated 40 bytes are needed, but only 30 bytes',
+                      str(context.exception))
+
+    def test_shared_outputs(self):
+        p = FixedPlanner(100, self.tempdir, ScratchPlanner.FAIL)
+        self.assertEqual((20, False), p.admit(20, 0, {'a': 30, 'b': 10}))
+        self.assertEqual(60, p.reserved)
+        # a is already reserved, so only b and c are new
+        self.assertEqual((20, False), p.admit(20, 0, {'a': 30, 'c': 10}))
+        self.assertEqual(90, p.reserved)
+        with self.assertRaises(ScratchSpaceError) as context:
+            p.admit(0, 0, {'a': 30, 'd': 11})
+        self.assertIn('An estimated 11 bytes are needed, but only 10 bytes',
+                      str(context.exception))
+        p.release(20, {'a': 30, 'b': 10})
+        self.assertEqual(60, p.reserved)
+        p.release(20, {'a': 30, 'c': 10})
+        self.assertEqual(0, p.reserved)
+
+    def test_queue(self):
+        p = FixedPlanner(100, self.tempdir, ScratchPlanner.QUEUE, 10, 0.05)
+        p.admit(60, 10)
+        result = []
+        t = threading.Thread(target=lambda: result.append(p.admit(60, 10)))
+        t.start()
+        time.sleep(0.2)
+        self.assertEqual([], result)
+        p.release(60)
+        t.join(5)
+        self.assertEqual([(60, False)], result)
+
+    def test_queue_timeout(self):
+        p = FixedPlanner(100, self.tempdir, ScratchPlanner.QUEUE, 0.1, 0.05)
+        with self.assertRaises(ScratchSpaceError):
+            p.admit(101, 10)
+
+    def test_bad_strategy(self):
+        with self.assertRaises(ValueError) as context:
+            ScratchPlanner(self.tempdir, 'foo')
+        self.assertEqual('Unknown scratch admission strategy: foo. Allowed ' +
+                         'values are fail, queue, stream.',
+                         str(context.exception))
+
+    def test_sweep_age(self):
+        old = self.make_file('old.fastq', 10, 1000)
+        new = self.make_file('new.fastq', 10, 10)
+        inuse = self.make_file('shock_tmp/inuse', 10, 1000)
+        excluded = self.make_file('progress/p.json', 10, 1000)
+        db = self.make_file('jobs.sqlite3', 10, 1000)
+        s = ScratchSweeper(self.tempdir, 100, 0, 0, 0,
+                           [os.path.join(self.tempdir, 'progress'), db],
+                           lambda: set([inuse]))
+        self.assertEqual((1, 10), s.sweep())
+        self.assertFalse(os.path.exists(old))
+        for p in [new, inuse, excluded, db]:
+            self.assertTrue(os.path.exists(p))
+        self.assertTrue(os.path.isdir(os.path.join(self.tempdir, 'shock_tmp')))
+
+    def test_sweep_size(self):
+        oldest = self.make_file('a', 10, 300)
+        older = self.make_file('b', 10, 200)
+        old = self.make_file('c', 10, 100)
+        recent = self.make_file('d', 10, 10)
+        # the recent file can't be deleted, even though the directory is
+        # still over the limit
+        s = ScratchSweeper(self.tempdir, 0, 15, 50, 0)
+        self.assertEqual((3, 30), s.sweep())
+        self.assertEqual([recent], [p for p in [oldest, older, old, recent]
+                                    if os.path.exists(p)])
+
+        self.make_file('a', 10, 300)
+        s = ScratchSweeper(self.tempdir, 0, 20, 0, 0)
+        self.assertEqual((0, 0), s.sweep())
+        s = ScratchSweeper(self.tempdir, 0, 19, 0, 0)
+        self.assertEqual((1, 10), s.sweep())
+        self.assertEqual(['d'], os.listdir(self.tempdir))
+
+    def test_sweep_thread(self):
+        old = self.make_file('old', 10, 1000)
+        s = ScratchSweeper(self.tempdir, 100, 0, 0, 0.05)
+        s.start()
+        s.start()
+        try:
+            end = time.time() + 5
+            while os.path.exists(old) and time.time() < end:
+                time.sleep(0.05)
+            self.assertFalse(os.path.exists(old))
+        finally:
+            s.stop()
+
+    def test_sweep_tasks(self):
+        ran = threading.Event()
+        # the tasks run even if both limits are disabled
+        s = ScratchSweeper(self.tempdir, 0, 0, 0, 0.05, tasks=[ran.set])
+        s.start()
+        try:
+            self.assertTrue(ran.wait(5))
+        finally:
+            s.stop()
+
+
+class PruneRecordsTest(FakeShockTestCase):
+
+    def test_prune_records(self):
+        # pruning doesn't create the job database
+        self.impl.prune_records()
+        self.assertFalse(os.path.exists(self.impl.job_db))
+        store = self.impl.get_job_runner().store
+        job_id = store.create('user1', 'host:1', {})
+        store.set_complete(job_id, {'files': {}})
+        progress = self.impl.progress.start('call', 1)
+        self.impl.progress.finish(progress)
+        self.impl.prune_records()
+        self.assertIsNotNone(store.get(job_id))
+        self.assertTrue(os.path.exists(progress.path))
+        self.impl.job_max_age = self.impl.progress_max_age = 0.001
+        time.sleep(0.01)
+        self.impl.prune_records()
+        self.assertIsNone(store.get(job_id))
+        self.assertFalse(os.path.exists(progress.path))
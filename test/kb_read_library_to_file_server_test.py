@@ -17,6 +17,8 @@ import requests
 import inspect
 import hashlib
 import subprocess
+import gzip
+import json
 
 
 class TestError(Exception):
@@ -425,6 +427,11 @@ class kb_read_library_to_fileTest(unittest.TestCase):
     MD5_FR_TO_I = '1c58d7d59c656db39cedcb431376514b'
     MD5_I_TO_F = '4a5f4c05aae26dcb288c0faec6583946'
     MD5_I_TO_R = '2be8de9afa4bcd1f437f35891363800a'
+    # the reverse reads without the trailing blank line
+    MD5_SM_R_TRIM = '918ee1eecd617adbcdd9d3fa4cc40048'
+    MD5_SM_F_FA = '3c586837e9315cb23248e0ea2d03093c'
+    MD5_SM_R_FA = 'd1377e5c8f9812095d93edf238afe317'
+    MD5_FR_TO_I_FA = '5a1697d2f6220e441f6aa4430334f858'
 
     STD_OBJ_KBF_P = {'gc_content': None,
                      'insert_size_mean': None,
@@ -1615,6 +1622,319 @@ class kb_read_library_to_fileTest(unittest.TestCase):
              }, interleave='false', gzip='false'
         )
 
+    def test_chunks_paired(self):
+        self.run_chunks_success(
+            'frbasic_gz', 3, {'fwd': self.MD5_SM_F, 'rev': self.MD5_SM_R_TRIM},
+            {'fwd': True, 'rev': True}, gzip='true', interleave='false')
+
+    def test_chunks_interleave(self):
+        self.run_chunks_success(
+            'frbasic', 4, {'inter': self.MD5_FR_TO_I}, {'inter': False},
+            interleave='true')
+
+    def test_chunks_deinterleave(self):
+        self.run_chunks_success(
+            'intbasic_gz', 2, {'fwd': self.MD5_I_TO_F, 'rev': self.MD5_I_TO_R},
+            {'fwd': False, 'rev': False}, interleave='false')
+
+    def test_chunks_single_end(self):
+        self.run_chunks_success(
+            'single_end_gz', 1, {'sing': self.MD5_SM_F}, {'sing': True})
+
+    def test_fasta(self):
+        self.run_success(
+            {'frbasic': {
+                'md5': {'fwd': self.MD5_SM_F_FA, 'rev': self.MD5_SM_R_FA},
+                'gzp': {'fwd': False, 'rev': False},
+                'obj': dictmerge(
+                    self.STD_OBJ_KBF_P,
+                    {'files': {'fwd_gz': 'false',
+                               'rev_gz': 'false'
+                               },
+                     'ref': self.staged['frbasic']['ref']
+                     })
+                },
+             'single_end_gz': {
+                'md5': {'sing': self.MD5_SM_F_FA},
+                'gzp': {'sing': True},
+                'obj': dictmerge(
+                    self.STD_OBJ_KBF_S,
+                    {'files': {'sing_gz': 'true'},
+                     'ref': self.staged['single_end_gz']['ref']
+                     })
+                }
+             }, output_format='fasta'
+        )
+
+    def test_fasta_interleave_and_gzip(self):
+        self.run_success(
+            {'frbasic': {
+                'md5': {'inter': self.MD5_FR_TO_I_FA},
+                'gzp': {'inter': True},
+                'obj': dictmerge(
+                    self.STD_OBJ_KBF_P,
+                    {'files': {'inter_gz': 'true'},
+                     'ref': self.staged['frbasic']['ref']
+                     })
+                }
+             }, interleave='true', gzip='true', output_format='fasta'
+        )
+
+    def test_ws_cache(self):
+        impl = self.getImpl()
+        absref = self.staged['single_end']['ref']
+        relref = self.getWsName() + '/single_end'
+        params = {'read_libraries': [absref]}
+        impl.convert_read_library_to_file(self.ctx, params)
+        hits = impl.ws_cache.hits
+        misses = impl.ws_cache.misses
+        ret = impl.convert_read_library_to_file(self.ctx, params)[0]
+        self.assertEqual(hits + 1, impl.ws_cache.hits)
+        self.assertEqual(misses, impl.ws_cache.misses)
+        self.assertEqual(absref, ret['files'][absref]['ref'])
+        self.assertEqual(self.MD5_SM_F,
+                         self.md5(ret['files'][absref]['files']['sing']))
+
+        # relative refs are resolved to absolute refs via the workspace, and
+        # the objects fetched to resolve them are converted without using
+        # the cache
+        params = {'read_libraries': [relref]}
+        impl.convert_read_library_to_file(self.ctx, params)
+        self.assertEqual(hits + 1, impl.ws_cache.hits)
+        self.assertEqual(misses, impl.ws_cache.misses)
+
+        # the cache is per user
+        ctx = dictmerge(self.ctx, {'token': 'fake token'})
+        with self.assertRaises(WorkspaceError):
+            impl.convert_read_library_to_file(
+                ctx, {'read_libraries': [absref]})
+
+    def test_ref_spellings(self):
+        info = self.staged['frbasic']['info']
+        refs = [self.getWsName() + '/frbasic',
+                str(info[6]) + '/' + str(info[0]),
+                self.staged['frbasic']['ref'],
+                self.getWsName() + '/' + str(info[0]) + '/' + str(info[4])
+                ]
+        ret = self.getImpl().convert_read_library_to_file(
+            self.ctx, {'read_libraries': refs})[0]
+        print('\n== converter returned:')
+        pprint(ret)
+        self.assertEqual(set(refs), set(ret['files'].keys()))
+        for ref in refs:
+            self.assertDictEqual(ret['files'][refs[0]], ret['files'][ref])
+        files = ret['files'][refs[0]]['files']
+        self.assertEqual(self.MD5_SM_F, self.md5(files['fwd']))
+        self.assertEqual(self.MD5_SM_R, self.md5(files['rev']))
+
+    def test_batched_fetch(self):
+        impl = self.getImpl()
+        batch_size = impl.ws_batch_size
+        impl.ws_batch_size = 2
+        try:
+            self.run_success(
+                {'frbasic': {
+                    'md5': {'fwd': self.MD5_SM_F, 'rev': self.MD5_SM_R},
+                    'gzp': {'fwd': False, 'rev': False},
+                    'obj': dictmerge(
+                        self.STD_OBJ_KBF_P,
+                        {'files': {'fwd_gz': 'false',
+                                   'rev_gz': 'false'
+                                   },
+                         'ref': self.staged['frbasic']['ref']
+                         })
+                    },
+                 'single_end': {
+                    'md5': {'sing': self.MD5_SM_F},
+                    'gzp': {'sing': False},
+                    'obj': dictmerge(
+                        self.STD_OBJ_KBF_S,
+                        {'files': {'sing_gz': 'false'},
+                         'ref': self.staged['single_end']['ref']
+                         })
+                    },
+                 'single_end_kbassy': {
+                    'md5': {'sing': self.MD5_SM_R},
+                    'gzp': {'sing': False},
+                    'obj': dictmerge(
+                        self.STD_OBJ_KBA,
+                        {'files': {'sing_gz': 'false'},
+                         'ref': self.staged['single_end_kbassy']['ref']
+                         })
+                    }
+                 }
+            )
+        finally:
+            impl.ws_batch_size = batch_size
+
+    def test_stats(self):
+        ref = self.staged['frbasic']['ref']
+        ret = self.getImpl().convert_read_library_to_file(
+            self.ctx, {'read_libraries': [ref], 'gzip': 'true',
+                       'stats': 'true'})[0]
+        print('\n== converter returned:')
+        pprint(ret)
+        files = ret['files'][ref]['files']
+        stats = ret['stats']
+        self.assertEqual(['gzip', 'shock_download', 'shock_metadata',
+                          'ws_fetch'],
+                         sorted(stats['stages'].keys()))
+        self.assertEqual([ref], stats['libraries'].keys())
+        # the workspace calls are for the whole conversion
+        self.assertDictEqual(
+            {k: v for k, v in stats['stages'].items()
+             if not k.startswith('ws_')}, stats['libraries'][ref])
+        insize = (os.path.getsize('data/small.forward.fq') +
+                  os.path.getsize('data/small.reverse.fq'))
+        outsize = (os.path.getsize(files['fwd']) +
+                   os.path.getsize(files['rev']))
+        download = stats['stages']['shock_download']
+        self.assertEqual(insize, download['bytes_read'])
+        self.assertEqual(insize, download['bytes_written'])
+        gz = stats['stages']['gzip']
+        self.assertEqual(insize, gz['bytes_read'])
+        self.assertEqual(outsize, gz['bytes_written'])
+        for s in [download, gz]:
+            self.assertGreater(s['seconds'], 0)
+            self.assertAlmostEqual(s['bytes_read'] / s['seconds'],
+                                   s['bytes_per_sec'])
+        self.assertGreaterEqual(stats['seconds'],
+                                download['seconds'] + gz['seconds'])
+
+        # stats are omitted unless requested
+        ret = self.getImpl().convert_read_library_to_file(
+            self.ctx, {'read_libraries': [ref]})[0]
+        self.assertNotIn('stats', ret)
+
+    def test_continue_on_failure(self):
+        ref = self.staged['frbasic']['ref']
+        ws = self.getWsName()
+        bad = [ws + '/foo', ws + '/empty', ws + '/bad_node']
+        ret = self.getImpl().convert_read_library_to_file(
+            self.ctx, {'read_libraries': [ref] + bad,
+                       'continue_on_failure': 'true'})[0]
+        print('\n== converter returned:')
+        pprint(ret)
+        self.assertEqual([ref], ret['files'].keys())
+        self.assertEqual(
+            sorted(['fwd', 'fwd_gz', 'rev', 'rev_gz']),
+            sorted(ret['files'][ref]['files'].keys()))
+        errors = ret['errors']
+        self.assertEqual(sorted(bad), sorted(errors.keys()))
+        self.assertDictEqual(
+            {'error': 'No object with name foo exists in workspace ' +
+                      str(self.wsinfo[0]),
+             'type': 'ServerError',
+             'transient': 'false'},
+            errors[ws + '/foo'])
+        self.assertEqual('ValueError', errors[ws + '/empty']['type'])
+        self.assertDictEqual(
+            {'error': ('Error downloading reads for object {} (bad_node) ' +
+                       'from Shock node {}: Node not found').format(
+                           self.staged['bad_node']['ref'],
+                           self.staged['bad_node']['fwd_node_id']),
+             'type': 'ShockError',
+             'transient': 'false'},
+            errors[ws + '/bad_node'])
+
+        # errors are omitted unless continue_on_failure is set
+        ret = self.getImpl().convert_read_library_to_file(
+            self.ctx, {'read_libraries': [ref]})[0]
+        self.assertNotIn('errors', ret)
+
+    def test_async_job(self):
+        impl = self.getImpl()
+        ctx = dictmerge(self.ctx, {'user_id': 'fakeuser'})
+        job_id = impl.submit_convert_read_library_to_file(
+            ctx, {'read_libraries': [self.getWsName() + '/single_end'],
+                  'gzip': 'true'})[0]
+        end = time.time() + 120
+        while True:
+            status = impl.get_job_status(ctx, job_id)[0]
+            if status['status'] in ('complete', 'error'):
+                break
+            if time.time() > end:
+                raise TestError('Job {} did not complete'.format(job_id))
+            time.sleep(0.5)
+        pprint(status)
+        self.assertEqual('complete', status['status'])
+        self.assertEqual(job_id, status['job_id'])
+        self.assertIsNone(status['error'])
+        self.assertLessEqual(status['submitted'], status['started'])
+        self.assertLessEqual(status['started'], status['finished'])
+        self.assertEqual(1, status['progress']['libraries_total'])
+        self.assertEqual(1, status['progress']['libraries_done'])
+        self.assertIsNone(status['progress']['stage'])
+
+        ret = impl.get_job_result(ctx, job_id)[0]
+        self.assertEqual(job_id, ret['call_id'])
+        sing = ret['files'][self.getWsName() + '/single_end']['files']
+        self.assertEqual('true', sing['sing_gz'])
+        if subprocess.call(['gunzip', '-f', sing['sing']]):
+            raise TestError('Error unzipping file {}'.format(sing['sing']))
+        self.assertEqual(self.MD5_SM_F, self.md5(sing['sing'][: -3]))
+
+        # other users can't see the job
+        otherctx = dictmerge(self.ctx, {'user_id': 'otheruser'})
+        with self.assertRaises(ValueError) as context:
+            impl.get_job_status(otherctx, job_id)
+        self.assertEqual('No job with ID ' + job_id, str(context.exception))
+
+    def test_async_job_failure(self):
+        impl = self.getImpl()
+        ctx = dictmerge(self.ctx, {'user_id': 'fakeuser'})
+        job_id = impl.submit_convert_read_library_to_file(
+            ctx, {'read_libraries': [self.getWsName() + '/empty']})[0]
+        end = time.time() + 120
+        while impl.get_job_status(ctx, job_id)[0]['status'] not in (
+                'complete', 'error'):
+            if time.time() > end:
+                raise TestError('Job {} did not complete'.format(job_id))
+            time.sleep(0.5)
+        with self.assertRaises(ValueError) as context:
+            impl.get_job_result(ctx, job_id)
+        self.assertTrue(str(context.exception).startswith(
+            'Job {} failed: Invalid type for object'.format(job_id)))
+
+    def test_async_job_bad_params(self):
+        with self.assertRaises(ValueError) as context:
+            self.getImpl().submit_convert_read_library_to_file(
+                self.ctx, {'read_libraries': []})
+        self.assertEqual('At least one reads library must be provided',
+                         str(context.exception))
+
+    def test_prefetch(self):
+        impl = self.getImpl()
+        max_bytes = impl.staging.max_bytes
+        impl.staging.max_bytes = 10 ** 9
+        try:
+            lib = self.getWsName() + '/single_end'
+            ret = impl.prefetch_read_libraries(
+                self.ctx, {'read_libraries': [lib]})[0]
+            self.assertEqual({lib: self.staged['single_end']['ref']},
+                             ret['refs'])
+            impl.prefetcher.join()
+            hits = impl.m_staging.get(result='hit')
+            ret = impl.convert_read_library_to_file(
+                self.ctx, {'read_libraries': [lib]})[0]
+            self.assertEqual(hits + 1, impl.m_staging.get(result='hit'))
+            self.assertEqual(self.MD5_SM_F, self.md5(
+                ret['files'][lib]['files']['sing']))
+        finally:
+            impl.staging.max_bytes = max_bytes
+
+    def test_prefetch_bad_params(self):
+        impl = self.getImpl()
+        max_bytes = impl.staging.max_bytes
+        impl.staging.max_bytes = 10 ** 9
+        try:
+            with self.assertRaises(ValueError) as context:
+                impl.prefetch_read_libraries(self.ctx, {})
+            self.assertEqual('read_libraries parameter is required',
+                             str(context.exception))
+        finally:
+            impl.staging.max_bytes = max_bytes
+
     def test_object_contents_single_end_single_genome(self):
         self.run_success(
             {'kbfile_sing_sg_t': {
@@ -1761,16 +2081,16 @@ class kb_read_library_to_fileTest(unittest.TestCase):
 
     def test_no_workspace_param(self):
 
-        self.run_error(['foo'], 'Error on ObjectIdentity #1: Illegal number ' +
-                       'of separators / in object reference foo',
+        self.run_error(['foo'], 'Error on ObjectSpecification #1: Illegal ' +
+                       'number of separators / in object reference foo',
                        exception=WorkspaceError)
 
     def test_bad_workspace_name(self):
 
         self.run_error(
             ['bad*name/foo'],
-            'Error on ObjectIdentity #1: Illegal character in workspace ' +
-            'name bad*name: *', exception=WorkspaceError)
+            'Error on ObjectSpecification #1: Illegal character in ' +
+            'workspace name bad*name: *', exception=WorkspaceError)
 
     def test_non_extant_workspace(self):
 
@@ -1784,8 +2104,8 @@ class kb_read_library_to_fileTest(unittest.TestCase):
 
         self.run_error(
             [self.getWsName() + '/bad&name'],
-            'Error on ObjectIdentity #1: Illegal character in object name ' +
-            'bad&name: &', exception=WorkspaceError)
+            'Error on ObjectSpecification #1: Illegal character in object ' +
+            'name bad&name: &', exception=WorkspaceError)
 
     def test_no_libs_param(self):
 
@@ -1890,14 +2210,76 @@ class kb_read_library_to_fileTest(unittest.TestCase):
             'wubba. Allowed values are "true", "false", and null.',
             interleave='wubba')
 
+    def test_invalid_output_format_input(self):
+
+        self.run_error(
+            ['foo'], 'Illegal value for parameter output_format: bam. ' +
+            'Allowed values are fastq, fasta.', output_format='bam')
+
+    def test_progress(self):
+        impl = self.getImpl()
+        ctx = dictmerge(self.ctx, {'call_id': 'progress_test'})
+        refs = [self.staged['frbasic']['ref'], self.staged['intbasic']['ref']]
+        ret = impl.convert_read_library_to_file(
+            ctx, {'read_libraries': refs, 'interleaved': 'true'})[0]
+        # the JSON-RPC ID is chosen by the client, so isn't used
+        self.assertNotEqual('progress_test', ret['call_id'])
+        # the progress of individual calls isn't public
+        self.assertNotIn('progress', impl.status(ctx)[0])
+        with open(os.path.join(impl.scratch, 'progress',
+                               ret['call_id'] + '.json')) as f:
+            progress = json.load(f)
+        self.assertEqual('complete', progress['state'])
+        self.assertEqual(2, progress['libraries_total'])
+        self.assertEqual(2, progress['libraries_done'])
+        self.assertIsNone(progress['error'])
+
+    def test_invalid_stats_input(self):
+
+        self.run_error(
+            ['foo'], 'Illegal value for boolean parameter stats: yes. ' +
+            'Allowed values are "true" and "false".', stats='yes')
+
+    def test_invalid_continue_on_failure_input(self):
+
+        self.run_error(
+            ['foo'], 'Illegal value for boolean parameter ' +
+            'continue_on_failure: 1. Allowed values are "true" and "false".',
+            continue_on_failure=1)
+
+    def test_invalid_priority_input(self):
+
+        self.run_error(
+            ['foo'], 'Illegal value for parameter priority: urgent. ' +
+            'Allowed values are interactive, batch.', priority='urgent')
+
+    def test_invalid_chunks_input(self):
+
+        self.run_error(
+            ['foo'], 'Illegal value for parameter chunks: 0. Must be an ' +
+            'integer greater than 0.', chunks=0)
+        self.run_error(
+            ['foo'], 'Illegal value for parameter chunks: 2. Must be an ' +
+            'integer greater than 0.', chunks='2')
+        self.run_error(
+            ['foo'], 'Illegal value for parameter chunks: 101. Must be at ' +
+            'most 100, the max-chunks setting of the service.', chunks=101)
+
     def run_error(self, readnames, error, gzip=None,
-                  interleave=None, exception=ValueError):
+                  interleave=None, exception=ValueError, chunks=None,
+                  output_format=None, stats=None, continue_on_failure=None,
+                  priority=None):
 
         test_name = inspect.stack()[1][3]
         print('\n****** starting expected fail test: ' + test_name + ' ******')
 
         params = {'gzip': gzip,
-                  'interleaved': interleave}
+                  'interleaved': interleave,
+                  'chunks': chunks,
+                  'output_format': output_format,
+                  'stats': stats,
+                  'continue_on_failure': continue_on_failure,
+                  'priority': priority}
 
         if (readnames is not None):
             params['read_libraries'] = readnames
@@ -1910,7 +2292,8 @@ class kb_read_library_to_fileTest(unittest.TestCase):
             self.getImpl().convert_read_library_to_file(self.ctx, params)
         self.assertEqual(error, str(context.exception.message))
 
-    def run_success(self, testspecs, gzip=None, interleave=None):
+    def run_success(self, testspecs, gzip=None, interleave=None,
+                    output_format=None):
         self.maxDiff = None
         test_name = inspect.stack()[1][3]
         print('\n**** starting expected success test: ' + test_name + ' ***\n')
@@ -1922,6 +2305,9 @@ class kb_read_library_to_fileTest(unittest.TestCase):
             params['gzip'] = gzip
         if interleave != 'none':
             params['interleaved'] = interleave
+        if output_format:
+            params['output_format'] = output_format
+        ext = '.' + (output_format or 'fastq')
 
         print('Running test with {} libs. Params:'.format(len(testspecs)))
         pprint(params)
@@ -1940,17 +2326,72 @@ class kb_read_library_to_fileTest(unittest.TestCase):
                 expectedmd5 = testspecs[f]['md5'][dirc]
                 file_ = retmap[wsref]['files'][dirc]
                 if gz:
-                    if not file_.endswith('.' + dirc + '.fastq.gz'):
+                    if not file_.endswith('.' + dirc + ext + '.gz'):
                         raise TestError(
-                            'Expected file {} to end with .{}.fastq.gz'
-                            .format(file_, dirc))
+                            'Expected file {} to end with .{}{}.gz'
+                            .format(file_, dirc, ext))
                     if subprocess.call(['gunzip', '-f', file_]):
                         raise TestError(
                             'Error unzipping file {}'.format(file_))
                     file_ = file_[: -3]
-                elif not file_.endswith('.' + dirc + '.fastq'):
-                    raise TestError('Expected file {} to end with .{}.fastq'
-                                    .format(file_, dirc))
+                elif not file_.endswith('.' + dirc + ext):
+                    raise TestError('Expected file {} to end with .{}{}'
+                                    .format(file_, dirc, ext))
                 self.assertEqual(expectedmd5, self.md5(file_))
                 del retmap[wsref]['files'][dirc]
             self.assertDictEqual(testspecs[f]['obj'], retmap[wsref])
+
+    # reassembles chunked reads files into the original file, assuming the
+    # records were distributed round robin
+    def unchunk(self, chunkfiles, gzipped, lines, target):
+        opener = gzip.open if gzipped else open
+        sources = [opener(f, 'rb') for f in chunkfiles]
+        try:
+            with open(target, 'w') as t:
+                i = 0
+                while True:
+                    record = [sources[i % len(sources)].readline()
+                              for _ in xrange(lines)]
+                    if not record[0]:
+                        break
+                    t.writelines(record)
+                    i += 1
+        finally:
+            for s in sources:
+                s.close()
+
+    def run_chunks_success(self, readname, chunks, md5s, gzps, gzip=None,
+                           interleave=None):
+        test_name = inspect.stack()[1][3]
+        print('\n**** starting expected success test: ' + test_name + ' ***\n')
+
+        wsref = self.getWsName() + '/' + readname
+        params = {'read_libraries': [wsref],
+                  'gzip': gzip,
+                  'interleaved': interleave,
+                  'chunks': chunks
+                  }
+        print('Running test with params:')
+        pprint(params)
+
+        ret = self.getImpl().convert_read_library_to_file(self.ctx, params)[0]
+        print('\n== converter returned:')
+        pprint(ret)
+        files = ret['files'][wsref]['files']
+        for dirc in md5s:
+            print('\t== checking read set ' + dirc)
+            self.assertNotIn(dirc, files)
+            self.assertEqual('true' if gzps[dirc] else 'false',
+                             files[dirc + '_gz'])
+            chunkfiles = files[dirc + '_chunks']
+            self.assertEqual(chunks, len(chunkfiles))
+            ext = '.fastq.gz' if gzps[dirc] else '.fastq'
+            for i, f in enumerate(chunkfiles):
+                if not f.endswith('.{}.{}{}'.format(dirc, i, ext)):
+                    raise TestError('Expected file {} to end with .{}.{}{}'
+                                    .format(f, dirc, i, ext))
+            target = os.path.join(self.cfg['scratch'],
+                                  test_name + '.' + dirc + '.fastq')
+            self.unchunk(chunkfiles, gzps[dirc], 8 if dirc == 'inter' else 4,
+                         target)
+            self.assertEqual(md5s[dirc], self.md5(target))
@@ -0,0 +1,123 @@
+import unittest
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from kb_read_library_to_file.kb_read_library_to_fileImpl import kb_read_library_to_file  # @IgnorePep8
+
+SERVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                      'lib', 'kb_read_library_to_file',
+                      'kb_read_library_to_fileServer.py')
+
+# modules that are only needed to serve requests over HTTP or to log, and so
+# should not be loaded when running a job that doesn't log via the async CLI
+SERVER_ONLY_MODULES = ['wsgiref.simple_server', 'multiprocessing',
+                       'multiprocessing.pool', 'biokbase.nexus',
+                       'biokbase.log']
+
+# runs the server as the async CLI and reports the loaded server only modules
+CLI = '''
+import json
+import runpy
+import sys
+sys.argv = [{server!r}, {infile!r}, {outfile!r}]
+try:
+    runpy.run_path({server!r}, run_name='__main__')
+except SystemExit as e:
+    code = e.code
+print(json.dumps({{'code': code,
+                   'modules': [m for m in {modules!r} if m in sys.modules]}}))
+'''
+
+# imports the server as a WSGI module and scrapes the metrics endpoint
+METRICS = '''
+import json
+from io import BytesIO
+from kb_read_library_to_file import kb_read_library_to_fileServer as server
+res = {}
+
+
+def start_response(status, headers):
+    res['status'] = status
+    res['headers'] = dict(headers)
+
+body = ''.join(server.application(
+    {'REQUEST_METHOD': 'GET', 'PATH_INFO': '/metrics',
+     'wsgi.input': BytesIO()}, start_response))
+server.impl_kb_read_library_to_file.sweeper.stop()
+res['body'] = body
+print(json.dumps(res))
+'''
+
+
+class StartupTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.scratch = os.path.join(self.tempdir, 'scratch')
+        self.config = os.path.join(self.tempdir, 'deploy.cfg')
+        with open(self.config, 'w') as f:
+            f.write('[kb_read_library_to_file]\n' +
+                    'workspace-url = http://localhost:1\n' +
+                    'shock-url = http://localhost:1\n' +
+                    'scratch = ' + self.scratch + '\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_async_cli_skips_server_setup(self):
+        infile = os.path.join(self.tempdir, 'input.json')
+        outfile = os.path.join(self.tempdir, 'output.json')
+        with open(infile, 'w') as f:
+            json.dump({'method': 'kb_read_library_to_file.status',
+                       'params': []}, f)
+        out = subprocess.check_output([sys.executable, '-c', CLI.format(
+            server=SERVER, infile=infile, outfile=outfile,
+            modules=SERVER_ONLY_MODULES)],
+            env=dict(os.environ, KB_DEPLOYMENT_CONFIG=self.config))
+        res = json.loads(out.strip().split('\n')[-1])
+        self.assertEqual(0, res['code'])
+        self.assertEqual([], res['modules'])
+        with open(outfile) as f:
+            self.assertEqual('OK', json.load(f)['result'][0]['state'])
+        # the job database is only opened by the job methods
+        self.assertFalse(os.path.exists(
+            os.path.join(self.scratch, 'jobs.sqlite3')))
+
+    def test_subsystems_built_on_first_use(self):
+        impl = kb_read_library_to_file({'workspace-url': 'http://localhost:1',
+                                        'shock-url': 'http://localhost:1',
+                                        'scratch': self.scratch})
+        lazy = ['sweeper', 'downloads', 'batch_slots', 'coalescer',
+                'output_cache', 'node_cache', 'staging', 'prefetcher',
+                'peer_server', 'peer_client']
+        self.assertEqual([], [n for n in lazy if n in vars(impl)])
+        self.assertEqual(['progress', 'shock_tmp'],
+                         sorted(os.listdir(self.scratch)))
+        cache = impl.output_cache
+        self.assertIs(cache, impl.output_cache)
+        self.assertTrue(os.path.isdir(
+            os.path.join(self.scratch, 'output_cache')))
+        self.assertIsNone(impl.peer_client)
+
+    def test_metrics_endpoint(self):
+        out = subprocess.check_output(
+            [sys.executable, '-c', METRICS],
+            env=dict(os.environ, KB_DEPLOYMENT_CONFIG=self.config))
+        res = json.loads(out.strip().split('\n')[-1])
+        self.assertEqual('200 OK', res['status'])
+        self.assertEqual('text/plain; version=0.0.4; charset=utf-8',
+                         res['headers']['content-type'])
+        body = res['body']
+        self.assertEqual(str(len(body)), res['headers']['content-length'])
+        self.assertTrue(body.endswith('\n'))
+        lines = body.split('\n')
+        name = 'kb_read_library_to_file_conversions_total'
+        self.assertIn('# HELP {} Conversions started.'.format(name), lines)
+        self.assertIn('# TYPE {} counter'.format(name), lines)
+        self.assertIn(name + ' 0.0', lines)
+        self.assertIn('# TYPE kb_read_library_to_file_stage_seconds histogram',
+                      lines)
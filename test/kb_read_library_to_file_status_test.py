@@ -0,0 +1,43 @@
+import unittest
+import os
+
+from kb_read_library_to_file.kb_read_library_to_fileImpl import ConversionRequest  # @IgnorePep8
+
+from fake_shock import FakeShockTestCase
+
+
+class StatusTest(FakeShockTestCase):
+
+    def test_status(self):
+        self.impl.output_cache.max_bytes = 10 ** 9
+        reads = [self.reads(True), self.reads(False)]
+        for i in xrange(2):
+            req = ConversionRequest(
+                'token', True, True, None, False,
+                progress=self.impl.progress.start('call' + str(i), 2))
+            self.impl.convert_reads(
+                reads, {ref: [ref] for ref, _ in reads}, req)
+            self.impl.progress.finish(req.progress)
+        active = self.impl.progress.start('active', 1)
+        active.start_stage('download', 10)
+        status = self.impl.status({'token': None})[0]
+        self.assertEqual({'active': 0, 'stages': {'download': 1}},
+                         status['conversions'])
+        self.assertEqual({'queued': 0, 'running': 0}, status['jobs'])
+        # checking the status doesn't create the job database
+        self.assertFalse(os.path.exists(self.impl.job_db))
+        self.assertEqual(0, status['prefetches_queued'])
+        self.assertEqual({'active': 0, 'waiting': 0}, status['downloads'])
+        self.assertEqual(0, status['disk']['shock_tmp_bytes'])
+        self.assertEqual(0, status['disk']['scratch_reserved_bytes'])
+        self.assertGreater(status['disk']['scratch_free_bytes'], 0)
+        throughput = status['throughput']
+        self.assertGreater(throughput['download_bytes_per_sec'], 0)
+        self.assertGreater(throughput['libraries_per_sec'], 0)
+        output = status['caches']['output']
+        self.assertEqual(2, output['entries'])
+        self.assertGreater(output['bytes'], 0)
+        self.assertEqual(0.5, output['hit_rate'])
+        # disabled caches have no lookups
+        self.assertEqual({'entries': 0, 'bytes': 0, 'hit_rate': None},
+                         status['caches']['staging'])
@@ -0,0 +1,49 @@
+import unittest
+
+from fake_shock import FakeShockTestCase
+
+
+class WorkspaceTest(FakeShockTestCase):
+
+    def workspace(self, obj, calls):
+        class Workspace(object):
+
+            def get_objects2(self, params):
+                calls.append([o['ref'] for o in params['objects']])
+                return {'data': [obj for _ in params['objects']]}
+        return Workspace()
+
+    def test_resolve_refs(self):
+        ref, obj = self.reads(True)
+        calls = []
+        ws = self.workspace(obj, calls)
+        fetched = {}
+        absrefs = self.impl.resolve_refs(ws, 'token',
+                                         [ref, 'ws/reads1', '1/1'],
+                                         fetched=fetched)
+        self.assertEqual({ref: ref, 'ws/reads1': ref, '1/1': ref}, absrefs)
+        # absolute refs aren't looked up
+        self.assertEqual([['ws/reads1', '1/1']], calls)
+        self.assertEqual({ref: obj}, fetched)
+
+    def test_resolved_objects_not_fetched_again(self):
+        # with the workspace cache disabled, the objects fetched to resolve
+        # references are only available from fetched
+        self.impl = self.make_impl(self.scratch, **{'ws-cache-size': 0})
+        ref, obj = self.reads(True)
+        calls = []
+        ws = self.workspace(obj, calls)
+        fetched = {}
+        absrefs = self.impl.resolve_refs(ws, 'token', ['ws/reads1'],
+                                         fetched=fetched)
+        self.assertEqual([(ref, obj)], list(self.impl.iter_reads_objects(
+            ws, 'token', [absrefs['ws/reads1']], fetched=fetched)))
+        self.assertEqual([['ws/reads1']], calls)
+        # objects are only used once
+        self.assertEqual({}, fetched)
+
+    def test_read_libraries_deduplicated_in_order(self):
+        params = {'read_libraries': ['ws/b', '1/2/3', 'ws/b', 'ws/a',
+                                     '1/2/3']}
+        self.impl.process_read_libraries(params)
+        self.assertEqual(['ws/b', '1/2/3', 'ws/a'], params['read_libraries'])